@@ -0,0 +1,20 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { cache } from '@/lib/cache'
+import { isAdminRequest } from '@/lib/admin'
+
+// Size and per-prefix hit/miss/eviction counters for this instance's response cache
+export async function GET(request: NextRequest) {
+  if (!isAdminRequest(request)) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  const { searchParams } = new URL(request.url)
+  const stats = cache.getStats()
+
+  // Counters are cumulative; reset=true starts a fresh measurement window
+  if (searchParams.get('reset') === 'true') {
+    cache.resetStats()
+  }
+
+  return NextResponse.json(stats, { status: 200 })
+}
@@ -0,0 +1,73 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { cache } from '@/lib/cache'
+import { isAdminRequest } from '@/lib/admin'
+import { getSupabaseAdminClient } from '@/lib/supabase/server'
+
+// Operator tools for the response cache: inspect what this instance holds and
+// invalidate keys across every instance. A group's entries are retired by bumping
+// its version, which every instance reads on the next request.
+
+// Writes go to the shared backend, where authorization reads keys such as
+// memberships:<userId>, so they are test-only: off unless CACHE_TEST_WRITES=true,
+// and then only for keys under this prefix
+const TEST_KEY_PREFIX = 'test:'
+
+export async function GET(request: NextRequest) {
+  if (!isAdminRequest(request)) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  const key = new URL(request.url).searchParams.get('key')
+  if (!key) {
+    return NextResponse.json({ error: 'Key is required' }, { status: 400 })
+  }
+
+  return NextResponse.json({ key, present: cache.has(key), backend: cache.backendName }, { status: 200 })
+}
+
+export async function PUT(request: NextRequest) {
+  if (!isAdminRequest(request)) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  if (process.env.CACHE_TEST_WRITES !== 'true') {
+    return NextResponse.json({ error: 'Cache writes are disabled' }, { status: 403 })
+  }
+
+  const { key, value, ttl } = await request.json()
+  if (!key || typeof key !== 'string' || value === undefined) {
+    return NextResponse.json({ error: 'Key and value are required' }, { status: 400 })
+  }
+  if (!key.startsWith(TEST_KEY_PREFIX)) {
+    return NextResponse.json({ error: `Only ${TEST_KEY_PREFIX} keys can be written` }, { status: 403 })
+  }
+
+  cache.set(key, value, typeof ttl === 'number' && ttl > 0 ? ttl : undefined)
+
+  return NextResponse.json({ key, present: true, backend: cache.backendName }, { status: 200 })
+}
+
+export async function DELETE(request: NextRequest) {
+  if (!isAdminRequest(request)) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  const { searchParams } = new URL(request.url)
+  const groupId = searchParams.get('groupId')
+  // Several keys are dropped with one cross-instance message
+  const keys = searchParams.getAll('key')
+
+  if (groupId) {
+    const { error } = await getSupabaseAdminClient().rpc('bump_group_versions', { p_group_ids: [groupId] })
+    if (error) {
+      console.error('Error bumping group version:', error)
+      return NextResponse.json({ error: 'Failed to invalidate group' }, { status: 500 })
+    }
+  } else if (keys.length > 0) {
+    cache.deleteMany(keys)
+  } else {
+    return NextResponse.json({ error: 'Group ID or key is required' }, { status: 400 })
+  }
+
+  return NextResponse.json({ invalidated: groupId ? { groupId } : { keys } }, { status: 200 })
+}
@@ -0,0 +1,20 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { memorySampler } from '@/lib/memory-stats'
+import { isAdminRequest } from '@/lib/admin'
+
+// Current and peak memory of this instance's process, in bytes
+export async function GET(request: NextRequest) {
+  if (!isAdminRequest(request)) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  const { searchParams } = new URL(request.url)
+  const stats = memorySampler.getStats()
+
+  // Peaks are kept since the last reset; reset=true starts a fresh measurement window
+  if (searchParams.get('reset') === 'true') {
+    memorySampler.reset()
+  }
+
+  return NextResponse.json(stats, { status: 200 })
+}
@@ -0,0 +1,59 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { getSupabaseAdminClient } from '@/lib/supabase/server'
+import { isAdminRequest } from '@/lib/admin'
+
+// Recomputes member balances from expenses/expense_participants and
+// reports rows where the group_member_balances ledger drifted. GET only reports and is
+// meant to be run on a schedule; POST also rewrites the drifted rows, so a prefetch,
+// link checker or retried cron request can never repair by accident.
+async function reconcile(request: NextRequest, repair: boolean) {
+  try {
+    // Only the scheduler (or an operator) holding the job secret may run reconciliation
+    if (!isAdminRequest(request)) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    const groupId = searchParams.get('groupId')
+
+    const supabase = getSupabaseAdminClient()
+    const { data: drift, error } = await supabase.rpc('reconcile_group_member_balances', {
+      p_group_id: groupId,
+      p_repair: repair
+    })
+
+    if (error) {
+      console.error('Error reconciling group balances:', error)
+      return NextResponse.json(
+        { error: 'Failed to reconcile balances' },
+        { status: 500 }
+      )
+    }
+
+    if (drift && drift.length > 0) {
+      console.warn('Balance ledger drift detected:', { rows: drift.length, repaired: repair, drift })
+    }
+
+    return NextResponse.json({
+      checkedAt: new Date().toISOString(),
+      groupId,
+      repaired: repair,
+      driftCount: drift?.length || 0,
+      drift: drift || []
+    }, { status: 200 })
+  } catch (error) {
+    console.error('Unexpected error in balance reconciliation:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    )
+  }
+}
+
+export async function GET(request: NextRequest) {
+  return reconcile(request, false)
+}
+
+export async function POST(request: NextRequest) {
+  return reconcile(request, true)
+}
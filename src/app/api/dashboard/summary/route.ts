@@ -0,0 +1,30 @@
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import { getGroupSummariesServer } from '@/features/groups/api-server'
+import { NextRequest, NextResponse } from 'next/server'
+
+export const GET = withRouteQueryStats('GET /api/dashboard/summary', async function GET(
+  request: NextRequest
+) {
+  try {
+    const supabase = await getSupabaseServerClient()
+
+    // Check authentication
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
+    if (authError || !user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    // Every group the user belongs to with member count, last activity and the
+    // user's balance, from one query (cached per user)
+    const groups = await getGroupSummariesServer()
+
+    return NextResponse.json({ groups, total: groups.length }, { status: 200 })
+  } catch (error) {
+    console.error('Unexpected error in fetching dashboard summary:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    )
+  }
+})
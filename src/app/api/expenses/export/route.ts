@@ -0,0 +1,114 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import type { ExpenseCursor } from '@/features/expenses/query'
+import {
+  createExpenseExportStream,
+  EXPORT_BATCH_SIZE,
+  EXPORT_CONTENT_TYPES,
+  EXPORT_SELECT,
+  exportCursorFilter,
+  parseExportFormat,
+  type ExportExpense
+} from '@/features/expenses/export'
+
+export const dynamic = 'force-dynamic'
+
+/**
+ * Streams a group's ledger as CSV (default) or JSONL: `?groupId=&format=csv|jsonl`.
+ * One line per participant split, oldest expense first (see src/features/expenses/export.ts).
+ * Batches are read as the client downloads, so an export reflects writes made while
+ * it runs only for expenses it hasn't reached yet.
+ */
+export const GET = withRouteQueryStats('GET /api/expenses/export', async function GET(request: NextRequest) {
+  try {
+    const supabase = await getSupabaseServerClient()
+
+    // Check authentication
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
+    if (authError || !user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    const groupId = searchParams.get('groupId')
+
+    if (!groupId) {
+      return NextResponse.json(
+        { error: 'Group ID is required' },
+        { status: 400 }
+      )
+    }
+
+    const format = parseExportFormat(searchParams.get('format'))
+    if (!format) {
+      return NextResponse.json(
+        { error: 'Export format must be csv or jsonl' },
+        { status: 400 }
+      )
+    }
+
+    // Verify user is a member of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
+
+    if (!role) {
+      return NextResponse.json(
+        { error: 'You are not a member of this group' },
+        { status: 403 }
+      )
+    }
+
+    const fetchBatch = async (cursor: ExpenseCursor | null): Promise<ExportExpense[]> => {
+      let query = supabase
+        .from('expenses')
+        .select(EXPORT_SELECT)
+        .eq('group_id', groupId)
+
+      if (cursor) {
+        query = query.or(exportCursorFilter(cursor))
+      }
+
+      const { data, error } = await query
+        .order('created_at', { ascending: true })
+        .order('id', { ascending: true })
+        .limit(EXPORT_BATCH_SIZE)
+
+      if (error) {
+        console.error('Error exporting expenses:', error)
+        throw new Error('Failed to export expenses')
+      }
+      return (data || []) as unknown as ExportExpense[]
+    }
+
+    // The first batch is read up front so a failing query is still a 500, not a cut-off file
+    let firstBatch: ExportExpense[]
+    try {
+      firstBatch = await fetchBatch(null)
+    } catch {
+      return NextResponse.json(
+        { error: 'Failed to export expenses' },
+        { status: 500 }
+      )
+    }
+
+    const stream = createExpenseExportStream(format, fetchBatch, firstBatch)
+
+    return new Response(stream, {
+      status: 200,
+      headers: {
+        'Content-Type': EXPORT_CONTENT_TYPES[format],
+        'Content-Disposition': `attachment; filename="expenses-${groupId}.${format}"`,
+        'Cache-Control': 'private, no-store',
+        // Keeps proxies such as nginx from buffering the whole export
+        'X-Accel-Buffering': 'no'
+      }
+    })
+  } catch (error) {
+    console.error('Unexpected error in exporting expenses:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    )
+  }
+})
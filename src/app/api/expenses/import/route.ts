@@ -0,0 +1,170 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import { invalidateGroupSummaries } from '@/lib/cache'
+import { groupEvents } from '@/lib/group-events/server'
+import {
+  detectImportFormat,
+  ExpenseImportError,
+  IMPORT_MAX_REPORTED_ERRORS,
+  IMPORT_MAX_ROWS,
+  normalizeImportRecord,
+  parseImportStream,
+  toImportPayload,
+  type ImportFormat,
+  type ImportRow,
+  type ImportRowError
+} from '@/features/expenses/import'
+
+/**
+ * Bulk expense import.
+ *
+ * Accepts a CSV (text/csv) or JSONL (application/x-ndjson) body, or `?format=csv|jsonl`.
+ * Rows may carry their own groupId; `?groupId=` is the default for rows that don't.
+ * Valid rows are inserted together in one transaction and invalid rows are
+ * reported by source row number.
+ */
+export const POST = withRouteQueryStats('POST /api/expenses/import', async function POST(request: NextRequest) {
+  try {
+    const supabase = await getSupabaseServerClient()
+
+    // Check authentication
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
+    if (authError || !user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    let format: ImportFormat
+    try {
+      format = detectImportFormat(request.headers.get('content-type'), searchParams.get('format'))
+    } catch (error) {
+      if (error instanceof ExpenseImportError) {
+        return NextResponse.json({ error: error.message }, { status: 415 })
+      }
+      throw error
+    }
+
+    if (!request.body) {
+      return NextResponse.json(
+        { error: 'Request body is required' },
+        { status: 400 }
+      )
+    }
+
+    const defaultGroupId = searchParams.get('groupId')
+    const rows: ImportRow[] = []
+    const errors: ImportRowError[] = []
+    let failed = 0
+
+    const reject = (row: number, error: string) => {
+      failed++
+      if (errors.length < IMPORT_MAX_REPORTED_ERRORS) {
+        errors.push({ row, error })
+      }
+    }
+
+    // Member IDs per group, loaded once per group in the import; null when the caller isn't a member
+    const groupMembers = new Map<string, Set<string> | null>()
+    const membersOf = async (groupId: string): Promise<Set<string> | null> => {
+      if (!groupMembers.has(groupId)) {
+        const { data: members, error: membersError } = await supabase
+          .from('group_members')
+          .select('user_id')
+          .eq('group_id', groupId)
+
+        if (membersError) {
+          console.error('Error loading group members for import:', membersError)
+          throw membersError
+        }
+
+        const ids = new Set((members || []).map(member => member.user_id))
+        groupMembers.set(groupId, ids.has(user.id) ? ids : null)
+      }
+      return groupMembers.get(groupId) ?? null
+    }
+
+    for await (const parsed of parseImportStream(request.body, format)) {
+      if (rows.length + failed >= IMPORT_MAX_ROWS) {
+        return NextResponse.json(
+          { error: `Imports are limited to ${IMPORT_MAX_ROWS} rows` },
+          { status: 413 }
+        )
+      }
+
+      if (parsed.error || !parsed.record) {
+        reject(parsed.row, parsed.error || 'Invalid row')
+        continue
+      }
+
+      let row: ImportRow
+      try {
+        row = normalizeImportRecord(parsed.record, parsed.row, defaultGroupId)
+      } catch (error) {
+        if (error instanceof ExpenseImportError) {
+          reject(parsed.row, error.message)
+          continue
+        }
+        throw error
+      }
+
+      const members = await membersOf(row.groupId)
+      if (!members) {
+        reject(row.row, 'You are not a member of this group')
+        continue
+      }
+      if (row.paidByUserId && !members.has(row.paidByUserId)) {
+        reject(row.row, 'Payer is not a member of this group')
+        continue
+      }
+      const outsider = row.participants.find(participant => !members.has(participant.userId))
+      if (outsider) {
+        reject(row.row, `Participant ${outsider.userId} is not a member of this group`)
+        continue
+      }
+
+      rows.push(row)
+    }
+
+    if (rows.length === 0) {
+      return NextResponse.json(
+        { imported: 0, failed, errors },
+        { status: failed > 0 ? 400 : 200 }
+      )
+    }
+
+    // Every valid row goes in one call, so the import commits or rolls back as a whole
+    const { error: importError } = await supabase.rpc('import_expenses', {
+      p_rows: toImportPayload(rows)
+    })
+
+    if (importError) {
+      console.error('Error importing expenses:', importError)
+      return NextResponse.json(
+        { error: 'Failed to import expenses', imported: 0, failed, errors },
+        { status: 500 }
+      )
+    }
+
+    // The import bumped every touched group's version, which retires their cached balances,
+    // settlements and analytics; the dashboard summaries of their members are dropped here
+    const touchedMembers = new Set<string>()
+    for (const groupId of new Set(rows.map(row => row.groupId))) {
+      // Open pages refetch once rather than replaying every row; with Realtime,
+      // import_expenses sends this itself and the call is a no-op
+      groupEvents.publish(groupId, [{ type: 'resync' }])
+      for (const memberId of groupMembers.get(groupId) ?? []) {
+        touchedMembers.add(memberId)
+      }
+    }
+    invalidateGroupSummaries([...touchedMembers])
+
+    return NextResponse.json({ imported: rows.length, failed, errors }, { status: 201 })
+  } catch (error) {
+    console.error('Unexpected error in expense import:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    )
+  }
+})
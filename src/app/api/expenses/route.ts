@@ -1,12 +1,37 @@
 import { NextRequest, NextResponse } from 'next/server'
-import { getSupabaseServerClient } from '@/lib/supabase/server'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import { invalidateGroupSummaries } from '@/lib/cache'
+import { getGroupVersion, groupETag, isNotModified, notModified, versionHeaders } from '@/lib/group-version'
+import { parseCents } from '@/lib/money'
+import { publishExpenseCreated } from '@/features/expenses/events-server'
+import {
+  buildExpenseSelect,
+  decodeExpenseCursor,
+  expenseCursorFilter,
+  ExpenseQueryError,
+  parseExpenseFields,
+  parseExpenseLimit,
+  toExpensePage,
+  type ExpenseCursor
+} from '@/features/expenses/query'
+
+// SQLSTATEs from create_expense_with_participants that are the caller's mistake.
+// Without an error message the function's own message is returned.
+const CREATE_EXPENSE_ERRORS: Record<string, { status: number; error?: string }> = {
+  '42501': { status: 403, error: 'You are not a member of this group' },
+  '22023': { status: 400 },
+  '22P02': { status: 400, error: 'Invalid participant or share amount' },
+  '23503': { status: 400, error: 'Every participant must be a member of this group' },
+}
 
-export async function POST(request: NextRequest) {
+export const POST = withRouteQueryStats('POST /api/expenses', async function POST(request: NextRequest) {
   try {
     const supabase = await getSupabaseServerClient()
     
     // Check authentication
-    const { data: { user }, error: authError } = await supabase.auth.getUser()
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
     if (authError || !user) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
     }
@@ -22,49 +47,57 @@ export async function POST(request: NextRequest) {
       )
     }
 
-    if (amount <= 0) {
+    // Amounts arrive in currency units and are handled as integer cents from here on
+    const amountCents = parseCents(amount)
+    if (amountCents === null) {
+      return NextResponse.json(
+        { error: 'Amount must be a number with at most two decimal places' }, 
+        { status: 400 }
+      )
+    }
+
+    if (amountCents <= 0) {
       return NextResponse.json(
         { error: 'Amount must be greater than 0' }, 
         { status: 400 }
       )
     }
 
-    if (!participants || participants.length === 0) {
+    if (!Array.isArray(participants) || participants.length === 0) {
       return NextResponse.json(
         { error: 'At least one participant is required' }, 
         { status: 400 }
       )
     }
 
-    // Verify user is a member of the group
-    const { data: membership, error: membershipError } = await supabase
-      .from('group_members')
-      .select('id')
-      .eq('group_id', groupId)
-      .eq('user_id', user.id)
-      .single()
-
-    if (membershipError || !membership) {
+    const shares = participants.map((participant: any) => ({
+      user_id: participant.userId,
+      share_cents: parseCents(participant.shareAmount)
+    }))
+    if (shares.some((share: { share_cents: number | null }) => share.share_cents === null || share.share_cents < 0)) {
       return NextResponse.json(
-        { error: 'You are not a member of this group' }, 
-        { status: 403 }
+        { error: 'Invalid participant or share amount' }, 
+        { status: 400 }
       )
     }
 
-    // Create the expense
-    const { data: expense, error: expenseError } = await supabase
-      .from('expenses')
-      .insert({
-        group_id: groupId,
-        paid_by_user_id: user.id,
-        amount: parseFloat(amount),
-        description: description.trim(),
-        category: category?.trim() || 'other'
-      })
-      .select()
-      .single()
+    // Membership check, both inserts and the exact share total check run in one transaction
+    const { data: expense, error: expenseError } = await supabase.rpc('create_expense_with_participants', {
+      p_group_id: groupId,
+      p_amount_cents: amountCents,
+      p_description: description.trim(),
+      p_category: category?.trim() || 'other',
+      p_participants: shares
+    })
 
     if (expenseError) {
+      const known = CREATE_EXPENSE_ERRORS[expenseError.code]
+      if (known) {
+        return NextResponse.json(
+          { error: known.error ?? expenseError.message }, 
+          { status: known.status }
+        )
+      }
       console.error('Error creating expense:', expenseError)
       return NextResponse.json(
         { error: 'Failed to create expense' }, 
@@ -72,26 +105,15 @@ export async function POST(request: NextRequest) {
       )
     }
 
-    // Add participants
-    const participantData = participants.map((participant: any) => ({
-      expense_id: expense.id,
-      user_id: participant.userId,
-      share_amount: parseFloat(participant.shareAmount)
-    }))
-
-    const { error: participantsError } = await supabase
-      .from('expense_participants')
-      .insert(participantData)
+    // The insert bumped the group's version, so its cached balances, settlements and
+    // analytics are already out of reach. The dashboard balances of everyone the expense
+    // touched are keyed per user and dropped here; other members' totals and last
+    // activity catch up within CACHE_TTL.GROUP_SUMMARIES
+    const touchedUserIds = [user.id, ...participants.map((participant: any) => participant.userId)]
+    invalidateGroupSummaries(touchedUserIds)
 
-    if (participantsError) {
-      console.error('Error adding participants:', participantsError)
-      // Clean up the expense if participants failed
-      await supabase.from('expenses').delete().eq('id', expense.id)
-      return NextResponse.json(
-        { error: 'Failed to add participants' }, 
-        { status: 500 }
-      )
-    }
+    // Open group pages get the new expense and the moved balances pushed to them
+    await publishExpenseCreated(supabase, expense, touchedUserIds)
 
     return NextResponse.json(expense, { status: 201 })
   } catch (error) {
@@ -101,14 +123,14 @@ export async function POST(request: NextRequest) {
       { status: 500 }
     )
   }
-}
+})
 
-export async function GET(request: NextRequest) {
+export const GET = withRouteQueryStats('GET /api/expenses', async function GET(request: NextRequest) {
   try {
     const supabase = await getSupabaseServerClient()
     
     // Check authentication
-    const { data: { user }, error: authError } = await supabase.auth.getUser()
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
     if (authError || !user) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
     }
@@ -123,41 +145,57 @@ export async function GET(request: NextRequest) {
       )
     }
 
-    // Verify user is a member of the group
-    const { data: membership, error: membershipError } = await supabase
-      .from('group_members')
-      .select('id')
-      .eq('group_id', groupId)
-      .eq('user_id', user.id)
-      .single()
+    // Verify user is a member of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
 
-    if (membershipError || !membership) {
+    if (!role) {
       return NextResponse.json(
         { error: 'You are not a member of this group' }, 
         { status: 403 }
       )
     }
 
-    // Get expenses for the group
-    const { data: expenses, error: expensesError } = await supabase
+    // Parameters are checked before the version read so bad requests cost no query
+    let select: string
+    let limit: number
+    let cursor: ExpenseCursor | null
+    try {
+      select = buildExpenseSelect(parseExpenseFields(searchParams.get('fields')))
+      limit = parseExpenseLimit(searchParams.get('limit'))
+      const cursorParam = searchParams.get('cursor')
+      cursor = cursorParam ? decodeExpenseCursor(cursorParam) : null
+    } catch (error) {
+      if (error instanceof ExpenseQueryError) {
+        return NextResponse.json({ error: error.message }, { status: 400 })
+      }
+      throw error
+    }
+
+    // One indexed read decides whether the client's copy of this page is still current
+    const version = await getGroupVersion(supabase, groupId)
+    if (version === null) {
+      return NextResponse.json({ error: 'Group not found' }, { status: 404 })
+    }
+    const etag = groupETag(groupId, version)
+    if (isNotModified(request, etag)) {
+      return notModified(etag)
+    }
+
+    // One page of expenses, newest first, after the cursor if one was given
+    let query = supabase
       .from('expenses')
-      .select(`
-        *,
-        payer:profiles!expenses_paid_by_user_id_fkey (
-          full_name,
-          avatar_url
-        ),
-        participants:expense_participants (
-          user_id,
-          share_amount,
-          user:profiles!expense_participants_user_id_fkey (
-            full_name,
-            avatar_url
-          )
-        )
-      `)
+      .select(select)
       .eq('group_id', groupId)
+
+    if (cursor) {
+      query = query.or(expenseCursorFilter(cursor))
+    }
+
+    // Fetch one extra row to know whether another page exists
+    const { data: rows, error: expensesError } = await query
       .order('created_at', { ascending: false })
+      .order('id', { ascending: false })
+      .limit(limit + 1)
 
     if (expensesError) {
       console.error('Error fetching expenses:', expensesError)
@@ -167,7 +205,9 @@ export async function GET(request: NextRequest) {
       )
     }
 
-    return NextResponse.json(expenses, { status: 200 })
+    const page = toExpensePage((rows || []) as unknown as Array<{ created_at: string; id: string }>, limit)
+
+    return NextResponse.json(page, { status: 200, headers: versionHeaders(etag) })
   } catch (error) {
     console.error('Unexpected error in fetching expenses:', error)
     return NextResponse.json(
@@ -175,4 +215,4 @@ export async function GET(request: NextRequest) {
       { status: 500 }
     )
   }
-}
\ No newline at end of file
+})
\ No newline at end of file
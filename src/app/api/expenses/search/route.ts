@@ -0,0 +1,149 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import { getGroupVersion, groupETag, isNotModified, notModified, versionHeaders } from '@/lib/group-version'
+import {
+  buildExpenseSelect,
+  decodeExpenseCursor,
+  expenseCursorFilter,
+  ExpenseQueryError,
+  expenseSearchEndOf,
+  expenseSearchPattern,
+  parseExpenseFields,
+  parseExpenseLimit,
+  parseExpenseSearch,
+  PARTICIPANT_FILTER_ALIAS,
+  PARTICIPANT_FILTER_SELECT,
+  toExpensePage,
+  type ExpenseCursor,
+  type ExpenseSearchFilters
+} from '@/features/expenses/query'
+
+/**
+ * Searches a group's expenses (see parseExpenseSearch for the filters).
+ * Same page shape, `fields` projection and cursors as GET /api/expenses; words are
+ * matched through the trigram index from migration 016, everything else narrows the
+ * keyset scan, so a page costs the same at 100 expenses as at 100k.
+ */
+export const GET = withRouteQueryStats('GET /api/expenses/search', async function GET(request: NextRequest) {
+  try {
+    const supabase = await getSupabaseServerClient()
+
+    // Check authentication
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
+    if (authError || !user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    const groupId = searchParams.get('groupId')
+
+    if (!groupId) {
+      return NextResponse.json(
+        { error: 'Group ID is required' },
+        { status: 400 }
+      )
+    }
+
+    // Verify user is a member of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
+
+    if (!role) {
+      return NextResponse.json(
+        { error: 'You are not a member of this group' },
+        { status: 403 }
+      )
+    }
+
+    // Parameters are checked before the version read so bad requests cost no query
+    let select: string
+    let limit: number
+    let cursor: ExpenseCursor | null
+    let filters: ExpenseSearchFilters
+    try {
+      select = buildExpenseSelect(parseExpenseFields(searchParams.get('fields')))
+      limit = parseExpenseLimit(searchParams.get('limit'))
+      const cursorParam = searchParams.get('cursor')
+      cursor = cursorParam ? decodeExpenseCursor(cursorParam) : null
+      filters = parseExpenseSearch(searchParams)
+    } catch (error) {
+      if (error instanceof ExpenseQueryError) {
+        return NextResponse.json({ error: error.message }, { status: 400 })
+      }
+      throw error
+    }
+
+    // Results change only when the group does, so the listing's ETag applies here too
+    const version = await getGroupVersion(supabase, groupId)
+    if (version === null) {
+      return NextResponse.json({ error: 'Group not found' }, { status: 404 })
+    }
+    const etag = groupETag(groupId, version)
+    if (isNotModified(request, etag)) {
+      return notModified(etag)
+    }
+
+    let query = supabase
+      .from('expenses')
+      .select(filters.participant ? `${select},\n${PARTICIPANT_FILTER_SELECT}` : select)
+      .eq('group_id', groupId)
+
+    // Every word must match; each is its own ilike filter so the trigram index can AND them
+    for (const term of filters.terms) {
+      query = query.ilike('search_text', expenseSearchPattern(term))
+    }
+    if (filters.category) {
+      query = query.eq('category', filters.category)
+    }
+    if (filters.paidBy) {
+      query = query.eq('paid_by_user_id', filters.paidBy)
+    }
+    if (filters.participant) {
+      query = query.eq(`${PARTICIPANT_FILTER_ALIAS}.user_id`, filters.participant)
+    }
+    if (filters.minCents !== null) {
+      query = query.gte('amount_cents', filters.minCents)
+    }
+    if (filters.maxCents !== null) {
+      query = query.lte('amount_cents', filters.maxCents)
+    }
+    if (filters.from) {
+      query = query.gte('created_at', `${filters.from}T00:00:00Z`)
+    }
+    if (filters.to) {
+      query = query.lt('created_at', expenseSearchEndOf(filters.to))
+    }
+    if (cursor) {
+      query = query.or(expenseCursorFilter(cursor))
+    }
+
+    // Fetch one extra row to know whether another page exists
+    const { data: rows, error: searchError } = await query
+      .order('created_at', { ascending: false })
+      .order('id', { ascending: false })
+      .limit(limit + 1)
+
+    if (searchError) {
+      console.error('Error searching expenses:', searchError)
+      return NextResponse.json(
+        { error: 'Failed to search expenses' },
+        { status: 500 }
+      )
+    }
+
+    const matches = (rows || []) as unknown as Array<{ created_at: string; id: string } & Record<string, unknown>>
+    for (const expense of matches) {
+      delete expense[PARTICIPANT_FILTER_ALIAS]
+    }
+    const page = toExpensePage(matches, limit)
+
+    return NextResponse.json(page, { status: 200, headers: versionHeaders(etag) })
+  } catch (error) {
+    console.error('Unexpected error in searching expenses:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    )
+  }
+})
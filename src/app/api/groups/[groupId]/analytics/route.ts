@@ -0,0 +1,70 @@
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import {
+  getCachedGroupAnalytics,
+  validateGroupAnalyticsOptions,
+  type AnalyticsGranularity,
+  type GroupAnalyticsOptions
+} from '@/features/analytics/api/analytics-server'
+import { getGroupVersion, groupETag, isNotModified, notModified, versionHeaders } from '@/lib/group-version'
+import { NextRequest, NextResponse } from 'next/server'
+
+export const GET = withRouteQueryStats('GET /api/groups/[groupId]/analytics', async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ groupId: string }> }
+) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const options: GroupAnalyticsOptions = {
+      granularity: (searchParams.get('granularity') || undefined) as AnalyticsGranularity | undefined,
+      from: searchParams.get('from') || undefined,
+      to: searchParams.get('to') || undefined
+    }
+
+    const invalidOptions = validateGroupAnalyticsOptions(options)
+    if (invalidOptions) {
+      return NextResponse.json({ error: invalidOptions }, { status: 400 })
+    }
+
+    const supabase = await getSupabaseServerClient()
+    const { groupId } = await params
+
+    // Check authentication
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
+    if (authError || !user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    // Check if user is a member of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
+
+    if (!role) {
+      return NextResponse.json(
+        { error: 'You are not a member of this group' },
+        { status: 403 }
+      )
+    }
+
+    // One indexed read decides whether the client's copy is still current
+    const version = await getGroupVersion(supabase, groupId)
+    if (version === null) {
+      return NextResponse.json({ error: 'Group not found' }, { status: 404 })
+    }
+    const etag = groupETag(groupId, version)
+    if (isNotModified(request, etag)) {
+      return notModified(etag)
+    }
+
+    // Same rollup reads and cache as the getGroupAnalytics action
+    const analytics = await getCachedGroupAnalytics(supabase, groupId, version, options)
+
+    return NextResponse.json(analytics, { status: 200, headers: versionHeaders(etag) })
+  } catch (error) {
+    console.error('Unexpected error in fetching group analytics:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    )
+  }
+})
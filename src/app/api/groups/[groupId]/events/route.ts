@@ -0,0 +1,108 @@
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import { groupEvents, type GroupEvent } from '@/lib/group-events/server'
+import { NextRequest, NextResponse } from 'next/server'
+
+export const dynamic = 'force-dynamic'
+
+// Comment lines keep proxies from timing out idle streams
+const HEARTBEAT_INTERVAL_MS = 25 * 1000
+// Streams are closed after this long; the browser reconnects, which re-checks the session and membership
+const MAX_STREAM_MS = 15 * 60 * 1000
+// Events queued for a reader that isn't keeping up; past this it is dropped and resyncs on reconnect
+const MAX_QUEUED_EVENTS = 256
+// How long a browser waits before reconnecting after the stream ends
+const RETRY_MS = 3000
+
+/**
+ * Server-sent event stream of a group's changes (see src/lib/group-events).
+ * Sends `ready` once subscribed, then one `expense`, `balance` or `resync` event per change.
+ */
+export const GET = withRouteQueryStats('GET /api/groups/[groupId]/events', async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ groupId: string }> }
+) {
+  try {
+    const supabase = await getSupabaseServerClient()
+    const { groupId } = await params
+
+    // Check authentication
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
+    if (authError || !user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    // Check if user is a member of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
+
+    if (!role) {
+      return NextResponse.json(
+        { error: 'You are not a member of this group' },
+        { status: 403 }
+      )
+    }
+
+    const encoder = new TextEncoder()
+    let close = () => {}
+
+    const stream = new ReadableStream<Uint8Array>({
+      start(controller) {
+        let closed = false
+        const write = (chunk: string) => {
+          if (!closed) {
+            controller.enqueue(encoder.encode(chunk))
+          }
+        }
+
+        const unsubscribe = groupEvents.subscribe(groupId, (event: GroupEvent) => {
+          // A full queue means the reader stopped draining; end the stream rather than buffer without bound
+          if ((controller.desiredSize ?? 1) <= 0) {
+            close()
+            return
+          }
+          write(`event: ${event.type}\ndata: ${JSON.stringify(event)}\n\n`)
+        })
+        const heartbeat = setInterval(() => write(': keep-alive\n\n'), HEARTBEAT_INTERVAL_MS)
+        const expiry = setTimeout(() => close(), MAX_STREAM_MS)
+
+        close = () => {
+          if (closed) return
+          closed = true
+          unsubscribe()
+          clearInterval(heartbeat)
+          clearTimeout(expiry)
+          request.signal.removeEventListener('abort', close)
+          try {
+            controller.close()
+          } catch {
+            // Already cancelled by the reader
+          }
+        }
+        request.signal.addEventListener('abort', close)
+
+        write(`retry: ${RETRY_MS}\nevent: ready\ndata: {}\n\n`)
+      },
+      cancel() {
+        close()
+      }
+    }, new CountQueuingStrategy({ highWaterMark: MAX_QUEUED_EVENTS }))
+
+    return new Response(stream, {
+      status: 200,
+      headers: {
+        'Content-Type': 'text/event-stream; charset=utf-8',
+        'Cache-Control': 'no-cache, no-transform',
+        Connection: 'keep-alive',
+        // Stops nginx-style proxies from buffering the stream
+        'X-Accel-Buffering': 'no'
+      }
+    })
+  } catch (error) {
+    console.error('Unexpected error in streaming group events:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    )
+  }
+})
@@ -1,7 +1,9 @@
-import { getSupabaseServerClient } from '@/lib/supabase/server'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
 import { NextRequest, NextResponse } from 'next/server'
 
-export async function GET(
+export const GET = withRouteQueryStats('GET /api/groups/[groupId]', async function GET(
   request: NextRequest,
   { params }: { params: Promise<{ groupId: string }> }
 ) {
@@ -10,20 +12,15 @@ export async function GET(
     const { groupId } = await params
     
     // Check authentication
-    const { data: { user }, error: authError } = await supabase.auth.getUser()
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
     if (authError || !user) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
     }
 
-    // Check if user is a member of the group
-    const { data: membership, error: membershipError } = await supabase
-      .from('group_members')
-      .select('id')
-      .eq('group_id', groupId)
-      .eq('user_id', user.id)
-      .single()
+    // Check if user is a member of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
 
-    if (membershipError || !membership) {
+    if (!role) {
       return NextResponse.json(
         { error: 'You are not a member of this group' }, 
         { status: 403 }
@@ -63,9 +60,9 @@ export async function GET(
       { status: 500 }
     )
   }
-}
+})
 
-export async function PUT(
+export const PUT = withRouteQueryStats('PUT /api/groups/[groupId]', async function PUT(
   request: NextRequest,
   { params }: { params: Promise<{ groupId: string }> }
 ) {
@@ -74,20 +71,15 @@ export async function PUT(
     const { groupId } = await params
     
     // Check authentication
-    const { data: { user }, error: authError } = await supabase.auth.getUser()
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
     if (authError || !user) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
     }
 
-    // Check if user is an admin of the group
-    const { data: membership, error: membershipError } = await supabase
-      .from('group_members')
-      .select('role')
-      .eq('group_id', groupId)
-      .eq('user_id', user.id)
-      .single()
+    // Check if user is an admin of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
 
-    if (membershipError || !membership || membership.role !== 'admin') {
+    if (role !== 'admin') {
       return NextResponse.json(
         { error: 'You do not have permission to update this group' }, 
         { status: 403 }
@@ -133,9 +125,9 @@ export async function PUT(
       { status: 500 }
     )
   }
-}
+})
 
-export async function DELETE(
+export const DELETE = withRouteQueryStats('DELETE /api/groups/[groupId]', async function DELETE(
   request: NextRequest,
   { params }: { params: Promise<{ groupId: string }> }
 ) {
@@ -144,7 +136,7 @@ export async function DELETE(
     const { groupId } = await params
     
     // Check authentication
-    const { data: { user }, error: authError } = await supabase.auth.getUser()
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
     if (authError || !user) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
     }
@@ -192,4 +184,4 @@ export async function DELETE(
       { status: 500 }
     )
   }
-}
+})
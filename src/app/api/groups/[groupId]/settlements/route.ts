@@ -0,0 +1,71 @@
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import { getCachedGroupBalances } from '@/features/groups/api/balances-server'
+import { planSettlements, type SettlementMode, type SettlementPlan } from '@/features/groups/api/settlements'
+import { cache, CACHE_KEYS, CACHE_TTL } from '@/lib/cache'
+import { getGroupVersion, groupETag, isNotModified, notModified, versionHeaders } from '@/lib/group-version'
+import { NextRequest, NextResponse } from 'next/server'
+
+export const GET = withRouteQueryStats('GET /api/groups/[groupId]/settlements', async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ groupId: string }> }
+) {
+  try {
+    const supabase = await getSupabaseServerClient()
+    const { groupId } = await params
+    
+    // Check authentication
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
+    if (authError || !user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    const modeParam = searchParams.get('mode') || 'greedy'
+
+    if (modeParam !== 'greedy' && modeParam !== 'exact') {
+      return NextResponse.json(
+        { error: 'Mode must be either "greedy" or "exact"' }, 
+        { status: 400 }
+      )
+    }
+    const mode: SettlementMode = modeParam
+
+    // Check if user is a member of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
+
+    if (!role) {
+      return NextResponse.json(
+        { error: 'You are not a member of this group' }, 
+        { status: 403 }
+      )
+    }
+
+    // Plans change only with the balances they come from, so they share the group version
+    const version = await getGroupVersion(supabase, groupId)
+    if (version === null) {
+      return NextResponse.json({ error: 'Group not found' }, { status: 404 })
+    }
+    const etag = groupETag(groupId, version)
+    if (isNotModified(request, etag)) {
+      return notModified(etag)
+    }
+
+    // Served from cache when possible; concurrent misses share one plan computation
+    const plan = await cache.getOrLoad<SettlementPlan>(
+      CACHE_KEYS.SETTLEMENTS(groupId, version, mode),
+      async () => planSettlements(await getCachedGroupBalances(supabase, groupId, version), { mode }),
+      CACHE_TTL.SETTLEMENTS,
+      { staleWhileRevalidate: CACHE_TTL.SETTLEMENTS }
+    )
+
+    return NextResponse.json(plan, { status: 200, headers: versionHeaders(etag) })
+  } catch (error) {
+    console.error('Unexpected error in planning group settlements:', error)
+    return NextResponse.json(
+      { error: 'Internal server error' }, 
+      { status: 500 }
+    )
+  }
+})
@@ -2,12 +2,14 @@ import { NextRequest, NextResponse } from 'next/server'
 import { createServerClient } from '@supabase/ssr'
 import { cookies } from 'next/headers'
 import type { Database } from '@/types/database.types'
+import { getVerifiedUser } from '@/lib/supabase/server'
+import { withRouteQueryStats } from '@/lib/supabase/query-stats'
+import { cache, CACHE_KEYS } from '@/lib/cache'
+import { getGroupsServer, GroupServerError } from '@/features/groups/api-server'
 
 // Tell Next.js not to statically optimize this route
 export const dynamic = 'force-dynamic' // disables static prerendering
 
-export const runtime = 'edge' // (optional) runs on the Edge runtime
-
 // Helper function to create Supabase client with cookie support for API routes
 async function createServerSupabaseClient() {
   const cookieStore = await cookies()
@@ -45,7 +47,7 @@ async function createServerSupabaseClient() {
 
 export async function POST(req: Request) {
   const supabase = await createServerSupabaseClient()
-  const { data: { user } } = await supabase.auth.getUser()
+  const { data: { user } } = await getVerifiedUser(supabase)
   
   console.log('Supabase user UID →', user?.id)
   
@@ -81,47 +83,25 @@ export async function POST(req: Request) {
     })
   }
   
+  // GET serves the creator's groups from cache
+  cache.deleteMany([CACHE_KEYS.GROUPS(user.id), CACHE_KEYS.GROUP_SUMMARIES(user.id)])
+
   return new Response(JSON.stringify(data), {
     status: 201,
     headers: { 'Content-Type': 'application/json' },
   })
 }
 
-export async function GET(req: Request) {
-  const supabase = await createServerSupabaseClient()
-  const { data: { user } } = await supabase.auth.getUser()
-  
-  console.log('Supabase user UID →', user?.id)
-  
-  if (!user) {
-    return new Response(JSON.stringify({ error: 'Not authenticated' }), {
-      status: 401,
-      headers: { 'Content-Type': 'application/json' },
-    })
-  }
-
-  const { data, error } = await supabase
-    .from('groups')
-    .select('*')
-    .eq('created_by', user.id)
-    .order('created_at', { ascending: false })
-
-  if (error) {
-    const payload = {
-      message: error.message,
-      code: error.code,
-      details: error.details,
-      hint: error.hint,
+export const GET = withRouteQueryStats('GET /api/groups', async function GET() {
+  try {
+    // Groups created by the current user, cached per user (see getGroupsServer)
+    const groups = await getGroupsServer()
+    return NextResponse.json(groups, { status: 200 })
+  } catch (error) {
+    if (error instanceof GroupServerError && error.code === 'UNAUTHENTICATED') {
+      return NextResponse.json({ error: 'Not authenticated' }, { status: 401 })
     }
-    console.error('Supabase fetch error →', payload)
-    return new Response(JSON.stringify({ error: payload }), {
-      status: 400,
-      headers: { 'Content-Type': 'application/json' },
-    })
+    console.error('Error fetching groups:', error)
+    return NextResponse.json({ error: 'Failed to fetch groups' }, { status: 500 })
   }
-
-  return new Response(JSON.stringify(data || []), {
-    status: 200,
-    headers: { 'Content-Type': 'application/json' },
-  })
-}
+})
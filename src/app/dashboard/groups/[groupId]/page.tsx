@@ -1,115 +1,72 @@
-'use client'
-
-import { useState, useEffect } from 'react'
-import { useRouter } from 'next/navigation'
+import { Suspense } from 'react'
+import { redirect } from 'next/navigation'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
-import { Modal } from '@/components/ui/modal'
 import Link from 'next/link'
-import { ArrowLeft, Users, DollarSign, BarChart3, Plus } from 'lucide-react'
-import { GroupAnalytics } from '@/features/analytics'
-import { AddExpenseForm } from '@/features/expenses/components/AddExpenseForm'
-import { supabase } from '@/lib/supabase/client'
+import { ArrowLeft, Users, DollarSign, BarChart3, Plus, Download } from 'lucide-react'
+import { GroupAnalytics, type GroupAnalyticsData } from '@/features/analytics'
+import { getCachedGroupAnalytics } from '@/features/analytics/api/analytics-server'
+import { AddExpenseDialog } from '@/features/expenses'
+import { getRecentExpensesServer, type RecentExpense } from '@/features/expenses/api-server'
+import { GroupBalances, type GroupBalance } from '@/features/groups'
+import { getCachedGroupBalances } from '@/features/groups/api/balances-server'
+import { getGroupByIdServer, getGroupMembersServer, type GroupMember } from '@/features/groups/api-server'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
+import { getGroupVersion } from '@/lib/group-version'
+import { withQueryStats } from '@/lib/supabase/query-stats'
+import { formatCents } from '@/lib/money'
 
 interface PageProps {
-  params: {
+  params: Promise<{
     groupId: string
-  }
+  }>
 }
 
-export default function GroupPage({ params }: PageProps) {
-  const router = useRouter()
-  const [group, setGroup] = useState<any>(null)
-  const [expenses, setExpenses] = useState<any[]>([])
-  const [loading, setLoading] = useState(true)
-  const [error, setError] = useState<string | null>(null)
-  const [showAddExpense, setShowAddExpense] = useState(false)
-
-  useEffect(() => {
-    async function fetchData() {
-      try {
-        setLoading(true)
-        setError(null)
-
-        // Get group details
-        const { data: groupData, error: groupError } = await supabase
-          .from('groups')
-          .select('*')
-          .eq('id', params.groupId)
-          .single()
-
-        if (groupError || !groupData) {
-          setError('Group not found')
-          return
-        }
-
-        setGroup(groupData)
-
-        // Get expenses for this group
-        const { data: expensesData, error: expensesError } = await supabase
-          .from('expenses')
-          .select(`
-            *,
-            payer:profiles!expenses_paid_by_user_id_fkey (
-              full_name,
-              avatar_url
-            )
-          `)
-          .eq('group_id', params.groupId)
-          .order('created_at', { ascending: false })
-
-        if (expensesError) {
-          console.error('Error fetching expenses:', expensesError)
-        } else {
-          setExpenses(expensesData || [])
-        }
-      } catch (err) {
-        console.error('Error fetching data:', err)
-        setError('Failed to load group data')
-      } finally {
-        setLoading(false)
-      }
-    }
+type Group = Awaited<ReturnType<typeof getGroupByIdServer>>
 
-    fetchData()
-  }, [params.groupId])
+const RECENT_EXPENSES_LIMIT = 5
 
-  const handleExpenseAdded = () => {
-    setShowAddExpense(false)
-    // Refresh the page data
-    window.location.reload()
-  }
+// Pages can't set Server-Timing, so each section's query stats go to the log and Sentry only
+const track = <T,>(section: string, load: () => Promise<T>): Promise<T> =>
+  withQueryStats(`page /dashboard/groups/[groupId] ${section}`, load)
 
-  if (loading) {
-    return (
-      <div className="container mx-auto py-6">
-        <div className="animate-pulse space-y-6">
-          <div className="h-8 bg-gray-200 rounded w-1/3"></div>
-          <div className="grid gap-6 md:grid-cols-2">
-            <div className="h-32 bg-gray-200 rounded"></div>
-            <div className="h-32 bg-gray-200 rounded"></div>
-          </div>
-          <div className="h-64 bg-gray-200 rounded"></div>
-        </div>
-      </div>
-    )
+export default async function GroupPage({ params }: PageProps) {
+  const { groupId } = await params
+  const supabase = await getSupabaseServerClient()
+
+  const { data: { user } } = await getVerifiedUser(supabase)
+  if (!user) {
+    redirect('/login')
   }
 
-  if (error || !group) {
-    return (
-      <div className="container mx-auto py-6">
-        <div className="text-center">
-          <h1 className="text-2xl font-bold text-red-600 mb-4">Error</h1>
-          <p className="text-gray-600 mb-4">{error || 'Group not found'}</p>
-          <Button asChild>
-            <Link href="/dashboard">Back to Dashboard</Link>
-          </Button>
-        </div>
-      </div>
-    )
+  // Memberships are cached per user, so this is usually answered without a query
+  let role: Awaited<ReturnType<typeof getGroupRole>>
+  try {
+    role = await getGroupRole(supabase, user.id, groupId)
+  } catch (error) {
+    console.error('Error checking group membership:', error)
+    return <GroupError message="Failed to load group data" />
+  }
+  if (!role) {
+    return <GroupError message="Group not found" />
   }
 
-  const totalExpenses = expenses.reduce((sum, expense) => sum + expense.amount, 0)
+  // Every load starts now and runs concurrently; each section below awaits only its own
+  // and streams in as soon as it resolves, instead of the client fetching them one by one
+  const group = track('group', () => getGroupByIdServer(groupId))
+  const expenses = track('expenses', () => getRecentExpensesServer(supabase, groupId, RECENT_EXPENSES_LIMIT))
+  // The cached balances and analytics are keyed by the group's version, read once for both
+  const version = track('version', async () => {
+    const current = await getGroupVersion(supabase, groupId)
+    if (current === null) {
+      throw new Error('Group not found')
+    }
+    return current
+  })
+  const balances = track('balances', async () => getCachedGroupBalances(supabase, groupId, await version))
+  const analytics = track('analytics', async () => getCachedGroupAnalytics(supabase, groupId, await version))
+  const members = track('members', () => getGroupMembersServer(supabase, groupId))
 
   return (
     <div className="container mx-auto py-6">
@@ -120,11 +77,10 @@ export default function GroupPage({ params }: PageProps) {
             Back to Dashboard
           </Link>
         </Button>
-        
-        <h1 className="text-3xl font-bold text-gray-900">{group.name}</h1>
-        <p className="text-gray-600 mt-2">
-          Created on {new Date(group.created_at).toLocaleDateString()}
-        </p>
+
+        <Suspense fallback={<HeaderSkeleton />}>
+          <GroupHeader group={group} />
+        </Suspense>
       </div>
 
       <div className="grid gap-6 md:grid-cols-2">
@@ -137,16 +93,9 @@ export default function GroupPage({ params }: PageProps) {
             </CardTitle>
           </CardHeader>
           <CardContent>
-            <div className="space-y-2">
-              <div className="flex justify-between">
-                <span>Total Expenses:</span>
-                <span className="font-semibold">${totalExpenses.toFixed(2)}</span>
-              </div>
-              <div className="flex justify-between">
-                <span>Number of Expenses:</span>
-                <span className="font-semibold">{expenses?.length || 0}</span>
-              </div>
-            </div>
+            <Suspense fallback={<LinesSkeleton lines={2} />}>
+              <GroupStats analytics={analytics} />
+            </Suspense>
           </CardContent>
         </Card>
 
@@ -160,23 +109,32 @@ export default function GroupPage({ params }: PageProps) {
           </CardHeader>
           <CardContent className="space-y-2">
             <Button asChild className="w-full">
-              <Link href={`/dashboard/groups/${params.groupId}/balances`}>
+              <Link href={`/dashboard/groups/${groupId}/balances`}>
                 <Users className="mr-2 h-4 w-4" />
                 View Balances
               </Link>
             </Button>
-            <Button 
-              variant="outline" 
-              className="w-full"
-              onClick={() => setShowAddExpense(true)}
-            >
-              <Plus className="mr-2 h-4 w-4" />
-              Add Expense
+            <Suspense fallback={<AddExpenseButtonPlaceholder />}>
+              <AddExpenseSection groupId={groupId} members={members} />
+            </Suspense>
+            {/* A plain link: the export streams as a download, so it must not be prefetched */}
+            <Button variant="outline" asChild className="w-full">
+              <a href={`/api/expenses/export?groupId=${groupId}&format=csv`} download>
+                <Download className="mr-2 h-4 w-4" />
+                Export CSV
+              </a>
             </Button>
           </CardContent>
         </Card>
       </div>
 
+      {/* Balances */}
+      <div className="mt-6">
+        <Suspense fallback={<BalancesSkeleton />}>
+          <BalancesSection groupId={groupId} balances={balances} />
+        </Suspense>
+      </div>
+
       {/* Recent Expenses */}
       <Card className="mt-6">
         <CardHeader>
@@ -186,62 +144,207 @@ export default function GroupPage({ params }: PageProps) {
           </CardDescription>
         </CardHeader>
         <CardContent>
-          {expenses && expenses.length > 0 ? (
-            <div className="space-y-3">
-              {expenses.slice(0, 5).map((expense) => (
-                <div key={expense.id} className="flex justify-between items-center p-3 border rounded-lg">
-                  <div>
-                    <p className="font-medium">{expense.description}</p>
-                    <p className="text-sm text-gray-600">
-                      Paid by {expense.payer?.full_name || 'Unknown'}
-                    </p>
-                  </div>
-                  <div className="text-right">
-                    <p className="font-semibold">${expense.amount.toFixed(2)}</p>
-                    <p className="text-sm text-gray-600">
-                      {new Date(expense.created_at).toLocaleDateString()}
-                    </p>
-                  </div>
-                </div>
-              ))}
-            </div>
-          ) : (
-            <div className="text-center py-8 text-gray-500">
-              <p>No expenses yet. Add your first expense to get started!</p>
-            </div>
-          )}
+          <Suspense fallback={<LinesSkeleton lines={3} />}>
+            <RecentExpenses expenses={expenses} />
+          </Suspense>
         </CardContent>
       </Card>
 
       {/* Analytics Section */}
-      {expenses && expenses.length > 0 && (
-        <div className="mt-6">
-          <div className="mb-4">
-            <h2 className="text-2xl font-bold text-gray-900 flex items-center gap-2">
-              <BarChart3 className="h-6 w-6" />
-              Analytics
-            </h2>
-            <p className="text-gray-600 mt-1">
-              Insights into your group's spending patterns
+      <Suspense fallback={null}>
+        <AnalyticsSection groupId={groupId} analytics={analytics} />
+      </Suspense>
+    </div>
+  )
+}
+
+function GroupError({ message }: { message: string }) {
+  return (
+    <div className="container mx-auto py-6">
+      <div className="text-center">
+        <h1 className="text-2xl font-bold text-red-600 mb-4">Error</h1>
+        <p className="text-gray-600 mb-4">{message}</p>
+        <Button asChild>
+          <Link href="/dashboard">Back to Dashboard</Link>
+        </Button>
+      </div>
+    </div>
+  )
+}
+
+async function GroupHeader({ group }: { group: Promise<Group> }) {
+  let data: Group
+  try {
+    data = await group
+  } catch (error) {
+    console.error('Error fetching group:', error)
+    return <h1 className="text-3xl font-bold text-red-600">Failed to load group data</h1>
+  }
+
+  return (
+    <>
+      <h1 className="text-3xl font-bold text-gray-900">{data.name}</h1>
+      <p className="text-gray-600 mt-2">
+        Created on {new Date(data.created_at).toLocaleDateString()}
+      </p>
+    </>
+  )
+}
+
+// Totals over the group's whole history come from the analytics rollups,
+// so the page never has to load every expense to show them
+async function GroupStats({ analytics }: { analytics: Promise<GroupAnalyticsData> }) {
+  let data: GroupAnalyticsData
+  try {
+    data = await analytics
+  } catch {
+    return <p className="text-sm text-gray-600">Statistics are unavailable right now.</p>
+  }
+
+  return (
+    <div className="space-y-2">
+      <div className="flex justify-between">
+        <span>Total Expenses:</span>
+        <span className="font-semibold">${formatCents(data.totalSpentCents)}</span>
+      </div>
+      <div className="flex justify-between">
+        <span>Number of Expenses:</span>
+        <span className="font-semibold">{data.expenseCount}</span>
+      </div>
+    </div>
+  )
+}
+
+async function AddExpenseSection({ groupId, members }: { groupId: string; members: Promise<GroupMember[]> }) {
+  let data: GroupMember[]
+  try {
+    data = await members
+  } catch {
+    return <AddExpenseButtonPlaceholder />
+  }
+  return <AddExpenseDialog groupId={groupId} members={data} />
+}
+
+// A failed server load falls back to the component's own fetch, which shows its error state
+async function BalancesSection({ groupId, balances }: { groupId: string; balances: Promise<GroupBalance[]> }) {
+  let data: GroupBalance[] | undefined
+  try {
+    data = await balances
+  } catch {
+    data = undefined
+  }
+  return <GroupBalances groupId={groupId} initialBalances={data} />
+}
+
+async function RecentExpenses({ expenses }: { expenses: Promise<RecentExpense[]> }) {
+  let data: RecentExpense[]
+  try {
+    data = await expenses
+  } catch {
+    return (
+      <div className="text-center py-8 text-gray-500">
+        <p>Failed to load expenses.</p>
+      </div>
+    )
+  }
+
+  if (data.length === 0) {
+    return (
+      <div className="text-center py-8 text-gray-500">
+        <p>No expenses yet. Add your first expense to get started!</p>
+      </div>
+    )
+  }
+
+  return (
+    <div className="space-y-3">
+      {data.map((expense) => (
+        <div key={expense.id} className="flex justify-between items-center p-3 border rounded-lg">
+          <div>
+            <p className="font-medium">{expense.description}</p>
+            <p className="text-sm text-gray-600">
+              Paid by {expense.payer?.full_name || 'Unknown'}
+            </p>
+          </div>
+          <div className="text-right">
+            <p className="font-semibold">${formatCents(expense.amount_cents)}</p>
+            <p className="text-sm text-gray-600">
+              {new Date(expense.created_at).toLocaleDateString()}
             </p>
           </div>
-          <GroupAnalytics groupId={params.groupId} />
         </div>
-      )}
-
-      {/* Add Expense Modal */}
-      <Modal
-        isOpen={showAddExpense}
-        onClose={() => setShowAddExpense(false)}
-        title="Add New Expense"
-        size="lg"
-      >
-        <AddExpenseForm
-          groupId={params.groupId}
-          onSuccess={handleExpenseAdded}
-          onCancel={() => setShowAddExpense(false)}
-        />
-      </Modal>
+      ))}
     </div>
   )
 }
+
+async function AnalyticsSection({ groupId, analytics }: { groupId: string; analytics: Promise<GroupAnalyticsData> }) {
+  let data: GroupAnalyticsData | undefined
+  try {
+    data = await analytics
+  } catch {
+    data = undefined
+  }
+
+  // Hidden until the group has expenses, as before
+  if (data && data.expenseCount === 0) {
+    return null
+  }
+
+  return (
+    <div className="mt-6">
+      <div className="mb-4">
+        <h2 className="text-2xl font-bold text-gray-900 flex items-center gap-2">
+          <BarChart3 className="h-6 w-6" />
+          Analytics
+        </h2>
+        <p className="text-gray-600 mt-1">
+          Insights into your group&apos;s spending patterns
+        </p>
+      </div>
+      <GroupAnalytics groupId={groupId} initialAnalytics={data} />
+    </div>
+  )
+}
+
+function HeaderSkeleton() {
+  return (
+    <div className="animate-pulse space-y-2">
+      <div className="h-8 bg-gray-200 rounded w-1/3"></div>
+      <div className="h-4 bg-gray-200 rounded w-1/4"></div>
+    </div>
+  )
+}
+
+function BalancesSkeleton() {
+  return (
+    <Card>
+      <CardHeader>
+        <CardTitle>Group Balances</CardTitle>
+        <CardDescription>Loading balances...</CardDescription>
+      </CardHeader>
+      <CardContent>
+        <LinesSkeleton lines={3} />
+      </CardContent>
+    </Card>
+  )
+}
+
+function LinesSkeleton({ lines }: { lines: number }) {
+  return (
+    <div className="animate-pulse space-y-3">
+      {[...Array(lines)].map((_, i) => (
+        <div key={i} className="h-5 bg-gray-200 rounded"></div>
+      ))}
+    </div>
+  )
+}
+
+function AddExpenseButtonPlaceholder() {
+  return (
+    <Button variant="outline" className="w-full" disabled>
+      <Plus className="mr-2 h-4 w-4" />
+      Add Expense
+    </Button>
+  )
+}
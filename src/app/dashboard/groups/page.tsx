@@ -10,10 +10,13 @@ import { Plus, Users, AlertCircle } from 'lucide-react';
 interface Group {
   id: string;
   name: string;
-  description?: string;
+  role: 'admin' | 'member';
   memberCount: number;
-  totalExpenses: number;
-  createdAt: Date;
+  expenseCount: number;
+  totalSpent: number;
+  lastActivityAt: string;
+  netBalance: number;
+  createdAt: string;
 }
 
 interface GroupsResponse {
@@ -35,7 +38,7 @@ export default function GroupsPage() {
       setLoading(true);
       setError(null);
       
-      const response = await fetch('/api/groups');
+      const response = await fetch('/api/dashboard/summary');
       if (!response.ok) {
         throw new Error('Failed to fetch groups');
       }
@@ -56,7 +59,7 @@ export default function GroupsPage() {
     }).format(amount);
   };
 
-  const formatDate = (date: Date) => {
+  const formatDate = (date: string) => {
     return new Intl.DateTimeFormat('en-IN', {
       year: 'numeric',
       month: 'short',
@@ -172,7 +175,7 @@ export default function GroupsPage() {
               </CardHeader>
               <CardContent>
                 <div className="text-2xl font-bold">
-                  {formatCurrency(groups.reduce((sum, group) => sum + group.totalExpenses, 0))}
+                  {formatCurrency(groups.reduce((sum, group) => sum + group.totalSpent, 0))}
                 </div>
               </CardContent>
             </Card>
@@ -188,11 +191,9 @@ export default function GroupsPage() {
                       <span className="truncate">{group.name}</span>
                       <Users className="h-4 w-4 text-gray-400" />
                     </CardTitle>
-                    {group.description && (
-                      <CardDescription className="line-clamp-2">
-                        {group.description}
-                      </CardDescription>
-                    )}
+                    <CardDescription>
+                      {group.role === 'admin' ? 'Admin' : 'Member'}
+                    </CardDescription>
                   </CardHeader>
                   <CardContent>
                     <div className="space-y-2 text-sm">
@@ -203,13 +204,19 @@ export default function GroupsPage() {
                       <div className="flex justify-between">
                         <span className="text-gray-600">Total Expenses:</span>
                         <span className="font-medium">
-                          {formatCurrency(group.totalExpenses)}
+                          {formatCurrency(group.totalSpent)}
                         </span>
                       </div>
                       <div className="flex justify-between">
-                        <span className="text-gray-600">Created:</span>
+                        <span className="text-gray-600">Your Balance:</span>
+                        <span className={`font-medium ${group.netBalance > 0 ? 'text-green-600' : group.netBalance < 0 ? 'text-red-600' : ''}`}>
+                          {formatCurrency(group.netBalance)}
+                        </span>
+                      </div>
+                      <div className="flex justify-between">
+                        <span className="text-gray-600">Last Activity:</span>
                         <span className="font-medium">
-                          {formatDate(group.createdAt)}
+                          {formatDate(group.lastActivityAt)}
                         </span>
                       </div>
                     </div>
@@ -2,16 +2,24 @@ import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import Link from 'next/link'
 import { PlusCircle, Users, Calendar, ArrowRight } from 'lucide-react'
-import { getGroupsServer, GroupServerError } from '@/features/groups/api-server'
-import { type Group } from '@/features/groups/api'
+import { getGroupSummariesServer, GroupServerError, type GroupSummary } from '@/features/groups/api-server'
+import { withQueryStats } from '@/lib/supabase/query-stats'
+
+const formatCurrency = (amount: number) => {
+  return new Intl.NumberFormat('en-IN', {
+    style: 'currency',
+    currency: 'INR'
+  }).format(Math.abs(amount))
+}
 
 export default async function DashboardPage() {
-  let groups: Group[] = []
+  let groups: GroupSummary[] = []
   let error: string | null = null
 
   try {
-    // Use our optimized server-side function to fetch groups
-    groups = await getGroupsServer()
+    // Every group the user belongs to with member count and balance, in one cached query
+    // Pages can't set Server-Timing, so these query stats go to the log and Sentry only
+    groups = await withQueryStats('page /dashboard', () => getGroupSummariesServer())
   } catch (err) {
     console.error('Error fetching groups:', err)
     if (err instanceof GroupServerError) {
@@ -73,13 +81,22 @@ export default async function DashboardPage() {
                       <div className="flex items-center gap-4 text-sm text-muted-foreground">
                         <div className="flex items-center gap-1">
                           <Users className="h-3 w-3" />
-                          <span>Creator</span>
+                          <span>{group.memberCount} {group.memberCount === 1 ? 'member' : 'members'}</span>
                         </div>
                         <div className="flex items-center gap-1">
                           <Calendar className="h-3 w-3" />
-                          <span>{new Date(group.created_at).toLocaleDateString()}</span>
+                          <span>{new Date(group.lastActivityAt).toLocaleDateString()}</span>
                         </div>
                       </div>
+
+                      {/* Your Balance */}
+                      <p className={`text-sm font-medium ${group.netBalance > 0 ? 'text-green-600' : group.netBalance < 0 ? 'text-red-600' : 'text-muted-foreground'}`}>
+                        {group.netBalance > 0
+                          ? `You are owed ${formatCurrency(group.netBalance)}`
+                          : group.netBalance < 0
+                            ? `You owe ${formatCurrency(group.netBalance)}`
+                            : 'Settled up'}
+                      </p>
                       
                       {/* Action Button */}
                       <Button 
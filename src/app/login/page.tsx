@@ -1,10 +1,10 @@
-import { getSupabaseServerClient } from '@/lib/supabase/server'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
 import { redirect } from 'next/navigation'
 import LoginForm from './LoginForm'
 
 export default async function LoginPage() {
   const supabase = await getSupabaseServerClient()
-  const { data: { user } } = await supabase.auth.getUser()
+  const { data: { user } } = await getVerifiedUser(supabase)
 
   if (user) {
     redirect('/dashboard')
@@ -0,0 +1,153 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+import type { Database } from '@/types/database.types'
+import { cache, CACHE_KEYS, CACHE_TTL } from '@/lib/cache'
+import { fromCents, sumCents, type Cents } from '@/lib/money'
+import { isCalendarDate } from '@/lib/dates'
+import { TOP_SPENDER_LIMIT } from '../deltas'
+
+export type AnalyticsGranularity = 'day' | 'week' | 'month'
+
+const ANALYTICS_GRANULARITIES: AnalyticsGranularity[] = ['day', 'week', 'month']
+
+export interface GroupAnalyticsOptions {
+  // Inclusive UTC date range as YYYY-MM-DD; open-ended when omitted
+  from?: string
+  to?: string
+  granularity?: AnalyticsGranularity
+}
+
+export interface GroupAnalyticsData {
+  totalSpent: number
+  totalSpentCents: Cents
+  expenseCount: number
+  granularity: AnalyticsGranularity
+  spendingTrends: Array<{
+    date: string
+    amount: number
+    count: number
+  }>
+  topSpenders: Array<{
+    userId: string
+    name: string
+    amount: number
+  }>
+}
+
+/**
+ * Checks analytics options before any query runs.
+ *
+ * @param options - Requested date range and granularity
+ * @returns string | null - A user-facing error message, or null when the options are valid
+ */
+export const validateGroupAnalyticsOptions = (options: GroupAnalyticsOptions): string | null => {
+  if (options.granularity && !ANALYTICS_GRANULARITIES.includes(options.granularity)) {
+    return 'Granularity must be day, week or month'
+  }
+  if ((options.from && !isCalendarDate(options.from)) || (options.to && !isCalendarDate(options.to))) {
+    return 'Dates must be in YYYY-MM-DD format'
+  }
+  // Same-format dates compare correctly as strings
+  if (options.from && options.to && options.from > options.to) {
+    return 'from must not be after to'
+  }
+  return null
+}
+
+/**
+ * Computes spending totals, the spending trend and the top spenders of a group.
+ * Reads only the daily rollups kept by the expense triggers, never the expenses
+ * themselves, so the cost is two round trips regardless of how many expenses the
+ * group has. Callers are expected to have verified group membership and validated
+ * the options first.
+ *
+ * @param supabase - Server client for the current request
+ * @param groupId - The UUID of the group
+ * @param options - Inclusive date range and granularity
+ * @returns Promise<GroupAnalyticsData> - Totals, trend points and up to 10 top spenders
+ * @throws Error - If either rollup query fails
+ */
+export const computeGroupAnalytics = async (
+  supabase: SupabaseClient<Database>,
+  groupId: string,
+  options: GroupAnalyticsOptions = {}
+): Promise<GroupAnalyticsData> => {
+  const granularity = options.granularity ?? 'day'
+  const range = { from: options.from ?? null, to: options.to ?? null }
+
+  const [trend, spenders] = await Promise.all([
+    supabase.rpc('get_group_spending_trend', {
+      p_group_id: groupId,
+      p_from: range.from,
+      p_to: range.to,
+      p_granularity: granularity
+    }),
+    supabase.rpc('get_group_top_spenders', {
+      p_group_id: groupId,
+      p_from: range.from,
+      p_to: range.to,
+      p_limit: TOP_SPENDER_LIMIT
+    })
+  ])
+
+  if (trend.error || spenders.error) {
+    throw new Error('Failed to fetch analytics')
+  }
+
+  // Rollups are kept in cents, so the total is an exact integer sum
+  const trendCents = (trend.data || []).map(row => Number(row.total_cents))
+  const totalSpentCents = sumCents(trendCents)
+
+  const spendingTrends = (trend.data || []).map((row, index) => ({
+    date: row.period,
+    amount: fromCents(trendCents[index]),
+    count: Number(row.expense_count)
+  }))
+
+  const topSpenders = (spenders.data || []).map(row => ({
+    userId: row.user_id,
+    name: row.full_name || 'Unknown',
+    amount: fromCents(Number(row.total_cents))
+  }))
+
+  return {
+    totalSpent: fromCents(totalSpentCents),
+    totalSpentCents,
+    expenseCount: spendingTrends.reduce((sum, point) => sum + point.count, 0),
+    granularity,
+    spendingTrends,
+    topSpenders
+  }
+}
+
+/**
+ * Cached variant of computeGroupAnalytics.
+ * Date-ranged reads are a couple of rollup rows each, so only the full-history views
+ * are cached, keyed by the group's version; concurrent misses for those share one computation.
+ * Both rollup reads return the same rows to every member (top spenders' names come from
+ * a SECURITY DEFINER function since migration 017), so one entry serves the whole group.
+ *
+ * @param supabase - Server client for the current request
+ * @param groupId - The UUID of the group
+ * @param version - The group's current version (see getGroupVersion)
+ * @param options - Inclusive date range and granularity
+ * @returns Promise<GroupAnalyticsData> - Totals, trend points and up to 10 top spenders
+ * @throws Error - If either rollup query fails
+ */
+export const getCachedGroupAnalytics = (
+  supabase: SupabaseClient<Database>,
+  groupId: string,
+  version: number,
+  options: GroupAnalyticsOptions = {}
+): Promise<GroupAnalyticsData> => {
+  if (options.from || options.to) {
+    return computeGroupAnalytics(supabase, groupId, options)
+  }
+
+  const granularity = options.granularity ?? 'day'
+  return cache.getOrLoad(
+    CACHE_KEYS.ANALYTICS(groupId, version, granularity),
+    () => computeGroupAnalytics(supabase, groupId, { granularity }),
+    CACHE_TTL.ANALYTICS,
+    { staleWhileRevalidate: CACHE_TTL.ANALYTICS }
+  )
+}
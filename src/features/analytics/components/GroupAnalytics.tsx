@@ -1,6 +1,7 @@
 'use client'
 
-import { useEffect, useState } from 'react'
+import { useCallback, useEffect, useState } from 'react'
+import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { 
   LineChart, 
@@ -17,37 +18,74 @@ import {
   Legend, 
   ResponsiveContainer 
 } from 'recharts'
-import { getGroupAnalytics, type GroupAnalyticsData } from '../actions/getGroupAnalytics'
+import { getGroupAnalytics, type AnalyticsGranularity, type GroupAnalyticsData } from '../actions/getGroupAnalytics'
+import { applyExpenseDelta } from '../deltas'
+import { useGroupEvents } from '@/lib/group-events/client'
 
 interface GroupAnalyticsProps {
   groupId: string
+  // Daily view already loaded by a server component; other granularities are fetched on demand
+  initialAnalytics?: GroupAnalyticsData
 }
 
 const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042', '#8884D8', '#82CA9D']
 
-export function GroupAnalytics({ groupId }: GroupAnalyticsProps) {
-  const [analytics, setAnalytics] = useState<GroupAnalyticsData | null>(null)
-  const [loading, setLoading] = useState(true)
+const GRANULARITY_LABELS: Record<AnalyticsGranularity, string> = {
+  day: 'Daily',
+  week: 'Weekly',
+  month: 'Monthly',
+}
+
+export function GroupAnalytics({ groupId, initialAnalytics }: GroupAnalyticsProps) {
+  const [analytics, setAnalytics] = useState<GroupAnalyticsData | null>(initialAnalytics ?? null)
+  const [loading, setLoading] = useState(!initialAnalytics)
   const [error, setError] = useState<string | null>(null)
+  const [granularity, setGranularity] = useState<AnalyticsGranularity>('day')
+
+  // Background refreshes keep the current charts on screen instead of the skeleton
+  const fetchAnalytics = useCallback(async (background = false) => {
+    try {
+      if (!background) setLoading(true)
+      setError(null)
+      const data = await getGroupAnalytics(groupId, { granularity })
+      setAnalytics(data)
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to fetch analytics')
+    } finally {
+      setLoading(false)
+    }
+  }, [groupId, granularity])
 
   useEffect(() => {
-    async function fetchAnalytics() {
-      try {
-        setLoading(true)
-        setError(null)
-        const data = await getGroupAnalytics(groupId)
-        setAnalytics(data)
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Failed to fetch analytics')
-      } finally {
-        setLoading(false)
-      }
+    if (initialAnalytics && granularity === 'day') {
+      setAnalytics(initialAnalytics)
+      setError(null)
+      setLoading(false)
+      return
     }
 
     if (groupId) {
       fetchAnalytics()
     }
-  }, [groupId])
+  }, [groupId, granularity, initialAnalytics, fetchAnalytics])
+
+  // Pushed expense changes are folded into the totals, trend and top spenders in place;
+  // a resync, or a change the loaded data can't absorb exactly, falls back to one refetch
+  useGroupEvents(groupId, event => {
+    if (event.type === 'resync') {
+      fetchAnalytics(true)
+      return
+    }
+    if (event.type !== 'expense' || !analytics) {
+      return
+    }
+    const next = applyExpenseDelta(analytics, event.previous, event.expense)
+    if (next) {
+      setAnalytics(next)
+    } else {
+      fetchAnalytics(true)
+    }
+  })
 
   const formatCurrency = (amount: number) => {
     return new Intl.NumberFormat('en-US', {
@@ -92,7 +130,7 @@ export function GroupAnalytics({ groupId }: GroupAnalyticsProps) {
     )
   }
 
-  if (!analytics || analytics.expenses.length === 0) {
+  if (!analytics || analytics.expenseCount === 0) {
     return (
       <Card>
         <CardHeader>
@@ -121,7 +159,7 @@ export function GroupAnalytics({ groupId }: GroupAnalyticsProps) {
           <CardContent>
             <div className="text-2xl font-bold">{formatCurrency(analytics.totalSpent)}</div>
             <p className="text-xs text-muted-foreground">
-              {analytics.expenses.length} expenses
+              {analytics.expenseCount} expenses
             </p>
           </CardContent>
         </Card>
@@ -133,7 +171,7 @@ export function GroupAnalytics({ groupId }: GroupAnalyticsProps) {
           </CardHeader>
           <CardContent>
             <div className="text-2xl font-bold">
-              {formatCurrency(analytics.totalSpent / analytics.expenses.length)}
+              {formatCurrency(analytics.totalSpent / analytics.expenseCount)}
             </div>
             <p className="text-xs text-muted-foreground">
               Per expense
@@ -159,9 +197,24 @@ export function GroupAnalytics({ groupId }: GroupAnalyticsProps) {
 
       {/* Spending Trends */}
       <Card>
-        <CardHeader>
-          <CardTitle>Spending Trends</CardTitle>
-          <CardDescription>Expenses over time</CardDescription>
+        <CardHeader className="flex flex-row items-start justify-between space-y-0">
+          <div className="space-y-1.5">
+            <CardTitle>Spending Trends</CardTitle>
+            <CardDescription>Expenses over time</CardDescription>
+          </div>
+          <div className="flex gap-1">
+            {(Object.keys(GRANULARITY_LABELS) as AnalyticsGranularity[]).map((option) => (
+              <Button
+                key={option}
+                type="button"
+                size="sm"
+                variant={granularity === option ? 'default' : 'outline'}
+                onClick={() => setGranularity(option)}
+              >
+                {GRANULARITY_LABELS[option]}
+              </Button>
+            ))}
+          </div>
         </CardHeader>
         <CardContent>
           <ResponsiveContainer width="100%" height={300}>
@@ -0,0 +1,116 @@
+import { fromCents, toCents, type Cents } from '@/lib/money'
+import type { ExpenseDelta } from '@/lib/group-events/types'
+import type { AnalyticsGranularity, GroupAnalyticsData } from './api/analytics-server'
+
+// Shared with the server so the browser knows when the list it holds is every payer
+export const TOP_SPENDER_LIMIT = 10
+
+const DAY_MS = 24 * 60 * 60 * 1000
+
+/**
+ * Start of the rollup period an expense falls in, computed the way the SQL functions
+ * do: UTC dates, weeks starting on Monday, months on the 1st.
+ *
+ * @param createdAt - The expense's timestamp
+ * @param granularity - Trend granularity
+ * @returns string - The period as YYYY-MM-DD
+ */
+export const periodOf = (createdAt: string, granularity: AnalyticsGranularity): string => {
+  const at = new Date(createdAt)
+  let start = Date.UTC(at.getUTCFullYear(), at.getUTCMonth(), at.getUTCDate())
+  if (granularity === 'week') {
+    start -= ((at.getUTCDay() + 6) % 7) * DAY_MS
+  } else if (granularity === 'month') {
+    start = Date.UTC(at.getUTCFullYear(), at.getUTCMonth(), 1)
+  }
+  return new Date(start).toISOString().slice(0, 10)
+}
+
+const adjustTrend = (
+  trends: GroupAnalyticsData['spendingTrends'],
+  period: string,
+  cents: Cents,
+  count: number
+): GroupAnalyticsData['spendingTrends'] | null => {
+  const index = trends.findIndex(point => point.date === period)
+  if (index === -1) {
+    if (count < 0) return null
+    return [...trends, { date: period, amount: fromCents(cents), count }]
+      .sort((a, b) => a.date.localeCompare(b.date))
+  }
+
+  const point = trends[index]
+  const next = { date: period, amount: fromCents(toCents(point.amount) + cents), count: point.count + count }
+  return next.count > 0
+    ? trends.map((existing, i) => (i === index ? next : existing))
+    : trends.filter((_, i) => i !== index)
+}
+
+// The list holds only the top payers, so a change involving someone outside it, or one
+// that could let an unlisted payer overtake, can't be applied without their totals
+const adjustTopSpenders = (
+  spenders: GroupAnalyticsData['topSpenders'],
+  userId: string,
+  cents: Cents
+): GroupAnalyticsData['topSpenders'] | null => {
+  // Fewer rows than the limit means every payer is listed
+  const complete = spenders.length < TOP_SPENDER_LIMIT
+  const index = spenders.findIndex(spender => spender.userId === userId)
+  if (index === -1) {
+    return cents < 0 ? spenders : null
+  }
+
+  const amountCents = toCents(spenders[index].amount) + cents
+  if (!complete && cents < 0) {
+    const lowestOther = Math.min(...spenders.filter((_, i) => i !== index).map(spender => toCents(spender.amount)))
+    if (amountCents < lowestOther) return null
+  }
+
+  const next = amountCents > 0
+    ? spenders.map((spender, i) => (i === index ? { ...spender, amount: fromCents(amountCents) } : spender))
+    : spenders.filter((_, i) => i !== index)
+  return next.sort((a, b) => b.amount - a.amount)
+}
+
+const addExpense = (data: GroupAnalyticsData, expense: ExpenseDelta, sign: 1 | -1): GroupAnalyticsData | null => {
+  const cents = sign * expense.amountCents
+  const spendingTrends = adjustTrend(data.spendingTrends, periodOf(expense.createdAt, data.granularity), cents, sign)
+  const topSpenders = adjustTopSpenders(data.topSpenders, expense.paidByUserId, cents)
+  if (!spendingTrends || !topSpenders) {
+    return null
+  }
+
+  const totalSpentCents = data.totalSpentCents + cents
+  return {
+    ...data,
+    totalSpent: fromCents(totalSpentCents),
+    totalSpentCents,
+    expenseCount: data.expenseCount + sign,
+    spendingTrends,
+    topSpenders
+  }
+}
+
+/**
+ * Applies one pushed expense change to full-history analytics instead of refetching them:
+ * the old row is taken out and the new one put in.
+ *
+ * @param data - Analytics as currently shown
+ * @param previous - The expense before the change, or null for an insert
+ * @param expense - The expense after the change, or null for a delete
+ * @returns GroupAnalyticsData | null - Updated analytics, or null when the change needs a refetch
+ */
+export const applyExpenseDelta = (
+  data: GroupAnalyticsData,
+  previous: ExpenseDelta | null,
+  expense: ExpenseDelta | null
+): GroupAnalyticsData | null => {
+  let next: GroupAnalyticsData | null = data
+  if (previous) {
+    next = addExpense(next, previous, -1)
+  }
+  if (next && expense) {
+    next = addExpense(next, expense, 1)
+  }
+  return next
+}
@@ -1,3 +1,3 @@
 export { GroupAnalytics } from './components/GroupAnalytics'
 export { getGroupAnalytics } from './actions/getGroupAnalytics'
-export type { GroupAnalyticsData } from './actions/getGroupAnalytics'
+export type { AnalyticsGranularity, GroupAnalyticsData, GroupAnalyticsOptions } from './actions/getGroupAnalytics'
@@ -0,0 +1,44 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+import type { Database } from '@/types/database.types'
+import { buildExpenseSelect } from './query'
+
+export interface RecentExpense {
+  id: string
+  description: string
+  amount: number
+  amount_cents: number
+  created_at: string
+  payer: { full_name: string | null; avatar_url: string | null } | null
+}
+
+/**
+ * The newest expenses of a group with their payer, for summary views.
+ * Reads the first keyset page only, so the cost doesn't grow with the group's history.
+ * Callers are expected to have verified group membership first.
+ *
+ * @param supabase - Server client for the current request
+ * @param groupId - The UUID of the group
+ * @param limit - How many expenses to return
+ * @returns Promise<RecentExpense[]> - Newest first
+ * @throws Error - If the expenses can't be loaded
+ */
+export const getRecentExpensesServer = async (
+  supabase: SupabaseClient<Database>,
+  groupId: string,
+  limit: number = 5
+): Promise<RecentExpense[]> => {
+  const { data, error } = await supabase
+    .from('expenses')
+    .select(buildExpenseSelect(['description', 'amount', 'amount_cents', 'payer']))
+    .eq('group_id', groupId)
+    .order('created_at', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(limit)
+
+  if (error) {
+    console.error('Error fetching recent expenses:', error)
+    throw new Error('Failed to fetch expenses')
+  }
+
+  return (data || []) as unknown as RecentExpense[]
+}
@@ -1,4 +1,11 @@
 import { supabase } from '@/lib/supabase/client'
+import {
+  buildExpenseSelect,
+  decodeExpenseCursor,
+  expenseCursorFilter,
+  parseExpenseLimit,
+  toExpensePage
+} from './query'
 
 export async function createExpense(data: {
   group_id: string
@@ -9,18 +16,43 @@ export async function createExpense(data: {
   return supabase.from('expenses').insert([data])
 }
 
-export async function getExpensesByGroup(groupId: string) {
-  return supabase
-    .from('expenses')
-    .select(`
+export async function getExpensesByGroup(groupId: string, options: {
+  limit?: number
+  cursor?: string | null
+  fields?: string[]
+} = {}) {
+  const limit = parseExpenseLimit(options.limit)
+  const select = options.fields
+    ? buildExpenseSelect(options.fields)
+    : `
       *,
       payer:profiles!expenses_paid_by_user_id_fkey (
         full_name,
         avatar_url
       )
-    `)
+    `
+
+  let query = supabase
+    .from('expenses')
+    .select(select)
     .eq('group_id', groupId)
+
+  if (options.cursor) {
+    query = query.or(expenseCursorFilter(decodeExpenseCursor(options.cursor)))
+  }
+
+  // Fetch one extra row to know whether another page exists
+  const { data, error } = await query
     .order('created_at', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(limit + 1)
+
+  if (error) {
+    return { data: null, error, nextCursor: null }
+  }
+
+  const page = toExpensePage((data || []) as unknown as Array<{ created_at: string; id: string }>, limit)
+  return { data: page.expenses, error: null, nextCursor: page.nextCursor }
 }
 
 export async function getExpenseById(id: string) {
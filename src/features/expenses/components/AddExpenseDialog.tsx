@@ -0,0 +1,53 @@
+'use client'
+
+import { useState } from 'react'
+import { useRouter } from 'next/navigation'
+import { Button } from '@/components/ui/button'
+import { Modal } from '@/components/ui/modal'
+import { Plus } from 'lucide-react'
+import { AddExpenseForm } from './AddExpenseForm'
+import type { GroupMember } from '@/features/groups/api/members-server'
+
+interface AddExpenseDialogProps {
+  groupId: string
+  members: GroupMember[]
+}
+
+// "Add Expense" button and modal for the server-rendered group page
+export function AddExpenseDialog({ groupId, members }: AddExpenseDialogProps) {
+  const router = useRouter()
+  const [open, setOpen] = useState(false)
+
+  const handleExpenseAdded = () => {
+    setOpen(false)
+    // Re-renders the page's server components; the expense route already dropped the cached group data
+    router.refresh()
+  }
+
+  return (
+    <>
+      <Button
+        variant="outline"
+        className="w-full"
+        onClick={() => setOpen(true)}
+      >
+        <Plus className="mr-2 h-4 w-4" />
+        Add Expense
+      </Button>
+
+      <Modal
+        isOpen={open}
+        onClose={() => setOpen(false)}
+        title="Add New Expense"
+        size="lg"
+      >
+        <AddExpenseForm
+          groupId={groupId}
+          members={members}
+          onSuccess={handleExpenseAdded}
+          onCancel={() => setOpen(false)}
+        />
+      </Modal>
+    </>
+  )
+}
@@ -1,13 +1,14 @@
 'use client'
 
-import { useState, useEffect } from 'react'
+import { useState } from 'react'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
 import { Label } from '@/components/ui/label'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
-import { supabase } from '@/lib/supabase/client'
 import { Plus, Minus, Loader2, DollarSign, Users } from 'lucide-react'
 import { toast } from 'sonner'
+import { formatCents, fromCents, parseCents, splitCentsEvenly, sumCents, toCents } from '@/lib/money'
+import type { GroupMember } from '@/features/groups/api/members-server'
 
 interface Participant {
   userId: string
@@ -17,60 +18,28 @@ interface Participant {
 
 interface AddExpenseFormProps {
   groupId: string
+  // Loaded once with the group page rather than queried again by the form
+  members: GroupMember[]
   onSuccess?: () => void
   onCancel?: () => void
 }
 
-export function AddExpenseForm({ groupId, onSuccess, onCancel }: AddExpenseFormProps) {
+export function AddExpenseForm({ groupId, members, onSuccess, onCancel }: AddExpenseFormProps) {
   const [isLoading, setIsLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
-  const [members, setMembers] = useState<Array<{ id: string; full_name: string }>>([])
   const [formData, setFormData] = useState({
     amount: '',
     description: '',
     category: 'other'
   })
-  const [participants, setParticipants] = useState<Participant[]>([])
-
-  // Fetch group members
-  useEffect(() => {
-    async function fetchMembers() {
-      try {
-        const { data, error } = await supabase
-          .from('group_members')
-          .select(`
-            user_id,
-            profiles!inner (
-              id,
-              full_name
-            )
-          `)
-          .eq('group_id', groupId)
-
-        if (error) throw error
-
-        const memberList = data.map(item => ({
-          id: item.user_id,
-          full_name: (item.profiles as any).full_name || 'Unknown'
-        }))
-
-        setMembers(memberList)
-        
-        // Initialize participants with all members
-        const initialParticipants = memberList.map(member => ({
-          userId: member.id,
-          name: member.full_name,
-          shareAmount: 0
-        }))
-        setParticipants(initialParticipants)
-      } catch (err) {
-        console.error('Error fetching members:', err)
-        setError('Failed to load group members')
-      }
-    }
-
-    fetchMembers()
-  }, [groupId])
+  // Every member starts in the split with a zero share
+  const [participants, setParticipants] = useState<Participant[]>(() =>
+    members.map(member => ({
+      userId: member.userId,
+      name: member.fullName,
+      shareAmount: 0
+    }))
+  )
 
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement | HTMLSelectElement>) => {
     const { name, value } = e.target
@@ -91,15 +60,20 @@ export function AddExpenseForm({ groupId, onSuccess, onCancel }: AddExpenseFormP
     )
   }
 
+  // Whole cents each; leftover cents go to the first members, so $10 over 3 is 3.34 / 3.33 / 3.33
   const distributeEqually = () => {
-    const totalAmount = parseFloat(formData.amount) || 0
-    const sharePerPerson = totalAmount / participants.length
+    const totalCents = parseCents(formData.amount) ?? 0
+    if (participants.length === 0 || totalCents <= 0) return
+    const shares = splitCentsEvenly(totalCents, participants.length)
     
     setParticipants(prev => 
-      prev.map(p => ({ ...p, shareAmount: sharePerPerson }))
+      prev.map((p, index) => ({ ...p, shareAmount: fromCents(shares[index]) }))
     )
   }
 
+  const amountCents = parseCents(formData.amount)
+  const totalShareCents = sumCents(participants.map(p => toCents(p.shareAmount)))
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault()
     
@@ -109,19 +83,21 @@ export function AddExpenseForm({ groupId, onSuccess, onCancel }: AddExpenseFormP
       return
     }
 
-    const amount = parseFloat(formData.amount)
-    if (amount <= 0) {
+    if (amountCents === null) {
+      setError('Amount must have at most two decimal places')
+      return
+    }
+    if (amountCents <= 0) {
       setError('Amount must be greater than 0')
       return
     }
 
-    const totalShares = participants.reduce((sum, p) => sum + p.shareAmount, 0)
-    if (Math.abs(totalShares - amount) > 0.01) {
+    if (totalShareCents !== amountCents) {
       setError('Total shares must equal the expense amount')
       return
     }
 
-    const activeParticipants = participants.filter(p => p.shareAmount > 0)
+    const activeParticipants = participants.filter(p => toCents(p.shareAmount) > 0)
     if (activeParticipants.length === 0) {
       setError('At least one participant must have a share amount')
       return
@@ -138,10 +114,13 @@ export function AddExpenseForm({ groupId, onSuccess, onCancel }: AddExpenseFormP
         },
         body: JSON.stringify({
           groupId,
-          amount: formData.amount,
+          amount: formatCents(amountCents),
           description: formData.description.trim(),
           category: formData.category,
-          participants: activeParticipants
+          participants: activeParticipants.map(p => ({
+            userId: p.userId,
+            shareAmount: formatCents(toCents(p.shareAmount))
+          }))
         }),
       })
 
@@ -169,7 +148,7 @@ export function AddExpenseForm({ groupId, onSuccess, onCancel }: AddExpenseFormP
         <CardContent className="p-6">
           <div className="text-center text-gray-500">
             <Users className="h-12 w-12 mx-auto mb-4 text-gray-300" />
-            <p>Loading group members...</p>
+            <p>This group has no members to split with.</p>
           </div>
         </CardContent>
       </Card>
@@ -318,11 +297,11 @@ export function AddExpenseForm({ groupId, onSuccess, onCancel }: AddExpenseFormP
               <div className="flex justify-between items-center text-sm">
                 <span>Total shares:</span>
                 <span className={`font-medium ${
-                  Math.abs(participants.reduce((sum, p) => sum + p.shareAmount, 0) - (parseFloat(formData.amount) || 0)) < 0.01
+                  totalShareCents === (amountCents ?? 0)
                     ? 'text-green-600'
                     : 'text-red-600'
                 }`}>
-                  ${participants.reduce((sum, p) => sum + p.shareAmount, 0).toFixed(2)}
+                  ${formatCents(totalShareCents)}
                 </span>
               </div>
             </div>
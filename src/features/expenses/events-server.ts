@@ -0,0 +1,45 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+import type { Database } from '@/types/database.types'
+import { groupEvents, toExpenseDelta, type GroupEvent } from '@/lib/group-events/server'
+import { computeGroupBalances } from '@/features/groups/api/balances-server'
+
+type Expense = Database['public']['Tables']['expenses']['Row']
+
+/**
+ * Pushes a newly created expense and the balances it moved to open group pages.
+ * With Realtime the database triggers broadcast the write themselves and this does
+ * nothing; with the in-process event source the route has to, so it reads the
+ * group's balances once and sends the affected members' new positions.
+ * Failures are logged, never thrown: the expense is already committed.
+ *
+ * @param supabase - Server client for the current request
+ * @param expense - The row returned by create_expense_with_participants
+ * @param userIds - Payer and participants, whose balances changed
+ */
+export const publishExpenseCreated = async (
+  supabase: SupabaseClient<Database>,
+  expense: Expense,
+  userIds: string[]
+): Promise<void> => {
+  if (!groupEvents.publishesLocally) {
+    return
+  }
+
+  const events: GroupEvent[] = [
+    { type: 'expense', action: 'insert', expense: toExpenseDelta(expense), previous: null }
+  ]
+
+  try {
+    const affected = new Set(userIds)
+    for (const balance of await computeGroupBalances(supabase, expense.group_id)) {
+      if (affected.has(balance.userId)) {
+        events.push({ type: 'balance', userId: balance.userId, balanceCents: balance.balanceCents })
+      }
+    }
+  } catch (error) {
+    console.error('Could not load balances for group events:', error)
+    events.push({ type: 'resync' })
+  }
+
+  groupEvents.publish(expense.group_id, events)
+}
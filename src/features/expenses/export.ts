@@ -0,0 +1,201 @@
+// Ledger export: a group's expenses as CSV or JSONL, one line per participant split.
+// Expenses are read in keyset batches (oldest first, on the same (created_at, id) index
+// as the listing) and each batch is only fetched when the response stream asks for more,
+// so memory holds at most one batch whatever the group's size, and a slow download
+// slows the reads down instead of queueing rows on the server.
+
+import { formatCents, type Cents } from '@/lib/money'
+import type { ExpenseCursor } from '@/features/expenses/query'
+import type { ImportFormat } from '@/features/expenses/import'
+
+export type ExportFormat = ImportFormat
+
+export const EXPORT_BATCH_SIZE = 1000
+
+export const EXPORT_SELECT = `
+  id,
+  group_id,
+  created_at,
+  description,
+  category,
+  paid_by_user_id,
+  amount_cents,
+  payer:profiles!expenses_paid_by_user_id_fkey (
+    full_name
+  ),
+  participants:expense_participants (
+    user_id,
+    share_cents,
+    user:profiles!expense_participants_user_id_fkey (
+      full_name
+    )
+  )
+`
+
+// Header names follow the import's camelCase columns
+export const EXPORT_COLUMNS = [
+  'expenseId',
+  'groupId',
+  'createdAt',
+  'description',
+  'category',
+  'paidByUserId',
+  'paidByName',
+  'amount',
+  'participantUserId',
+  'participantName',
+  'share',
+] as const
+
+export type ExportRecord = Record<(typeof EXPORT_COLUMNS)[number], string | null>
+
+export interface ExportExpense {
+  id: string
+  group_id: string
+  created_at: string
+  description: string
+  category: string | null
+  paid_by_user_id: string
+  amount_cents: Cents
+  payer: { full_name: string | null } | null
+  participants: Array<{
+    user_id: string
+    share_cents: Cents
+    user: { full_name: string | null } | null
+  }> | null
+}
+
+export const EXPORT_CONTENT_TYPES: Record<ExportFormat, string> = {
+  csv: 'text/csv; charset=utf-8',
+  jsonl: 'application/x-ndjson; charset=utf-8',
+}
+
+/**
+ * Reads `format=csv|jsonl`, defaulting to CSV.
+ *
+ * @returns ExportFormat | null - null for an unsupported format
+ */
+export const parseExportFormat = (value: string | null): ExportFormat | null => {
+  const format = (value || 'csv').toLowerCase()
+  if (format === 'csv') return 'csv'
+  if (format === 'jsonl' || format === 'ndjson') return 'jsonl'
+  return null
+}
+
+/**
+ * PostgREST `or` filter selecting rows strictly after the cursor in
+ * (created_at ASC, id ASC) order; the export's counterpart of expenseCursorFilter.
+ */
+export const exportCursorFilter = (cursor: ExpenseCursor): string =>
+  `created_at.gt."${cursor.createdAt}",and(created_at.eq."${cursor.createdAt}",id.gt.${cursor.id})`
+
+/**
+ * Flattens an expense into one record per participant split, or a single record with
+ * empty participant columns when it has none.
+ */
+export const toExportRecords = (expense: ExportExpense): ExportRecord[] => {
+  const base = {
+    expenseId: expense.id,
+    groupId: expense.group_id,
+    createdAt: expense.created_at,
+    description: expense.description,
+    category: expense.category,
+    paidByUserId: expense.paid_by_user_id,
+    paidByName: expense.payer?.full_name ?? null,
+    amount: formatCents(expense.amount_cents),
+  }
+  const participants = expense.participants || []
+  if (participants.length === 0) {
+    return [{ ...base, participantUserId: null, participantName: null, share: null }]
+  }
+  return participants.map(participant => ({
+    ...base,
+    participantUserId: participant.user_id,
+    participantName: participant.user?.full_name ?? null,
+    share: formatCents(participant.share_cents),
+  }))
+}
+
+// Text starting with these is run as a formula by spreadsheet apps
+const FORMULA_PREFIX = /^[=+\-@\t\r]/
+// Plain numbers such as a negative amount are left as numbers; anything else that
+// merely starts like one (`-1+cmd|...`) is still escaped
+const PLAIN_NUMBER = /^-?\d+(\.\d+)?$/
+
+const csvField = (value: string | null): string => {
+  if (value === null) return ''
+  const text = FORMULA_PREFIX.test(value) && !PLAIN_NUMBER.test(value) ? `'${value}` : value
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text
+}
+
+/**
+ * Serializes records as CSV lines (RFC 4180 quoting, CRLF endings) or JSONL lines.
+ */
+export const formatExportRecords = (records: ExportRecord[], format: ExportFormat): string => {
+  let text = ''
+  for (const record of records) {
+    text += format === 'csv'
+      ? EXPORT_COLUMNS.map(column => csvField(record[column])).join(',') + '\r\n'
+      : JSON.stringify(record) + '\n'
+  }
+  return text
+}
+
+/**
+ * Pull-based byte stream of an export.
+ * `fetchBatch` is called with the last exported row's cursor (null for the first
+ * batch) only when the stream's single-chunk queue has room, i.e. after the consumer
+ * has taken the previous batch. A short batch ends the export. A failed batch errors
+ * the stream, which aborts the response so the client sees a truncated download
+ * rather than a silently short file.
+ *
+ * @param format - Output format
+ * @param fetchBatch - Reads up to EXPORT_BATCH_SIZE expenses after the cursor, oldest first
+ * @param firstBatch - Already fetched first batch, so the route can report its errors as a status
+ * @returns ReadableStream<Uint8Array> - Header (CSV) followed by one chunk per batch
+ */
+export const createExpenseExportStream = (
+  format: ExportFormat,
+  fetchBatch: (cursor: ExpenseCursor | null) => Promise<ExportExpense[]>,
+  firstBatch?: ExportExpense[]
+): ReadableStream<Uint8Array> => {
+  const encoder = new TextEncoder()
+  let pending = firstBatch
+  let cursor: ExpenseCursor | null = null
+  let done = false
+  let cancelled = false
+
+  return new ReadableStream<Uint8Array>({
+    start(controller) {
+      if (format === 'csv') {
+        controller.enqueue(encoder.encode(EXPORT_COLUMNS.join(',') + '\r\n'))
+      }
+    },
+    async pull(controller) {
+      if (done) {
+        controller.close()
+        return
+      }
+
+      const batch = pending ?? await fetchBatch(cursor)
+      pending = undefined
+      if (cancelled) return
+
+      if (batch.length < EXPORT_BATCH_SIZE) {
+        done = true
+      }
+      if (batch.length > 0) {
+        const last = batch[batch.length - 1]
+        cursor = { createdAt: last.created_at, id: last.id }
+        controller.enqueue(encoder.encode(formatExportRecords(batch.flatMap(toExportRecords), format)))
+      }
+      if (done) {
+        controller.close()
+      }
+    },
+    cancel() {
+      // The client went away; the in-flight batch, if any, is dropped when it arrives
+      cancelled = true
+    }
+  }, { highWaterMark: 1 })
+}
@@ -0,0 +1,330 @@
+// Streaming parsers and row validation for bulk expense imports.
+// Request bodies are decoded chunk by chunk, so only the current line (JSONL)
+// or record (CSV) is held as text while the import is read.
+
+import { parseCents, sumCents, type Cents } from '@/lib/money'
+
+export type ImportFormat = 'csv' | 'jsonl'
+
+export const IMPORT_MAX_ROWS = 50000
+// Only the first errors are reported; the failed count still covers every row
+export const IMPORT_MAX_REPORTED_ERRORS = 1000
+
+const UUID_REGEX = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
+
+export interface ImportParticipant {
+  userId: string
+  shareCents: Cents
+}
+
+export interface ImportRow {
+  row: number
+  groupId: string
+  paidByUserId: string | null
+  amountCents: Cents
+  description: string
+  category: string
+  createdAt: string | null
+  participants: ImportParticipant[]
+}
+
+export interface ImportRowError {
+  row: number
+  error: string
+}
+
+export interface ParsedRecord {
+  row: number
+  record?: Record<string, unknown>
+  error?: string
+}
+
+export class ExpenseImportError extends Error {
+  constructor(message: string, public code?: string) {
+    super(message)
+    this.name = 'ExpenseImportError'
+  }
+}
+
+/**
+ * Picks the parser from an explicit `format=` value or the request content type.
+ *
+ * @throws ExpenseImportError - If neither names a supported format
+ */
+export const detectImportFormat = (contentType: string | null, format: string | null): ImportFormat => {
+  const value = (format || contentType || '').toLowerCase()
+  if (value === 'csv' || value.includes('text/csv')) return 'csv'
+  if (value === 'jsonl' || value === 'ndjson' || value.includes('jsonl') || value.includes('ndjson')) return 'jsonl'
+  throw new ExpenseImportError('Import format must be CSV (text/csv) or JSONL (application/x-ndjson)', 'INVALID_FORMAT')
+}
+
+async function* decodeChunks(stream: ReadableStream<Uint8Array>): AsyncGenerator<string> {
+  const reader = stream.getReader()
+  const decoder = new TextDecoder()
+  try {
+    for (;;) {
+      const { done, value } = await reader.read()
+      if (done) break
+      yield decoder.decode(value, { stream: true })
+    }
+    const tail = decoder.decode()
+    if (tail) yield tail
+  } finally {
+    reader.releaseLock()
+  }
+}
+
+/**
+ * Yields one JSON object per non-empty line, numbered by line.
+ */
+export async function* parseJsonlStream(stream: ReadableStream<Uint8Array>): AsyncGenerator<ParsedRecord> {
+  let pending = ''
+  let line = 0
+
+  const parseLine = (text: string): ParsedRecord | null => {
+    line++
+    if (!text.trim()) return null
+    try {
+      const record = JSON.parse(text)
+      if (!record || typeof record !== 'object' || Array.isArray(record)) {
+        return { row: line, error: 'Each line must be a JSON object' }
+      }
+      return { row: line, record }
+    } catch {
+      return { row: line, error: 'Invalid JSON' }
+    }
+  }
+
+  for await (const chunk of decodeChunks(stream)) {
+    pending += chunk
+    let newline = pending.indexOf('\n')
+    while (newline !== -1) {
+      const parsed = parseLine(pending.slice(0, newline))
+      pending = pending.slice(newline + 1)
+      if (parsed) yield parsed
+      newline = pending.indexOf('\n')
+    }
+  }
+
+  const parsed = parseLine(pending)
+  if (parsed) yield parsed
+}
+
+// Header names are matched loosely so both `paid_by_user_id` and `paidByUserId` work
+const normalizeHeader = (header: string): string => header.trim().toLowerCase().replace(/[_\s-]/g, '')
+
+const CSV_COLUMNS: Record<string, string> = {
+  groupid: 'groupId',
+  amount: 'amount',
+  description: 'description',
+  category: 'category',
+  paidbyuserid: 'paidByUserId',
+  paidby: 'paidByUserId',
+  createdat: 'createdAt',
+  date: 'createdAt',
+  participants: 'participants',
+}
+
+/**
+ * Yields one record per CSV data row (RFC 4180 quoting, CRLF or LF endings).
+ * The first row is the header. Rows are numbered by the line they start on,
+ * matching what a spreadsheet shows.
+ */
+export async function* parseCsvStream(stream: ReadableStream<Uint8Array>): AsyncGenerator<ParsedRecord> {
+  let header: Array<string | undefined> | null = null
+  let fields: string[] = []
+  let field = ''
+  let quoted = false
+  let quoteSeen = false
+  let line = 1
+  let rowStart = 1
+
+  const endRecord = (): ParsedRecord | null => {
+    fields.push(field)
+    const values = fields
+    const row = rowStart
+    fields = []
+    field = ''
+    rowStart = line
+
+    if (values.length === 1 && values[0].trim() === '') return null
+
+    if (!header) {
+      header = values.map(value => CSV_COLUMNS[normalizeHeader(value)])
+      return null
+    }
+
+    if (values.length !== header.length) {
+      return { row, error: `Expected ${header.length} columns but found ${values.length}` }
+    }
+
+    const record: Record<string, unknown> = {}
+    header.forEach((column, i) => {
+      if (column) record[column] = values[i]
+    })
+    return { row, record }
+  }
+
+  for await (const chunk of decodeChunks(stream)) {
+    for (let i = 0; i < chunk.length; i++) {
+      const char = chunk[i]
+
+      if (quoted) {
+        if (char === '"') {
+          quoted = false
+          quoteSeen = true
+        } else {
+          if (char === '\n') line++
+          field += char
+        }
+        continue
+      }
+
+      if (char === '"') {
+        // A quote right after a closing quote is an escaped quote
+        if (quoteSeen) field += '"'
+        quoted = true
+        quoteSeen = false
+        continue
+      }
+      quoteSeen = false
+
+      if (char === ',') {
+        fields.push(field)
+        field = ''
+      } else if (char === '\n') {
+        line++
+        const parsed = endRecord()
+        if (parsed) yield parsed
+      } else if (char !== '\r') {
+        field += char
+      }
+    }
+  }
+
+  if (quoted) {
+    yield { row: rowStart, error: 'Unterminated quoted field' }
+    return
+  }
+  const parsed = endRecord()
+  if (parsed) yield parsed
+}
+
+export const parseImportStream = (
+  stream: ReadableStream<Uint8Array>,
+  format: ImportFormat
+): AsyncGenerator<ParsedRecord> => (format === 'csv' ? parseCsvStream(stream) : parseJsonlStream(stream))
+
+const asText = (value: unknown): string =>
+  value === undefined || value === null ? '' : String(value).trim()
+
+// CSV participants are `userId:share` pairs separated by semicolons
+const parseParticipants = (value: unknown): ImportParticipant[] => {
+  const entries = typeof value === 'string'
+    ? value.split(';').filter(entry => entry.trim()).map(entry => {
+        const [userId, shareAmount] = entry.split(':')
+        return { userId, shareAmount }
+      })
+    : value
+
+  if (!Array.isArray(entries)) {
+    throw new ExpenseImportError('Participants must be a list')
+  }
+
+  return entries.map((entry: any) => {
+    const userId = asText(entry?.userId)
+    const shareCents = parseCents(asText(entry?.shareAmount))
+    if (!UUID_REGEX.test(userId)) {
+      throw new ExpenseImportError(`Invalid participant user ID: ${userId || '(empty)'}`)
+    }
+    if (shareCents === null || shareCents < 0) {
+      throw new ExpenseImportError(`Invalid share amount for participant ${userId}`)
+    }
+    return { userId, shareCents }
+  })
+}
+
+/**
+ * Applies the single-expense creation rules to one imported record.
+ *
+ * @param record - Parsed CSV or JSONL record
+ * @param row - Source row number, reported back with any error
+ * @param defaultGroupId - Group used when the record doesn't name one
+ * @returns ImportRow - Normalized row ready for import_expenses
+ * @throws ExpenseImportError - With a message describing the first invalid value
+ */
+export const normalizeImportRecord = (
+  record: Record<string, unknown>,
+  row: number,
+  defaultGroupId: string | null
+): ImportRow => {
+  const groupId = asText(record.groupId) || defaultGroupId || ''
+  const description = asText(record.description)
+  const amountCents = parseCents(asText(record.amount))
+
+  if (!groupId || !asText(record.amount) || !description) {
+    throw new ExpenseImportError('Group ID, amount, and description are required')
+  }
+  if (!UUID_REGEX.test(groupId)) {
+    throw new ExpenseImportError('Invalid group ID')
+  }
+  if (amountCents === null) {
+    throw new ExpenseImportError('Amount must be a number with at most two decimal places')
+  }
+  if (amountCents <= 0) {
+    throw new ExpenseImportError('Amount must be greater than 0')
+  }
+
+  const paidByUserId = asText(record.paidByUserId) || null
+  if (paidByUserId && !UUID_REGEX.test(paidByUserId)) {
+    throw new ExpenseImportError('Invalid payer user ID')
+  }
+
+  const createdAtText = asText(record.createdAt)
+  let createdAt: string | null = null
+  if (createdAtText) {
+    const date = new Date(createdAtText)
+    if (Number.isNaN(date.getTime())) {
+      throw new ExpenseImportError('Invalid date')
+    }
+    createdAt = date.toISOString()
+  }
+
+  const participants = parseParticipants(record.participants ?? [])
+  if (participants.length === 0) {
+    throw new ExpenseImportError('At least one participant is required')
+  }
+
+  // Same exact check create_expense_with_participants applies to single expenses
+  const shareTotal = sumCents(participants.map(participant => participant.shareCents))
+  if (shareTotal !== amountCents) {
+    throw new ExpenseImportError('Total shares must equal the expense amount')
+  }
+
+  return {
+    row,
+    groupId,
+    paidByUserId,
+    amountCents,
+    description,
+    category: asText(record.category) || 'other',
+    createdAt,
+    participants
+  }
+}
+
+// Shape expected by the import_expenses database function
+export const toImportPayload = (rows: ImportRow[]) =>
+  rows.map(row => ({
+    row: row.row,
+    group_id: row.groupId,
+    paid_by_user_id: row.paidByUserId,
+    amount_cents: row.amountCents,
+    description: row.description,
+    category: row.category,
+    created_at: row.createdAt,
+    participants: row.participants.map(participant => ({
+      user_id: participant.userId,
+      share_cents: participant.shareCents
+    }))
+  }))
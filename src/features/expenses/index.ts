@@ -1 +1,2 @@
 export { AddExpenseForm } from './components/AddExpenseForm'
+export { AddExpenseDialog } from './components/AddExpenseDialog'
@@ -0,0 +1,251 @@
+import { parseCents, type Cents } from '@/lib/money'
+import { isCalendarDate } from '@/lib/dates'
+
+// Shared keyset pagination, field projection and search filters for expense listings.
+// Pages are ordered newest first on (created_at, id), which is backed by
+// idx_expenses_group_created_at_id, so every page is an index range scan.
+
+export const EXPENSE_PAGE_DEFAULT_LIMIT = 50
+export const EXPENSE_PAGE_MAX_LIMIT = 200
+
+// Selectable fields; `payer` and `participants` are embedded profile joins
+const EXPENSE_FIELD_SELECTS: Record<string, string> = {
+  id: 'id',
+  group_id: 'group_id',
+  paid_by_user_id: 'paid_by_user_id',
+  amount: 'amount',
+  amount_cents: 'amount_cents',
+  description: 'description',
+  category: 'category',
+  created_at: 'created_at',
+  payer: `payer:profiles!expenses_paid_by_user_id_fkey (
+    full_name,
+    avatar_url
+  )`,
+  participants: `participants:expense_participants (
+    user_id,
+    share_amount,
+    share_cents,
+    user:profiles!expense_participants_user_id_fkey (
+      full_name,
+      avatar_url
+    )
+  )`,
+}
+
+export const EXPENSE_FIELDS = Object.keys(EXPENSE_FIELD_SELECTS)
+
+const UUID_REGEX = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
+const TIMESTAMP_REGEX = /^[0-9T:.+\- Z]+$/
+
+export const DEFAULT_EXPENSE_SELECT = `
+  *,
+  ${EXPENSE_FIELD_SELECTS.payer},
+  ${EXPENSE_FIELD_SELECTS.participants}
+`
+
+export interface ExpenseCursor {
+  createdAt: string
+  id: string
+}
+
+export class ExpenseQueryError extends Error {
+  constructor(message: string, public code?: string) {
+    super(message)
+    this.name = 'ExpenseQueryError'
+  }
+}
+
+/**
+ * Builds the select clause for a `fields=` projection.
+ * The cursor columns are always included so the next page can be requested.
+ *
+ * @param fields - Requested field names, or undefined for the full payload
+ * @returns string - PostgREST select clause
+ * @throws ExpenseQueryError - If an unknown field is requested
+ */
+export const buildExpenseSelect = (fields?: string[]): string => {
+  if (!fields || fields.length === 0) {
+    return DEFAULT_EXPENSE_SELECT
+  }
+
+  const unknown = fields.filter(field => !(field in EXPENSE_FIELD_SELECTS))
+  if (unknown.length > 0) {
+    throw new ExpenseQueryError(`Unknown expense fields: ${unknown.join(', ')}`, 'INVALID_FIELDS')
+  }
+
+  const selected = new Set(['id', 'created_at', ...fields])
+  return Array.from(selected).map(field => EXPENSE_FIELD_SELECTS[field]).join(',\n')
+}
+
+/**
+ * Parses a `fields=a,b,c` query value.
+ */
+export const parseExpenseFields = (value: string | null): string[] | undefined => {
+  if (!value) return undefined
+  return value.split(',').map(field => field.trim()).filter(Boolean)
+}
+
+/**
+ * Clamps a requested page size to 1..EXPENSE_PAGE_MAX_LIMIT.
+ *
+ * @throws ExpenseQueryError - If the limit is not a positive integer
+ */
+export const parseExpenseLimit = (value: string | number | null | undefined): number => {
+  if (value === null || value === undefined || value === '') {
+    return EXPENSE_PAGE_DEFAULT_LIMIT
+  }
+
+  const limit = Number(value)
+  if (!Number.isInteger(limit) || limit <= 0) {
+    throw new ExpenseQueryError('Limit must be a positive integer', 'INVALID_LIMIT')
+  }
+  return Math.min(limit, EXPENSE_PAGE_MAX_LIMIT)
+}
+
+const toBase64Url = (value: string): string =>
+  btoa(value).replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '')
+
+const fromBase64Url = (value: string): string =>
+  atob(value.replace(/-/g, '+').replace(/_/g, '/'))
+
+// Cursors are opaque to clients: base64url-encoded JSON of the last row's sort key
+export const encodeExpenseCursor = (row: { created_at: string; id: string }): string =>
+  toBase64Url(JSON.stringify([row.created_at, row.id]))
+
+/**
+ * @throws ExpenseQueryError - If the cursor was not produced by encodeExpenseCursor
+ */
+export const decodeExpenseCursor = (cursor: string): ExpenseCursor => {
+  try {
+    const [createdAt, id] = JSON.parse(fromBase64Url(cursor))
+    // Both values end up inside a PostgREST filter, so only accept exactly what we encode
+    if (typeof createdAt !== 'string' || !TIMESTAMP_REGEX.test(createdAt) || !UUID_REGEX.test(id)) {
+      throw new Error('Malformed cursor')
+    }
+    return { createdAt, id }
+  } catch {
+    throw new ExpenseQueryError('Invalid cursor', 'INVALID_CURSOR')
+  }
+}
+
+/**
+ * PostgREST `or` filter selecting rows strictly after the cursor in
+ * (created_at DESC, id DESC) order.
+ */
+export const expenseCursorFilter = (cursor: ExpenseCursor): string =>
+  `created_at.lt."${cursor.createdAt}",and(created_at.eq."${cursor.createdAt}",id.lt.${cursor.id})`
+
+/**
+ * Splits an over-fetched page (limit + 1 rows) into the page and the next cursor.
+ */
+export const toExpensePage = <T extends { created_at: string; id: string }>(
+  rows: T[],
+  limit: number
+): { expenses: T[]; nextCursor: string | null } => {
+  const hasMore = rows.length > limit
+  const expenses = hasMore ? rows.slice(0, limit) : rows
+  return {
+    expenses,
+    nextCursor: hasMore ? encodeExpenseCursor(expenses[expenses.length - 1]) : null
+  }
+}
+
+// Search (GET /api/expenses/search, migration 016)
+
+export const EXPENSE_SEARCH_MAX_TERMS = 5
+const EXPENSE_SEARCH_MAX_TERM_LENGTH = 50
+const DAY_MS = 24 * 60 * 60 * 1000
+
+// Inner-joined only to filter by participant; stripped from the rows before they are returned
+export const PARTICIPANT_FILTER_ALIAS = 'participant_match'
+export const PARTICIPANT_FILTER_SELECT = `${PARTICIPANT_FILTER_ALIAS}:expense_participants!inner(user_id)`
+
+export interface ExpenseSearchFilters {
+  // Lower-cased words that must all appear in the description or category
+  terms: string[]
+  category: string | null
+  paidBy: string | null
+  participant: string | null
+  minCents: Cents | null
+  maxCents: Cents | null
+  // Inclusive UTC dates, as YYYY-MM-DD
+  from: string | null
+  to: string | null
+}
+
+const parseUuid = (value: string | null, name: string): string | null => {
+  if (!value) return null
+  if (!UUID_REGEX.test(value)) {
+    throw new ExpenseQueryError(`${name} must be a user ID`, 'INVALID_FILTER')
+  }
+  return value
+}
+
+const parseAmount = (value: string | null, name: string): Cents | null => {
+  if (!value) return null
+  const cents = parseCents(value)
+  if (cents === null || cents < 0) {
+    throw new ExpenseQueryError(`${name} must be a non-negative amount with at most two decimal places`, 'INVALID_FILTER')
+  }
+  return cents
+}
+
+const parseDate = (value: string | null, name: string): string | null => {
+  if (!value) return null
+  if (!isCalendarDate(value)) {
+    throw new ExpenseQueryError(`${name} must be a date in YYYY-MM-DD format`, 'INVALID_FILTER')
+  }
+  return value
+}
+
+/**
+ * Reads the search text and filters from a request's query string:
+ * `q`, `category`, `paidBy`, `participant`, `minAmount`, `maxAmount`, `from` and `to`.
+ *
+ * @param params - The request's search params
+ * @returns ExpenseSearchFilters - Normalised filters; absent ones are null
+ * @throws ExpenseQueryError - If a filter is malformed or a range is inverted
+ */
+export const parseExpenseSearch = (params: URLSearchParams): ExpenseSearchFilters => {
+  const terms = (params.get('q') || '')
+    .toLowerCase()
+    .split(/\s+/)
+    .filter(Boolean)
+  if (terms.length > EXPENSE_SEARCH_MAX_TERMS) {
+    throw new ExpenseQueryError(`Search accepts at most ${EXPENSE_SEARCH_MAX_TERMS} words`, 'INVALID_SEARCH')
+  }
+  if (terms.some(term => term.length > EXPENSE_SEARCH_MAX_TERM_LENGTH)) {
+    throw new ExpenseQueryError(`Search words must be at most ${EXPENSE_SEARCH_MAX_TERM_LENGTH} characters`, 'INVALID_SEARCH')
+  }
+
+  const filters: ExpenseSearchFilters = {
+    terms,
+    category: params.get('category')?.trim().toLowerCase() || null,
+    paidBy: parseUuid(params.get('paidBy'), 'paidBy'),
+    participant: parseUuid(params.get('participant'), 'participant'),
+    minCents: parseAmount(params.get('minAmount'), 'minAmount'),
+    maxCents: parseAmount(params.get('maxAmount'), 'maxAmount'),
+    from: parseDate(params.get('from'), 'from'),
+    to: parseDate(params.get('to'), 'to'),
+  }
+
+  if (filters.minCents !== null && filters.maxCents !== null && filters.minCents > filters.maxCents) {
+    throw new ExpenseQueryError('minAmount must not be greater than maxAmount', 'INVALID_FILTER')
+  }
+  if (filters.from && filters.to && filters.from > filters.to) {
+    throw new ExpenseQueryError('from must not be after to', 'INVALID_FILTER')
+  }
+  return filters
+}
+
+/**
+ * `ilike` pattern matching a word anywhere in search_text. LIKE wildcards and the
+ * backslash are escaped, and `*`, which PostgREST reads as `%`, is dropped.
+ */
+export const expenseSearchPattern = (term: string): string =>
+  `%${term.replace(/\*/g, '').replace(/[\\%_]/g, match => `\\${match}`)}%`
+
+// Exclusive upper bound for an inclusive `to` date: midnight UTC the day after
+export const expenseSearchEndOf = (date: string): string =>
+  new Date(Date.parse(`${date}T00:00:00Z`) + DAY_MS).toISOString()
@@ -2,8 +2,12 @@
 export {
   createGroupServer,
   getGroupsServer,
+  getGroupSummariesServer,
   getGroupByIdServer,
   updateGroupServer,
   deleteGroupServer,
   GroupServerError
 } from './api/groups-server'
+export type { GroupSummary } from './api/groups-server'
+export { getGroupMembersServer } from './api/members-server'
+export type { GroupMember } from './api/members-server'
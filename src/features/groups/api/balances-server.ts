@@ -0,0 +1,79 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+import type { Database } from '@/types/database.types'
+import { cache, CACHE_KEYS, CACHE_TTL } from '@/lib/cache'
+import { fromCents, type Cents } from '@/lib/money'
+
+export interface GroupBalance {
+  userId: string
+  fullName: string
+  avatarUrl: string | null
+  balance: number
+  balanceCents: Cents
+}
+
+/**
+ * Computes the net balance of every member of a group.
+ * Paid and share totals come from the `get_group_balances` SQL function, which reads
+ * the trigger-maintained `group_member_balances` ledger, so the cost is a single
+ * round trip and one row per member regardless of how many expenses the group has.
+ * Callers are expected to have verified group membership first.
+ *
+ * @param supabase - Server client for the current request
+ * @param groupId - The UUID of the group
+ * @returns Promise<GroupBalance[]> - Balances sorted descending (people owed money first)
+ * @throws Error - If the aggregate query fails
+ */
+export const computeGroupBalances = async (
+  supabase: SupabaseClient<Database>,
+  groupId: string
+): Promise<GroupBalance[]> => {
+  const { data, error } = await supabase.rpc('get_group_balances', { p_group_id: groupId })
+
+  if (error) {
+    console.error('Error computing group balances:', error)
+    throw new Error('Failed to compute group balances')
+  }
+
+  const balances: GroupBalance[] = (data || []).map(row => {
+    // BIGINT cents; Number() also covers drivers that return int8 as a string
+    const balanceCents = Number(row.balance_cents)
+    return {
+      userId: row.user_id,
+      fullName: row.full_name || 'Unknown User',
+      avatarUrl: row.avatar_url || null,
+      balance: fromCents(balanceCents),
+      balanceCents
+    }
+  })
+
+  // Sort by balance descending (people owed money first)
+  return balances.sort((a, b) => b.balanceCents - a.balanceCents)
+}
+
+/**
+ * Cached variant of computeGroupBalances.
+ * Entries are keyed by the group's version, so a write is never followed by an older
+ * read; concurrent requests for the same version share one query.
+ * One entry serves every member: `get_group_balances` runs as SECURITY DEFINER behind
+ * is_group_member (migration 017), so its rows don't depend on whose client loads them.
+ * The loader and any background refresh use the client of the request that missed,
+ * which only has to belong to a member; a refresh that fails keeps the stale entry.
+ *
+ * @param supabase - Server client for the current request
+ * @param groupId - The UUID of the group
+ * @param version - The group's current version (see getGroupVersion)
+ * @returns Promise<GroupBalance[]> - Balances sorted descending (people owed money first)
+ * @throws Error - If the aggregate query fails
+ */
+export const getCachedGroupBalances = (
+  supabase: SupabaseClient<Database>,
+  groupId: string,
+  version: number
+): Promise<GroupBalance[]> => {
+  return cache.getOrLoad(
+    CACHE_KEYS.BALANCES(groupId, version),
+    () => computeGroupBalances(supabase, groupId),
+    CACHE_TTL.BALANCES,
+    { staleWhileRevalidate: CACHE_TTL.BALANCES }
+  )
+}
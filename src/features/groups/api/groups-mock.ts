@@ -28,9 +28,6 @@ const MOCK_USER_ID = 'mock-user-123'
  * Mock implementation of createGroup
  */
 export const createGroup = async (name: string): Promise<Group> => {
-  // Simulate network delay
-  await new Promise(resolve => setTimeout(resolve, 500))
-  
   // Input validation
   if (!name || typeof name !== 'string') {
     throw new GroupError('Group name is required and must be a string', 'INVALID_NAME')
@@ -66,9 +63,6 @@ export const createGroup = async (name: string): Promise<Group> => {
  * Mock implementation of getGroups
  */
 export const getGroups = async (): Promise<Group[]> => {
-  // Simulate network delay
-  await new Promise(resolve => setTimeout(resolve, 300))
-  
   const userGroups = mockGroups.filter(g => g.created_by === MOCK_USER_ID)
   console.log('Mock: Retrieved groups:', userGroups)
   
@@ -79,9 +73,6 @@ export const getGroups = async (): Promise<Group[]> => {
  * Mock implementation of getGroupById
  */
 export const getGroupById = async (id: string): Promise<Group> => {
-  // Simulate network delay
-  await new Promise(resolve => setTimeout(resolve, 200))
-  
   const group = mockGroups.find(g => g.id === id && g.created_by === MOCK_USER_ID)
   
   if (!group) {
@@ -99,9 +90,6 @@ export const updateGroup = async (
   id: string, 
   updates: Partial<{ name: string }>
 ): Promise<Group> => {
-  // Simulate network delay
-  await new Promise(resolve => setTimeout(resolve, 400))
-  
   const groupIndex = mockGroups.findIndex(g => g.id === id && g.created_by === MOCK_USER_ID)
   
   if (groupIndex === -1) {
@@ -129,9 +117,6 @@ export const updateGroup = async (
  * Mock implementation of deleteGroup
  */
 export const deleteGroup = async (id: string): Promise<void> => {
-  // Simulate network delay
-  await new Promise(resolve => setTimeout(resolve, 300))
-  
   const groupIndex = mockGroups.findIndex(g => g.id === id && g.created_by === MOCK_USER_ID)
   
   if (groupIndex === -1) {
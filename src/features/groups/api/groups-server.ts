@@ -1,5 +1,6 @@
-import { getSupabaseServerClient } from '@/lib/supabase/server'
-import { cache, CACHE_KEYS, CACHE_TTL, invalidateGroupCache } from '@/lib/cache'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { cache, CACHE_KEYS, CACHE_TTL } from '@/lib/cache'
+import { fromCents, type Cents } from '@/lib/money'
 import type { Database } from '@/types/database.types'
 
 // Type definitions for better type safety
@@ -7,6 +8,23 @@ type Group = Database['public']['Tables']['groups']['Row']
 type GroupInsert = Database['public']['Tables']['groups']['Insert']
 type GroupUpdate = Database['public']['Tables']['groups']['Update']
 
+// One dashboard row: a group the user belongs to, with its activity and the user's balance
+export interface GroupSummary {
+  id: string
+  name: string
+  createdBy: string
+  createdAt: string
+  role: 'admin' | 'member'
+  memberCount: number
+  expenseCount: number
+  totalSpent: number
+  totalSpentCents: Cents
+  lastActivityAt: string
+  // Positive when the group owes the user, negative when the user owes the group
+  netBalance: number
+  netBalanceCents: Cents
+}
+
 // Custom error class for group operations
 export class GroupServerError extends Error {
   constructor(
@@ -46,7 +64,7 @@ const validateGroupId = (id: string): void => {
 
 // Helper to get current user ID with proper error handling
 const getCurrentUserId = async (supabase: any): Promise<string> => {
-  const { data: { user }, error } = await supabase.auth.getUser()
+  const { data: { user }, error } = await getVerifiedUser(supabase)
   
   if (error) {
     throw new GroupServerError('Failed to get current user', 'AUTH_ERROR', error)
@@ -109,7 +127,7 @@ export const createGroupServer = async (
     }
     
     // Invalidate cache for the user's groups
-    cache.delete(CACHE_KEYS.GROUPS(ownerId))
+    cache.deleteMany([CACHE_KEYS.GROUPS(ownerId), CACHE_KEYS.GROUP_SUMMARIES(ownerId)])
     
     return data
   } catch (error) {
@@ -134,36 +152,32 @@ export const getGroupsServer = async (): Promise<Group[]> => {
     const supabase = await getSupabaseServerClient()
     
     // Get current user for cache key
-    const { data: { user } } = await supabase.auth.getUser()
+    const { data: { user } } = await getVerifiedUser(supabase)
     if (!user) {
       throw new GroupServerError('User must be authenticated', 'UNAUTHENTICATED')
     }
 
-    // Check cache first
-    const cacheKey = CACHE_KEYS.GROUPS(user.id)
-    const cachedData = cache.get<Group[]>(cacheKey)
-    if (cachedData) {
-      return cachedData
-    }
-    
-    // Optimized query with proper ordering and error handling
-    // RLS policies will automatically filter to only show groups created by the current user
-    const { data, error } = await supabase
-      .from('groups')
-      .select('*')
-      .order('created_at', { ascending: false })
-    
-    if (error) {
-      console.error('Supabase error:', error)
-      throw new GroupServerError('Failed to fetch groups', 'DATABASE_ERROR', error)
-    }
-    
-    const groups = data || []
-    
-    // Cache the result
-    cache.set(cacheKey, groups, CACHE_TTL.GROUPS)
-    
-    return groups
+    // Served from cache when possible; concurrent misses share one query
+    return await cache.getOrLoad<Group[]>(
+      CACHE_KEYS.GROUPS(user.id),
+      async () => {
+        // Optimized query with proper ordering and error handling
+        // RLS policies will automatically filter to only show groups created by the current user
+        const { data, error } = await supabase
+          .from('groups')
+          .select('*')
+          .order('created_at', { ascending: false })
+        
+        if (error) {
+          console.error('Supabase error:', error)
+          throw new GroupServerError('Failed to fetch groups', 'DATABASE_ERROR', error)
+        }
+        
+        return data || []
+      },
+      CACHE_TTL.GROUPS,
+      { staleWhileRevalidate: CACHE_TTL.GROUPS }
+    )
   } catch (error) {
     if (error instanceof GroupServerError) {
       throw error
@@ -172,6 +186,62 @@ export const getGroupsServer = async (): Promise<Group[]> => {
   }
 }
 
+/**
+ * Server-side function to fetch the dashboard summary for the current user.
+ * Every group the user belongs to (not only the ones they created) comes back with its
+ * member count, spending totals, last activity and the user's net balance from a single
+ * `get_dashboard_summary` call, so the cost doesn't grow with the number of groups.
+ * Cached per user; expense writes drop the entry for everyone in the group.
+ *
+ * @returns Promise<GroupSummary[]> - Groups, most recently active first
+ * @throws GroupServerError - For auth errors or database errors
+ */
+export const getGroupSummariesServer = async (): Promise<GroupSummary[]> => {
+  try {
+    const supabase = await getSupabaseServerClient()
+    const userId = await getCurrentUserId(supabase)
+
+    return await cache.getOrLoad<GroupSummary[]>(
+      CACHE_KEYS.GROUP_SUMMARIES(userId),
+      async () => {
+        const { data, error } = await supabase.rpc('get_dashboard_summary')
+
+        if (error) {
+          console.error('Supabase error:', error)
+          throw new GroupServerError('Failed to fetch group summaries', 'DATABASE_ERROR', error)
+        }
+
+        return (data || []).map((row): GroupSummary => {
+          // BIGINT cents; Number() also covers drivers that return int8 as a string
+          const totalSpentCents = Number(row.total_spent_cents)
+          const netBalanceCents = Number(row.net_balance_cents)
+          return {
+            id: row.id,
+            name: row.name,
+            createdBy: row.created_by,
+            createdAt: row.created_at,
+            role: row.role === 'admin' ? 'admin' : 'member',
+            memberCount: row.member_count,
+            expenseCount: row.expense_count,
+            totalSpent: fromCents(totalSpentCents),
+            totalSpentCents,
+            lastActivityAt: row.last_activity_at,
+            netBalance: fromCents(netBalanceCents),
+            netBalanceCents
+          }
+        })
+      },
+      CACHE_TTL.GROUP_SUMMARIES,
+      { staleWhileRevalidate: CACHE_TTL.GROUP_SUMMARIES }
+    )
+  } catch (error) {
+    if (error instanceof GroupServerError) {
+      throw error
+    }
+    throw new GroupServerError('Unexpected error fetching group summaries', 'UNEXPECTED_ERROR', error)
+  }
+}
+
 /**
  * Server-side function to fetch a single group by ID.
  * Use this in API routes and server components.
@@ -0,0 +1,48 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+import type { Database } from '@/types/database.types'
+import type { GroupRole } from '@/lib/membership'
+
+export interface GroupMember {
+  userId: string
+  fullName: string
+  role: GroupRole
+}
+
+/**
+ * Lists a group's members with their profile names, oldest member first.
+ * The group page loads this once and hands it to the add-expense form.
+ * Callers are expected to have verified group membership first.
+ *
+ * @param supabase - Server client for the current request
+ * @param groupId - The UUID of the group
+ * @returns Promise<GroupMember[]> - One entry per member
+ * @throws Error - If the members can't be loaded
+ */
+export const getGroupMembersServer = async (
+  supabase: SupabaseClient<Database>,
+  groupId: string
+): Promise<GroupMember[]> => {
+  const { data, error } = await supabase
+    .from('group_members')
+    .select(`
+      user_id,
+      role,
+      joined_at,
+      profiles!inner (
+        full_name
+      )
+    `)
+    .eq('group_id', groupId)
+    .order('joined_at', { ascending: true })
+
+  if (error) {
+    console.error('Error fetching group members:', error)
+    throw new Error('Failed to load group members')
+  }
+
+  return (data || []).map(row => ({
+    userId: row.user_id,
+    fullName: (row.profiles as any)?.full_name || 'Unknown',
+    role: row.role === 'admin' ? 'admin' : 'member'
+  }))
+}
@@ -0,0 +1,204 @@
+import type { GroupBalance } from './balances-server'
+import { fromCents } from '@/lib/money'
+
+export interface Settlement {
+  from: string // userId of the member who pays
+  to: string // userId of the member who gets paid
+  amount: number
+  amountCents: number
+}
+
+export type SettlementMode = 'greedy' | 'exact'
+
+export interface SettlementPlan {
+  owed: Settlement[]
+  mode: SettlementMode // Mode that actually produced the plan
+  timedOut: boolean // True when exact mode ran out of budget and fell back to greedy
+}
+
+export interface PlanSettlementsOptions {
+  mode?: SettlementMode
+  timeBudgetMs?: number
+}
+
+// Exact mode is exponential in the number of unsettled members, so it is only attempted for small groups
+export const EXACT_MODE_MAX_MEMBERS = 14
+export const DEFAULT_SETTLEMENT_TIME_BUDGET_MS = 50
+
+interface Position {
+  userId: string
+  cents: number
+}
+
+// Minimal binary max-heap keyed on cents
+class MaxHeap {
+  private items: Position[] = []
+
+  get size(): number {
+    return this.items.length
+  }
+
+  push(item: Position): void {
+    const items = this.items
+    items.push(item)
+    let i = items.length - 1
+    while (i > 0) {
+      const parent = (i - 1) >> 1
+      if (items[parent].cents >= items[i].cents) break
+      ;[items[parent], items[i]] = [items[i], items[parent]]
+      i = parent
+    }
+  }
+
+  pop(): Position | undefined {
+    const items = this.items
+    if (items.length === 0) return undefined
+    const top = items[0]
+    const last = items.pop()!
+    if (items.length > 0) {
+      items[0] = last
+      let i = 0
+      for (;;) {
+        const left = 2 * i + 1
+        const right = left + 1
+        let largest = i
+        if (left < items.length && items[left].cents > items[largest].cents) largest = left
+        if (right < items.length && items[right].cents > items[largest].cents) largest = right
+        if (largest === i) break
+        ;[items[largest], items[i]] = [items[i], items[largest]]
+        i = largest
+      }
+    }
+    return top
+  }
+}
+
+const toSettlement = (from: string, to: string, cents: number): Settlement => ({
+  from,
+  to,
+  amount: fromCents(cents),
+  amountCents: cents
+})
+
+// Drops settled members. Balances come from the cent ledger and sum to exactly zero;
+// any residue (e.g. a hand-edited ledger) is absorbed by the largest position so every
+// plan still fully settles the group.
+const toPositions = (balances: GroupBalance[]): Position[] => {
+  const positions = balances
+    .map(b => ({ userId: b.userId, cents: b.balanceCents }))
+    .filter(p => p.cents !== 0)
+
+  const residue = positions.reduce((sum, p) => sum + p.cents, 0)
+  if (residue !== 0 && positions.length > 0) {
+    const largest = positions.reduce((max, p) => (Math.abs(p.cents) > Math.abs(max.cents) ? p : max))
+    largest.cents -= residue
+  }
+
+  return positions.filter(p => p.cents !== 0)
+}
+
+// Repeatedly matches the largest creditor with the largest debtor: O(n log n), at most n - 1 transfers
+const settleGreedy = (positions: Position[]): Settlement[] => {
+  const creditors = new MaxHeap()
+  const debtors = new MaxHeap()
+
+  for (const p of positions) {
+    if (p.cents > 0) creditors.push({ userId: p.userId, cents: p.cents })
+    else if (p.cents < 0) debtors.push({ userId: p.userId, cents: -p.cents })
+  }
+
+  const owed: Settlement[] = []
+  while (creditors.size > 0 && debtors.size > 0) {
+    const creditor = creditors.pop()!
+    const debtor = debtors.pop()!
+    const cents = Math.min(creditor.cents, debtor.cents)
+
+    owed.push(toSettlement(debtor.userId, creditor.userId, cents))
+
+    if (creditor.cents > cents) creditors.push({ userId: creditor.userId, cents: creditor.cents - cents })
+    if (debtor.cents > cents) debtors.push({ userId: debtor.userId, cents: debtor.cents - cents })
+  }
+
+  return owed
+}
+
+// Minimal transfer count is n minus the largest number of disjoint zero-sum subsets.
+// Finds that partition with a subset DP, then settles each subset greedily (k - 1 transfers each).
+// Returns null if the deadline passes before the DP completes.
+const settleExact = (positions: Position[], deadline: number): Settlement[] | null => {
+  const n = positions.length
+  const full = (1 << n) - 1
+  const sums = new Float64Array(full + 1)
+  const best = new Int8Array(full + 1)
+
+  for (let mask = 1; mask <= full; mask++) {
+    // Checking the clock on every mask is wasteful; every 4096 masks keeps overshoot negligible
+    if ((mask & 0xfff) === 0 && Date.now() > deadline) {
+      return null
+    }
+
+    const low = mask & -mask
+    const i = 31 - Math.clz32(low)
+    sums[mask] = sums[mask ^ low] + positions[i].cents
+
+    let max = 0
+    for (let rest = mask; rest !== 0; rest &= rest - 1) {
+      const bit = rest & -rest
+      if (best[mask ^ bit] > max) max = best[mask ^ bit]
+    }
+    best[mask] = max + (sums[mask] === 0 ? 1 : 0)
+  }
+
+  // Walk back from the full set; each zero-sum mask on the path closes one subset
+  const owed: Settlement[] = []
+  let subset: Position[] = []
+  let mask = full
+  while (mask !== 0) {
+    const gain = sums[mask] === 0 ? 1 : 0
+    for (let rest = mask; rest !== 0; rest &= rest - 1) {
+      const bit = rest & -rest
+      if (best[mask ^ bit] + gain === best[mask]) {
+        subset.push(positions[31 - Math.clz32(bit)])
+        mask ^= bit
+        break
+      }
+    }
+    if (sums[mask] === 0) {
+      owed.push(...settleGreedy(subset))
+      subset = []
+    }
+  }
+
+  return owed
+}
+
+/**
+ * Turns net group balances into a list of "who pays whom" transfers that settles everyone.
+ * Works in integer cents so transfers always sum exactly to the balances.
+ *
+ * Greedy mode matches largest creditor with largest debtor in O(n log n).
+ * Exact mode finds the minimum number of transfers for groups of up to
+ * EXACT_MODE_MAX_MEMBERS unsettled members, falling back to greedy if it
+ * cannot finish within the time budget.
+ *
+ * @param balances - Net balances as returned by getGroupBalances
+ * @param options - Planner mode and time budget in milliseconds
+ * @returns SettlementPlan - Transfers plus the mode that produced them
+ */
+export const planSettlements = (
+  balances: GroupBalance[],
+  options: PlanSettlementsOptions = {}
+): SettlementPlan => {
+  const { mode = 'greedy', timeBudgetMs = DEFAULT_SETTLEMENT_TIME_BUDGET_MS } = options
+  const positions = toPositions(balances)
+
+  if (mode === 'exact' && positions.length <= EXACT_MODE_MAX_MEMBERS) {
+    const owed = settleExact(positions, Date.now() + timeBudgetMs)
+    if (owed) {
+      return { owed, mode: 'exact', timedOut: false }
+    }
+    return { owed: settleGreedy(positions), mode: 'greedy', timedOut: true }
+  }
+
+  return { owed: settleGreedy(positions), mode: 'greedy', timedOut: false }
+}
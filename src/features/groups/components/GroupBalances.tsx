@@ -1,36 +1,72 @@
 'use client'
 
-import { useEffect, useState } from 'react'
+import { useCallback, useEffect, useState } from 'react'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
+import { useGroupEvents } from '@/lib/group-events/client'
+import { fromCents } from '@/lib/money'
 import { getGroupBalances, type GroupBalance } from '../actions/getGroupBalances'
 
 interface GroupBalancesProps {
   groupId: string
+  // Balances already loaded by a server component; the client fetch is skipped
+  initialBalances?: GroupBalance[]
 }
 
-export function GroupBalances({ groupId }: GroupBalancesProps) {
-  const [balances, setBalances] = useState<GroupBalance[]>([])
-  const [loading, setLoading] = useState(true)
+export function GroupBalances({ groupId, initialBalances }: GroupBalancesProps) {
+  const [balances, setBalances] = useState<GroupBalance[]>(initialBalances ?? [])
+  const [loading, setLoading] = useState(!initialBalances)
   const [error, setError] = useState<string | null>(null)
 
+  // Background refreshes keep the current list on screen instead of the skeleton
+  const fetchBalances = useCallback(async (background = false) => {
+    try {
+      if (!background) setLoading(true)
+      setError(null)
+      const data = await getGroupBalances(groupId)
+      setBalances(data)
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to fetch balances')
+    } finally {
+      setLoading(false)
+    }
+  }, [groupId])
+
   useEffect(() => {
-    async function fetchBalances() {
-      try {
-        setLoading(true)
-        setError(null)
-        const data = await getGroupBalances(groupId)
-        setBalances(data)
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Failed to fetch balances')
-      } finally {
-        setLoading(false)
-      }
+    if (initialBalances) {
+      setBalances(initialBalances)
+      setLoading(false)
+      return
     }
 
     if (groupId) {
       fetchBalances()
     }
-  }, [groupId])
+  }, [groupId, initialBalances, fetchBalances])
+
+  // Pushed balance changes are applied in place; a resync, or a member we haven't
+  // loaded yet, falls back to one refetch
+  useGroupEvents(groupId, event => {
+    if (event.type === 'resync') {
+      fetchBalances(true)
+      return
+    }
+    if (event.type !== 'balance') {
+      return
+    }
+    if (!balances.some(balance => balance.userId === event.userId)) {
+      fetchBalances(true)
+      return
+    }
+    setBalances(prev =>
+      prev
+        .map(balance =>
+          balance.userId === event.userId
+            ? { ...balance, balance: fromCents(event.balanceCents), balanceCents: event.balanceCents }
+            : balance
+        )
+        .sort((a, b) => b.balanceCents - a.balanceCents)
+    )
+  })
 
   const formatCurrency = (amount: number) => {
     return new Intl.NumberFormat('en-IN', {
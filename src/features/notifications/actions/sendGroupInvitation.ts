@@ -1,6 +1,7 @@
 'use server'
 
-import { getSupabaseServerClient } from '@/lib/supabase/server'
+import { getSupabaseServerClient, getVerifiedUser } from '@/lib/supabase/server'
+import { getGroupRole } from '@/lib/membership'
 
 interface SendGroupInvitationParams {
   groupId: string
@@ -19,21 +20,16 @@ export async function sendGroupInvitation({
     const supabase = await getSupabaseServerClient()
 
     // Get the current user
-    const { data: { user }, error: authError } = await supabase.auth.getUser()
+    const { data: { user }, error: authError } = await getVerifiedUser(supabase)
     
     if (authError || !user) {
       return { success: false, error: 'User not authenticated' }
     }
 
-    // Verify that the current user is an admin of the group
-    const { data: membership, error: membershipError } = await supabase
-      .from('group_members')
-      .select('role')
-      .eq('group_id', groupId)
-      .eq('user_id', user.id)
-      .single()
+    // Verify that the current user is an admin of the group (memberships are cached per user)
+    const role = await getGroupRole(supabase, user.id, groupId)
 
-    if (membershipError || !membership || membership.role !== 'admin') {
+    if (role !== 'admin') {
       return { success: false, error: 'You are not authorized to invite members to this group' }
     }
 
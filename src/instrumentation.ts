@@ -3,6 +3,10 @@ import * as Sentry from '@sentry/nextjs';
 export async function register() {
   if (process.env.NEXT_RUNTIME === 'nodejs') {
     await import('../sentry.server.config');
+
+    // Drop cached group memberships as soon as they change
+    const { subscribeToMembershipChanges } = await import('./lib/membership');
+    subscribeToMembershipChanges();
   }
 
   if (process.env.NEXT_RUNTIME === 'edge') {
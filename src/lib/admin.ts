@@ -0,0 +1,16 @@
+import { timingSafeEqual } from 'node:crypto'
+import type { NextRequest } from 'next/server'
+
+// Admin and maintenance endpoints are only callable with the job secret,
+// sent the way Vercel Cron sends it: `Authorization: Bearer <CRON_SECRET>`
+export function isAdminRequest(request: NextRequest): boolean {
+  const secret = process.env.CRON_SECRET
+  if (!secret) {
+    return false
+  }
+  const given = Buffer.from(request.headers.get('authorization') ?? '')
+  const expected = Buffer.from(`Bearer ${secret}`)
+  // Constant-time, so response timing doesn't reveal how much of the secret matched;
+  // timingSafeEqual needs equal lengths, and the length alone gives nothing away
+  return given.length === expected.length && timingSafeEqual(given, expected)
+}
@@ -0,0 +1,33 @@
+// Shared tier of the response cache. Every instance keeps its own LRU store;
+// a backend shares values and invalidation events between instances.
+
+export interface CacheBackend {
+  readonly name: string
+  // Whether values stored here are visible to other instances
+  readonly shared: boolean
+  get<T>(key: string): Promise<T | null>
+  set<T>(key: string, data: T, ttl: number): Promise<void>
+  delete(keys: string[]): Promise<void>
+  // Tell every other instance to drop these keys from its local store
+  publishInvalidation(keys: string[]): Promise<void>
+  // Registers the handler for invalidations published by other instances
+  subscribeInvalidations(handler: (keys: string[]) => void): void
+}
+
+// Default backend: nothing is shared, the per-instance LRU store is the whole cache
+export class MemoryCacheBackend implements CacheBackend {
+  readonly name = 'memory'
+  readonly shared = false
+
+  async get<T>(): Promise<T | null> {
+    return null
+  }
+
+  async set(): Promise<void> {}
+
+  async delete(): Promise<void> {}
+
+  async publishInvalidation(): Promise<void> {}
+
+  subscribeInvalidations(): void {}
+}
@@ -0,0 +1,184 @@
+import { LRUCache, DEFAULT_CACHE_OPTIONS, type CacheStats, type GetOrLoadOptions } from './memory'
+import { MemoryCacheBackend, type CacheBackend } from './backend'
+import { RedisCacheBackend } from './redis'
+
+export type { CacheBackend } from './backend'
+export type { CacheOptions, CachePrefixStats, CacheStats, GetOrLoadOptions } from './memory'
+
+// Response cache for API routes and server actions.
+// Each instance reads from its own bounded LRU store; a pluggable backend shares
+// values and invalidations between instances when the app is scaled horizontally.
+class TieredCache {
+  constructor(
+    private local: LRUCache,
+    private backend: CacheBackend
+  ) {
+    // Keys invalidated on another instance are dropped here too
+    backend.subscribeInvalidations(keys => {
+      for (const key of keys) {
+        local.delete(key)
+      }
+    })
+  }
+
+  get backendName(): string {
+    return this.backend.name
+  }
+
+  get<T>(key: string): T | null {
+    return this.local.get<T>(key)
+  }
+
+  set<T>(key: string, data: T, ttl: number = 5 * 60 * 1000): void {
+    this.local.set(key, data, ttl)
+    this.writeThrough(key, data, ttl)
+  }
+
+  // Local-only check, used to observe what this instance currently holds
+  has(key: string): boolean {
+    return this.local.has(key)
+  }
+
+  /**
+   * Returns the cached value for a key, running the loader on a miss.
+   * On a local miss the shared backend is consulted before the loader runs,
+   * so one instance's load warms every instance.
+   * See LRUCache.getOrLoad for single-flight and stale-while-revalidate behaviour.
+   */
+  getOrLoad<T>(
+    key: string,
+    loader: () => Promise<T>,
+    ttl: number,
+    options: GetOrLoadOptions = {}
+  ): Promise<T> {
+    if (!this.backend.shared) {
+      return this.local.getOrLoad(key, loader, ttl, options)
+    }
+
+    return this.local.getOrLoad(key, async () => {
+      try {
+        const shared = await this.backend.get<T>(key)
+        if (shared !== null) {
+          return shared
+        }
+      } catch (error) {
+        console.error(`Cache backend ${this.backend.name} read failed for ${key}:`, error)
+      }
+
+      const data = await loader()
+      this.writeThrough(key, data, ttl + (options.staleWhileRevalidate ?? 0))
+      return data
+    }, ttl, options)
+  }
+
+  delete(key: string): void {
+    this.deleteMany([key])
+  }
+
+  // Drops keys here, in the shared store, and on every other instance
+  deleteMany(keys: string[]): void {
+    for (const key of keys) {
+      this.local.delete(key)
+    }
+
+    if (this.backend.shared) {
+      Promise.all([
+        this.backend.delete(keys),
+        this.backend.publishInvalidation(keys)
+      ]).catch(error => {
+        console.error(`Cache backend ${this.backend.name} invalidation failed:`, error)
+      })
+    }
+  }
+
+  clear(): void {
+    this.local.clear()
+  }
+
+  cleanup(): void {
+    this.local.cleanup()
+  }
+
+  getStats(): CacheStats & { backend: string } {
+    return { ...this.local.getStats(), backend: this.backend.name }
+  }
+
+  resetStats(): void {
+    this.local.resetStats()
+  }
+
+  private writeThrough<T>(key: string, data: T, ttl: number): void {
+    if (!this.backend.shared) return
+    this.backend.set(key, data, ttl).catch(error => {
+      console.error(`Cache backend ${this.backend.name} write failed for ${key}:`, error)
+    })
+  }
+}
+
+// CACHE_BACKEND=redis with REDIS_URL shares the cache across instances; the default is in-memory only
+const createCacheBackend = (): CacheBackend => {
+  if (typeof window === 'undefined' && process.env.CACHE_BACKEND === 'redis' && process.env.REDIS_URL) {
+    return new RedisCacheBackend(process.env.REDIS_URL)
+  }
+  return new MemoryCacheBackend()
+}
+
+export const cache = new TieredCache(
+  new LRUCache({
+    maxEntries: Number(process.env.CACHE_MAX_ENTRIES) || DEFAULT_CACHE_OPTIONS.maxEntries,
+    maxBytes: Number(process.env.CACHE_MAX_BYTES) || DEFAULT_CACHE_OPTIONS.maxBytes,
+  }),
+  createCacheBackend()
+)
+
+// Cache keys
+// Group-derived entries carry the group's version (src/lib/group-version.ts), which every
+// write to its expenses, participants or members bumps: a write makes the old entries
+// unreachable on every instance at once, and they age out through TTL and LRU eviction
+export const CACHE_KEYS = {
+  GROUPS: (userId: string) => `groups:${userId}`,
+  // Dashboard rows with member counts and the user's balance, alongside the plain group list
+  GROUP_SUMMARIES: (userId: string) => `groups:${userId}:summary`,
+  MEMBERSHIPS: (userId: string) => `memberships:${userId}`,
+  GROUP: (groupId: string) => `group:${groupId}`,
+  EXPENSES: (groupId: string, version: number) => `expenses:${groupId}:v${version}`,
+  BALANCES: (groupId: string, version: number) => `balances:${groupId}:v${version}`,
+  SETTLEMENTS: (groupId: string, version: number, mode: string) =>
+    `balances:${groupId}:v${version}:settlements:${mode}`,
+  // Day granularity keeps the plain key; week and month views are cached alongside it
+  ANALYTICS: (groupId: string, version: number, granularity: string = 'day') =>
+    granularity === 'day' ? `analytics:${groupId}:v${version}` : `analytics:${groupId}:v${version}:${granularity}`,
+} as const
+
+// Cache TTL constants (in milliseconds)
+export const CACHE_TTL = {
+  GROUPS: 2 * 60 * 1000, // 2 minutes
+  GROUP_SUMMARIES: 30 * 1000, // 30 seconds; balances in it move with every expense
+  MEMBERSHIPS: 60 * 1000, // 1 minute; changes also invalidate it straight away
+  GROUP: 5 * 60 * 1000, // 5 minutes
+  EXPENSES: 1 * 60 * 1000, // 1 minute
+  BALANCES: 30 * 1000, // 30 seconds
+  SETTLEMENTS: 30 * 1000, // 30 seconds, same as the balances they are derived from
+  ANALYTICS: 5 * 60 * 1000, // 5 minutes
+} as const
+
+// Drops cached group memberships, and the dashboard summaries listing them,
+// after a user joins, leaves or changes role
+export function invalidateMembershipCache(userIds: string[]): void {
+  cache.deleteMany(userIds.flatMap(userId => [
+    CACHE_KEYS.MEMBERSHIPS(userId),
+    CACHE_KEYS.GROUP_SUMMARIES(userId),
+  ]))
+}
+
+// Drops the dashboard summaries of users whose balances or groups just changed
+export function invalidateGroupSummaries(userIds: string[]): void {
+  cache.deleteMany(userIds.map(userId => CACHE_KEYS.GROUP_SUMMARIES(userId)))
+}
+
+// Expired entries are dropped lazily on read; this sweep just returns their memory sooner
+if (typeof window === 'undefined') {
+  setInterval(() => {
+    cache.cleanup()
+  }, 5 * 60 * 1000)
+}
@@ -0,0 +1,263 @@
+// Bounded in-memory LRU store: the per-instance tier of the response cache
+
+interface CacheEntry<T> {
+  data: T
+  timestamp: number
+  ttl: number // Time to live in milliseconds
+  staleTtl: number // Extra time an expired entry may still be served while it is refreshed
+  size: number // Approximate size in bytes
+}
+
+export interface CacheOptions {
+  maxEntries: number
+  maxBytes: number
+}
+
+export interface CachePrefixStats {
+  hits: number
+  misses: number
+  evictions: number // Entries dropped to stay within maxEntries/maxBytes
+  expirations: number // Entries dropped because their TTL passed
+  coalesced: number // Loads that joined a loader already in flight for the same key
+  staleServed: number // Expired values served while a background refresh ran
+}
+
+export interface GetOrLoadOptions {
+  staleWhileRevalidate?: number // Milliseconds past the TTL that a stale value may be served
+}
+
+export interface CacheStats {
+  entries: number
+  bytes: number
+  maxEntries: number
+  maxBytes: number
+  prefixes: Record<string, CachePrefixStats>
+}
+
+export const DEFAULT_CACHE_OPTIONS: CacheOptions = {
+  maxEntries: 5000,
+  maxBytes: 50 * 1024 * 1024, // 50 MB
+}
+
+// Stats are grouped by the part of the key before the first ':' (groups, group, balances, ...)
+const keyPrefix = (key: string): string => {
+  const index = key.indexOf(':')
+  return index === -1 ? key : key.slice(0, index)
+}
+
+// Rough UTF-16 size of the serialized value; good enough to keep memory bounded
+const estimateSize = (key: string, data: unknown): number => {
+  try {
+    return (key.length + (JSON.stringify(data)?.length ?? 0)) * 2
+  } catch {
+    return key.length * 2 + 1024
+  }
+}
+
+export class LRUCache {
+  // Map iteration order is insertion order, so the first key is always the least recently used
+  private cache = new Map<string, CacheEntry<any>>()
+  private bytes = 0
+  private stats = new Map<string, CachePrefixStats>()
+  private options: CacheOptions
+  private inflight = new Map<string, Promise<any>>()
+
+  constructor(options: Partial<CacheOptions> = {}) {
+    this.options = { ...DEFAULT_CACHE_OPTIONS, ...options }
+  }
+
+  set<T>(key: string, data: T, ttl: number = 5 * 60 * 1000, staleTtl: number = 0): void {
+    const size = estimateSize(key, data)
+
+    // A single value larger than the whole budget would just flush everything else
+    if (size > this.options.maxBytes) {
+      this.delete(key)
+      return
+    }
+
+    this.remove(key)
+    this.cache.set(key, {
+      data,
+      timestamp: Date.now(),
+      ttl,
+      staleTtl,
+      size
+    })
+    this.bytes += size
+
+    this.evict()
+  }
+
+  get<T>(key: string): T | null {
+    const entry = this.cache.get(key)
+    const stats = this.statsFor(key)
+    
+    if (!entry) {
+      stats.misses++
+      return null
+    }
+
+    // Check if entry has expired
+    if (this.isExpired(entry)) {
+      // Keep it around while it may still be served stale by getOrLoad
+      if (this.isDead(entry)) {
+        this.remove(key)
+        stats.expirations++
+      }
+      stats.misses++
+      return null
+    }
+
+    // Move to the most recently used position
+    this.cache.delete(key)
+    this.cache.set(key, entry)
+
+    stats.hits++
+    return entry.data
+  }
+
+  /**
+   * Returns the cached value for a key, running the loader on a miss.
+   * Concurrent misses for the same key share a single loader call.
+   * With staleWhileRevalidate, an expired value is returned immediately while
+   * one background load refreshes it.
+   *
+   * @param key - Cache key (see CACHE_KEYS)
+   * @param loader - Fetches a fresh value
+   * @param ttl - Time to live in milliseconds
+   * @param options - Stale-while-revalidate window
+   * @returns Promise<T> - Cached, stale or freshly loaded value
+   */
+  async getOrLoad<T>(
+    key: string,
+    loader: () => Promise<T>,
+    ttl: number,
+    options: GetOrLoadOptions = {}
+  ): Promise<T> {
+    const staleTtl = options.staleWhileRevalidate ?? 0
+    const entry = this.cache.get(key)
+    const stats = this.statsFor(key)
+
+    if (entry && !this.isExpired(entry)) {
+      return this.get<T>(key) as T
+    }
+
+    if (entry && !this.isDead(entry)) {
+      stats.staleServed++
+      // Refresh in the background; failures keep serving the stale value until it dies
+      this.load(key, loader, ttl, staleTtl).catch(error => {
+        console.error(`Background refresh failed for cache key ${key}:`, error)
+      })
+      return entry.data
+    }
+
+    stats.misses++
+    return this.load(key, loader, ttl, staleTtl)
+  }
+
+  // Whether a live (fresh or still-servable stale) entry exists, without touching stats or LRU order
+  has(key: string): boolean {
+    const entry = this.cache.get(key)
+    return entry !== undefined && !this.isDead(entry)
+  }
+
+  delete(key: string): void {
+    this.remove(key)
+    // A load started before the invalidation must not repopulate the key
+    this.inflight.delete(key)
+  }
+
+  clear(): void {
+    this.cache.clear()
+    this.inflight.clear()
+    this.bytes = 0
+  }
+
+  // Clear expired entries
+  cleanup(): void {
+    for (const [key, entry] of this.cache.entries()) {
+      if (this.isDead(entry)) {
+        this.remove(key)
+        this.statsFor(key).expirations++
+      }
+    }
+  }
+
+  getStats(): CacheStats {
+    return {
+      entries: this.cache.size,
+      bytes: this.bytes,
+      maxEntries: this.options.maxEntries,
+      maxBytes: this.options.maxBytes,
+      prefixes: Object.fromEntries(
+        Array.from(this.stats.entries()).map(([prefix, stats]) => [prefix, { ...stats }])
+      )
+    }
+  }
+
+  resetStats(): void {
+    this.stats.clear()
+  }
+
+  // Single-flight: at most one loader per key runs at a time
+  private load<T>(key: string, loader: () => Promise<T>, ttl: number, staleTtl: number): Promise<T> {
+    const pending = this.inflight.get(key)
+    if (pending) {
+      this.statsFor(key).coalesced++
+      return pending
+    }
+
+    const promise = loader()
+      .then(data => {
+        // Skip the write if the key was invalidated while loading
+        if (this.inflight.get(key) === promise) {
+          this.set(key, data, ttl, staleTtl)
+        }
+        return data
+      })
+      .finally(() => {
+        if (this.inflight.get(key) === promise) {
+          this.inflight.delete(key)
+        }
+      })
+
+    this.inflight.set(key, promise)
+    return promise
+  }
+
+  private isExpired(entry: CacheEntry<unknown>): boolean {
+    return Date.now() - entry.timestamp > entry.ttl
+  }
+
+  private isDead(entry: CacheEntry<unknown>): boolean {
+    return Date.now() - entry.timestamp > entry.ttl + entry.staleTtl
+  }
+
+  private remove(key: string): void {
+    const entry = this.cache.get(key)
+    if (entry) {
+      this.bytes -= entry.size
+      this.cache.delete(key)
+    }
+  }
+
+  // Drop least recently used entries until both limits are respected
+  private evict(): void {
+    while (this.cache.size > this.options.maxEntries || this.bytes > this.options.maxBytes) {
+      const oldestKey = this.cache.keys().next().value
+      if (oldestKey === undefined) break
+      this.remove(oldestKey)
+      this.statsFor(oldestKey).evictions++
+    }
+  }
+
+  private statsFor(key: string): CachePrefixStats {
+    const prefix = keyPrefix(key)
+    let stats = this.stats.get(prefix)
+    if (!stats) {
+      stats = { hits: 0, misses: 0, evictions: 0, expirations: 0, coalesced: 0, staleServed: 0 }
+      this.stats.set(prefix, stats)
+    }
+    return stats
+  }
+}
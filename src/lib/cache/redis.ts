@@ -0,0 +1,228 @@
+import { connect, type Socket } from 'node:net'
+import { randomUUID } from 'node:crypto'
+import type { CacheBackend } from './backend'
+
+// Minimal RESP2 client: just enough of the Redis protocol for GET/SET/DEL/PUBLISH/SUBSCRIBE.
+// Works against Redis, Valkey, KeyDB or any local stand-in that speaks RESP.
+
+type RespValue = string | number | null | RespValue[] | Error
+
+const CRLF = '\r\n'
+const INVALIDATION_CHANNEL = 'spliteasy:cache:invalidate'
+const KEY_NAMESPACE = 'spliteasy:cache:'
+const RECONNECT_DELAY_MS = 1000
+
+const encodeCommand = (args: string[]): string => {
+  let out = `*${args.length}${CRLF}`
+  for (const arg of args) {
+    out += `$${Buffer.byteLength(arg)}${CRLF}${arg}${CRLF}`
+  }
+  return out
+}
+
+// Parses one complete reply starting at offset; returns null if more bytes are needed
+const parseReply = (buffer: Buffer, offset: number): { value: RespValue; next: number } | null => {
+  const lineEnd = buffer.indexOf(CRLF, offset)
+  if (lineEnd === -1) return null
+
+  const type = String.fromCharCode(buffer[offset])
+  const line = buffer.toString('utf8', offset + 1, lineEnd)
+  const afterLine = lineEnd + 2
+
+  switch (type) {
+    case '+':
+      return { value: line, next: afterLine }
+    case '-':
+      return { value: new Error(line), next: afterLine }
+    case ':':
+      return { value: Number(line), next: afterLine }
+    case '$': {
+      const length = Number(line)
+      if (length === -1) return { value: null, next: afterLine }
+      if (buffer.length < afterLine + length + 2) return null
+      return { value: buffer.toString('utf8', afterLine, afterLine + length), next: afterLine + length + 2 }
+    }
+    case '*': {
+      const count = Number(line)
+      if (count === -1) return { value: null, next: afterLine }
+      const items: RespValue[] = []
+      let next = afterLine
+      for (let i = 0; i < count; i++) {
+        const item = parseReply(buffer, next)
+        if (!item) return null
+        items.push(item.value)
+        next = item.next
+      }
+      return { value: items, next }
+    }
+    default:
+      throw new Error(`Unexpected RESP type byte: ${type}`)
+  }
+}
+
+class RespConnection {
+  private socket: Socket | null = null
+  private buffer = Buffer.alloc(0)
+  private pending: Array<{ resolve: (value: RespValue) => void; reject: (error: Error) => void }> = []
+
+  constructor(
+    private url: URL,
+    // Receives replies that don't answer a command (pub/sub messages)
+    private onPush?: (value: RespValue) => void,
+    private onClose?: () => void
+  ) {}
+
+  command(args: string[]): Promise<RespValue> {
+    const socket = this.socket ?? this.open()
+    return new Promise((resolve, reject) => {
+      this.pending.push({ resolve, reject })
+      socket.write(encodeCommand(args))
+    })
+  }
+
+  // Sends a command whose replies arrive through onPush (SUBSCRIBE)
+  send(args: string[]): void {
+    const socket = this.socket ?? this.open()
+    socket.write(encodeCommand(args))
+  }
+
+  private open(): Socket {
+    const socket = connect(Number(this.url.port || 6379), this.url.hostname)
+    socket.setNoDelay(true)
+    this.socket = socket
+
+    socket.on('data', chunk => this.onData(chunk))
+    socket.on('error', error => this.fail(error))
+    socket.on('close', () => this.fail(new Error('Cache backend connection closed')))
+
+    // AUTH and SELECT are queued before any caller's command
+    if (this.url.password) {
+      const auth = this.url.username
+        ? ['AUTH', decodeURIComponent(this.url.username), decodeURIComponent(this.url.password)]
+        : ['AUTH', decodeURIComponent(this.url.password)]
+      this.pending.push({ resolve: () => {}, reject: () => {} })
+      socket.write(encodeCommand(auth))
+    }
+    const db = this.url.pathname.replace('/', '')
+    if (db) {
+      this.pending.push({ resolve: () => {}, reject: () => {} })
+      socket.write(encodeCommand(['SELECT', db]))
+    }
+
+    return socket
+  }
+
+  private onData(chunk: Buffer): void {
+    this.buffer = this.buffer.length === 0 ? chunk : Buffer.concat([this.buffer, chunk])
+
+    let offset = 0
+    for (;;) {
+      let reply
+      try {
+        reply = parseReply(this.buffer, offset)
+      } catch (error) {
+        this.fail(error as Error)
+        return
+      }
+      if (!reply) break
+      offset = reply.next
+
+      const waiter = this.pending.shift()
+      if (waiter) {
+        if (reply.value instanceof Error) waiter.reject(reply.value)
+        else waiter.resolve(reply.value)
+      } else {
+        this.onPush?.(reply.value)
+      }
+    }
+
+    this.buffer = this.buffer.subarray(offset)
+  }
+
+  private fail(error: Error): void {
+    if (!this.socket) return
+    this.socket.destroy()
+    this.socket = null
+    this.buffer = Buffer.alloc(0)
+    for (const waiter of this.pending.splice(0)) {
+      waiter.reject(error)
+    }
+    this.onClose?.()
+  }
+}
+
+/**
+ * Cache backend for a Redis-protocol server.
+ * Values are stored as JSON under a namespaced key with a PX expiry, and
+ * invalidations are broadcast on a pub/sub channel so every instance drops
+ * the same keys from its local store.
+ */
+export class RedisCacheBackend implements CacheBackend {
+  readonly name = 'redis'
+  readonly shared = true
+  // Lets an instance ignore its own invalidation messages
+  private readonly instanceId = randomUUID()
+  private readonly url: URL
+  private commands: RespConnection
+  private subscriber: RespConnection | null = null
+  private invalidationHandler: ((keys: string[]) => void) | null = null
+
+  constructor(url: string) {
+    this.url = new URL(url)
+    this.commands = new RespConnection(this.url)
+  }
+
+  async get<T>(key: string): Promise<T | null> {
+    const raw = await this.commands.command(['GET', KEY_NAMESPACE + key])
+    return typeof raw === 'string' ? (JSON.parse(raw) as T) : null
+  }
+
+  async set<T>(key: string, data: T, ttl: number): Promise<void> {
+    await this.commands.command(['SET', KEY_NAMESPACE + key, JSON.stringify(data), 'PX', String(Math.max(1, Math.round(ttl)))])
+  }
+
+  async delete(keys: string[]): Promise<void> {
+    if (keys.length === 0) return
+    await this.commands.command(['DEL', ...keys.map(key => KEY_NAMESPACE + key)])
+  }
+
+  async publishInvalidation(keys: string[]): Promise<void> {
+    if (keys.length === 0) return
+    const message = JSON.stringify({ origin: this.instanceId, keys })
+    await this.commands.command(['PUBLISH', INVALIDATION_CHANNEL, message])
+  }
+
+  subscribeInvalidations(handler: (keys: string[]) => void): void {
+    this.invalidationHandler = handler
+    this.connectSubscriber()
+  }
+
+  // Subscriber connections can only receive pushes, so they get their own socket
+  private connectSubscriber(): void {
+    this.subscriber = new RespConnection(
+      this.url,
+      value => this.onMessage(value),
+      () => {
+        // Invalidations published while disconnected are lost; entries then expire by TTL
+        console.error('Cache invalidation subscriber disconnected, reconnecting')
+        setTimeout(() => this.connectSubscriber(), RECONNECT_DELAY_MS)
+      }
+    )
+    this.subscriber.send(['SUBSCRIBE', INVALIDATION_CHANNEL])
+  }
+
+  private onMessage(value: RespValue): void {
+    if (!Array.isArray(value) || value[0] !== 'message' || value[1] !== INVALIDATION_CHANNEL) {
+      return
+    }
+
+    try {
+      const { origin, keys } = JSON.parse(String(value[2])) as { origin: string; keys: string[] }
+      if (origin !== this.instanceId && Array.isArray(keys)) {
+        this.invalidationHandler?.(keys)
+      }
+    } catch (error) {
+      console.error('Ignoring malformed cache invalidation message:', error)
+    }
+  }
+}
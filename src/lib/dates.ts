@@ -0,0 +1,14 @@
+// Calendar dates in query strings are plain YYYY-MM-DD values, read as UTC days.
+
+const DATE_REGEX = /^\d{4}-\d{2}-\d{2}$/
+
+/**
+ * Whether a value is a real YYYY-MM-DD date. Round-tripping through Date rejects
+ * values like 2025-02-30 that the format allows but Date.parse rolls over, and that
+ * Postgres would refuse to cast.
+ */
+export const isCalendarDate = (value: string): boolean => {
+  if (!DATE_REGEX.test(value)) return false
+  const parsed = new Date(`${value}T00:00:00Z`)
+  return !Number.isNaN(parsed.getTime()) && parsed.toISOString().slice(0, 10) === value
+}
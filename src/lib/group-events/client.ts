@@ -0,0 +1,76 @@
+'use client'
+
+import { useEffect, useRef } from 'react'
+import type { GroupEvent, GroupEventListener } from './types'
+
+export type { ExpenseDelta, GroupEvent } from './types'
+
+const EVENT_TYPES: GroupEvent['type'][] = ['expense', 'balance', 'resync']
+
+// One EventSource per group per tab, shared by every component showing that group
+const connections = new Map<string, { source: EventSource; listeners: Set<GroupEventListener> }>()
+
+const connect = (groupId: string): { source: EventSource; listeners: Set<GroupEventListener> } => {
+  const listeners = new Set<GroupEventListener>()
+  const source = new EventSource(`/api/groups/${groupId}/events`)
+  const dispatch = (event: GroupEvent) => {
+    for (const listener of listeners) {
+      listener(event)
+    }
+  }
+
+  let connectedBefore = false
+  source.addEventListener('ready', () => {
+    // Events sent while we were reconnecting are gone; have every reader catch up once
+    if (connectedBefore) {
+      dispatch({ type: 'resync' })
+    }
+    connectedBefore = true
+  })
+
+  for (const type of EVENT_TYPES) {
+    source.addEventListener(type, message => {
+      try {
+        dispatch(JSON.parse((message as MessageEvent<string>).data) as GroupEvent)
+      } catch (error) {
+        console.error('Malformed group event:', error)
+      }
+    })
+  }
+
+  return { source, listeners }
+}
+
+/**
+ * Subscribes to a group's change events for as long as the component is mounted.
+ * The latest `onEvent` is always used, so it doesn't need to be memoised.
+ *
+ * @param groupId - The UUID of the group, or null to stay disconnected
+ * @param onEvent - Called with each expense, balance or resync event
+ */
+export function useGroupEvents(groupId: string | null, onEvent: GroupEventListener): void {
+  const handler = useRef(onEvent)
+  handler.current = onEvent
+
+  useEffect(() => {
+    if (!groupId || typeof EventSource === 'undefined') {
+      return
+    }
+
+    let connection = connections.get(groupId)
+    if (!connection) {
+      connection = connect(groupId)
+      connections.set(groupId, connection)
+    }
+    const listener: GroupEventListener = event => handler.current(event)
+    connection.listeners.add(listener)
+
+    return () => {
+      connection.listeners.delete(listener)
+      if (connection.listeners.size === 0) {
+        connection.source.close()
+        connections.delete(groupId)
+      }
+    }
+  }, [groupId])
+}
@@ -0,0 +1,74 @@
+import { LocalGroupEventSource, type GroupEventSource } from './source'
+import { SupabaseGroupEventSource } from './supabase'
+import type { GroupEvent, GroupEventListener } from './types'
+
+export type { GroupEventSource } from './source'
+export type { ExpenseDelta, GroupEvent, GroupEventListener } from './types'
+export { toExpenseDelta } from './supabase'
+
+// Fans group events out to every SSE connection on this instance. Each group with at
+// least one open page holds a single upstream subscription, dropped with its last reader,
+// so N readers cost one Realtime channel rather than N polling loops.
+class GroupEventHub {
+  private readers = new Map<string, { listeners: Set<GroupEventListener>; unsubscribe: () => void }>()
+
+  constructor(private source: GroupEventSource) {}
+
+  get backendName(): string {
+    return this.source.name
+  }
+
+  get publishesLocally(): boolean {
+    return this.source.publishesLocally
+  }
+
+  get openGroups(): number {
+    return this.readers.size
+  }
+
+  subscribe(groupId: string, listener: GroupEventListener): () => void {
+    let group = this.readers.get(groupId)
+    if (!group) {
+      const listeners = new Set<GroupEventListener>()
+      group = {
+        listeners,
+        unsubscribe: this.source.subscribe(groupId, event => {
+          for (const reader of listeners) {
+            try {
+              reader(event)
+            } catch (error) {
+              console.error(`Group event listener failed for ${groupId}:`, error)
+            }
+          }
+        })
+      }
+      this.readers.set(groupId, group)
+    }
+    group.listeners.add(listener)
+
+    return () => {
+      const current = this.readers.get(groupId)
+      if (!current) return
+      current.listeners.delete(listener)
+      if (current.listeners.size === 0) {
+        this.readers.delete(groupId)
+        current.unsubscribe()
+      }
+    }
+  }
+
+  publish(groupId: string, events: GroupEvent[]): void {
+    this.source.publish(groupId, events)
+  }
+}
+
+// GROUP_EVENTS_BACKEND=local keeps events in-process; otherwise Realtime is used whenever
+// the service role key is available to join the private group topics
+const createGroupEventSource = (): GroupEventSource => {
+  if (process.env.GROUP_EVENTS_BACKEND !== 'local' && process.env.SUPABASE_SERVICE_ROLE_KEY) {
+    return new SupabaseGroupEventSource()
+  }
+  return new LocalGroupEventSource()
+}
+
+export const groupEvents = new GroupEventHub(createGroupEventSource())
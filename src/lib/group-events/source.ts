@@ -0,0 +1,46 @@
+import type { GroupEvent, GroupEventListener } from './types'
+
+// Where a server instance gets group events from. The hub holds at most one
+// subscription per group, however many browsers are watching it.
+
+export interface GroupEventSource {
+  readonly name: string
+  // Whether writes made through this app must publish their own events (see publishGroupEvents)
+  readonly publishesLocally: boolean
+  // Returns the unsubscribe function
+  subscribe(groupId: string, listener: GroupEventListener): () => void
+  publish(groupId: string, events: GroupEvent[]): void
+}
+
+// In-process source, used when Realtime isn't configured (local development, the
+// Supabase stand-in in testsprite_tests). Only writes made through this instance's
+// routes are seen, which is all a single test server needs.
+export class LocalGroupEventSource implements GroupEventSource {
+  readonly name = 'local'
+  readonly publishesLocally = true
+  private listeners = new Map<string, Set<GroupEventListener>>()
+
+  subscribe(groupId: string, listener: GroupEventListener): () => void {
+    let groupListeners = this.listeners.get(groupId)
+    if (!groupListeners) {
+      groupListeners = new Set()
+      this.listeners.set(groupId, groupListeners)
+    }
+    groupListeners.add(listener)
+
+    return () => {
+      groupListeners.delete(listener)
+      if (groupListeners.size === 0) {
+        this.listeners.delete(groupId)
+      }
+    }
+  }
+
+  publish(groupId: string, events: GroupEvent[]): void {
+    for (const listener of this.listeners.get(groupId) ?? []) {
+      for (const event of events) {
+        listener(event)
+      }
+    }
+  }
+}
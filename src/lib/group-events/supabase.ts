@@ -0,0 +1,82 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+import type { Database } from '@/types/database.types'
+import { getSupabaseAdminClient } from '@/lib/supabase/server'
+import type { GroupEventSource } from './source'
+import type { ExpenseDelta, GroupEvent, GroupEventListener } from './types'
+
+// Expense rows as the triggers and create_expense_with_participants return them
+export const toExpenseDelta = (row: any): ExpenseDelta | null =>
+  row
+    ? {
+        id: row.id,
+        groupId: row.group_id,
+        paidByUserId: row.paid_by_user_id,
+        amountCents: Number(row.amount_cents),
+        description: row.description,
+        category: row.category,
+        createdAt: row.created_at
+      }
+    : null
+
+// Broadcast payloads are built by the triggers in migration 014
+export const toGroupEvent = (event: string, payload: any): GroupEvent | null => {
+  switch (event) {
+    case 'expense':
+      return {
+        type: 'expense',
+        action: payload.action,
+        expense: toExpenseDelta(payload.expense),
+        previous: toExpenseDelta(payload.previous)
+      }
+    case 'balance':
+      // BIGINT ledger totals; Number() also covers int8 serialised as a string
+      return {
+        type: 'balance',
+        userId: payload.user_id,
+        balanceCents: Number(payload.paid_cents) - Number(payload.share_cents)
+      }
+    case 'resync':
+      return { type: 'resync' }
+    default:
+      return null
+  }
+}
+
+// Subscribes to the private `group:<id>` Realtime topics the database triggers broadcast on.
+// Needs the service role key, which is allowed to join any private topic.
+export class SupabaseGroupEventSource implements GroupEventSource {
+  readonly name = 'supabase'
+  readonly publishesLocally = false
+  private client: SupabaseClient<Database> | null = null
+
+  subscribe(groupId: string, listener: GroupEventListener): () => void {
+    this.client ??= getSupabaseAdminClient()
+    const client = this.client
+
+    const channel = client
+      .channel(`group:${groupId}`, { config: { private: true } })
+      .on('broadcast', { event: '*' }, message => {
+        const event = toGroupEvent(message.event, message.payload)
+        if (event) {
+          listener(event)
+        }
+      })
+      .subscribe((status, error) => {
+        if (status === 'SUBSCRIBED') {
+          // Anything broadcast while we were (re)joining is lost; have readers catch up
+          listener({ type: 'resync' })
+        } else if (status === 'CHANNEL_ERROR' || status === 'TIMED_OUT') {
+          console.error(`Group event subscription ${status.toLowerCase()} for ${groupId}:`, error)
+        }
+      })
+
+    return () => {
+      client.removeChannel(channel).catch(error => {
+        console.error(`Could not leave group event channel for ${groupId}:`, error)
+      })
+    }
+  }
+
+  // The database broadcasts every committed write itself
+  publish(): void {}
+}
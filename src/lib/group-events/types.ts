@@ -0,0 +1,24 @@
+import type { Cents } from '@/lib/money'
+
+// Deltas pushed to open group pages, one per change (see migration 014).
+// Shared by the server hub and the browser hook, so this file stays import-free at runtime.
+
+export interface ExpenseDelta {
+  id: string
+  groupId: string
+  paidByUserId: string
+  amountCents: Cents
+  description: string
+  category: string
+  createdAt: string
+}
+
+export type GroupEvent =
+  // The expense before and after the change: `previous` is null for inserts, `expense` for deletes
+  | { type: 'expense'; action: 'insert' | 'update' | 'delete'; expense: ExpenseDelta | null; previous: ExpenseDelta | null }
+  // A member's net balance after the change; absolute, so applying one twice is harmless
+  | { type: 'balance'; userId: string; balanceCents: Cents }
+  // Too much changed at once (an import, a missed stretch of events); refetch instead
+  | { type: 'resync' }
+
+export type GroupEventListener = (event: GroupEvent) => void
@@ -0,0 +1,64 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+import type { Database } from '@/types/database.types'
+import { NextResponse } from 'next/server'
+
+// Clients keep the body but must revalidate it with If-None-Match before reuse
+const REVALIDATE = 'private, no-cache'
+
+/**
+ * The group's current version (migration 015), bumped by every write to its expenses,
+ * participants or members. One primary-key lookup, so group reads check it before any
+ * aggregate runs: it is their ETag and part of their cache keys.
+ *
+ * @param supabase - Server client for the current request
+ * @param groupId - The UUID of the group
+ * @returns Promise<number | null> - The version, or null if the group doesn't exist or the caller isn't a member
+ * @throws Error - If the lookup fails
+ */
+export const getGroupVersion = async (
+  supabase: SupabaseClient<Database>,
+  groupId: string
+): Promise<number | null> => {
+  const { data, error } = await supabase.rpc('get_group_version', { p_group_id: groupId })
+
+  if (error) {
+    console.error('Error reading group version:', error)
+    throw new Error('Failed to read group version')
+  }
+
+  // BIGINT; Number() also covers drivers that return int8 as a string
+  return data === null || data === undefined ? null : Number(data)
+}
+
+/**
+ * Weak entity tag for a group-scoped response at a given version.
+ * Different URLs (fields, cursor, granularity) are different resources, so the
+ * version alone tells whether a previously returned body is still current.
+ */
+export const groupETag = (groupId: string, version: number): string => `W/"${groupId}:${version}"`
+
+/**
+ * Whether the request's If-None-Match already names this tag (weak comparison, so
+ * `W/` prefixes are ignored; `*` matches anything).
+ */
+export const isNotModified = (request: Request, etag: string): boolean => {
+  const header = request.headers.get('if-none-match')
+  if (!header) {
+    return false
+  }
+  if (header.trim() === '*') {
+    return true
+  }
+  const opaque = (tag: string) => tag.trim().replace(/^W\//, '')
+  return header.split(',').some(tag => opaque(tag) === opaque(etag))
+}
+
+// Headers for a 200 whose body is current as of the tagged version
+export const versionHeaders = (etag: string): Record<string, string> => ({
+  ETag: etag,
+  'Cache-Control': REVALIDATE
+})
+
+// Empty 304 telling the client its copy is still current
+export const notModified = (etag: string): NextResponse =>
+  new NextResponse(null, { status: 304, headers: versionHeaders(etag) })
@@ -0,0 +1,109 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+import type { Database } from '@/types/database.types'
+import { cache, CACHE_KEYS, CACHE_TTL, invalidateMembershipCache } from '@/lib/cache'
+import { getSupabaseAdminClient } from '@/lib/supabase/server'
+
+export type GroupRole = 'admin' | 'member'
+
+// groupId -> role for every group the user belongs to
+export type GroupMemberships = Record<string, GroupRole>
+
+/**
+ * All of a user's group memberships and roles, loaded in one query and cached per user.
+ * Group-scoped handlers check membership against this instead of querying
+ * group_members on every request. Entries are dropped when the membership changes
+ * (see subscribeToMembershipChanges) and expire after CACHE_TTL.MEMBERSHIPS regardless.
+ *
+ * @param supabase - Server client for the current request
+ * @param userId - The authenticated user's id
+ * @returns Promise<GroupMemberships> - Role per group id
+ * @throws Error - If the memberships can't be loaded
+ */
+export const getGroupMemberships = (
+  supabase: SupabaseClient<Database>,
+  userId: string
+): Promise<GroupMemberships> => {
+  return cache.getOrLoad(
+    CACHE_KEYS.MEMBERSHIPS(userId),
+    async () => {
+      const { data, error } = await supabase
+        .from('group_members')
+        .select('group_id, role')
+        .eq('user_id', userId)
+
+      if (error) {
+        console.error('Error loading group memberships:', error)
+        throw new Error('Failed to load group memberships')
+      }
+
+      const memberships: GroupMemberships = {}
+      for (const row of data || []) {
+        if (row.group_id) {
+          memberships[row.group_id] = row.role === 'admin' ? 'admin' : 'member'
+        }
+      }
+      return memberships
+    },
+    CACHE_TTL.MEMBERSHIPS
+  )
+}
+
+/**
+ * The user's role in a group, or null when they aren't a member.
+ *
+ * @param supabase - Server client for the current request
+ * @param userId - The authenticated user's id
+ * @param groupId - The UUID of the group
+ * @returns Promise<GroupRole | null>
+ * @throws Error - If the memberships can't be loaded
+ */
+export const getGroupRole = async (
+  supabase: SupabaseClient<Database>,
+  userId: string,
+  groupId: string
+): Promise<GroupRole | null> => {
+  const memberships = await getGroupMemberships(supabase, userId)
+  return memberships[groupId] ?? null
+}
+
+let membershipChannel: ReturnType<SupabaseClient<Database>['channel']> | null = null
+
+/**
+ * Listens for group_members changes over Supabase Realtime and drops the affected
+ * users' cached memberships. Called once per server process from instrumentation.
+ * Needs the service role key and migration 011, which publishes the table; without
+ * them cached memberships simply expire after CACHE_TTL.MEMBERSHIPS.
+ */
+export function subscribeToMembershipChanges(): void {
+  if (membershipChannel || !process.env.SUPABASE_SERVICE_ROLE_KEY) {
+    return
+  }
+
+  try {
+    membershipChannel = getSupabaseAdminClient()
+      .channel('group-members-changes')
+      .on(
+        'postgres_changes',
+        { event: '*', schema: 'public', table: 'group_members' },
+        payload => {
+          const userIds = new Set<string>()
+          for (const row of [payload.new, payload.old] as Array<{ user_id?: string } | null>) {
+            if (row?.user_id) {
+              userIds.add(row.user_id)
+            }
+          }
+          if (userIds.size > 0) {
+            invalidateMembershipCache([...userIds])
+          }
+        }
+      )
+      .subscribe((status, error) => {
+        if (status === 'CHANNEL_ERROR' || status === 'TIMED_OUT') {
+          console.error(`Membership change subscription ${status.toLowerCase()}:`, error)
+        }
+      })
+  } catch (error) {
+    membershipChannel = null
+    console.error('Could not subscribe to membership changes:', error)
+  }
+}
@@ -0,0 +1,63 @@
+// Process memory high-water marks for benchmarks (GET /api/admin/memory-stats).
+// Node only reports current usage, so the peaks come from sampling it on a timer;
+// the timer starts with the first measurement window and never keeps the process alive.
+
+export interface MemorySample {
+  rss: number
+  heapUsed: number
+  external: number
+  arrayBuffers: number
+}
+
+export interface MemoryStats {
+  current: MemorySample
+  peak: MemorySample
+  // When the current window started (ISO timestamp) and how many samples it holds
+  since: string
+  samples: number
+}
+
+const SAMPLE_INTERVAL_MS = 20
+
+const sample = (): MemorySample => {
+  const { rss, heapUsed, external, arrayBuffers } = process.memoryUsage()
+  return { rss, heapUsed, external, arrayBuffers }
+}
+
+class MemorySampler {
+  private peak = sample()
+  private since = new Date()
+  private samples = 1
+  private timer: ReturnType<typeof setInterval> | null = null
+
+  private record(): MemorySample {
+    const current = sample()
+    for (const key of Object.keys(current) as Array<keyof MemorySample>) {
+      this.peak[key] = Math.max(this.peak[key], current[key])
+    }
+    this.samples++
+    return current
+  }
+
+  private ensureStarted(): void {
+    if (this.timer) return
+    this.timer = setInterval(() => this.record(), SAMPLE_INTERVAL_MS)
+    this.timer.unref?.()
+  }
+
+  getStats(): MemoryStats {
+    this.ensureStarted()
+    const current = this.record()
+    return { current, peak: { ...this.peak }, since: this.since.toISOString(), samples: this.samples }
+  }
+
+  // Starts a new window whose peaks begin at the current usage
+  reset(): void {
+    this.ensureStarted()
+    this.peak = sample()
+    this.since = new Date()
+    this.samples = 1
+  }
+}
+
+export const memorySampler = new MemorySampler()
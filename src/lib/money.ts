@@ -0,0 +1,108 @@
+// Money is handled as integer cents everywhere amounts are added, compared or split.
+// Decimal amounts only appear at the edges: parsed once from user input, and divided
+// back out (`fromCents`) for display and for the `amount` fields API responses keep.
+// Cent counts stay exact in a JS number up to Number.MAX_SAFE_INTEGER, about 90 trillion.
+
+export type Cents = number
+
+// Optional sign, digits, and at most two decimal places
+const DECIMAL_AMOUNT_REGEX = /^([+-]?)(\d+)(?:\.(\d{0,2}))?$/
+
+/**
+ * Parses a user-supplied amount into cents without going through floating point.
+ * Strings must be plain decimals with at most two decimal places ("12", "12.5", "12.50");
+ * numbers must already be a whole number of cents (12.5 is fine, 12.345 is not).
+ *
+ * @param value - Amount in currency units, as a string or number
+ * @returns Cents | null - The amount in cents, or null when it isn't a valid amount
+ */
+export const parseCents = (value: unknown): Cents | null => {
+  if (typeof value === 'number') {
+    if (!Number.isFinite(value)) return null
+    const cents = Math.round(value * 100)
+    // 0.1 * 100 is 10.000000000000002; anything further off has sub-cent digits
+    return Math.abs(value * 100 - cents) < 1e-6 && Number.isSafeInteger(cents) ? cents : null
+  }
+
+  if (typeof value !== 'string') return null
+  const match = DECIMAL_AMOUNT_REGEX.exec(value.trim())
+  if (!match) return null
+
+  const [, sign, whole, fraction = ''] = match
+  const cents = Number(whole) * 100 + Number(fraction.padEnd(2, '0'))
+  if (!Number.isSafeInteger(cents)) return null
+  return sign === '-' ? -cents : cents
+}
+
+// Nearest cent for values that are already floats, e.g. a share typed into a number input
+export const toCents = (amount: number): Cents => Math.round(amount * 100)
+
+export const fromCents = (cents: Cents): number => cents / 100
+
+// "12.34" or "-0.05", exact for any safe integer
+export const formatCents = (cents: Cents): string => {
+  const sign = cents < 0 ? '-' : ''
+  const absolute = Math.abs(cents)
+  return `${sign}${Math.floor(absolute / 100)}.${String(absolute % 100).padStart(2, '0')}`
+}
+
+export const sumCents = (values: Iterable<Cents>): Cents => {
+  let total = 0
+  for (const value of values) {
+    total += value
+  }
+  return total
+}
+
+/**
+ * Splits a total in cents by weight so the parts add up to the total exactly.
+ * Each part gets the floor of its exact share; the cents left over go one each to
+ * the parts with the largest remainders, ties going to the earliest part. Only
+ * integer arithmetic is used, so the same inputs always give the same split;
+ * callers that need a stable assignment should pass participants in a stable order.
+ *
+ * @param total - Amount to split, in cents (non-negative)
+ * @param weights - Relative weight of each part (non-negative integers, not all zero)
+ * @returns Cents[] - One amount per weight, in the same order
+ * @throws RangeError - If the total or weights can't be split exactly
+ */
+export const allocateCents = (total: Cents, weights: number[]): Cents[] => {
+  const weightSum = sumCents(weights)
+  if (!Number.isSafeInteger(total) || total < 0) {
+    throw new RangeError('Total must be a non-negative whole number of cents')
+  }
+  if (weights.length === 0 || weights.some(weight => !Number.isSafeInteger(weight) || weight < 0) || weightSum <= 0) {
+    throw new RangeError('Weights must be non-negative integers and not all zero')
+  }
+  if (!Number.isSafeInteger(total * Math.max(...weights))) {
+    throw new RangeError('Total and weights are too large to split exactly')
+  }
+
+  const remainders = weights.map(weight => (total * weight) % weightSum)
+  const parts = weights.map((weight, index) => (total * weight - remainders[index]) / weightSum)
+  const order = remainders
+    .map((remainder, index) => ({ index, remainder }))
+    .sort((a, b) => b.remainder - a.remainder || a.index - b.index)
+
+  let remaining = total - sumCents(parts)
+  for (let i = 0; remaining > 0; i++, remaining--) {
+    parts[order[i].index] += 1
+  }
+  return parts
+}
+
+/**
+ * Splits a total in cents into equal parts, e.g. 1000 across 3 gives [334, 333, 333].
+ * The leftover cents go to the first parts.
+ *
+ * @param total - Amount to split, in cents (non-negative)
+ * @param count - Number of parts (at least 1)
+ * @returns Cents[] - `count` amounts adding up to `total`
+ * @throws RangeError - If the total or count can't be split
+ */
+export const splitCentsEvenly = (total: Cents, count: number): Cents[] => {
+  if (!Number.isInteger(count) || count < 1) {
+    throw new RangeError('Count must be a positive whole number')
+  }
+  return allocateCents(total, new Array(count).fill(1))
+}
@@ -0,0 +1,210 @@
+import { AsyncLocalStorage } from 'node:async_hooks'
+import * as Sentry from '@sentry/nextjs'
+
+// Per-request Supabase query statistics, switched on with SUPABASE_QUERY_STATS=true.
+// The server clients record every REST, RPC and auth call made while a request runs
+// inside withQueryStats; the summary goes out as a Server-Timing header, one JSON log
+// line and a Sentry span with a child span per query.
+
+export interface QueryRecord {
+  kind: 'rest' | 'rpc' | 'auth'
+  method: string
+  // Table name, RPC function name or auth endpoint
+  target: string
+  // Filtered columns with their operator, e.g. `group_id=eq`; values are left out
+  filters: string[]
+  rows: number | null
+  status: number
+  durationMs: number
+}
+
+export interface QueryStatsSummary {
+  name: string
+  queries: number
+  authCalls: number
+  rows: number
+  dbMs: number
+  totalMs: number
+  targets: Record<string, { calls: number; rows: number; durationMs: number }>
+}
+
+interface QueryStatsStore {
+  name: string
+  records: QueryRecord[]
+}
+
+// PostgREST parameters that shape the response rather than filter rows
+const NON_FILTER_PARAMS = new Set(['select', 'order', 'limit', 'offset', 'on_conflict', 'columns'])
+
+const storage = new AsyncLocalStorage<QueryStatsStore>()
+
+export function isQueryStatsEnabled(): boolean {
+  return process.env.SUPABASE_QUERY_STATS === 'true'
+}
+
+const round = (value: number) => Math.round(value * 10) / 10
+
+function describeRequest(url: URL, method: string): Pick<QueryRecord, 'kind' | 'method' | 'target' | 'filters'> {
+  const path = url.pathname
+  if (path.includes('/auth/v1/')) {
+    return { kind: 'auth', method, target: path.split('/auth/v1/')[1], filters: [] }
+  }
+
+  const filters: string[] = []
+  url.searchParams.forEach((value, key) => {
+    if (!NON_FILTER_PARAMS.has(key)) {
+      // `or`/`and` groups keep only their name; their contents carry values too
+      filters.push(key === 'or' || key === 'and' ? key : `${key}=${value.split('.')[0]}`)
+    }
+  })
+
+  const rest = path.split('/rest/v1/')[1] ?? path
+  if (rest.startsWith('rpc/')) {
+    return { kind: 'rpc', method, target: rest.slice(4), filters }
+  }
+  return { kind: 'rest', method, target: rest, filters }
+}
+
+// `0-24/*` is 25 rows and `*/0` none; PostgREST sends it on reads, RPC sets and returned writes
+function countRows(response: Response): number | null {
+  const range = response.headers.get('content-range')
+  if (!range) {
+    return null
+  }
+  const [span] = range.split('/')
+  if (span === '*') {
+    return 0
+  }
+  const [first, last] = span.split('-').map(Number)
+  return Number.isFinite(first) && Number.isFinite(last) ? last - first + 1 : null
+}
+
+/**
+ * Wraps fetch so every Supabase call made inside withQueryStats is timed and recorded.
+ * Calls made outside a measured request pass straight through.
+ *
+ * @param baseFetch - The fetch implementation to wrap
+ * @returns typeof fetch - A drop-in replacement for the Supabase client's `global.fetch`
+ */
+export function createQueryStatsFetch(baseFetch: typeof fetch = fetch): typeof fetch {
+  return async (input, init) => {
+    const store = storage.getStore()
+    if (!store) {
+      return baseFetch(input, init)
+    }
+
+    // Read the URL and method without building a Request, which would consume a streamed body
+    const url = typeof input === 'string' ? input : input instanceof URL ? input.href : input.url
+    const method = (init?.method ?? (input instanceof Request ? input.method : 'GET')).toUpperCase()
+    const description = describeRequest(new URL(url), method)
+
+    return Sentry.startSpan(
+      {
+        name: `${description.method} ${description.target}`,
+        op: `db.supabase.${description.kind}`,
+        attributes: { 'db.filters': description.filters.join(',') }
+      },
+      async span => {
+        const start = performance.now()
+        let status = 0
+        let rows: number | null = null
+        try {
+          const response = await baseFetch(input, init)
+          status = response.status
+          rows = countRows(response)
+          return response
+        } finally {
+          const durationMs = performance.now() - start
+          store.records.push({ ...description, rows, status, durationMs })
+          span.setAttributes({ 'http.response.status_code': status, 'db.rows': rows ?? undefined })
+        }
+      }
+    )
+  }
+}
+
+export function summarizeQueries(name: string, records: QueryRecord[], totalMs: number): QueryStatsSummary {
+  const targets: QueryStatsSummary['targets'] = {}
+  let rows = 0
+  let dbMs = 0
+  for (const record of records) {
+    const key = record.kind === 'rest' ? record.target : `${record.kind}:${record.target}`
+    const entry = (targets[key] ??= { calls: 0, rows: 0, durationMs: 0 })
+    entry.calls += 1
+    entry.rows += record.rows ?? 0
+    entry.durationMs = round(entry.durationMs + record.durationMs)
+    rows += record.rows ?? 0
+    dbMs += record.durationMs
+  }
+
+  return {
+    name,
+    queries: records.filter(record => record.kind !== 'auth').length,
+    authCalls: records.filter(record => record.kind === 'auth').length,
+    rows,
+    dbMs: round(dbMs),
+    totalMs: round(totalMs),
+    targets
+  }
+}
+
+// `db;dur=41.2;desc="queries=3 auth=1 rows=57"` plus one `db-<target>` entry per table or function
+export function formatServerTiming(summary: QueryStatsSummary): string {
+  const entries = [
+    `db;dur=${summary.dbMs};desc="queries=${summary.queries} auth=${summary.authCalls} rows=${summary.rows}"`
+  ]
+  for (const [target, entry] of Object.entries(summary.targets)) {
+    const token = target.replace(/[^A-Za-z0-9_-]/g, '-')
+    entries.push(`db-${token};dur=${entry.durationMs};desc="calls=${entry.calls} rows=${entry.rows}"`)
+  }
+  return entries.join(', ')
+}
+
+/**
+ * Runs one request (or any server work) with its Supabase calls measured.
+ * When SUPABASE_QUERY_STATS is off this is a plain call. When the result is a
+ * Response it gets a Server-Timing header.
+ *
+ * @param name - Label for the log line and Sentry span, e.g. `GET /api/expenses`
+ * @param work - The handler or loader to run
+ * @returns Promise<T> - Whatever work returns
+ */
+export async function withQueryStats<T>(name: string, work: () => Promise<T>): Promise<T> {
+  if (!isQueryStatsEnabled()) {
+    return work()
+  }
+
+  return Sentry.startSpan({ name, op: 'supabase.request' }, async span => {
+    const store: QueryStatsStore = { name, records: [] }
+    const start = performance.now()
+    const result = await storage.run(store, work)
+    const summary = summarizeQueries(name, store.records, performance.now() - start)
+
+    span.setAttributes({
+      'db.query_count': summary.queries,
+      'db.auth_calls': summary.authCalls,
+      'db.rows': summary.rows,
+      'db.duration_ms': summary.dbMs
+    })
+    console.log(JSON.stringify({ event: 'supabase.queries', ...summary }))
+
+    if (result instanceof Response) {
+      try {
+        result.headers.append('Server-Timing', formatServerTiming(summary))
+      } catch {
+        // Redirects and other immutable responses go out without the header
+      }
+    }
+    return result
+  })
+}
+
+/**
+ * Route handler wrapper for withQueryStats: `export const GET = withRouteQueryStats('GET /api/x', handler)`.
+ */
+export function withRouteQueryStats<Args extends unknown[]>(
+  name: string,
+  handler: (...args: Args) => Promise<Response>
+): (...args: Args) => Promise<Response> {
+  return (...args: Args) => withQueryStats(name, () => handler(...args))
+}
@@ -1,6 +1,9 @@
 import { createServerClient } from '@supabase/ssr'
-import { cookies } from 'next/headers'
+import { createClient, type SupabaseClient, type UserResponse } from '@supabase/supabase-js'
+import { cookies, headers } from 'next/headers'
 import type { Database } from '@/types/database.types'
+import { decodeVerifiedUser, VERIFIED_USER_HEADER } from './session'
+import { createQueryStatsFetch, isQueryStatsEnabled } from './query-stats'
 
 export async function getSupabaseServerClient() {
   const cookieStore = await cookies()
@@ -32,6 +35,44 @@ export async function getSupabaseServerClient() {
           }
         },
       },
+      // Every query made through this client is counted and timed when SUPABASE_QUERY_STATS=true
+      global: queryStatsGlobalOptions(),
+    }
+  )
+}
+
+function queryStatsGlobalOptions(): { fetch?: typeof fetch } {
+  return isQueryStatsEnabled() ? { fetch: createQueryStatsFetch() } : {}
+}
+
+/**
+ * The current user, as already verified by the middleware for this request.
+ * Drop-in for `supabase.auth.getUser()`; falls back to it when the middleware
+ * didn't run or couldn't verify the token locally.
+ *
+ * @param supabase - Server client for the current request, used for the fallback
+ * @returns Promise<UserResponse> - Same shape as `auth.getUser()`
+ */
+export async function getVerifiedUser(supabase: SupabaseClient<Database>): Promise<UserResponse> {
+  const headerStore = await headers()
+  const user = decodeVerifiedUser(headerStore.get(VERIFIED_USER_HEADER))
+  if (user) {
+    return { data: { user }, error: null }
+  }
+  return supabase.auth.getUser()
+}
+
+// Service-role client for trusted server-side jobs (bypasses RLS, never expose to the browser)
+export function getSupabaseAdminClient() {
+  return createClient<Database>(
+    process.env.NEXT_PUBLIC_SUPABASE_URL!,
+    process.env.SUPABASE_SERVICE_ROLE_KEY!,
+    {
+      auth: {
+        persistSession: false,
+        autoRefreshToken: false,
+      },
+      global: queryStatsGlobalOptions(),
     }
   )
 }
@@ -0,0 +1,237 @@
+import type { User } from '@supabase/supabase-js'
+
+// Local verification of Supabase access tokens, shared by the middleware (Edge
+// runtime) and server code. Only Web Crypto is used so it runs in both.
+//
+// HS256 tokens are checked against SUPABASE_JWT_SECRET; ES256/RS256 tokens against
+// the project's published signing keys. A token that can't be checked locally is
+// reported as unverified and the caller falls back to `auth.getUser()`.
+//
+// Local checks can't see a sign-out or a deleted user until the token expires;
+// access tokens are short-lived, which is the trade-off Supabase documents for it.
+
+// Request header the middleware sets for handlers; any client-supplied value is dropped
+export const VERIFIED_USER_HEADER = 'x-spliteasy-verified-user'
+
+const SESSION_CACHE_TTL = 60 * 1000 // 1 minute, or the token's expiry if sooner
+const SESSION_CACHE_MAX_ENTRIES = 1000
+const JWKS_TTL = 10 * 60 * 1000 // 10 minutes
+const JWKS_MIN_REFRESH_INTERVAL = 30 * 1000 // unknown key ids refetch at most this often
+
+interface CachedSession {
+  user: User
+  expiresAt: number
+}
+
+interface JwtHeader {
+  alg?: string
+  kid?: string
+}
+
+interface JwtClaims {
+  sub?: string
+  exp?: number
+  aud?: string | string[]
+  role?: string
+  email?: string
+  phone?: string
+  app_metadata?: Record<string, any>
+  user_metadata?: Record<string, any>
+  is_anonymous?: boolean
+}
+
+// Keyed by the token's SHA-256 so tokens themselves are never held in memory longer than the request
+const verifiedSessions = new Map<string, CachedSession>()
+
+let jwks: { keys: JsonWebKey[]; fetchedAt: number } | null = null
+const importedKeys = new Map<string, CryptoKey>()
+
+const encoder = new TextEncoder()
+
+function base64UrlDecode(value: string): Uint8Array {
+  const base64 = value.replace(/-/g, '+').replace(/_/g, '/').padEnd(Math.ceil(value.length / 4) * 4, '=')
+  const binary = atob(base64)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i)
+  }
+  return bytes
+}
+
+function decodeSegment<T>(segment: string): T {
+  return JSON.parse(new TextDecoder().decode(base64UrlDecode(segment))) as T
+}
+
+async function hashToken(token: string): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', encoder.encode(token))
+  return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('')
+}
+
+async function fetchJwks(force: boolean): Promise<JsonWebKey[]> {
+  const now = Date.now()
+  const age = jwks ? now - jwks.fetchedAt : Infinity
+  if (jwks && (age < JWKS_MIN_REFRESH_INTERVAL || (!force && age < JWKS_TTL))) {
+    return jwks.keys
+  }
+
+  const response = await fetch(`${process.env.NEXT_PUBLIC_SUPABASE_URL}/auth/v1/.well-known/jwks.json`)
+  if (!response.ok) {
+    throw new Error(`Failed to fetch signing keys: ${response.status}`)
+  }
+  const { keys } = await response.json() as { keys: JsonWebKey[] }
+  jwks = { keys: keys || [], fetchedAt: now }
+  importedKeys.clear()
+  return jwks.keys
+}
+
+async function getVerificationKey(header: JwtHeader): Promise<{ key: CryptoKey; algorithm: AlgorithmIdentifier | EcdsaParams } | null> {
+  if (header.alg === 'HS256') {
+    const secret = process.env.SUPABASE_JWT_SECRET
+    if (!secret) {
+      return null
+    }
+    const cacheKey = 'HS256'
+    let key = importedKeys.get(cacheKey)
+    if (!key) {
+      key = await crypto.subtle.importKey('raw', encoder.encode(secret), { name: 'HMAC', hash: 'SHA-256' }, false, ['verify'])
+      importedKeys.set(cacheKey, key)
+    }
+    return { key, algorithm: 'HMAC' }
+  }
+
+  if (header.alg !== 'ES256' && header.alg !== 'RS256') {
+    return null
+  }
+
+  const cacheKey = `${header.alg}:${header.kid}`
+  const imported = importedKeys.get(cacheKey)
+  const algorithm = header.alg === 'ES256'
+    ? { name: 'ECDSA', hash: 'SHA-256' }
+    : { name: 'RSASSA-PKCS1-v1_5' }
+  if (imported) {
+    return { key: imported, algorithm }
+  }
+
+  let jwk = (await fetchJwks(false)).find(candidate => (candidate as { kid?: string }).kid === header.kid)
+  if (!jwk) {
+    // Keys rotate; look once more before giving up on this kid
+    jwk = (await fetchJwks(true)).find(candidate => (candidate as { kid?: string }).kid === header.kid)
+  }
+  if (!jwk) {
+    return null
+  }
+
+  const key = await crypto.subtle.importKey(
+    'jwk',
+    jwk,
+    header.alg === 'ES256' ? { name: 'ECDSA', namedCurve: 'P-256' } : { name: 'RSASSA-PKCS1-v1_5', hash: 'SHA-256' },
+    false,
+    ['verify']
+  )
+  importedKeys.set(cacheKey, key)
+  return { key, algorithm }
+}
+
+function userFromClaims(claims: JwtClaims): User {
+  // The fields handlers read; the rest of the User record needs a round trip to the auth server
+  return {
+    id: claims.sub!,
+    aud: Array.isArray(claims.aud) ? claims.aud[0] : claims.aud ?? 'authenticated',
+    role: claims.role,
+    email: claims.email,
+    phone: claims.phone,
+    app_metadata: claims.app_metadata ?? {},
+    user_metadata: claims.user_metadata ?? {},
+    is_anonymous: claims.is_anonymous,
+    created_at: ''
+  } as User
+}
+
+function rememberSession(tokenHash: string, session: CachedSession): void {
+  if (verifiedSessions.size >= SESSION_CACHE_MAX_ENTRIES) {
+    const now = Date.now()
+    for (const [hash, cached] of verifiedSessions) {
+      if (cached.expiresAt <= now) {
+        verifiedSessions.delete(hash)
+      }
+    }
+    // Still full: drop the oldest insertion
+    if (verifiedSessions.size >= SESSION_CACHE_MAX_ENTRIES) {
+      verifiedSessions.delete(verifiedSessions.keys().next().value!)
+    }
+  }
+  verifiedSessions.set(tokenHash, session)
+}
+
+/**
+ * Verifies a Supabase access token without calling the auth server.
+ * Results are cached briefly by token hash, so repeat requests with the same
+ * session skip the signature check too.
+ *
+ * @param accessToken - The session's access token
+ * @returns Promise<User | null> - The token's user, or null when it can't be verified locally
+ */
+export async function verifyAccessToken(accessToken: string): Promise<User | null> {
+  const tokenHash = await hashToken(accessToken)
+  const now = Date.now()
+
+  const cached = verifiedSessions.get(tokenHash)
+  if (cached) {
+    if (cached.expiresAt > now) {
+      return cached.user
+    }
+    verifiedSessions.delete(tokenHash)
+  }
+
+  const [headerSegment, payloadSegment, signatureSegment] = accessToken.split('.')
+  if (!headerSegment || !payloadSegment || !signatureSegment) {
+    return null
+  }
+
+  try {
+    const header = decodeSegment<JwtHeader>(headerSegment)
+    const verification = await getVerificationKey(header)
+    if (!verification) {
+      return null
+    }
+
+    const valid = await crypto.subtle.verify(
+      verification.algorithm,
+      verification.key,
+      base64UrlDecode(signatureSegment),
+      encoder.encode(`${headerSegment}.${payloadSegment}`)
+    )
+    if (!valid) {
+      return null
+    }
+
+    const claims = decodeSegment<JwtClaims>(payloadSegment)
+    const audience = Array.isArray(claims.aud) ? claims.aud : [claims.aud]
+    if (!claims.sub || !claims.exp || claims.exp * 1000 <= now || claims.role !== 'authenticated' || !audience.includes('authenticated')) {
+      return null
+    }
+
+    const user = userFromClaims(claims)
+    rememberSession(tokenHash, { user, expiresAt: Math.min(claims.exp * 1000, now + SESSION_CACHE_TTL) })
+    return user
+  } catch (error) {
+    console.error('Local access token verification failed:', error)
+    return null
+  }
+}
+
+// Header values must be ASCII, and user metadata may not be
+export function encodeVerifiedUser(user: User): string {
+  return encodeURIComponent(JSON.stringify(user))
+}
+
+export function decodeVerifiedUser(value: string | null): User | null {
+  if (!value) {
+    return null
+  }
+  try {
+    return JSON.parse(decodeURIComponent(value)) as User
+  } catch {
+    return null
+  }
+}
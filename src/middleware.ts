@@ -1,5 +1,7 @@
 import { createServerClient } from '@supabase/ssr'
 import { NextResponse, type NextRequest } from 'next/server'
+import type { User } from '@supabase/supabase-js'
+import { encodeVerifiedUser, verifyAccessToken, VERIFIED_USER_HEADER } from '@/lib/supabase/session'
 
 export async function middleware(request: NextRequest) {
   let supabaseResponse = NextResponse.next({
@@ -52,10 +54,16 @@ export async function middleware(request: NextRequest) {
     }
   )
 
-  // Refresh session if expired - required for Server Components
+  // Refresh session if expired - required for Server Components.
+  // A current access token is verified locally; only tokens that can't be go to the auth server.
   const {
-    data: { user },
-  } = await supabase.auth.getUser()
+    data: { session },
+  } = await supabase.auth.getSession()
+
+  let user: User | null = session ? await verifyAccessToken(session.access_token) : null
+  if (session && !user) {
+    ({ data: { user } } = await supabase.auth.getUser())
+  }
 
   // Protected routes
   const protectedRoutes = ['/dashboard']
@@ -81,7 +89,19 @@ export async function middleware(request: NextRequest) {
     return NextResponse.redirect(new URL('/dashboard', request.url))
   }
 
-  return supabaseResponse
+  // Hand the verified user to handlers so they don't authenticate again.
+  // Always rewritten here, so a client can't supply its own.
+  const requestHeaders = new Headers(request.headers)
+  requestHeaders.delete(VERIFIED_USER_HEADER)
+  if (user) {
+    requestHeaders.set(VERIFIED_USER_HEADER, encodeVerifiedUser(user))
+  }
+  const response = NextResponse.next({
+    request: { headers: requestHeaders },
+  })
+  supabaseResponse.cookies.getAll().forEach(cookie => response.cookies.set(cookie))
+
+  return response
 }
 
 export const config = {
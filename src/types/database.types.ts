@@ -15,18 +15,21 @@ export interface Database {
           name: string
           created_by: string
           created_at: string
+          version: number
         }
         Insert: {
           id?: string
           name: string
           created_by: string
           created_at?: string
+          version?: number
         }
         Update: {
           id?: string
           name?: string
           created_by?: string
           created_at?: string
+          version?: number
         }
         Relationships: [
           {
@@ -44,7 +47,10 @@ export interface Database {
           group_id: string
           paid_by_user_id: string
           amount: number
+          amount_cents: number
           description: string
+          category: string | null
+          search_text: string
           created_at: string
         }
         Insert: {
@@ -53,6 +59,7 @@ export interface Database {
           paid_by_user_id: string
           amount: number
           description: string
+          category?: string | null
           created_at?: string
         }
         Update: {
@@ -61,6 +68,7 @@ export interface Database {
           paid_by_user_id?: string
           amount?: number
           description?: string
+          category?: string | null
           created_at?: string
         }
         Relationships: [
@@ -125,6 +133,7 @@ export interface Database {
           expense_id: string
           user_id: string
           share_amount: number
+          share_cents: number
         }
         Insert: {
           id?: string
@@ -155,6 +164,113 @@ export interface Database {
           }
         ]
       }
+      group_member_balances: {
+        Row: {
+          group_id: string
+          user_id: string
+          paid_cents: number
+          share_cents: number
+          updated_at: string
+        }
+        Insert: {
+          group_id: string
+          user_id: string
+          paid_cents?: number
+          share_cents?: number
+          updated_at?: string
+        }
+        Update: {
+          group_id?: string
+          user_id?: string
+          paid_cents?: number
+          share_cents?: number
+          updated_at?: string
+        }
+        Relationships: [
+          {
+            foreignKeyName: "group_member_balances_group_id_fkey"
+            columns: ["group_id"]
+            isOneToOne: false
+            referencedRelation: "groups"
+            referencedColumns: ["id"]
+          },
+          {
+            foreignKeyName: "group_member_balances_user_id_fkey"
+            columns: ["user_id"]
+            isOneToOne: false
+            referencedRelation: "users"
+            referencedColumns: ["id"]
+          }
+        ]
+      }
+      group_daily_spending: {
+        Row: {
+          group_id: string
+          day: string
+          total_cents: number
+          expense_count: number
+        }
+        Insert: {
+          group_id: string
+          day: string
+          total_cents?: number
+          expense_count?: number
+        }
+        Update: {
+          group_id?: string
+          day?: string
+          total_cents?: number
+          expense_count?: number
+        }
+        Relationships: [
+          {
+            foreignKeyName: "group_daily_spending_group_id_fkey"
+            columns: ["group_id"]
+            isOneToOne: false
+            referencedRelation: "groups"
+            referencedColumns: ["id"]
+          }
+        ]
+      }
+      group_payer_daily_spending: {
+        Row: {
+          group_id: string
+          user_id: string
+          day: string
+          total_cents: number
+          expense_count: number
+        }
+        Insert: {
+          group_id: string
+          user_id: string
+          day: string
+          total_cents?: number
+          expense_count?: number
+        }
+        Update: {
+          group_id?: string
+          user_id?: string
+          day?: string
+          total_cents?: number
+          expense_count?: number
+        }
+        Relationships: [
+          {
+            foreignKeyName: "group_payer_daily_spending_group_id_fkey"
+            columns: ["group_id"]
+            isOneToOne: false
+            referencedRelation: "groups"
+            referencedColumns: ["id"]
+          },
+          {
+            foreignKeyName: "group_payer_daily_spending_user_id_fkey"
+            columns: ["user_id"]
+            isOneToOne: false
+            referencedRelation: "users"
+            referencedColumns: ["id"]
+          }
+        ]
+      }
       profiles: {
         Row: {
           id: string
@@ -181,7 +297,122 @@ export interface Database {
       [_ in never]: never
     }
     Functions: {
-      [_ in never]: never
+      bump_group_versions: {
+        Args: {
+          p_group_ids: string[]
+        }
+        Returns: undefined
+      }
+      create_expense_with_participants: {
+        Args: {
+          p_group_id: string
+          p_amount_cents: number
+          p_description: string
+          p_category?: string
+          p_participants?: Json
+        }
+        Returns: Database["public"]["Tables"]["expenses"]["Row"]
+      }
+      get_dashboard_summary: {
+        Args: Record<PropertyKey, never>
+        Returns: {
+          id: string
+          name: string
+          created_by: string
+          created_at: string
+          role: string | null
+          member_count: number
+          expense_count: number
+          total_spent_cents: number
+          last_activity_at: string
+          net_balance_cents: number
+        }[]
+      }
+      get_group_balances: {
+        Args: {
+          p_group_id: string
+        }
+        Returns: {
+          user_id: string
+          full_name: string | null
+          avatar_url: string | null
+          paid_cents: number
+          share_cents: number
+          balance_cents: number
+        }[]
+      }
+      get_group_version: {
+        Args: {
+          p_group_id: string
+        }
+        Returns: number | null
+      }
+      get_group_spending_trend: {
+        Args: {
+          p_group_id: string
+          p_from?: string | null
+          p_to?: string | null
+          p_granularity?: string
+        }
+        Returns: {
+          period: string
+          total_cents: number
+          expense_count: number
+        }[]
+      }
+      get_group_top_spenders: {
+        Args: {
+          p_group_id: string
+          p_from?: string | null
+          p_to?: string | null
+          p_limit?: number
+        }
+        Returns: {
+          user_id: string
+          full_name: string | null
+          total_cents: number
+          expense_count: number
+        }[]
+      }
+      import_expenses: {
+        Args: {
+          p_rows: Json
+        }
+        Returns: {
+          row_number: number
+          expense_id: string
+        }[]
+      }
+      is_group_admin: {
+        Args: {
+          p_group_id: string
+        }
+        Returns: boolean
+      }
+      is_group_member: {
+        Args: {
+          p_group_id: string
+        }
+        Returns: boolean
+      }
+      reconcile_group_member_balances: {
+        Args: {
+          p_group_id?: string | null
+          p_repair?: boolean
+        }
+        Returns: {
+          group_id: string
+          user_id: string
+          ledger_paid_cents: number
+          actual_paid_cents: number
+          ledger_share_cents: number
+          actual_share_cents: number
+        }[]
+      }
+      user_group_ids: {
+        Args: Record<PropertyKey, never>
+        Returns: string[]
+      }
     }
     Enums: {
       [_ in never]: never
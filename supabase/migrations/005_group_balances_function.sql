@@ -0,0 +1,50 @@
+-- Migration: Set-based balance engine
+-- Computes paid and share totals for every member of a group in a single query,
+-- replacing the per-member expense/participant lookups done by the balances route
+
+-- Composite indexes so both aggregates can be answered from the group's rows only
+CREATE INDEX IF NOT EXISTS idx_expenses_group_id_paid_by ON public.expenses(group_id, paid_by_user_id);
+CREATE INDEX IF NOT EXISTS idx_expense_participants_expense_id_user_id ON public.expense_participants(expense_id, user_id);
+
+-- Net balance per group member (positive means they are owed money, negative means they owe money)
+-- Runs as the caller so the existing RLS policies still apply
+CREATE OR REPLACE FUNCTION public.get_group_balances(p_group_id UUID)
+RETURNS TABLE (
+  user_id UUID,
+  full_name TEXT,
+  avatar_url TEXT,
+  total_paid NUMERIC,
+  total_share NUMERIC,
+  balance NUMERIC
+) LANGUAGE sql STABLE AS $$
+  WITH paid AS (
+    SELECT e.paid_by_user_id AS user_id, SUM(e.amount) AS total
+    FROM public.expenses e
+    WHERE e.group_id = p_group_id
+    GROUP BY e.paid_by_user_id
+  ),
+  shares AS (
+    SELECT ep.user_id, SUM(ep.share_amount) AS total
+    FROM public.expense_participants ep
+    JOIN public.expenses e ON e.id = ep.expense_id
+    WHERE e.group_id = p_group_id
+    GROUP BY ep.user_id
+  )
+  SELECT
+    gm.user_id,
+    p.full_name,
+    p.avatar_url,
+    COALESCE(paid.total, 0) AS total_paid,
+    COALESCE(shares.total, 0) AS total_share,
+    COALESCE(paid.total, 0) - COALESCE(shares.total, 0) AS balance
+  FROM public.group_members gm
+  JOIN public.profiles p ON p.id = gm.user_id
+  LEFT JOIN paid ON paid.user_id = gm.user_id
+  LEFT JOIN shares ON shares.user_id = gm.user_id
+  WHERE gm.group_id = p_group_id
+  ORDER BY balance DESC;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.get_group_balances(UUID) TO authenticated;
+
+COMMENT ON FUNCTION public.get_group_balances(UUID) IS 'Per-member paid, share and net balance totals for a group, computed in one pass';
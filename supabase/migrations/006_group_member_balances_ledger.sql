@@ -0,0 +1,234 @@
+-- Migration: Materialized per-member balance ledger
+-- Keeps running paid/share totals per (group, member) up to date on every expense write,
+-- so balance reads no longer scan the group's full expense history
+
+CREATE TABLE IF NOT EXISTS public.group_member_balances (
+    group_id UUID REFERENCES public.groups(id) ON DELETE CASCADE,
+    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
+    total_paid DECIMAL(12,2) NOT NULL DEFAULT 0,
+    total_share DECIMAL(12,2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (group_id, user_id)
+);
+
+ALTER TABLE public.group_member_balances ENABLE ROW LEVEL SECURITY;
+
+-- Read-only for members; rows are only written by the triggers below
+CREATE POLICY "Users can view balances of their groups" ON public.group_member_balances
+    FOR SELECT TO authenticated
+    USING (
+        group_id IN (
+            SELECT group_id FROM public.group_members WHERE user_id = auth.uid()
+        )
+    );
+
+GRANT SELECT ON public.group_member_balances TO authenticated;
+
+-- Apply a delta to one member's running totals
+CREATE OR REPLACE FUNCTION public.apply_member_balance_delta(
+  p_group_id UUID,
+  p_user_id UUID,
+  p_paid_delta NUMERIC,
+  p_share_delta NUMERIC
+)
+RETURNS void LANGUAGE sql SECURITY DEFINER SET search_path = public AS $$
+  INSERT INTO public.group_member_balances (group_id, user_id, total_paid, total_share)
+  VALUES (p_group_id, p_user_id, p_paid_delta, p_share_delta)
+  ON CONFLICT (group_id, user_id) DO UPDATE
+  SET total_paid = group_member_balances.total_paid + EXCLUDED.total_paid,
+      total_share = group_member_balances.total_share + EXCLUDED.total_share,
+      updated_at = NOW();
+$$;
+
+-- Payer side: expenses insert/update/delete
+CREATE OR REPLACE FUNCTION public.sync_expense_balances()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+  participant RECORD;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.apply_member_balance_delta(OLD.group_id, OLD.paid_by_user_id, -OLD.amount, 0);
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.apply_member_balance_delta(NEW.group_id, NEW.paid_by_user_id, NEW.amount, 0);
+  END IF;
+
+  -- Shares follow their expense: moved when it changes group, removed when it is deleted.
+  -- Cascaded participant deletes can no longer see the expense, so they are handled here.
+  IF (TG_OP = 'UPDATE' AND NEW.group_id IS DISTINCT FROM OLD.group_id) OR TG_OP = 'DELETE' THEN
+    FOR participant IN
+      SELECT user_id, share_amount FROM public.expense_participants WHERE expense_id = OLD.id
+    LOOP
+      PERFORM public.apply_member_balance_delta(OLD.group_id, participant.user_id, 0, -participant.share_amount);
+      IF TG_OP = 'UPDATE' THEN
+        PERFORM public.apply_member_balance_delta(NEW.group_id, participant.user_id, 0, participant.share_amount);
+      END IF;
+    END LOOP;
+  END IF;
+
+  -- Returning OLD lets the BEFORE DELETE trigger proceed; AFTER triggers ignore it
+  RETURN COALESCE(NEW, OLD);
+END;
+$$;
+
+-- Participant side: expense_participants insert/update/delete
+CREATE OR REPLACE FUNCTION public.sync_participant_balances()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+  old_group_id UUID;
+  new_group_id UUID;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    SELECT group_id INTO old_group_id FROM public.expenses WHERE id = OLD.expense_id;
+    -- NULL when the parent expense is being deleted; sync_expense_balances already did it
+    IF old_group_id IS NOT NULL THEN
+      PERFORM public.apply_member_balance_delta(old_group_id, OLD.user_id, 0, -OLD.share_amount);
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    SELECT group_id INTO new_group_id FROM public.expenses WHERE id = NEW.expense_id;
+    PERFORM public.apply_member_balance_delta(new_group_id, NEW.user_id, 0, NEW.share_amount);
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+-- BEFORE DELETE so the expense's participants are still visible when its shares are removed
+DROP TRIGGER IF EXISTS expenses_sync_balances_delete ON public.expenses;
+CREATE TRIGGER expenses_sync_balances_delete
+  BEFORE DELETE ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.sync_expense_balances();
+
+DROP TRIGGER IF EXISTS expenses_sync_balances ON public.expenses;
+CREATE TRIGGER expenses_sync_balances
+  AFTER INSERT OR UPDATE OF group_id, paid_by_user_id, amount ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.sync_expense_balances();
+
+DROP TRIGGER IF EXISTS expense_participants_sync_balances ON public.expense_participants;
+CREATE TRIGGER expense_participants_sync_balances
+  AFTER INSERT OR UPDATE OF expense_id, user_id, share_amount OR DELETE ON public.expense_participants
+  FOR EACH ROW EXECUTE FUNCTION public.sync_participant_balances();
+
+-- Totals recomputed from scratch from expenses and expense_participants
+CREATE OR REPLACE FUNCTION public.compute_member_balances_from_scratch(p_group_id UUID DEFAULT NULL)
+RETURNS TABLE (
+  group_id UUID,
+  user_id UUID,
+  total_paid NUMERIC,
+  total_share NUMERIC
+) LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  WITH paid AS (
+    SELECT e.group_id, e.paid_by_user_id AS user_id, SUM(e.amount) AS total
+    FROM public.expenses e
+    WHERE p_group_id IS NULL OR e.group_id = p_group_id
+    GROUP BY e.group_id, e.paid_by_user_id
+  ),
+  shares AS (
+    SELECT e.group_id, ep.user_id, SUM(ep.share_amount) AS total
+    FROM public.expense_participants ep
+    JOIN public.expenses e ON e.id = ep.expense_id
+    WHERE p_group_id IS NULL OR e.group_id = p_group_id
+    GROUP BY e.group_id, ep.user_id
+  )
+  SELECT
+    COALESCE(paid.group_id, shares.group_id),
+    COALESCE(paid.user_id, shares.user_id),
+    COALESCE(paid.total, 0),
+    COALESCE(shares.total, 0)
+  FROM paid
+  FULL OUTER JOIN shares ON shares.group_id = paid.group_id AND shares.user_id = paid.user_id;
+$$;
+
+-- Reconciliation: report (and optionally repair) every ledger row that drifted from the source tables
+CREATE OR REPLACE FUNCTION public.reconcile_group_member_balances(
+  p_group_id UUID DEFAULT NULL,
+  p_repair BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE (
+  group_id UUID,
+  user_id UUID,
+  ledger_paid NUMERIC,
+  actual_paid NUMERIC,
+  ledger_share NUMERIC,
+  actual_share NUMERIC
+) LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+#variable_conflict use_column
+BEGIN
+  CREATE TEMP TABLE balance_drift ON COMMIT DROP AS
+  SELECT
+    COALESCE(actual.group_id, ledger.group_id) AS group_id,
+    COALESCE(actual.user_id, ledger.user_id) AS user_id,
+    COALESCE(ledger.total_paid, 0)::NUMERIC AS ledger_paid,
+    COALESCE(actual.total_paid, 0)::NUMERIC AS actual_paid,
+    COALESCE(ledger.total_share, 0)::NUMERIC AS ledger_share,
+    COALESCE(actual.total_share, 0)::NUMERIC AS actual_share
+  FROM public.compute_member_balances_from_scratch(p_group_id) actual
+  FULL OUTER JOIN (
+    SELECT gmb.group_id, gmb.user_id, gmb.total_paid, gmb.total_share
+    FROM public.group_member_balances gmb
+    WHERE p_group_id IS NULL OR gmb.group_id = p_group_id
+  ) ledger ON ledger.group_id = actual.group_id AND ledger.user_id = actual.user_id
+  WHERE COALESCE(ledger.total_paid, 0) <> COALESCE(actual.total_paid, 0)
+     OR COALESCE(ledger.total_share, 0) <> COALESCE(actual.total_share, 0);
+
+  IF p_repair THEN
+    INSERT INTO public.group_member_balances AS gmb (group_id, user_id, total_paid, total_share)
+    SELECT d.group_id, d.user_id, d.actual_paid, d.actual_share FROM balance_drift d
+    ON CONFLICT ON CONSTRAINT group_member_balances_pkey DO UPDATE
+    SET total_paid = EXCLUDED.total_paid,
+        total_share = EXCLUDED.total_share,
+        updated_at = NOW();
+  END IF;
+
+  RETURN QUERY SELECT d.group_id, d.user_id, d.ledger_paid, d.actual_paid, d.ledger_share, d.actual_share FROM balance_drift d;
+  DROP TABLE balance_drift;
+END;
+$$;
+
+-- Reconciliation runs across every group, so only the service role may call it.
+-- Supabase's default privileges grant new public functions to anon and authenticated
+-- directly, so revoking from PUBLIC alone would leave them callable through /rest/v1/rpc.
+REVOKE EXECUTE ON FUNCTION public.reconcile_group_member_balances(UUID, BOOLEAN) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.compute_member_balances_from_scratch(UUID) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.apply_member_balance_delta(UUID, UUID, NUMERIC, NUMERIC) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.reconcile_group_member_balances(UUID, BOOLEAN) TO service_role;
+
+-- Backfill the ledger from existing data
+INSERT INTO public.group_member_balances (group_id, user_id, total_paid, total_share)
+SELECT group_id, user_id, total_paid, total_share
+FROM public.compute_member_balances_from_scratch(NULL)
+ON CONFLICT (group_id, user_id) DO UPDATE
+SET total_paid = EXCLUDED.total_paid,
+    total_share = EXCLUDED.total_share,
+    updated_at = NOW();
+
+-- Balance reads now come from the ledger: one indexed lookup per member
+CREATE OR REPLACE FUNCTION public.get_group_balances(p_group_id UUID)
+RETURNS TABLE (
+  user_id UUID,
+  full_name TEXT,
+  avatar_url TEXT,
+  total_paid NUMERIC,
+  total_share NUMERIC,
+  balance NUMERIC
+) LANGUAGE sql STABLE AS $$
+  SELECT
+    gm.user_id,
+    p.full_name,
+    p.avatar_url,
+    COALESCE(gmb.total_paid, 0)::NUMERIC AS total_paid,
+    COALESCE(gmb.total_share, 0)::NUMERIC AS total_share,
+    (COALESCE(gmb.total_paid, 0) - COALESCE(gmb.total_share, 0))::NUMERIC AS balance
+  FROM public.group_members gm
+  JOIN public.profiles p ON p.id = gm.user_id
+  LEFT JOIN public.group_member_balances gmb
+    ON gmb.group_id = gm.group_id AND gmb.user_id = gm.user_id
+  WHERE gm.group_id = p_group_id
+  ORDER BY balance DESC;
+$$;
+
+COMMENT ON TABLE public.group_member_balances IS 'Running paid/share totals per group member, maintained by expense triggers';
+COMMENT ON FUNCTION public.reconcile_group_member_balances(UUID, BOOLEAN) IS 'Recomputes member balances from scratch and returns rows where the ledger drifted; repairs them when p_repair is true';
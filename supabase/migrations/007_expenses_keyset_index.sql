@@ -0,0 +1,8 @@
+-- Migration: Keyset pagination index for expense listings
+-- GET /api/expenses pages through a group's expenses newest first on (created_at, id);
+-- this index turns every page into a bounded range scan instead of a sort of the whole group
+
+CREATE INDEX IF NOT EXISTS idx_expenses_group_created_at_id
+    ON public.expenses(group_id, created_at DESC, id DESC);
+
+COMMENT ON INDEX public.idx_expenses_group_created_at_id IS 'Keyset pagination of a group''s expenses, newest first';
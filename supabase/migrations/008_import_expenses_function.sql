@@ -0,0 +1,63 @@
+-- Migration: Bulk expense import
+-- Inserts a whole import's expenses and participant splits with two set-based
+-- statements inside the function's single transaction: either every row lands or none do.
+-- Rows arrive pre-validated from /api/expenses/import as
+-- {row, group_id, paid_by_user_id, amount, description, category, created_at, participants: [{user_id, share_amount}]}
+
+CREATE OR REPLACE FUNCTION public.import_expenses(p_rows JSONB)
+RETURNS TABLE (
+  row_number INTEGER,
+  expense_id UUID
+) LANGUAGE plpgsql AS $$
+#variable_conflict use_column
+DECLARE
+  missing_group UUID;
+BEGIN
+  IF auth.uid() IS NULL THEN
+    RAISE EXCEPTION 'Not authenticated' USING ERRCODE = '28000';
+  END IF;
+
+  -- One membership check per distinct group in the import
+  SELECT DISTINCT (r->>'group_id')::UUID INTO missing_group
+  FROM jsonb_array_elements(p_rows) r
+  WHERE NOT EXISTS (
+    SELECT 1 FROM public.group_members gm
+    WHERE gm.group_id = (r->>'group_id')::UUID AND gm.user_id = auth.uid()
+  )
+  LIMIT 1;
+
+  IF missing_group IS NOT NULL THEN
+    RAISE EXCEPTION 'You are not a member of group %', missing_group USING ERRCODE = '42501';
+  END IF;
+
+  CREATE TEMP TABLE import_rows ON COMMIT DROP AS
+  SELECT
+    uuid_generate_v4() AS id,
+    t.ordinality AS position,
+    COALESCE((t.r->>'row')::INTEGER, t.ordinality::INTEGER) AS source_row,
+    (t.r->>'group_id')::UUID AS group_id,
+    COALESCE((t.r->>'paid_by_user_id')::UUID, auth.uid()) AS paid_by_user_id,
+    (t.r->>'amount')::DECIMAL(10,2) AS amount,
+    t.r->>'description' AS description,
+    COALESCE(NULLIF(t.r->>'category', ''), 'other') AS category,
+    COALESCE((t.r->>'created_at')::TIMESTAMPTZ, NOW()) AS created_at,
+    t.r->'participants' AS participants
+  FROM jsonb_array_elements(p_rows) WITH ORDINALITY AS t(r, ordinality);
+
+  INSERT INTO public.expenses (id, group_id, paid_by_user_id, amount, description, category, created_at)
+  SELECT id, group_id, paid_by_user_id, amount, description, category, created_at
+  FROM import_rows;
+
+  INSERT INTO public.expense_participants (expense_id, user_id, share_amount)
+  SELECT ir.id, (p->>'user_id')::UUID, (p->>'share_amount')::DECIMAL(10,2)
+  FROM import_rows ir, jsonb_array_elements(ir.participants) p;
+
+  RETURN QUERY SELECT ir.source_row, ir.id FROM import_rows ir ORDER BY ir.position;
+
+  DROP TABLE import_rows;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.import_expenses(JSONB) TO authenticated;
+
+COMMENT ON FUNCTION public.import_expenses(JSONB) IS 'Atomically inserts pre-validated expenses and their participants for groups the caller belongs to';
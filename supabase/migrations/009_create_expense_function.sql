@@ -0,0 +1,66 @@
+-- Migration: Atomic expense creation
+-- Creates an expense and its participant splits in one round trip and one transaction,
+-- so an expense can never exist without its participants
+
+CREATE OR REPLACE FUNCTION public.create_expense_with_participants(
+  p_group_id UUID,
+  p_amount DECIMAL,
+  p_description TEXT,
+  p_category TEXT DEFAULT 'other',
+  p_participants JSONB DEFAULT '[]'::JSONB
+)
+RETURNS public.expenses LANGUAGE plpgsql AS $$
+DECLARE
+  new_expense public.expenses;
+  share_total DECIMAL;
+BEGIN
+  IF auth.uid() IS NULL THEN
+    RAISE EXCEPTION 'Not authenticated' USING ERRCODE = '28000';
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM public.group_members
+    WHERE group_id = p_group_id AND user_id = auth.uid()
+  ) THEN
+    RAISE EXCEPTION 'You are not a member of this group' USING ERRCODE = '42501';
+  END IF;
+
+  IF jsonb_typeof(p_participants) IS DISTINCT FROM 'array' OR jsonb_array_length(p_participants) = 0 THEN
+    RAISE EXCEPTION 'At least one participant is required' USING ERRCODE = '22023';
+  END IF;
+
+  -- Same tolerance as the expense form: shares are entered unrounded and stored to the cent
+  SELECT COALESCE(SUM((p->>'share_amount')::DECIMAL), 0) INTO share_total
+  FROM jsonb_array_elements(p_participants) p;
+
+  IF ABS(share_total - p_amount) >= 0.01 THEN
+    RAISE EXCEPTION 'Total shares must equal the expense amount' USING ERRCODE = '22023';
+  END IF;
+
+  -- Shares of non-members would sit in the ledger but drop out of get_group_balances,
+  -- so the group's balances would no longer net to zero
+  IF EXISTS (
+    SELECT 1 FROM jsonb_array_elements(p_participants) p
+    WHERE NOT EXISTS (
+      SELECT 1 FROM public.group_members gm
+      WHERE gm.group_id = p_group_id AND gm.user_id = (p->>'user_id')::UUID
+    )
+  ) THEN
+    RAISE EXCEPTION 'Every participant must be a member of this group' USING ERRCODE = '23503';
+  END IF;
+
+  INSERT INTO public.expenses (group_id, paid_by_user_id, amount, description, category)
+  VALUES (p_group_id, auth.uid(), p_amount, p_description, COALESCE(NULLIF(p_category, ''), 'other'))
+  RETURNING * INTO new_expense;
+
+  INSERT INTO public.expense_participants (expense_id, user_id, share_amount)
+  SELECT new_expense.id, (p->>'user_id')::UUID, (p->>'share_amount')::DECIMAL(10,2)
+  FROM jsonb_array_elements(p_participants) p;
+
+  RETURN new_expense;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.create_expense_with_participants(UUID, DECIMAL, TEXT, TEXT, JSONB) TO authenticated;
+
+COMMENT ON FUNCTION public.create_expense_with_participants(UUID, DECIMAL, TEXT, TEXT, JSONB) IS 'Checks that the caller and every participant are members and the share totals, then inserts an expense paid by the caller with its participants in one transaction';
@@ -0,0 +1,190 @@
+-- Migration: Daily spending rollups for analytics
+-- Keeps per-day spending totals per group and per payer up to date on every expense write,
+-- so analytics read a handful of rollup rows instead of the group's full expense history.
+-- Days are UTC calendar days.
+
+CREATE TABLE IF NOT EXISTS public.group_daily_spending (
+    group_id UUID REFERENCES public.groups(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    total_amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+    expense_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS public.group_payer_daily_spending (
+    group_id UUID REFERENCES public.groups(id) ON DELETE CASCADE,
+    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    total_amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+    expense_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, user_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_group_payer_daily_spending_group_day ON public.group_payer_daily_spending(group_id, day);
+
+ALTER TABLE public.group_daily_spending ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.group_payer_daily_spending ENABLE ROW LEVEL SECURITY;
+
+-- Read-only for members; rows are only written by the trigger below
+CREATE POLICY "Users can view daily spending of their groups" ON public.group_daily_spending
+    FOR SELECT TO authenticated
+    USING (
+        group_id IN (
+            SELECT group_id FROM public.group_members WHERE user_id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Users can view payer spending of their groups" ON public.group_payer_daily_spending
+    FOR SELECT TO authenticated
+    USING (
+        group_id IN (
+            SELECT group_id FROM public.group_members WHERE user_id = auth.uid()
+        )
+    );
+
+GRANT SELECT ON public.group_daily_spending TO authenticated;
+GRANT SELECT ON public.group_payer_daily_spending TO authenticated;
+
+-- Apply one expense's contribution (p_count = 1) or its removal (p_count = -1) to both rollups
+CREATE OR REPLACE FUNCTION public.apply_spending_rollup_delta(
+  p_group_id UUID,
+  p_user_id UUID,
+  p_day DATE,
+  p_amount NUMERIC,
+  p_count INTEGER
+)
+RETURNS void LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF p_count > 0 THEN
+    INSERT INTO public.group_daily_spending (group_id, day, total_amount, expense_count)
+    VALUES (p_group_id, p_day, p_amount, p_count)
+    ON CONFLICT (group_id, day) DO UPDATE
+    SET total_amount = group_daily_spending.total_amount + EXCLUDED.total_amount,
+        expense_count = group_daily_spending.expense_count + EXCLUDED.expense_count;
+
+    INSERT INTO public.group_payer_daily_spending (group_id, user_id, day, total_amount, expense_count)
+    VALUES (p_group_id, p_user_id, p_day, p_amount, p_count)
+    ON CONFLICT (group_id, user_id, day) DO UPDATE
+    SET total_amount = group_payer_daily_spending.total_amount + EXCLUDED.total_amount,
+        expense_count = group_payer_daily_spending.expense_count + EXCLUDED.expense_count;
+    RETURN;
+  END IF;
+
+  -- Removals only touch existing rows: during a cascaded group delete the rollup
+  -- rows may already be gone, and re-inserting them would violate the group FK
+  UPDATE public.group_daily_spending
+  SET total_amount = total_amount + p_amount, expense_count = expense_count + p_count
+  WHERE group_id = p_group_id AND day = p_day;
+
+  UPDATE public.group_payer_daily_spending
+  SET total_amount = total_amount + p_amount, expense_count = expense_count + p_count
+  WHERE group_id = p_group_id AND user_id = p_user_id AND day = p_day;
+
+  -- Days whose last expense went away drop out of the rollups
+  DELETE FROM public.group_daily_spending
+  WHERE group_id = p_group_id AND day = p_day AND expense_count <= 0;
+
+  DELETE FROM public.group_payer_daily_spending
+  WHERE group_id = p_group_id AND user_id = p_user_id AND day = p_day AND expense_count <= 0;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.sync_expense_spending_rollups()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.apply_spending_rollup_delta(
+      OLD.group_id, OLD.paid_by_user_id, (OLD.created_at AT TIME ZONE 'UTC')::DATE, -OLD.amount, -1
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.apply_spending_rollup_delta(
+      NEW.group_id, NEW.paid_by_user_id, (NEW.created_at AT TIME ZONE 'UTC')::DATE, NEW.amount, 1
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS expenses_sync_spending_rollups ON public.expenses;
+CREATE TRIGGER expenses_sync_spending_rollups
+  AFTER INSERT OR UPDATE OF group_id, paid_by_user_id, amount, created_at OR DELETE ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.sync_expense_spending_rollups();
+
+-- Only the trigger may write rollups. Supabase's default privileges grant new public
+-- functions to anon and authenticated directly, so PUBLIC alone is not enough.
+REVOKE EXECUTE ON FUNCTION public.apply_spending_rollup_delta(UUID, UUID, DATE, NUMERIC, INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- Backfill the rollups from existing data
+INSERT INTO public.group_daily_spending (group_id, day, total_amount, expense_count)
+SELECT group_id, (created_at AT TIME ZONE 'UTC')::DATE, SUM(amount), COUNT(*)
+FROM public.expenses
+GROUP BY group_id, (created_at AT TIME ZONE 'UTC')::DATE
+ON CONFLICT (group_id, day) DO UPDATE
+SET total_amount = EXCLUDED.total_amount,
+    expense_count = EXCLUDED.expense_count;
+
+INSERT INTO public.group_payer_daily_spending (group_id, user_id, day, total_amount, expense_count)
+SELECT group_id, paid_by_user_id, (created_at AT TIME ZONE 'UTC')::DATE, SUM(amount), COUNT(*)
+FROM public.expenses
+GROUP BY group_id, paid_by_user_id, (created_at AT TIME ZONE 'UTC')::DATE
+ON CONFLICT (group_id, user_id, day) DO UPDATE
+SET total_amount = EXCLUDED.total_amount,
+    expense_count = EXCLUDED.expense_count;
+
+-- Spending per day, ISO week (starting Monday) or month within an optional date range
+CREATE OR REPLACE FUNCTION public.get_group_spending_trend(
+  p_group_id UUID,
+  p_from DATE DEFAULT NULL,
+  p_to DATE DEFAULT NULL,
+  p_granularity TEXT DEFAULT 'day'
+)
+RETURNS TABLE (
+  period DATE,
+  total_amount NUMERIC,
+  expense_count BIGINT
+) LANGUAGE sql STABLE AS $$
+  SELECT
+    date_trunc(p_granularity, gds.day::TIMESTAMP)::DATE AS period,
+    SUM(gds.total_amount)::NUMERIC,
+    SUM(gds.expense_count)::BIGINT
+  FROM public.group_daily_spending gds
+  WHERE gds.group_id = p_group_id
+    AND (p_from IS NULL OR gds.day >= p_from)
+    AND (p_to IS NULL OR gds.day <= p_to)
+  GROUP BY 1
+  ORDER BY 1;
+$$;
+
+-- Payers ranked by amount paid within an optional date range
+CREATE OR REPLACE FUNCTION public.get_group_top_spenders(
+  p_group_id UUID,
+  p_from DATE DEFAULT NULL,
+  p_to DATE DEFAULT NULL,
+  p_limit INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+  user_id UUID,
+  full_name TEXT,
+  total_amount NUMERIC,
+  expense_count BIGINT
+) LANGUAGE sql STABLE AS $$
+  SELECT
+    s.user_id,
+    p.full_name,
+    SUM(s.total_amount)::NUMERIC,
+    SUM(s.expense_count)::BIGINT
+  FROM public.group_payer_daily_spending s
+  LEFT JOIN public.profiles p ON p.id = s.user_id
+  WHERE s.group_id = p_group_id
+    AND (p_from IS NULL OR s.day >= p_from)
+    AND (p_to IS NULL OR s.day <= p_to)
+  GROUP BY s.user_id, p.full_name
+  ORDER BY 3 DESC
+  LIMIT p_limit;
+$$;
+
+COMMENT ON TABLE public.group_daily_spending IS 'Per-group daily spending totals, maintained by expense triggers';
+COMMENT ON TABLE public.group_payer_daily_spending IS 'Per-payer daily spending totals within a group, maintained by expense triggers';
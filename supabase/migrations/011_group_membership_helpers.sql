@@ -0,0 +1,146 @@
+-- Migration: Membership helpers for RLS
+-- The group-scoped policies used to run `group_id IN (SELECT group_id FROM group_members
+-- WHERE user_id = auth.uid())`, which is itself subject to the group_members policy and so
+-- re-checks membership through a second subquery. These SECURITY DEFINER helpers read
+-- group_members directly with the (group_id, user_id) and user_id indexes:
+--   user_group_ids()        the caller's groups; uncorrelated, so it runs once per query
+--   is_group_member(group)  point check for a single row (inserts, RPCs)
+--   is_group_admin(group)   same, for admin-only writes
+-- Membership changes are also published to Realtime so the app can drop its cached
+-- memberships (src/lib/membership.ts) as soon as they happen.
+
+CREATE OR REPLACE FUNCTION public.user_group_ids()
+RETURNS SETOF UUID LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  SELECT group_id FROM public.group_members WHERE user_id = auth.uid();
+$$;
+
+CREATE OR REPLACE FUNCTION public.is_group_member(p_group_id UUID)
+RETURNS BOOLEAN LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  SELECT EXISTS (
+    SELECT 1 FROM public.group_members
+    WHERE group_id = p_group_id AND user_id = auth.uid()
+  );
+$$;
+
+CREATE OR REPLACE FUNCTION public.is_group_admin(p_group_id UUID)
+RETURNS BOOLEAN LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  SELECT EXISTS (
+    SELECT 1 FROM public.group_members
+    WHERE group_id = p_group_id AND user_id = auth.uid() AND role = 'admin'
+  );
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.user_group_ids() FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.is_group_member(UUID) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.is_group_admin(UUID) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.user_group_ids() TO authenticated;
+GRANT EXECUTE ON FUNCTION public.is_group_member(UUID) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.is_group_admin(UUID) TO authenticated;
+
+-- group_members
+DROP POLICY IF EXISTS "Users can view group members of their groups" ON public.group_members;
+CREATE POLICY "Users can view group members of their groups" ON public.group_members
+    FOR SELECT TO authenticated
+    USING (group_id IN (SELECT public.user_group_ids()));
+
+DROP POLICY IF EXISTS "Group admins can add members" ON public.group_members;
+CREATE POLICY "Group admins can add members" ON public.group_members
+    FOR INSERT TO authenticated
+    WITH CHECK (public.is_group_admin(group_id));
+
+DROP POLICY IF EXISTS "Group admins can update members" ON public.group_members;
+CREATE POLICY "Group admins can update members" ON public.group_members
+    FOR UPDATE TO authenticated
+    USING (public.is_group_admin(group_id));
+
+DROP POLICY IF EXISTS "Group admins can remove members" ON public.group_members;
+CREATE POLICY "Group admins can remove members" ON public.group_members
+    FOR DELETE TO authenticated
+    USING (public.is_group_admin(group_id));
+
+-- expenses
+DROP POLICY IF EXISTS "Users can view expenses of their groups" ON public.expenses;
+CREATE POLICY "Users can view expenses of their groups" ON public.expenses
+    FOR SELECT TO authenticated
+    USING (group_id IN (SELECT public.user_group_ids()));
+
+DROP POLICY IF EXISTS "Group members can add expenses" ON public.expenses;
+CREATE POLICY "Group members can add expenses" ON public.expenses
+    FOR INSERT TO authenticated
+    WITH CHECK (public.is_group_member(group_id));
+
+-- expense_participants: the inner expenses scan is uncorrelated and hashed once per query
+DROP POLICY IF EXISTS "Users can view expense participants of their groups" ON public.expense_participants;
+CREATE POLICY "Users can view expense participants of their groups" ON public.expense_participants
+    FOR SELECT TO authenticated
+    USING (
+        expense_id IN (
+            SELECT e.id FROM public.expenses e
+            WHERE e.group_id IN (SELECT public.user_group_ids())
+        )
+    );
+
+DROP POLICY IF EXISTS "Group members can add expense participants" ON public.expense_participants;
+CREATE POLICY "Group members can add expense participants" ON public.expense_participants
+    FOR INSERT TO authenticated
+    WITH CHECK (
+        expense_id IN (
+            SELECT e.id FROM public.expenses e
+            WHERE e.group_id IN (SELECT public.user_group_ids())
+        )
+    );
+
+DROP POLICY IF EXISTS "Group members can update expense participants" ON public.expense_participants;
+CREATE POLICY "Group members can update expense participants" ON public.expense_participants
+    FOR UPDATE TO authenticated
+    USING (
+        expense_id IN (
+            SELECT e.id FROM public.expenses e
+            WHERE e.group_id IN (SELECT public.user_group_ids())
+        )
+    );
+
+DROP POLICY IF EXISTS "Group members can delete expense participants" ON public.expense_participants;
+CREATE POLICY "Group members can delete expense participants" ON public.expense_participants
+    FOR DELETE TO authenticated
+    USING (
+        expense_id IN (
+            SELECT e.id FROM public.expenses e
+            WHERE e.group_id IN (SELECT public.user_group_ids())
+        )
+    );
+
+-- Ledger and rollups
+DROP POLICY IF EXISTS "Users can view balances of their groups" ON public.group_member_balances;
+CREATE POLICY "Users can view balances of their groups" ON public.group_member_balances
+    FOR SELECT TO authenticated
+    USING (group_id IN (SELECT public.user_group_ids()));
+
+DROP POLICY IF EXISTS "Users can view daily spending of their groups" ON public.group_daily_spending;
+CREATE POLICY "Users can view daily spending of their groups" ON public.group_daily_spending
+    FOR SELECT TO authenticated
+    USING (group_id IN (SELECT public.user_group_ids()));
+
+DROP POLICY IF EXISTS "Users can view payer spending of their groups" ON public.group_payer_daily_spending;
+CREATE POLICY "Users can view payer spending of their groups" ON public.group_payer_daily_spending
+    FOR SELECT TO authenticated
+    USING (group_id IN (SELECT public.user_group_ids()));
+
+-- Publish membership changes with the old row on deletes, so removals carry the user id
+ALTER TABLE public.group_members REPLICA IDENTITY FULL;
+
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime')
+     AND NOT EXISTS (
+       SELECT 1 FROM pg_publication_tables
+       WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'group_members'
+     ) THEN
+    ALTER PUBLICATION supabase_realtime ADD TABLE public.group_members;
+  END IF;
+END;
+$$;
+
+COMMENT ON FUNCTION public.user_group_ids() IS 'Groups the current user belongs to; for RLS policies, read once per query';
+COMMENT ON FUNCTION public.is_group_member(UUID) IS 'Whether the current user belongs to the group';
+COMMENT ON FUNCTION public.is_group_admin(UUID) IS 'Whether the current user is an admin of the group';
@@ -0,0 +1,63 @@
+-- Migration: Dashboard summary
+-- One call returns every group the caller belongs to with its member count, spending
+-- totals, last activity and the caller's net balance. Each group costs a handful of
+-- index lookups (group_members, the daily rollup, the keyset index and the ledger row),
+-- so the dashboard is one round trip however many groups or expenses there are.
+-- SECURITY DEFINER because the groups policy only shows a group to its creator; the
+-- function itself restricts rows to the caller's memberships.
+
+CREATE OR REPLACE FUNCTION public.get_dashboard_summary()
+RETURNS TABLE (
+  id UUID,
+  name TEXT,
+  created_by UUID,
+  created_at TIMESTAMPTZ,
+  role TEXT,
+  member_count INTEGER,
+  expense_count INTEGER,
+  total_spent NUMERIC,
+  last_activity_at TIMESTAMPTZ,
+  net_balance NUMERIC
+) LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  SELECT
+    g.id,
+    g.name,
+    g.created_by,
+    g.created_at,
+    me.role,
+    members.member_count,
+    spending.expense_count,
+    spending.total_spent,
+    GREATEST(g.created_at, last_expense.created_at) AS last_activity_at,
+    (COALESCE(gmb.total_paid, 0) - COALESCE(gmb.total_share, 0))::NUMERIC AS net_balance
+  FROM public.group_members me
+  JOIN public.groups g ON g.id = me.group_id
+  CROSS JOIN LATERAL (
+    SELECT COUNT(*)::INTEGER AS member_count
+    FROM public.group_members gm
+    WHERE gm.group_id = g.id
+  ) members
+  CROSS JOIN LATERAL (
+    SELECT
+      COALESCE(SUM(gds.expense_count), 0)::INTEGER AS expense_count,
+      COALESCE(SUM(gds.total_amount), 0)::NUMERIC AS total_spent
+    FROM public.group_daily_spending gds
+    WHERE gds.group_id = g.id
+  ) spending
+  LEFT JOIN LATERAL (
+    SELECT e.created_at
+    FROM public.expenses e
+    WHERE e.group_id = g.id
+    ORDER BY e.created_at DESC, e.id DESC
+    LIMIT 1
+  ) last_expense ON TRUE
+  LEFT JOIN public.group_member_balances gmb
+    ON gmb.group_id = g.id AND gmb.user_id = me.user_id
+  WHERE me.user_id = auth.uid()
+  ORDER BY last_activity_at DESC, g.id;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.get_dashboard_summary() FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.get_dashboard_summary() TO authenticated;
+
+COMMENT ON FUNCTION public.get_dashboard_summary() IS 'Groups the current user belongs to with member count, spending totals, last activity and the user''s net balance';
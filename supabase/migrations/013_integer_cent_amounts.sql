@@ -0,0 +1,519 @@
+-- Migration: Integer-cent money
+-- Every amount is now also stored as a BIGINT count of cents, and everything derived from
+-- amounts (the balance ledger, the spending rollups and the functions reading them) is
+-- kept and returned in cents. Sums are plain integer additions, and the running totals the
+-- triggers maintain can never drift by a rounding step.
+--
+-- expenses.amount and expense_participants.share_amount stay as DECIMAL(10,2) for readers
+-- and existing writers; the *_cents columns are generated from them, so the two always agree.
+-- The write functions take cents and require shares to add up to the amount exactly.
+
+-- Source tables
+ALTER TABLE public.expenses
+    ADD COLUMN IF NOT EXISTS amount_cents BIGINT GENERATED ALWAYS AS ((amount * 100)::BIGINT) STORED NOT NULL;
+
+ALTER TABLE public.expense_participants
+    ADD COLUMN IF NOT EXISTS share_cents BIGINT GENERATED ALWAYS AS ((share_amount * 100)::BIGINT) STORED NOT NULL;
+
+-- Functions whose signature or result columns change
+DROP FUNCTION IF EXISTS public.get_dashboard_summary();
+DROP FUNCTION IF EXISTS public.get_group_balances(UUID);
+DROP FUNCTION IF EXISTS public.reconcile_group_member_balances(UUID, BOOLEAN);
+DROP FUNCTION IF EXISTS public.compute_member_balances_from_scratch(UUID);
+DROP FUNCTION IF EXISTS public.apply_member_balance_delta(UUID, UUID, NUMERIC, NUMERIC);
+DROP FUNCTION IF EXISTS public.get_group_spending_trend(UUID, DATE, DATE, TEXT);
+DROP FUNCTION IF EXISTS public.get_group_top_spenders(UUID, DATE, DATE, INTEGER);
+DROP FUNCTION IF EXISTS public.apply_spending_rollup_delta(UUID, UUID, DATE, NUMERIC, INTEGER);
+DROP FUNCTION IF EXISTS public.create_expense_with_participants(UUID, DECIMAL, TEXT, TEXT, JSONB);
+
+-- Balance ledger
+ALTER TABLE public.group_member_balances RENAME COLUMN total_paid TO paid_cents;
+ALTER TABLE public.group_member_balances RENAME COLUMN total_share TO share_cents;
+ALTER TABLE public.group_member_balances
+    ALTER COLUMN paid_cents DROP DEFAULT,
+    ALTER COLUMN share_cents DROP DEFAULT,
+    ALTER COLUMN paid_cents TYPE BIGINT USING (paid_cents * 100)::BIGINT,
+    ALTER COLUMN share_cents TYPE BIGINT USING (share_cents * 100)::BIGINT,
+    ALTER COLUMN paid_cents SET DEFAULT 0,
+    ALTER COLUMN share_cents SET DEFAULT 0;
+
+CREATE FUNCTION public.apply_member_balance_delta(
+  p_group_id UUID,
+  p_user_id UUID,
+  p_paid_delta BIGINT,
+  p_share_delta BIGINT
+)
+RETURNS void LANGUAGE sql SECURITY DEFINER SET search_path = public AS $$
+  INSERT INTO public.group_member_balances (group_id, user_id, paid_cents, share_cents)
+  VALUES (p_group_id, p_user_id, p_paid_delta, p_share_delta)
+  ON CONFLICT (group_id, user_id) DO UPDATE
+  SET paid_cents = group_member_balances.paid_cents + EXCLUDED.paid_cents,
+      share_cents = group_member_balances.share_cents + EXCLUDED.share_cents,
+      updated_at = NOW();
+$$;
+
+CREATE OR REPLACE FUNCTION public.sync_expense_balances()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+  participant RECORD;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.apply_member_balance_delta(OLD.group_id, OLD.paid_by_user_id, -OLD.amount_cents, 0);
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.apply_member_balance_delta(NEW.group_id, NEW.paid_by_user_id, NEW.amount_cents, 0);
+  END IF;
+
+  -- Shares follow their expense: moved when it changes group, removed when it is deleted.
+  -- Cascaded participant deletes can no longer see the expense, so they are handled here.
+  IF (TG_OP = 'UPDATE' AND NEW.group_id IS DISTINCT FROM OLD.group_id) OR TG_OP = 'DELETE' THEN
+    FOR participant IN
+      SELECT user_id, share_cents FROM public.expense_participants WHERE expense_id = OLD.id
+    LOOP
+      PERFORM public.apply_member_balance_delta(OLD.group_id, participant.user_id, 0, -participant.share_cents);
+      IF TG_OP = 'UPDATE' THEN
+        PERFORM public.apply_member_balance_delta(NEW.group_id, participant.user_id, 0, participant.share_cents);
+      END IF;
+    END LOOP;
+  END IF;
+
+  -- Returning OLD lets the BEFORE DELETE trigger proceed; AFTER triggers ignore it
+  RETURN COALESCE(NEW, OLD);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.sync_participant_balances()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+  old_group_id UUID;
+  new_group_id UUID;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    SELECT group_id INTO old_group_id FROM public.expenses WHERE id = OLD.expense_id;
+    -- NULL when the parent expense is being deleted; sync_expense_balances already did it
+    IF old_group_id IS NOT NULL THEN
+      PERFORM public.apply_member_balance_delta(old_group_id, OLD.user_id, 0, -OLD.share_cents);
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    SELECT group_id INTO new_group_id FROM public.expenses WHERE id = NEW.expense_id;
+    PERFORM public.apply_member_balance_delta(new_group_id, NEW.user_id, 0, NEW.share_cents);
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION public.compute_member_balances_from_scratch(p_group_id UUID DEFAULT NULL)
+RETURNS TABLE (
+  group_id UUID,
+  user_id UUID,
+  paid_cents BIGINT,
+  share_cents BIGINT
+) LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  WITH paid AS (
+    SELECT e.group_id, e.paid_by_user_id AS user_id, SUM(e.amount_cents) AS total
+    FROM public.expenses e
+    WHERE p_group_id IS NULL OR e.group_id = p_group_id
+    GROUP BY e.group_id, e.paid_by_user_id
+  ),
+  shares AS (
+    SELECT e.group_id, ep.user_id, SUM(ep.share_cents) AS total
+    FROM public.expense_participants ep
+    JOIN public.expenses e ON e.id = ep.expense_id
+    WHERE p_group_id IS NULL OR e.group_id = p_group_id
+    GROUP BY e.group_id, ep.user_id
+  )
+  SELECT
+    COALESCE(paid.group_id, shares.group_id),
+    COALESCE(paid.user_id, shares.user_id),
+    COALESCE(paid.total, 0)::BIGINT,
+    COALESCE(shares.total, 0)::BIGINT
+  FROM paid
+  FULL OUTER JOIN shares ON shares.group_id = paid.group_id AND shares.user_id = paid.user_id;
+$$;
+
+CREATE FUNCTION public.reconcile_group_member_balances(
+  p_group_id UUID DEFAULT NULL,
+  p_repair BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE (
+  group_id UUID,
+  user_id UUID,
+  ledger_paid_cents BIGINT,
+  actual_paid_cents BIGINT,
+  ledger_share_cents BIGINT,
+  actual_share_cents BIGINT
+) LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+#variable_conflict use_column
+BEGIN
+  CREATE TEMP TABLE balance_drift ON COMMIT DROP AS
+  SELECT
+    COALESCE(actual.group_id, ledger.group_id) AS group_id,
+    COALESCE(actual.user_id, ledger.user_id) AS user_id,
+    COALESCE(ledger.paid_cents, 0)::BIGINT AS ledger_paid_cents,
+    COALESCE(actual.paid_cents, 0)::BIGINT AS actual_paid_cents,
+    COALESCE(ledger.share_cents, 0)::BIGINT AS ledger_share_cents,
+    COALESCE(actual.share_cents, 0)::BIGINT AS actual_share_cents
+  FROM public.compute_member_balances_from_scratch(p_group_id) actual
+  FULL OUTER JOIN (
+    SELECT gmb.group_id, gmb.user_id, gmb.paid_cents, gmb.share_cents
+    FROM public.group_member_balances gmb
+    WHERE p_group_id IS NULL OR gmb.group_id = p_group_id
+  ) ledger ON ledger.group_id = actual.group_id AND ledger.user_id = actual.user_id
+  WHERE COALESCE(ledger.paid_cents, 0) <> COALESCE(actual.paid_cents, 0)
+     OR COALESCE(ledger.share_cents, 0) <> COALESCE(actual.share_cents, 0);
+
+  IF p_repair THEN
+    INSERT INTO public.group_member_balances AS gmb (group_id, user_id, paid_cents, share_cents)
+    SELECT d.group_id, d.user_id, d.actual_paid_cents, d.actual_share_cents FROM balance_drift d
+    ON CONFLICT ON CONSTRAINT group_member_balances_pkey DO UPDATE
+    SET paid_cents = EXCLUDED.paid_cents,
+        share_cents = EXCLUDED.share_cents,
+        updated_at = NOW();
+  END IF;
+
+  RETURN QUERY
+  SELECT d.group_id, d.user_id, d.ledger_paid_cents, d.actual_paid_cents, d.ledger_share_cents, d.actual_share_cents
+  FROM balance_drift d;
+  DROP TABLE balance_drift;
+END;
+$$;
+
+-- Recreated functions get Supabase's default grants to anon and authenticated again
+REVOKE EXECUTE ON FUNCTION public.reconcile_group_member_balances(UUID, BOOLEAN) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.compute_member_balances_from_scratch(UUID) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.apply_member_balance_delta(UUID, UUID, BIGINT, BIGINT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.reconcile_group_member_balances(UUID, BOOLEAN) TO service_role;
+
+CREATE FUNCTION public.get_group_balances(p_group_id UUID)
+RETURNS TABLE (
+  user_id UUID,
+  full_name TEXT,
+  avatar_url TEXT,
+  paid_cents BIGINT,
+  share_cents BIGINT,
+  balance_cents BIGINT
+) LANGUAGE sql STABLE AS $$
+  SELECT
+    gm.user_id,
+    p.full_name,
+    p.avatar_url,
+    COALESCE(gmb.paid_cents, 0) AS paid_cents,
+    COALESCE(gmb.share_cents, 0) AS share_cents,
+    COALESCE(gmb.paid_cents, 0) - COALESCE(gmb.share_cents, 0) AS balance_cents
+  FROM public.group_members gm
+  JOIN public.profiles p ON p.id = gm.user_id
+  LEFT JOIN public.group_member_balances gmb
+    ON gmb.group_id = gm.group_id AND gmb.user_id = gm.user_id
+  WHERE gm.group_id = p_group_id
+  ORDER BY balance_cents DESC;
+$$;
+
+-- Spending rollups
+ALTER TABLE public.group_daily_spending RENAME COLUMN total_amount TO total_cents;
+ALTER TABLE public.group_daily_spending
+    ALTER COLUMN total_cents DROP DEFAULT,
+    ALTER COLUMN total_cents TYPE BIGINT USING (total_cents * 100)::BIGINT,
+    ALTER COLUMN total_cents SET DEFAULT 0;
+
+ALTER TABLE public.group_payer_daily_spending RENAME COLUMN total_amount TO total_cents;
+ALTER TABLE public.group_payer_daily_spending
+    ALTER COLUMN total_cents DROP DEFAULT,
+    ALTER COLUMN total_cents TYPE BIGINT USING (total_cents * 100)::BIGINT,
+    ALTER COLUMN total_cents SET DEFAULT 0;
+
+CREATE FUNCTION public.apply_spending_rollup_delta(
+  p_group_id UUID,
+  p_user_id UUID,
+  p_day DATE,
+  p_cents BIGINT,
+  p_count INTEGER
+)
+RETURNS void LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF p_count > 0 THEN
+    INSERT INTO public.group_daily_spending (group_id, day, total_cents, expense_count)
+    VALUES (p_group_id, p_day, p_cents, p_count)
+    ON CONFLICT (group_id, day) DO UPDATE
+    SET total_cents = group_daily_spending.total_cents + EXCLUDED.total_cents,
+        expense_count = group_daily_spending.expense_count + EXCLUDED.expense_count;
+
+    INSERT INTO public.group_payer_daily_spending (group_id, user_id, day, total_cents, expense_count)
+    VALUES (p_group_id, p_user_id, p_day, p_cents, p_count)
+    ON CONFLICT (group_id, user_id, day) DO UPDATE
+    SET total_cents = group_payer_daily_spending.total_cents + EXCLUDED.total_cents,
+        expense_count = group_payer_daily_spending.expense_count + EXCLUDED.expense_count;
+    RETURN;
+  END IF;
+
+  -- Removals only touch existing rows: during a cascaded group delete the rollup
+  -- rows may already be gone, and re-inserting them would violate the group FK
+  UPDATE public.group_daily_spending
+  SET total_cents = total_cents + p_cents, expense_count = expense_count + p_count
+  WHERE group_id = p_group_id AND day = p_day;
+
+  UPDATE public.group_payer_daily_spending
+  SET total_cents = total_cents + p_cents, expense_count = expense_count + p_count
+  WHERE group_id = p_group_id AND user_id = p_user_id AND day = p_day;
+
+  -- Days whose last expense went away drop out of the rollups
+  DELETE FROM public.group_daily_spending
+  WHERE group_id = p_group_id AND day = p_day AND expense_count <= 0;
+
+  DELETE FROM public.group_payer_daily_spending
+  WHERE group_id = p_group_id AND user_id = p_user_id AND day = p_day AND expense_count <= 0;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.sync_expense_spending_rollups()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.apply_spending_rollup_delta(
+      OLD.group_id, OLD.paid_by_user_id, (OLD.created_at AT TIME ZONE 'UTC')::DATE, -OLD.amount_cents, -1
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.apply_spending_rollup_delta(
+      NEW.group_id, NEW.paid_by_user_id, (NEW.created_at AT TIME ZONE 'UTC')::DATE, NEW.amount_cents, 1
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.apply_spending_rollup_delta(UUID, UUID, DATE, BIGINT, INTEGER) FROM PUBLIC, anon, authenticated;
+
+CREATE FUNCTION public.get_group_spending_trend(
+  p_group_id UUID,
+  p_from DATE DEFAULT NULL,
+  p_to DATE DEFAULT NULL,
+  p_granularity TEXT DEFAULT 'day'
+)
+RETURNS TABLE (
+  period DATE,
+  total_cents BIGINT,
+  expense_count BIGINT
+) LANGUAGE sql STABLE AS $$
+  SELECT
+    date_trunc(p_granularity, gds.day::TIMESTAMP)::DATE AS period,
+    SUM(gds.total_cents)::BIGINT,
+    SUM(gds.expense_count)::BIGINT
+  FROM public.group_daily_spending gds
+  WHERE gds.group_id = p_group_id
+    AND (p_from IS NULL OR gds.day >= p_from)
+    AND (p_to IS NULL OR gds.day <= p_to)
+  GROUP BY 1
+  ORDER BY 1;
+$$;
+
+CREATE FUNCTION public.get_group_top_spenders(
+  p_group_id UUID,
+  p_from DATE DEFAULT NULL,
+  p_to DATE DEFAULT NULL,
+  p_limit INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+  user_id UUID,
+  full_name TEXT,
+  total_cents BIGINT,
+  expense_count BIGINT
+) LANGUAGE sql STABLE AS $$
+  SELECT
+    s.user_id,
+    p.full_name,
+    SUM(s.total_cents)::BIGINT,
+    SUM(s.expense_count)::BIGINT
+  FROM public.group_payer_daily_spending s
+  LEFT JOIN public.profiles p ON p.id = s.user_id
+  WHERE s.group_id = p_group_id
+    AND (p_from IS NULL OR s.day >= p_from)
+    AND (p_to IS NULL OR s.day <= p_to)
+  GROUP BY s.user_id, p.full_name
+  ORDER BY 3 DESC
+  LIMIT p_limit;
+$$;
+
+-- Dashboard summary, as in migration 012 but in cents
+CREATE FUNCTION public.get_dashboard_summary()
+RETURNS TABLE (
+  id UUID,
+  name TEXT,
+  created_by UUID,
+  created_at TIMESTAMPTZ,
+  role TEXT,
+  member_count INTEGER,
+  expense_count INTEGER,
+  total_spent_cents BIGINT,
+  last_activity_at TIMESTAMPTZ,
+  net_balance_cents BIGINT
+) LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  SELECT
+    g.id,
+    g.name,
+    g.created_by,
+    g.created_at,
+    me.role,
+    members.member_count,
+    spending.expense_count,
+    spending.total_spent_cents,
+    GREATEST(g.created_at, last_expense.created_at) AS last_activity_at,
+    COALESCE(gmb.paid_cents, 0) - COALESCE(gmb.share_cents, 0) AS net_balance_cents
+  FROM public.group_members me
+  JOIN public.groups g ON g.id = me.group_id
+  CROSS JOIN LATERAL (
+    SELECT COUNT(*)::INTEGER AS member_count
+    FROM public.group_members gm
+    WHERE gm.group_id = g.id
+  ) members
+  CROSS JOIN LATERAL (
+    SELECT
+      COALESCE(SUM(gds.expense_count), 0)::INTEGER AS expense_count,
+      COALESCE(SUM(gds.total_cents), 0)::BIGINT AS total_spent_cents
+    FROM public.group_daily_spending gds
+    WHERE gds.group_id = g.id
+  ) spending
+  LEFT JOIN LATERAL (
+    SELECT e.created_at
+    FROM public.expenses e
+    WHERE e.group_id = g.id
+    ORDER BY e.created_at DESC, e.id DESC
+    LIMIT 1
+  ) last_expense ON TRUE
+  LEFT JOIN public.group_member_balances gmb
+    ON gmb.group_id = g.id AND gmb.user_id = me.user_id
+  WHERE me.user_id = auth.uid()
+  ORDER BY last_activity_at DESC, g.id;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.get_dashboard_summary() FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.get_dashboard_summary() TO authenticated;
+
+-- Writes take cents; participants are [{user_id, share_cents}] and must add up exactly
+CREATE FUNCTION public.create_expense_with_participants(
+  p_group_id UUID,
+  p_amount_cents BIGINT,
+  p_description TEXT,
+  p_category TEXT DEFAULT 'other',
+  p_participants JSONB DEFAULT '[]'::JSONB
+)
+RETURNS public.expenses LANGUAGE plpgsql AS $$
+DECLARE
+  new_expense public.expenses;
+  share_total BIGINT;
+BEGIN
+  IF auth.uid() IS NULL THEN
+    RAISE EXCEPTION 'Not authenticated' USING ERRCODE = '28000';
+  END IF;
+
+  IF NOT public.is_group_member(p_group_id) THEN
+    RAISE EXCEPTION 'You are not a member of this group' USING ERRCODE = '42501';
+  END IF;
+
+  IF p_amount_cents IS NULL OR p_amount_cents <= 0 THEN
+    RAISE EXCEPTION 'Amount must be greater than 0' USING ERRCODE = '22023';
+  END IF;
+
+  IF jsonb_typeof(p_participants) IS DISTINCT FROM 'array' OR jsonb_array_length(p_participants) = 0 THEN
+    RAISE EXCEPTION 'At least one participant is required' USING ERRCODE = '22023';
+  END IF;
+
+  SELECT COALESCE(SUM((p->>'share_cents')::BIGINT), 0) INTO share_total
+  FROM jsonb_array_elements(p_participants) p;
+
+  IF share_total <> p_amount_cents THEN
+    RAISE EXCEPTION 'Total shares must equal the expense amount' USING ERRCODE = '22023';
+  END IF;
+
+  -- Shares of non-members would sit in the ledger but drop out of get_group_balances,
+  -- so the group's balances would no longer net to zero
+  IF EXISTS (
+    SELECT 1 FROM jsonb_array_elements(p_participants) p
+    WHERE NOT EXISTS (
+      SELECT 1 FROM public.group_members gm
+      WHERE gm.group_id = p_group_id AND gm.user_id = (p->>'user_id')::UUID
+    )
+  ) THEN
+    RAISE EXCEPTION 'Every participant must be a member of this group' USING ERRCODE = '23503';
+  END IF;
+
+  INSERT INTO public.expenses (group_id, paid_by_user_id, amount, description, category)
+  VALUES (p_group_id, auth.uid(), p_amount_cents / 100.0, p_description, COALESCE(NULLIF(p_category, ''), 'other'))
+  RETURNING * INTO new_expense;
+
+  INSERT INTO public.expense_participants (expense_id, user_id, share_amount)
+  SELECT new_expense.id, (p->>'user_id')::UUID, (p->>'share_cents')::BIGINT / 100.0
+  FROM jsonb_array_elements(p_participants) p;
+
+  RETURN new_expense;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.create_expense_with_participants(UUID, BIGINT, TEXT, TEXT, JSONB) TO authenticated;
+
+-- Import rows carry amount_cents and participants as [{user_id, share_cents}]
+CREATE OR REPLACE FUNCTION public.import_expenses(p_rows JSONB)
+RETURNS TABLE (
+  row_number INTEGER,
+  expense_id UUID
+) LANGUAGE plpgsql AS $$
+#variable_conflict use_column
+DECLARE
+  missing_group UUID;
+BEGIN
+  IF auth.uid() IS NULL THEN
+    RAISE EXCEPTION 'Not authenticated' USING ERRCODE = '28000';
+  END IF;
+
+  -- One membership check per distinct group in the import
+  SELECT DISTINCT (r->>'group_id')::UUID INTO missing_group
+  FROM jsonb_array_elements(p_rows) r
+  WHERE NOT public.is_group_member((r->>'group_id')::UUID)
+  LIMIT 1;
+
+  IF missing_group IS NOT NULL THEN
+    RAISE EXCEPTION 'You are not a member of group %', missing_group USING ERRCODE = '42501';
+  END IF;
+
+  CREATE TEMP TABLE import_rows ON COMMIT DROP AS
+  SELECT
+    uuid_generate_v4() AS id,
+    t.ordinality AS position,
+    COALESCE((t.r->>'row')::INTEGER, t.ordinality::INTEGER) AS source_row,
+    (t.r->>'group_id')::UUID AS group_id,
+    COALESCE((t.r->>'paid_by_user_id')::UUID, auth.uid()) AS paid_by_user_id,
+    (t.r->>'amount_cents')::BIGINT AS amount_cents,
+    t.r->>'description' AS description,
+    COALESCE(NULLIF(t.r->>'category', ''), 'other') AS category,
+    COALESCE((t.r->>'created_at')::TIMESTAMPTZ, NOW()) AS created_at,
+    t.r->'participants' AS participants
+  FROM jsonb_array_elements(p_rows) WITH ORDINALITY AS t(r, ordinality);
+
+  INSERT INTO public.expenses (id, group_id, paid_by_user_id, amount, description, category, created_at)
+  SELECT id, group_id, paid_by_user_id, amount_cents / 100.0, description, category, created_at
+  FROM import_rows;
+
+  INSERT INTO public.expense_participants (expense_id, user_id, share_amount)
+  SELECT ir.id, (p->>'user_id')::UUID, (p->>'share_cents')::BIGINT / 100.0
+  FROM import_rows ir, jsonb_array_elements(ir.participants) p;
+
+  RETURN QUERY SELECT ir.source_row, ir.id FROM import_rows ir ORDER BY ir.position;
+
+  DROP TABLE import_rows;
+END;
+$$;
+
+COMMENT ON COLUMN public.expenses.amount_cents IS 'amount in integer cents; generated, use it for arithmetic';
+COMMENT ON COLUMN public.expense_participants.share_cents IS 'share_amount in integer cents; generated, use it for arithmetic';
+COMMENT ON TABLE public.group_member_balances IS 'Running paid/share totals per group member in cents, maintained by expense triggers';
+COMMENT ON TABLE public.group_daily_spending IS 'Per-group daily spending totals in cents, maintained by expense triggers';
+COMMENT ON TABLE public.group_payer_daily_spending IS 'Per-payer daily spending totals within a group in cents, maintained by expense triggers';
+COMMENT ON FUNCTION public.reconcile_group_member_balances(UUID, BOOLEAN) IS 'Recomputes member balances from scratch and returns rows where the ledger drifted; repairs them when p_repair is true';
+COMMENT ON FUNCTION public.get_dashboard_summary() IS 'Groups the current user belongs to with member count, spending totals, last activity and the user''s net balance, in cents';
+COMMENT ON FUNCTION public.create_expense_with_participants(UUID, BIGINT, TEXT, TEXT, JSONB) IS 'Checks that the caller and every participant are members and that shares add up to the amount in cents, then inserts an expense paid by the caller with its participants in one transaction';
+COMMENT ON FUNCTION public.import_expenses(JSONB) IS 'Atomically inserts pre-validated expenses (amounts in cents) and their participants for groups the caller belongs to';
@@ -0,0 +1,177 @@
+-- Migration: Realtime group events
+-- Writes to a group's expenses and balance ledger are broadcast as small deltas on the
+-- private Realtime topic `group:<group_id>`, so open group pages can update in place
+-- instead of polling. Each server instance subscribes once per open group and fans the
+-- events out to its browsers over SSE (src/lib/group-events).
+--   expense   {action, expense, previous}      the changed row, before and after
+--   balance   {user_id, paid_cents, share_cents} a member's ledger row after the change
+--   resync    {}                               too much changed at once; refetch
+-- Messages are inserted into realtime.messages inside the writing transaction, so they are
+-- only delivered if it commits. Without the Realtime extension (plain Postgres, local
+-- stand-ins) the triggers are no-ops.
+
+CREATE OR REPLACE FUNCTION public.send_group_event(p_group_id UUID, p_event TEXT, p_payload JSONB)
+RETURNS void LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  -- Bulk writers turn per-row events off for their transaction and send one resync instead
+  IF p_event <> 'resync' AND current_setting('spliteasy.group_events', true) = 'off' THEN
+    RETURN;
+  END IF;
+
+  IF p_group_id IS NULL OR to_regprocedure('realtime.send(jsonb, text, text, boolean)') IS NULL THEN
+    RETURN;
+  END IF;
+
+  PERFORM realtime.send(p_payload, p_event, 'group:' || p_group_id::TEXT, TRUE);
+END;
+$$;
+
+-- Clients must not be able to forge events: only the triggers below (and
+-- send_group_resync) may send. Supabase's default privileges grant new public
+-- functions to anon and authenticated directly, so PUBLIC alone is not enough.
+REVOKE EXECUTE ON FUNCTION public.send_group_event(UUID, TEXT, JSONB) FROM PUBLIC, anon, authenticated;
+
+-- The one event a caller may send: a payload-free resync for a group they belong to.
+-- Bulk writers running as the caller (import_expenses) reach send_group_event through it.
+CREATE OR REPLACE FUNCTION public.send_group_resync(p_group_id UUID)
+RETURNS void LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF public.is_group_member(p_group_id) THEN
+    PERFORM public.send_group_event(p_group_id, 'resync', '{}'::JSONB);
+  END IF;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.send_group_resync(UUID) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.send_group_resync(UUID) TO authenticated;
+
+-- The columns clients need to place an expense in lists and analytics; shares travel as balance events
+CREATE OR REPLACE FUNCTION public.expense_event_row(e public.expenses)
+RETURNS JSONB LANGUAGE sql IMMUTABLE AS $$
+  SELECT jsonb_build_object(
+    'id', e.id,
+    'group_id', e.group_id,
+    'paid_by_user_id', e.paid_by_user_id,
+    'amount_cents', e.amount_cents,
+    'description', e.description,
+    'category', e.category,
+    'created_at', e.created_at
+  );
+$$;
+
+CREATE OR REPLACE FUNCTION public.broadcast_expense_change()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM public.send_group_event(NEW.group_id, 'expense', jsonb_build_object(
+      'action', 'insert', 'expense', public.expense_event_row(NEW), 'previous', NULL));
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM public.send_group_event(OLD.group_id, 'expense', jsonb_build_object(
+      'action', 'delete', 'expense', NULL, 'previous', public.expense_event_row(OLD)));
+  ELSIF NEW.group_id IS DISTINCT FROM OLD.group_id THEN
+    -- Moved between groups: it leaves one and arrives in the other
+    PERFORM public.send_group_event(OLD.group_id, 'expense', jsonb_build_object(
+      'action', 'delete', 'expense', NULL, 'previous', public.expense_event_row(OLD)));
+    PERFORM public.send_group_event(NEW.group_id, 'expense', jsonb_build_object(
+      'action', 'insert', 'expense', public.expense_event_row(NEW), 'previous', NULL));
+  ELSE
+    PERFORM public.send_group_event(NEW.group_id, 'expense', jsonb_build_object(
+      'action', 'update', 'expense', public.expense_event_row(NEW), 'previous', public.expense_event_row(OLD)));
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+-- Ledger rows carry running totals, so the event is the member's new absolute position
+-- and applying it twice (or out of a batch) is harmless
+CREATE OR REPLACE FUNCTION public.broadcast_member_balance_change()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  PERFORM public.send_group_event(NEW.group_id, 'balance', jsonb_build_object(
+    'user_id', NEW.user_id,
+    'paid_cents', NEW.paid_cents,
+    'share_cents', NEW.share_cents
+  ));
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS expenses_broadcast_changes ON public.expenses;
+CREATE TRIGGER expenses_broadcast_changes
+  AFTER INSERT OR UPDATE OF group_id, paid_by_user_id, amount, description, category, created_at OR DELETE
+  ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.broadcast_expense_change();
+
+DROP TRIGGER IF EXISTS group_member_balances_broadcast_changes ON public.group_member_balances;
+CREATE TRIGGER group_member_balances_broadcast_changes
+  AFTER INSERT OR UPDATE OF paid_cents, share_cents ON public.group_member_balances
+  FOR EACH ROW EXECUTE FUNCTION public.broadcast_member_balance_change();
+
+-- Same as migration 013, plus: per-row events are switched off for the import and each
+-- touched group gets a single resync once the rows are in
+CREATE OR REPLACE FUNCTION public.import_expenses(p_rows JSONB)
+RETURNS TABLE (
+  row_number INTEGER,
+  expense_id UUID
+) LANGUAGE plpgsql AS $$
+#variable_conflict use_column
+DECLARE
+  missing_group UUID;
+  touched_group UUID;
+BEGIN
+  IF auth.uid() IS NULL THEN
+    RAISE EXCEPTION 'Not authenticated' USING ERRCODE = '28000';
+  END IF;
+
+  -- One membership check per distinct group in the import
+  SELECT DISTINCT (r->>'group_id')::UUID INTO missing_group
+  FROM jsonb_array_elements(p_rows) r
+  WHERE NOT public.is_group_member((r->>'group_id')::UUID)
+  LIMIT 1;
+
+  IF missing_group IS NOT NULL THEN
+    RAISE EXCEPTION 'You are not a member of group %', missing_group USING ERRCODE = '42501';
+  END IF;
+
+  CREATE TEMP TABLE import_rows ON COMMIT DROP AS
+  SELECT
+    uuid_generate_v4() AS id,
+    t.ordinality AS position,
+    COALESCE((t.r->>'row')::INTEGER, t.ordinality::INTEGER) AS source_row,
+    (t.r->>'group_id')::UUID AS group_id,
+    COALESCE((t.r->>'paid_by_user_id')::UUID, auth.uid()) AS paid_by_user_id,
+    (t.r->>'amount_cents')::BIGINT AS amount_cents,
+    t.r->>'description' AS description,
+    COALESCE(NULLIF(t.r->>'category', ''), 'other') AS category,
+    COALESCE((t.r->>'created_at')::TIMESTAMPTZ, NOW()) AS created_at,
+    t.r->'participants' AS participants
+  FROM jsonb_array_elements(p_rows) WITH ORDINALITY AS t(r, ordinality);
+
+  PERFORM set_config('spliteasy.group_events', 'off', TRUE);
+
+  INSERT INTO public.expenses (id, group_id, paid_by_user_id, amount, description, category, created_at)
+  SELECT id, group_id, paid_by_user_id, amount_cents / 100.0, description, category, created_at
+  FROM import_rows;
+
+  INSERT INTO public.expense_participants (expense_id, user_id, share_amount)
+  SELECT ir.id, (p->>'user_id')::UUID, (p->>'share_cents')::BIGINT / 100.0
+  FROM import_rows ir, jsonb_array_elements(ir.participants) p;
+
+  PERFORM set_config('spliteasy.group_events', 'on', TRUE);
+
+  FOR touched_group IN SELECT DISTINCT ir.group_id FROM import_rows ir LOOP
+    PERFORM public.send_group_resync(touched_group);
+  END LOOP;
+
+  RETURN QUERY SELECT ir.source_row, ir.id FROM import_rows ir ORDER BY ir.position;
+
+  DROP TABLE import_rows;
+END;
+$$;
+
+COMMENT ON FUNCTION public.send_group_event(UUID, TEXT, JSONB) IS 'Broadcasts an event on the private Realtime topic group:<id>; a no-op without Realtime or while a bulk write has events off';
+COMMENT ON FUNCTION public.send_group_resync(UUID) IS 'Sends a resync event to a group the caller belongs to; the only event clients can trigger directly';
+COMMENT ON FUNCTION public.broadcast_expense_change() IS 'Sends an expense event with the row before and after each insert, update or delete';
+COMMENT ON FUNCTION public.broadcast_member_balance_change() IS 'Sends a balance event with the member''s ledger totals after each change';
+COMMENT ON FUNCTION public.import_expenses(JSONB) IS 'Atomically inserts pre-validated expenses (amounts in cents) and their participants for groups the caller belongs to; sends one resync event per group';
@@ -0,0 +1,156 @@
+-- Migration: Per-group version counter
+-- groups.version goes up with every statement that writes a group's expenses,
+-- expense_participants or group_members. Reads of expenses, balances and analytics
+-- check it with one primary-key lookup: it is their ETag, so unchanged data is answered
+-- with 304 before any aggregate runs, and it is part of their cache keys, so a write makes
+-- every cached entry for the group unreachable on every instance without an invalidation.
+-- The triggers are statement-level with transition tables, so a bulk import bumps each
+-- touched group once rather than once per row.
+
+ALTER TABLE public.groups ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1;
+
+-- Row locks are taken in id order so concurrent multi-group statements can't deadlock
+CREATE OR REPLACE FUNCTION public.bump_group_versions(p_group_ids UUID[])
+RETURNS void LANGUAGE sql SECURITY DEFINER SET search_path = public AS $$
+  UPDATE public.groups g
+  SET version = g.version + 1
+  FROM (
+    SELECT id FROM public.groups
+    WHERE id = ANY(p_group_ids)
+    ORDER BY id
+    FOR UPDATE
+  ) locked
+  WHERE g.id = locked.id;
+$$;
+
+CREATE OR REPLACE FUNCTION public.bump_expense_group_versions()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM public.bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM new_rows));
+  ELSIF TG_OP = 'UPDATE' THEN
+    -- A moved expense changes both groups
+    PERFORM public.bump_group_versions(ARRAY(
+      SELECT group_id FROM old_rows UNION SELECT group_id FROM new_rows
+    ));
+  ELSE
+    PERFORM public.bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM old_rows));
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Participant rows reach their group through the expense. Rows cascaded from a deleted
+-- expense find no parent here, but the expense's own trigger has bumped the group.
+CREATE OR REPLACE FUNCTION public.bump_participant_group_versions()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM public.bump_group_versions(ARRAY(
+      SELECT DISTINCT e.group_id FROM new_rows r JOIN public.expenses e ON e.id = r.expense_id
+    ));
+  ELSIF TG_OP = 'UPDATE' THEN
+    PERFORM public.bump_group_versions(ARRAY(
+      SELECT e.group_id FROM old_rows r JOIN public.expenses e ON e.id = r.expense_id
+      UNION
+      SELECT e.group_id FROM new_rows r JOIN public.expenses e ON e.id = r.expense_id
+    ));
+  ELSE
+    PERFORM public.bump_group_versions(ARRAY(
+      SELECT DISTINCT e.group_id FROM old_rows r JOIN public.expenses e ON e.id = r.expense_id
+    ));
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.bump_member_group_versions()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM public.bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM new_rows));
+  ELSIF TG_OP = 'UPDATE' THEN
+    PERFORM public.bump_group_versions(ARRAY(
+      SELECT group_id FROM old_rows UNION SELECT group_id FROM new_rows
+    ));
+  ELSE
+    PERFORM public.bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM old_rows));
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- A trigger with transition tables can fire on only one event, hence three per table
+DROP TRIGGER IF EXISTS expenses_bump_version_insert ON public.expenses;
+CREATE TRIGGER expenses_bump_version_insert
+  AFTER INSERT ON public.expenses
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_expense_group_versions();
+
+DROP TRIGGER IF EXISTS expenses_bump_version_update ON public.expenses;
+CREATE TRIGGER expenses_bump_version_update
+  AFTER UPDATE ON public.expenses
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_expense_group_versions();
+
+DROP TRIGGER IF EXISTS expenses_bump_version_delete ON public.expenses;
+CREATE TRIGGER expenses_bump_version_delete
+  AFTER DELETE ON public.expenses
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_expense_group_versions();
+
+DROP TRIGGER IF EXISTS expense_participants_bump_version_insert ON public.expense_participants;
+CREATE TRIGGER expense_participants_bump_version_insert
+  AFTER INSERT ON public.expense_participants
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_participant_group_versions();
+
+DROP TRIGGER IF EXISTS expense_participants_bump_version_update ON public.expense_participants;
+CREATE TRIGGER expense_participants_bump_version_update
+  AFTER UPDATE ON public.expense_participants
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_participant_group_versions();
+
+DROP TRIGGER IF EXISTS expense_participants_bump_version_delete ON public.expense_participants;
+CREATE TRIGGER expense_participants_bump_version_delete
+  AFTER DELETE ON public.expense_participants
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_participant_group_versions();
+
+DROP TRIGGER IF EXISTS group_members_bump_version_insert ON public.group_members;
+CREATE TRIGGER group_members_bump_version_insert
+  AFTER INSERT ON public.group_members
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_member_group_versions();
+
+DROP TRIGGER IF EXISTS group_members_bump_version_update ON public.group_members;
+CREATE TRIGGER group_members_bump_version_update
+  AFTER UPDATE ON public.group_members
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_member_group_versions();
+
+DROP TRIGGER IF EXISTS group_members_bump_version_delete ON public.group_members;
+CREATE TRIGGER group_members_bump_version_delete
+  AFTER DELETE ON public.group_members
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.bump_member_group_versions();
+
+-- SECURITY DEFINER because the groups policy only shows a group to its creator;
+-- returns NULL unless the caller is a member
+CREATE OR REPLACE FUNCTION public.get_group_version(p_group_id UUID)
+RETURNS BIGINT LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  SELECT g.version
+  FROM public.groups g
+  WHERE g.id = p_group_id AND public.is_group_member(p_group_id);
+$$;
+
+-- Only the triggers above and the service role may bump; Supabase grants new functions
+-- to anon and authenticated directly, so PUBLIC alone would leave them able to
+REVOKE EXECUTE ON FUNCTION public.bump_group_versions(UUID[]) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.get_group_version(UUID) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.bump_group_versions(UUID[]) TO service_role;
+GRANT EXECUTE ON FUNCTION public.get_group_version(UUID) TO authenticated;
+
+COMMENT ON COLUMN public.groups.version IS 'Bumped by every statement writing the group''s expenses, participants or members; used as ETag and cache key version';
+COMMENT ON FUNCTION public.bump_group_versions(UUID[]) IS 'Increments the version of each given group, locking them in id order';
+COMMENT ON FUNCTION public.get_group_version(UUID) IS 'Current version of a group the caller belongs to, or NULL';
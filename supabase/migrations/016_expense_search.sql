@@ -0,0 +1,29 @@
+-- Migration: Expense search
+-- GET /api/expenses/search matches words against an expense's description and category
+-- and filters by payer, participant, amount and date, paging newest first on the same
+-- (created_at, id) keyset as the plain listing.
+--   search_text   lower-cased description and category, generated so it never drifts
+--   trigram GIN   (group_id, search_text) answers substring matches inside one group
+--                 without scanning it; btree_gin lets the UUID share the index
+--   payer btree   keyset order within one payer, so payer-filtered pages are range scans
+-- Participant filters use the existing (expense_id, user_id) index, and amount and date
+-- ranges are checked on the rows the keyset or trigram scan returns.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA extensions;
+CREATE EXTENSION IF NOT EXISTS btree_gin WITH SCHEMA extensions;
+
+ALTER TABLE public.expenses
+  ADD COLUMN IF NOT EXISTS search_text TEXT
+  GENERATED ALWAYS AS (lower(description || ' ' || COALESCE(category, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_expenses_group_search_trgm
+    ON public.expenses USING gin (group_id, search_text extensions.gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_expenses_group_payer_created_at_id
+    ON public.expenses(group_id, paid_by_user_id, created_at DESC, id DESC);
+
+ANALYZE public.expenses;
+
+COMMENT ON COLUMN public.expenses.search_text IS 'lower(description || '' '' || category); generated, matched by expense search';
+COMMENT ON INDEX public.idx_expenses_group_search_trgm IS 'Substring search over a group''s expense descriptions and categories';
+COMMENT ON INDEX public.idx_expenses_group_payer_created_at_id IS 'Keyset pagination of a group''s expenses paid by one member, newest first';
@@ -0,0 +1,70 @@
+-- Migration: Group reads that are the same for every member
+-- get_group_balances and get_group_top_spenders are cached per group and version, and
+-- get_group_balances also feeds the cached settlement plans. As SECURITY INVOKER they
+-- joined profiles through its "own row" policy, so a result depended on who ran it: the
+-- first member to miss the cache saw only their own row (balances) or only their own
+-- name (top spenders), and that view was then served to everyone else.
+-- They now run as SECURITY DEFINER behind an explicit is_group_member check, so every
+-- member gets the same rows and names, non-members get none, and a cached result can be
+-- shared across the group.
+
+CREATE OR REPLACE FUNCTION public.get_group_balances(p_group_id UUID)
+RETURNS TABLE (
+  user_id UUID,
+  full_name TEXT,
+  avatar_url TEXT,
+  paid_cents BIGINT,
+  share_cents BIGINT,
+  balance_cents BIGINT
+) LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  SELECT
+    gm.user_id,
+    p.full_name,
+    p.avatar_url,
+    COALESCE(gmb.paid_cents, 0) AS paid_cents,
+    COALESCE(gmb.share_cents, 0) AS share_cents,
+    COALESCE(gmb.paid_cents, 0) - COALESCE(gmb.share_cents, 0) AS balance_cents
+  FROM public.group_members gm
+  JOIN public.profiles p ON p.id = gm.user_id
+  LEFT JOIN public.group_member_balances gmb
+    ON gmb.group_id = gm.group_id AND gmb.user_id = gm.user_id
+  WHERE gm.group_id = p_group_id
+    AND public.is_group_member(p_group_id)
+  ORDER BY balance_cents DESC;
+$$;
+
+CREATE OR REPLACE FUNCTION public.get_group_top_spenders(
+  p_group_id UUID,
+  p_from DATE DEFAULT NULL,
+  p_to DATE DEFAULT NULL,
+  p_limit INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+  user_id UUID,
+  full_name TEXT,
+  total_cents BIGINT,
+  expense_count BIGINT
+) LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public AS $$
+  SELECT
+    s.user_id,
+    p.full_name,
+    SUM(s.total_cents)::BIGINT,
+    SUM(s.expense_count)::BIGINT
+  FROM public.group_payer_daily_spending s
+  LEFT JOIN public.profiles p ON p.id = s.user_id
+  WHERE s.group_id = p_group_id
+    AND public.is_group_member(p_group_id)
+    AND (p_from IS NULL OR s.day >= p_from)
+    AND (p_to IS NULL OR s.day <= p_to)
+  GROUP BY s.user_id, p.full_name
+  ORDER BY 3 DESC
+  LIMIT p_limit;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.get_group_balances(UUID) FROM PUBLIC, anon;
+REVOKE EXECUTE ON FUNCTION public.get_group_top_spenders(UUID, DATE, DATE, INTEGER) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.get_group_balances(UUID) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.get_group_top_spenders(UUID, DATE, DATE, INTEGER) TO authenticated;
+
+COMMENT ON FUNCTION public.get_group_balances(UUID) IS 'Every member''s paid, share and net balance in cents for a group the caller belongs to; identical for all members';
+COMMENT ON FUNCTION public.get_group_top_spenders(UUID, DATE, DATE, INTEGER) IS 'Biggest payers of a group the caller belongs to, with names; identical for all members';
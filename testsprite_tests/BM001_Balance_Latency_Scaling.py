@@ -0,0 +1,165 @@
+import os
+import re
+import statistics
+import time
+import uuid
+
+import requests
+
+from spliteasy_api import (
+    ANON_KEY,
+    BASE_URL,
+    SERVICE_ROLE_KEY,
+    SUPABASE_URL,
+    admin_session,
+    app_session,
+    cleanup_seed,
+    get_group_balances,
+    rest_insert,
+    seed_group,
+    send,
+)
+
+CRON_SECRET = os.environ.get("CRON_SECRET", "")
+TIMEOUT = 30
+
+MEMBER_COUNTS = [5, 25, 50, 100]
+EXPENSES_PER_MEMBER = 5
+SAMPLES = 15
+# The set-based engine may get a little slower as rows grow, but nowhere near linearly
+# (20x the members); medians with this much headroom don't flip on scheduler noise
+MAX_FLAT_RATIO = 3.0
+# Present when the app runs with SUPABASE_QUERY_STATS=true
+SERVER_TIMING_QUERIES = re.compile(r'(?:^|,)\s*db;[^,]*desc="queries=(\d+)')
+
+
+def seed_balances_group(session, member_count, password):
+    group_id, emails, user_ids = seed_group(session, member_count, password, prefix="bench")
+
+    expenses = rest_insert(session, "expenses", [
+        {
+            "group_id": group_id,
+            "paid_by_user_id": user_ids[i % member_count],
+            "amount": 30,
+            "description": f"Bench expense {i}",
+        }
+        for i in range(member_count * EXPENSES_PER_MEMBER)
+    ])
+
+    # Each expense is split equally between its payer and the next two members
+    participants = []
+    for i, expense in enumerate(expenses):
+        for offset in range(3):
+            participants.append({
+                "expense_id": expense["id"],
+                "user_id": user_ids[(i + offset) % member_count],
+                "share_amount": 10,
+            })
+    rest_insert(session, "expense_participants", participants)
+
+    return group_id, emails, user_ids
+
+
+def invalidate_group(group_id):
+    # Bumps the group's version, so the next read misses the cache and runs the engine
+    resp = requests.delete(
+        f"{BASE_URL}/api/admin/cache",
+        params={"groupId": group_id},
+        headers={"Authorization": f"Bearer {CRON_SECRET}"},
+        timeout=TIMEOUT,
+    )
+    resp.raise_for_status()
+
+
+def balances_route(app, group_id):
+    """Cold GET /api/groups/[groupId]/balances; returns (ms, balances, reported query count)."""
+    invalidate_group(group_id)
+    start = time.perf_counter()
+    resp = send(app, get_group_balances(group_id))
+    elapsed = (time.perf_counter() - start) * 1000
+    assert resp.status_code == 200, f"Balances returned {resp.status_code}: {resp.text[:300]}"
+    match = SERVER_TIMING_QUERIES.search(resp.headers.get("Server-Timing", ""))
+    return elapsed, resp.json(), int(match.group(1)) if match else None
+
+
+def balances_per_member(session, group_id, user_ids):
+    # The query pattern the balances route used before the set-based engine
+    balances = []
+    for user_id in user_ids:
+        paid = session.get(
+            f"{SUPABASE_URL}/rest/v1/expenses",
+            params={"select": "amount", "group_id": f"eq.{group_id}", "paid_by_user_id": f"eq.{user_id}"},
+            timeout=TIMEOUT,
+        )
+        paid.raise_for_status()
+        shares = session.get(
+            f"{SUPABASE_URL}/rest/v1/expense_participants",
+            params={
+                "select": "share_amount,expenses!inner(group_id)",
+                "user_id": f"eq.{user_id}",
+                "expenses.group_id": f"eq.{group_id}",
+            },
+            timeout=TIMEOUT,
+        )
+        shares.raise_for_status()
+        total_paid = sum(float(row["amount"]) for row in paid.json())
+        total_share = sum(float(row["share_amount"]) for row in shares.json())
+        balances.append({"user_id": user_id, "balance": total_paid - total_share})
+    return balances
+
+
+def median_route_latency(app, group_id):
+    timings, queries = [], set()
+    for _ in range(SAMPLES):
+        elapsed, _, query_count = balances_route(app, group_id)
+        timings.append(elapsed)
+        if query_count is not None:
+            queries.add(query_count)
+    return statistics.median(timings), queries
+
+
+def test_balance_latency_scaling():
+    assert SERVICE_ROLE_KEY and ANON_KEY, "SUPABASE_SERVICE_ROLE_KEY and SUPABASE_ANON_KEY must be set to seed benchmark data"
+    assert CRON_SECRET, "CRON_SECRET must be set so each sample can skip the balances cache"
+    session = admin_session()
+    password = uuid.uuid4().hex
+    seeded = []
+    try:
+        results = []
+        for member_count in MEMBER_COUNTS:
+            group_id, emails, user_ids = seed_balances_group(session, member_count, password)
+            seeded.extend(user_ids)
+            app = app_session(emails[0], password)
+            try:
+                # The route must agree with the per-member queries before its timings mean anything
+                _, balances, _ = balances_route(app, group_id)
+                engine = {row["userId"]: row["balanceCents"] for row in balances}
+                legacy = {row["user_id"]: round(row["balance"] * 100) for row in balances_per_member(session, group_id, user_ids)}
+                assert engine == legacy, f"Balance mismatch for {member_count} members"
+
+                median_ms, queries = median_route_latency(app, group_id)
+            finally:
+                app.close()
+            results.append((member_count, median_ms, queries))
+
+        print(f"{'members':>8} {'median ms':>10} {'queries':>8}")
+        for member_count, median_ms, queries in results:
+            print(f"{member_count:>8} {median_ms:>10.1f} {','.join(map(str, sorted(queries))) or '-':>8}")
+
+        # Query counts are exact, so they are the primary check when the app reports them
+        reported = [queries for _, _, queries in results if queries]
+        if reported:
+            counts = set().union(*reported)
+            assert len(counts) == 1, f"Balances query count varies with group size: {sorted(counts)}"
+
+        smallest, largest = results[0][1], results[-1][1]
+        assert largest / smallest < MAX_FLAT_RATIO, (
+            f"Balances route grew from {smallest:.1f}ms to {largest:.1f}ms "
+            f"between {MEMBER_COUNTS[0]} and {MEMBER_COUNTS[-1]} members"
+        )
+    finally:
+        cleanup_seed(session, seeded)
+        session.close()
+
+
+test_balance_latency_scaling()
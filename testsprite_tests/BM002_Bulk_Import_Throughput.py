@@ -0,0 +1,124 @@
+import json
+import os
+import time
+import uuid
+
+from spliteasy_api import (
+    ANON_KEY,
+    BASE_URL,
+    SERVICE_ROLE_KEY,
+    SUPABASE_URL,
+    admin_session,
+    app_session,
+    cleanup_seed,
+    seed_group,
+)
+
+TIMEOUT = 300
+
+IMPORT_ROWS = int(os.environ.get("IMPORT_ROWS", "5000"))
+MEMBER_COUNT = 4
+# Deliberately broken rows mixed into each import; they must be reported, not imported
+INVALID_EVERY = 500
+MIN_ROWS_PER_SECOND = float(os.environ.get("MIN_ROWS_PER_SECOND", "500"))
+
+
+def generate_records(group_id, user_ids, count):
+    for i in range(count):
+        if i % INVALID_EVERY == INVALID_EVERY - 1:
+            yield {"groupId": group_id, "amount": -5, "description": f"Invalid {i}", "participants": []}
+            continue
+        participants = [user_ids[(i + offset) % len(user_ids)] for offset in range(3)]
+        yield {
+            "groupId": group_id,
+            "amount": 30,
+            "description": f"Imported expense {i}",
+            "category": ["food", "transport", "other"][i % 3],
+            "paidByUserId": user_ids[i % len(user_ids)],
+            "createdAt": f"2025-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}T12:00:00Z",
+            "participants": [{"userId": user_id, "shareAmount": 10} for user_id in participants],
+        }
+
+
+def jsonl_body(records):
+    # A generator body is sent with chunked transfer encoding, so the server parses while we upload
+    for record in records:
+        yield (json.dumps(record) + "\n").encode()
+
+
+def csv_body(records):
+    yield b"group_id,amount,description,category,paid_by_user_id,created_at,participants\n"
+    for record in records:
+        participants = ";".join(f"{p['userId']}:{p['shareAmount']}" for p in record["participants"])
+        fields = [
+            record["groupId"],
+            str(record["amount"]),
+            '"' + record["description"].replace('"', '""') + '"',
+            record.get("category", ""),
+            record.get("paidByUserId", ""),
+            record.get("createdAt", ""),
+            participants,
+        ]
+        yield (",".join(fields) + "\n").encode()
+
+
+def run_import(session, group_id, user_ids, fmt):
+    records = generate_records(group_id, user_ids, IMPORT_ROWS)
+    body = csv_body(records) if fmt == "csv" else jsonl_body(records)
+    content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+    start = time.perf_counter()
+    resp = session.post(
+        f"{BASE_URL}/api/expenses/import",
+        data=body,
+        headers={"Content-Type": content_type},
+        timeout=TIMEOUT,
+    )
+    elapsed = time.perf_counter() - start
+    assert resp.status_code == 201, f"{fmt} import returned {resp.status_code}: {resp.text[:500]}"
+    return resp.json(), elapsed
+
+
+def count_expenses(session, group_id):
+    resp = session.get(
+        f"{SUPABASE_URL}/rest/v1/expenses",
+        params={"select": "id", "group_id": f"eq.{group_id}"},
+        headers={"Prefer": "count=exact", "Range": "0-0"},
+        timeout=TIMEOUT,
+    )
+    resp.raise_for_status()
+    return int(resp.headers["Content-Range"].split("/")[1])
+
+
+def test_bulk_import_throughput():
+    assert SERVICE_ROLE_KEY and ANON_KEY, "SUPABASE_SERVICE_ROLE_KEY and SUPABASE_ANON_KEY must be set"
+    admin = admin_session()
+    password = uuid.uuid4().hex
+    user_ids = []
+    try:
+        group_id, emails, user_ids = seed_group(admin, MEMBER_COUNT, password, prefix="import")
+        session = app_session(emails[0], password)
+
+        expected_invalid = IMPORT_ROWS // INVALID_EVERY
+        expected_valid = IMPORT_ROWS - expected_invalid
+        total_imported = 0
+
+        print(f"{'format':>7} {'rows':>7} {'imported':>9} {'failed':>7} {'seconds':>8} {'rows/s':>9}")
+        for fmt in ("jsonl", "csv"):
+            result, elapsed = run_import(session, group_id, user_ids, fmt)
+            rate = IMPORT_ROWS / elapsed
+            print(f"{fmt:>7} {IMPORT_ROWS:>7} {result['imported']:>9} {result['failed']:>7} {elapsed:>8.2f} {rate:>9.0f}")
+
+            assert result["imported"] == expected_valid, f"{fmt}: expected {expected_valid} imported rows, got {result['imported']}"
+            assert result["failed"] == expected_invalid, f"{fmt}: expected {expected_invalid} failed rows, got {result['failed']}"
+            assert all(error["error"] == "Amount must be greater than 0" for error in result["errors"]), f"{fmt}: unexpected row errors"
+            assert rate >= MIN_ROWS_PER_SECOND, f"{fmt} import ran at {rate:.0f} rows/s, below {MIN_ROWS_PER_SECOND:.0f}"
+
+            total_imported += result["imported"]
+            assert count_expenses(admin, group_id) == total_imported, f"{fmt}: database row count does not match the import report"
+    finally:
+        cleanup_seed(admin, user_ids)
+        admin.close()
+
+
+test_bulk_import_throughput()
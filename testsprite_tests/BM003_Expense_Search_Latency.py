@@ -0,0 +1,92 @@
+import os
+import re
+import time
+
+from dataset_generator import DEFAULT_PASSWORD, DEFAULT_SEED, load_manifest
+from load_generator import percentile
+from spliteasy_api import app_session, search_expenses, send
+
+# Load the data set first: python testsprite_tests/dataset_generator.py --preset large
+# (medium's largest group stays just under MIN_GROUP_EXPENSES)
+PRESET = os.environ.get("DATASET_PRESET", "large")
+SEED = int(os.environ.get("DATASET_SEED", str(DEFAULT_SEED)))
+MIN_GROUP_EXPENSES = 100_000
+SAMPLES = int(os.environ.get("SEARCH_SAMPLES", "30"))
+WARMUP = 3
+MAX_SEARCH_MS = float(os.environ.get("MAX_SEARCH_MS", "50"))
+# Present when the app runs with SUPABASE_QUERY_STATS=true
+SERVER_TIMING_DB = re.compile(r'(?:^|,)\s*db;dur=([\d.]+)')
+
+
+def search_cases(group):
+    member = group["memberId"]
+    return {
+        "common word": {"q": "dinner"},
+        "rare word": {"q": "ferry"},
+        "two words": {"q": "train tickets"},
+        "prefix": {"q": "groc"},
+        "category": {"category": "accommodation"},
+        "payer": {"paidBy": member},
+        "participant": {"participant": member},
+        "amount range": {"minAmount": "100", "maxAmount": "250"},
+        "date range": {"from_": "2025-03-01", "to": "2025-03-31"},
+        "combined": {"q": "taxi", "participant": member, "minAmount": "10", "from_": "2025-01-01"},
+    }
+
+
+def timed(session, request):
+    start = time.perf_counter()
+    resp = send(session, request)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert resp.status_code == 200, f"{request.path} returned {resp.status_code}: {resp.text[:300]}"
+    match = SERVER_TIMING_DB.search(resp.headers.get("Server-Timing", ""))
+    return elapsed, float(match.group(1)) if match else None, resp.json()
+
+
+def p95_latency(session, request):
+    for _ in range(WARMUP):
+        timed(session, request)
+    totals, db_times = [], []
+    for _ in range(SAMPLES):
+        total_ms, db_ms, _ = timed(session, request)
+        totals.append(total_ms)
+        if db_ms is not None:
+            db_times.append(db_ms)
+    return percentile(sorted(totals), 95), percentile(sorted(db_times), 95) if db_times else None
+
+
+def test_expense_search_latency():
+    group = load_manifest(PRESET, SEED)["groups"]["largest"]
+    assert group["expenses"] >= MIN_GROUP_EXPENSES, (
+        f"The largest {PRESET} group has {group['expenses']} expenses; "
+        f"load a preset with at least {MIN_GROUP_EXPENSES} in one group"
+    )
+    session = app_session(group["memberEmail"], DEFAULT_PASSWORD)
+    try:
+        results = []
+        for name, filters in search_cases(group).items():
+            request = search_expenses(group["id"], **filters)
+            _, _, page = timed(session, request)
+            results.append((name, len(page["expenses"]), *p95_latency(session, request)))
+
+            # The second page must be as cheap as the first
+            if page["nextCursor"]:
+                request = search_expenses(group["id"], cursor=page["nextCursor"], **filters)
+                _, _, next_page = timed(session, request)
+                seen = {item["id"] for item in page["expenses"]}
+                assert not seen & {item["id"] for item in next_page["expenses"]}, f"{name}: pages overlap"
+                results.append((f"{name} page 2", len(next_page["expenses"]), *p95_latency(session, request)))
+
+        print(f"{group['expenses']} expenses in group {group['id']}")
+        print(f"{'case':<24} {'rows':>5} {'p95 ms':>8} {'db p95 ms':>10}")
+        for name, rows, total_ms, db_ms in results:
+            db = f"{db_ms:.1f}" if db_ms is not None else "-"
+            print(f"{name:<24} {rows:>5} {total_ms:>8.1f} {db:>10}")
+
+        slow = [f"{name} ({total_ms:.1f}ms)" for name, _, total_ms, _ in results if total_ms >= MAX_SEARCH_MS]
+        assert not slow, f"Search p95 over {MAX_SEARCH_MS:.0f}ms: {', '.join(slow)}"
+    finally:
+        session.close()
+
+
+test_expense_search_latency()
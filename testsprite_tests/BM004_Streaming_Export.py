@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+import os
+import time
+
+import requests
+
+from dataset_generator import DEFAULT_PASSWORD, DEFAULT_SEED, load_manifest
+from spliteasy_api import BASE_URL, app_session
+
+# Load the data set first: python testsprite_tests/dataset_generator.py --preset medium
+PRESET = os.environ.get("DATASET_PRESET", "medium")
+SEED = int(os.environ.get("DATASET_SEED", str(DEFAULT_SEED)))
+CRON_SECRET = os.environ.get("CRON_SECRET", "")
+TIMEOUT = 300
+
+# Split lines per second, counted on the client as they arrive
+MIN_ROWS_PER_SECOND = float(os.environ.get("MIN_ROWS_PER_SECOND", "5000"))
+# Peak RSS above the level at the start of the export; a buffered export of the
+# medium preset's largest group needs several times this
+MAX_MEMORY_GROWTH_MB = float(os.environ.get("MAX_MEMORY_GROWTH_MB", "64"))
+# The slow reader takes this long per chunk, so the server has to wait on it
+SLOW_CHUNK_BYTES = 16 * 1024
+SLOW_CHUNK_DELAY = 0.05
+SLOW_READ_SECONDS = 5
+COLUMNS = 11
+
+
+def memory_stats(reset=False):
+    resp = requests.get(
+        f"{BASE_URL}/api/admin/memory-stats",
+        params={"reset": "true"} if reset else None,
+        headers={"Authorization": f"Bearer {CRON_SECRET}"},
+        timeout=30,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def start_window():
+    # The reset response still describes the old window; its current sample is the new baseline
+    return memory_stats(reset=True)["current"]["rss"]
+
+
+def growth_mb(baseline):
+    return (memory_stats()["peak"]["rss"] - baseline) / (1024 * 1024)
+
+
+def open_export(session, group_id, fmt):
+    resp = session.get(
+        f"{BASE_URL}/api/expenses/export",
+        params={"groupId": group_id, "format": fmt},
+        stream=True,
+        timeout=TIMEOUT,
+    )
+    assert resp.status_code == 200, f"{fmt} export returned {resp.status_code}: {resp.text[:300]}"
+    assert "attachment" in resp.headers.get("Content-Disposition", "")
+    resp.raw.decode_content = True
+    return resp
+
+
+def read_export(resp, fmt):
+    """Parses the stream as it arrives; returns (split rows, distinct expense ids)."""
+    text = io.TextIOWrapper(resp.raw, encoding="utf-8", newline="")
+    expense_ids = set()
+    rows = 0
+    if fmt == "csv":
+        reader = csv.reader(text)
+        header = next(reader)
+        assert len(header) == COLUMNS and header[0] == "expenseId", f"Unexpected CSV header: {header}"
+        for record in reader:
+            assert len(record) == COLUMNS, f"CSV row {rows + 2} has {len(record)} columns"
+            expense_ids.add(record[0])
+            rows += 1
+    else:
+        for line in text:
+            record = json.loads(line)
+            assert len(record) == COLUMNS, f"JSONL line {rows + 1} has {len(record)} keys"
+            expense_ids.add(record["expenseId"])
+            rows += 1
+    return rows, expense_ids
+
+
+def test_streaming_export():
+    assert CRON_SECRET, "CRON_SECRET must be set to read the server's memory stats"
+    groups = load_manifest(PRESET, SEED)["groups"]
+    largest = groups["largest"]
+    session = app_session(largest["memberEmail"], DEFAULT_PASSWORD)
+    try:
+        results = []
+        for fmt in ["csv", "jsonl"]:
+            baseline = start_window()
+            start = time.perf_counter()
+            with open_export(session, largest["id"], fmt) as resp:
+                rows, expense_ids = read_export(resp, fmt)
+            elapsed = time.perf_counter() - start
+            growth = growth_mb(baseline)
+            results.append((fmt, rows, elapsed, rows / elapsed, growth))
+
+            # Every expense is exported exactly once, whatever the batch boundaries
+            assert len(expense_ids) == largest["expenses"], (
+                f"{fmt} export has {len(expense_ids)} expenses, the group has {largest['expenses']}"
+            )
+            assert rows >= len(expense_ids)
+
+        # A reader that stalls must hold the server back, not make it buffer the rest
+        baseline = start_window()
+        received = 0
+        with open_export(session, largest["id"], "csv") as resp:
+            deadline = time.perf_counter() + SLOW_READ_SECONDS
+            while time.perf_counter() < deadline:
+                chunk = resp.raw.read(SLOW_CHUNK_BYTES)
+                if not chunk:
+                    break
+                received += len(chunk)
+                time.sleep(SLOW_CHUNK_DELAY)
+            slow_growth = growth_mb(baseline)
+
+        print(f"{largest['expenses']} expenses in group {largest['id']}")
+        print(f"{'format':<8} {'rows':>9} {'seconds':>8} {'rows/s':>9} {'peak +MB':>9}")
+        for fmt, rows, elapsed, rate, growth in results:
+            print(f"{fmt:<8} {rows:>9} {elapsed:>8.1f} {rate:>9.0f} {growth:>9.1f}")
+        print(f"{'slow':<8} {received // 1024:>8}K {SLOW_READ_SECONDS:>8} {'-':>9} {slow_growth:>9.1f}")
+
+        for fmt, _, _, rate, growth in results:
+            assert rate >= MIN_ROWS_PER_SECOND, f"{fmt} export ran at {rate:.0f} rows/s, below {MIN_ROWS_PER_SECOND:.0f}"
+            assert growth <= MAX_MEMORY_GROWTH_MB, f"{fmt} export grew server memory by {growth:.1f}MB"
+        assert slow_growth <= MAX_MEMORY_GROWTH_MB, f"A slow reader grew server memory by {slow_growth:.1f}MB"
+    finally:
+        session.close()
+
+
+test_streaming_export()
@@ -1,4 +1,5 @@
 import requests
+import uuid
 from requests.exceptions import RequestException
 
 BASE_URL = "http://localhost:3000"
@@ -16,7 +17,7 @@ def authenticate_user():
 
     login_url = f"{BASE_URL}/api/auth/login"
     login_payload = {
-        "email": "testuser@example.com"
+        "email": f"testuser_{uuid.uuid4().hex[:12]}@example.com"
     }
     headers = {
         "Content-Type": "application/json"
@@ -42,7 +43,7 @@ def create_group(auth_cookies, auth_token):
         headers["Authorization"] = f"Bearer {auth_token}"
 
     payload = {
-        "name": "Test Group for TC007"
+        "name": f"Test Group for TC007 {uuid.uuid4()}"
     }
     try:
         resp = requests.post(url, json=payload, headers=headers, cookies=auth_cookies, timeout=TIMEOUT)
@@ -1,4 +1,5 @@
 import requests
+import uuid
 
 BASE_URL = "http://localhost:3000"
 TIMEOUT = 30
@@ -44,8 +45,8 @@ def test_prevent_unauthorized_access_to_group_balances():
         return group_id
 
     # LOGIN: create two users
-    user_member_email = "member_testuser@example.com"
-    user_nonmember_email = "nonmember_testuser@example.com"
+    user_member_email = f"member_{uuid.uuid4().hex[:12]}@example.com"
+    user_nonmember_email = f"nonmember_{uuid.uuid4().hex[:12]}@example.com"
 
     # Login users and get their tokens
     token_member = login_user(user_member_email)
@@ -54,7 +55,7 @@ def test_prevent_unauthorized_access_to_group_balances():
     # Create a group with member user
     group_id = None
     try:
-        group_id = create_group(token_member)
+        group_id = create_group(token_member, f"Test Group Unauthorized Access {uuid.uuid4()}")
 
         # Non-member tries to access balances of the group
         headers_nonmember = {"Authorization": f"Bearer {token_nonmember}"}
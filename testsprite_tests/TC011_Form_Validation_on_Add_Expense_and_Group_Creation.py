@@ -1,4 +1,5 @@
 import requests
+import uuid
 
 BASE_URL = "http://localhost:3000"
 TIMEOUT = 30
@@ -36,7 +37,7 @@ def test_form_validation_add_expense_and_group_creation():
     # 2. Test Add Expense Validation
 
     # First, create a valid group to test adding expense within it
-    valid_group_payload = {"name": "Test Group for Expense Validation"}
+    valid_group_payload = {"name": f"Test Group for Expense Validation {uuid.uuid4()}"}
     create_group_resp = session.post(f"{BASE_URL}/groups", json=valid_group_payload, headers=headers, timeout=TIMEOUT)
     assert create_group_resp.status_code == 201 or create_group_resp.status_code == 200, "Failed to create group for expense tests"
     try:
@@ -0,0 +1,145 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+import requests
+
+TIMEOUT = 30
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CRON_SECRET = os.environ.get("CRON_SECRET", f"test-{uuid.uuid4()}")
+# Point these at already-running instances to skip spawning them (they must share REDIS_URL and
+# CRON_SECRET, and run with CACHE_TEST_WRITES=true so test: keys can be warmed)
+NODE_A_URL = os.environ.get("NODE_A_URL")
+NODE_B_URL = os.environ.get("NODE_B_URL")
+PROPAGATION_TIMEOUT = 5
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until(predicate, timeout, message):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if predicate():
+                return
+        except (requests.RequestException, OSError):
+            pass
+        time.sleep(0.1)
+    raise AssertionError(message)
+
+
+def start_standin(port):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_ROOT, "testsprite_tests", "resp_standin.py"), "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+    )
+    wait_until(lambda: socket.create_connection(("127.0.0.1", port), timeout=1).close() or True, 10, "RESP stand-in did not start")
+    return process
+
+
+def start_node(port, redis_port):
+    # Requires a production build (`npm run build`) in the project root
+    env = dict(
+        os.environ,
+        CACHE_BACKEND="redis",
+        REDIS_URL=f"redis://127.0.0.1:{redis_port}",
+        CRON_SECRET=CRON_SECRET,
+        CACHE_TEST_WRITES="true",
+    )
+    process = subprocess.Popen(
+        ["npx", "next", "start", "-p", str(port)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # npx spawns the real server as a child; a session lets cleanup stop both
+        start_new_session=True,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    wait_until(lambda: cache_stats(base_url).status_code == 200, 60, f"Next.js node on port {port} did not start")
+    return process, base_url
+
+
+def admin_headers():
+    return {"Authorization": f"Bearer {CRON_SECRET}", "Content-Type": "application/json"}
+
+
+def cache_stats(base_url):
+    return requests.get(f"{base_url}/api/admin/cache-stats", headers=admin_headers(), timeout=TIMEOUT)
+
+
+def warm_key(base_url, key):
+    resp = requests.put(f"{base_url}/api/admin/cache", json={"key": key, "value": {"warmed": True}, "ttl": 60000}, headers=admin_headers(), timeout=TIMEOUT)
+    resp.raise_for_status()
+
+
+def has_key(base_url, key):
+    resp = requests.get(f"{base_url}/api/admin/cache", params={"key": key}, headers=admin_headers(), timeout=TIMEOUT)
+    resp.raise_for_status()
+    return resp.json()["present"]
+
+
+def invalidate_keys(base_url, keys):
+    # Dropped together with a single invalidation message to the other nodes
+    resp = requests.delete(f"{base_url}/api/admin/cache", params={"key": keys}, headers=admin_headers(), timeout=TIMEOUT)
+    resp.raise_for_status()
+
+
+def test_cross_node_cache_invalidation():
+    processes = []
+    try:
+        if NODE_A_URL and NODE_B_URL:
+            node_a, node_b = NODE_A_URL, NODE_B_URL
+        else:
+            redis_port = free_port()
+            processes.append(start_standin(redis_port))
+            process_a, node_a = start_node(free_port(), redis_port)
+            processes.append(process_a)
+            process_b, node_b = start_node(free_port(), redis_port)
+            processes.append(process_b)
+
+        assert cache_stats(node_a).json()["backend"] == "redis", "Node A is not using the shared cache backend"
+        assert cache_stats(node_b).json()["backend"] == "redis", "Node B is not using the shared cache backend"
+
+        group_id = str(uuid.uuid4())
+        # The admin endpoint only writes test: keys; they are invalidated like any other
+        group_keys = [f"test:group:{group_id}", f"test:expenses:{group_id}:v1", f"test:balances:{group_id}:v1", f"test:analytics:{group_id}:v1"]
+        unrelated_key = f"test:balances:{uuid.uuid4()}:v1"
+
+        # Both nodes hold the group's entries in their local stores
+        for node in (node_a, node_b):
+            for key in group_keys + [unrelated_key]:
+                warm_key(node, key)
+                assert has_key(node, key), f"{key} was not cached on {node}"
+
+        # Invalidating on node A must drop the entries on node B too
+        invalidate_keys(node_a, group_keys)
+
+        for key in group_keys:
+            assert not has_key(node_a, key), f"{key} still cached on node A after local invalidation"
+            wait_until(lambda: not has_key(node_b, key), PROPAGATION_TIMEOUT, f"{key} still cached on node B after invalidation on node A")
+
+        # Other groups' entries are untouched
+        assert has_key(node_a, unrelated_key), "Unrelated key was dropped on node A"
+        assert has_key(node_b, unrelated_key), "Unrelated key was dropped on node B"
+    finally:
+        for process in reversed(processes):
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except (PermissionError, ProcessLookupError):
+                process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+test_cross_node_cache_invalidation()
@@ -0,0 +1,99 @@
+import json
+import queue
+import threading
+import time
+import uuid
+
+from spliteasy_api import (
+    ANON_KEY,
+    BASE_URL,
+    SERVICE_ROLE_KEY,
+    add_expense,
+    admin_session,
+    app_session,
+    cleanup_seed,
+    seed_group,
+    send,
+)
+
+MEMBER_COUNT = 3
+# How long a committed expense may take to reach an open group page
+DELIVERY_TIMEOUT = 5
+
+
+def read_events(session, group_id, events, ready):
+    """Reads the group's SSE stream on a background thread, putting each parsed event on `events`."""
+    with session.get(f"{BASE_URL}/api/groups/{group_id}/events", stream=True, timeout=(10, None)) as resp:
+        assert resp.status_code == 200, f"Event stream returned {resp.status_code}"
+        assert resp.headers["Content-Type"].startswith("text/event-stream")
+        name, data = None, []
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                name = line[6:].strip()
+            elif line.startswith("data:"):
+                data.append(line[5:].strip())
+            elif line == "" and name:
+                if name == "ready":
+                    ready.set()
+                else:
+                    events.put(json.loads("\n".join(data)))
+                name, data = None, []
+
+
+def collect(events, predicate, timeout):
+    deadline = time.monotonic() + timeout
+    matched = []
+    while time.monotonic() < deadline:
+        try:
+            event = events.get(timeout=max(deadline - time.monotonic(), 0.01))
+        except queue.Empty:
+            break
+        if predicate(event):
+            matched.append(event)
+    return matched
+
+
+def test_realtime_group_events():
+    assert SERVICE_ROLE_KEY and ANON_KEY, "SUPABASE_SERVICE_ROLE_KEY and SUPABASE_ANON_KEY must be set"
+    admin = admin_session()
+    password = uuid.uuid4().hex
+    user_ids = []
+    try:
+        group_id, emails, user_ids = seed_group(admin, MEMBER_COUNT, password, prefix="events")
+        payer = app_session(emails[0], password)
+        watcher = app_session(emails[1], password)
+
+        # Outsiders can't open the stream
+        _, outsider_emails, outsider_ids = seed_group(admin, 1, password, prefix="events")
+        user_ids += outsider_ids
+        resp = app_session(outsider_emails[0], password).get(f"{BASE_URL}/api/groups/{group_id}/events", timeout=10)
+        assert resp.status_code == 403, f"Non-member stream returned {resp.status_code}"
+
+        events = queue.Queue()
+        ready = threading.Event()
+        threading.Thread(target=read_events, args=(watcher, group_id, events, ready), daemon=True).start()
+        assert ready.wait(10), "Event stream never became ready"
+
+        description = f"Realtime {uuid.uuid4().hex[:8]}"
+        resp = send(payer, add_expense(group_id, 30.01, description, user_ids[:MEMBER_COUNT]))
+        assert resp.status_code == 201, f"Expense creation returned {resp.status_code}: {resp.text[:300]}"
+        expense_id = resp.json()["id"]
+
+        received = collect(events, lambda event: event["type"] in ("expense", "balance"), DELIVERY_TIMEOUT)
+        expense_events = [event for event in received if event["type"] == "expense"]
+        assert len(expense_events) == 1, f"Expected one expense event, got {expense_events}"
+        delta = expense_events[0]
+        assert delta["action"] == "insert" and delta["previous"] is None
+        assert delta["expense"]["id"] == expense_id
+        assert delta["expense"]["amountCents"] == 3001
+        assert delta["expense"]["description"] == description
+
+        # Shares are 1001/1000/1000 cents and the first member paid all of it
+        balances = {event["userId"]: event["balanceCents"] for event in received if event["type"] == "balance"}
+        assert balances == {user_ids[0]: 2000, user_ids[1]: -1000, user_ids[2]: -1000}, f"Unexpected balance events: {balances}"
+    finally:
+        cleanup_seed(admin, user_ids)
+        admin.close()
+
+
+test_realtime_group_events()
@@ -0,0 +1,67 @@
+import uuid
+
+from spliteasy_api import (
+    ANON_KEY,
+    BASE_URL,
+    SERVICE_ROLE_KEY,
+    add_expense,
+    admin_session,
+    app_session,
+    cleanup_seed,
+    get_group_analytics,
+    get_group_balances,
+    list_expenses,
+    seed_group,
+    send,
+)
+
+TIMEOUT = 30
+MEMBER_COUNT = 2
+
+
+def conditional_get(session, request, etag):
+    return session.get(f"{BASE_URL}{request.path}", headers={"If-None-Match": etag}, timeout=TIMEOUT)
+
+
+def test_conditional_group_reads():
+    assert SERVICE_ROLE_KEY and ANON_KEY, "SUPABASE_SERVICE_ROLE_KEY and SUPABASE_ANON_KEY must be set"
+    admin = admin_session()
+    password = uuid.uuid4().hex
+    user_ids = []
+    try:
+        group_id, emails, user_ids = seed_group(admin, MEMBER_COUNT, password, prefix="etag")
+        session = app_session(emails[0], password)
+        reads = [list_expenses(group_id), get_group_balances(group_id), get_group_analytics(group_id)]
+
+        etags = {}
+        for request in reads:
+            resp = send(session, request)
+            assert resp.status_code == 200, f"{request.endpoint} returned {resp.status_code}"
+            etag = resp.headers.get("ETag")
+            assert etag, f"{request.endpoint} sent no ETag"
+            assert "no-cache" in resp.headers.get("Cache-Control", ""), f"{request.endpoint} may be reused without revalidation"
+            etags[request.endpoint] = etag
+
+            # Unchanged group: the client's copy is still current
+            resp = conditional_get(session, request, etag)
+            assert resp.status_code == 304, f"{request.endpoint} returned {resp.status_code} for a current ETag"
+            assert not resp.content, f"{request.endpoint} sent a body with 304"
+            assert resp.headers.get("ETag") == etag
+
+        resp = send(session, add_expense(group_id, 12.5, "Conditional read", user_ids))
+        assert resp.status_code == 201, f"Expense creation returned {resp.status_code}: {resp.text[:300]}"
+
+        # Every read sees the write: the old tag no longer matches and the body is fresh
+        for request in reads:
+            resp = conditional_get(session, request, etags[request.endpoint])
+            assert resp.status_code == 200, f"{request.endpoint} returned {resp.status_code} for a stale ETag"
+            assert resp.headers.get("ETag") != etags[request.endpoint], f"{request.endpoint} ETag did not change after a write"
+
+        balances = {row["userId"]: row["balanceCents"] for row in send(session, get_group_balances(group_id)).json()}
+        assert balances == {user_ids[0]: 625, user_ids[1]: -625}, f"Balances are stale after the write: {balances}"
+    finally:
+        cleanup_seed(admin, user_ids)
+        admin.close()
+
+
+test_conditional_group_reads()
@@ -0,0 +1,280 @@
+"""Latency and query-count baselines for the main read endpoints.
+
+Times each read path through its HTTP route against a dataset loaded by
+dataset_generator.py, for the largest, median and smallest group of a preset:
+
+    getGroupBalances   GET /api/groups/[groupId]/balances
+    getGroupAnalytics  GET /api/groups/[groupId]/analytics
+    expenses list      GET /api/expenses
+    getGroupsServer    GET /api/groups
+    dashboard summary  GET /api/dashboard/summary
+
+Every case runs warm and, when CRON_SECRET is set, cold (the group's or user's
+cache entries are invalidated through /api/admin/cache before each sample).
+Query counts come from the app's Server-Timing header when it runs with
+SUPABASE_QUERY_STATS=true, else from supabase_standin.py's request counters when
+the app points at a stand-in, and are left out otherwise.
+
+    python testsprite_tests/dataset_generator.py --preset small --rest
+    python testsprite_tests/benchmark_suite.py --preset small --record
+    python testsprite_tests/benchmark_suite.py --preset small --compare --threshold 0.2
+
+--record writes testsprite_tests/baselines/<preset>.json. --compare exits
+non-zero when a case's p95 latency or query count regresses against it by more
+than the threshold, and with status 2 when the preset has no baseline yet.
+Baselines are machine-specific: record them on the machine that runs --compare
+(usually CI) and commit them, as described in testsprite_tests/baselines/README.md.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import requests
+
+import spliteasy_api as api
+from dataset_generator import DEFAULT_PASSWORD, DEFAULT_SEED, PRESETS, load_manifest
+from load_generator import percentile
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(TESTS_DIR, "baselines")
+STATS_URL = f"{api.SUPABASE_URL}/standin/v1/stats"
+CRON_SECRET = os.environ.get("CRON_SECRET", "")
+
+GROUPS = ["largest", "median", "smallest"]
+# name -> (request builder taking the manifest group, cache key to invalidate for a cold sample)
+ENDPOINTS = {
+    "balances": (lambda group: api.get_group_balances(group["id"]), lambda group: {"groupId": group["id"]}),
+    "analytics": (lambda group: api.get_group_analytics(group["id"]), lambda group: {"groupId": group["id"]}),
+    "expenses": (lambda group: api.list_expenses(group["id"]), lambda group: {"groupId": group["id"]}),
+    "groups": (lambda group: api.list_groups(), lambda group: {"key": f"groups:{group['memberId']}"}),
+    "summary": (lambda group: api.get_dashboard_summary(), lambda group: {"key": f"groups:{group['memberId']}:summary"}),
+}
+
+DEFAULT_SAMPLES = 30
+DEFAULT_WARMUP = 3
+DEFAULT_THRESHOLD = 0.2
+# Sub-millisecond jitter on fast cases is not a regression
+DEFAULT_MIN_DELTA_MS = 5.0
+# The summary entry the app adds with SUPABASE_QUERY_STATS=true: db;dur=..;desc="queries=3 auth=1 rows=57"
+SERVER_TIMING_DB = re.compile(r'(?:^|,)\s*db;[^,]*desc="queries=(\d+) auth=(\d+)')
+
+
+class QueryCounter:
+    """Reads and resets the stand-in's per-API request counters; disabled against real Supabase."""
+
+    def __init__(self):
+        self.session = api.admin_session()
+        try:
+            self.enabled = self.session.delete(STATS_URL, timeout=api.TIMEOUT).status_code == 200
+        except requests.RequestException:
+            self.enabled = False
+
+    def take(self):
+        if not self.enabled:
+            return None
+        resp = self.session.delete(STATS_URL, timeout=api.TIMEOUT)
+        resp.raise_for_status()
+        return resp.json()
+
+    def close(self):
+        self.session.close()
+
+
+def invalidate(base_url, params):
+    resp = requests.delete(
+        f"{base_url}/api/admin/cache",
+        params=params,
+        headers={"Authorization": f"Bearer {CRON_SECRET}"},
+        timeout=api.TIMEOUT,
+    )
+    resp.raise_for_status()
+
+
+def server_timing_counts(resp):
+    match = SERVER_TIMING_DB.search(resp.headers.get("Server-Timing", ""))
+    return {"queries": int(match.group(1)), "auth": int(match.group(2))} if match else None
+
+
+def measure(session, request, base_url):
+    """Returns the latency in ms and the app's own query counts, if it reports them."""
+    start = time.perf_counter()
+    # Redirects are failures here: pages answer a lost session with one to /login
+    resp = session.request(request.method, f"{base_url}{request.path}", json=request.body, timeout=api.TIMEOUT, allow_redirects=False)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert resp.status_code == 200, f"{request.endpoint} returned {resp.status_code}: {resp.text[:300]}"
+    return elapsed_ms, server_timing_counts(resp)
+
+
+def run_case(session, counter, base_url, group, endpoint, cache_state, samples, warmup):
+    build_request, invalidation = ENDPOINTS[endpoint]
+    request = build_request(group)
+
+    # Unmeasured requests compile the route in dev builds and fill the cache for warm runs
+    for _ in range(warmup):
+        measure(session, request, base_url)
+
+    latencies, queries, auth_calls = [], [], []
+    for _ in range(samples):
+        if cache_state == "cold":
+            invalidate(base_url, invalidation(group))
+        counter.take()
+        elapsed_ms, reported = measure(session, request, base_url)
+        counted = counter.take()
+        latencies.append(elapsed_ms)
+        if reported is not None:
+            queries.append(reported["queries"])
+            auth_calls.append(reported["auth"])
+        elif counted is not None:
+            queries.append(counted["rest"] + counted["rpc"])
+            auth_calls.append(counted["auth"])
+
+    latencies.sort()
+    return {
+        "endpoint": request.endpoint,
+        "samples": samples,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "max_ms": round(latencies[-1], 2),
+        # The median request's count, so a rare background refresh doesn't move it
+        "queries": int(statistics.median(queries)) if queries else None,
+        "authCalls": int(statistics.median(auth_calls)) if auth_calls else None,
+    }
+
+
+def run_suite(options, manifest):
+    cache_states = ["warm", "cold"] if CRON_SECRET else ["warm"]
+    counter = QueryCounter()
+    cases = {}
+    try:
+        for label in GROUPS:
+            group = manifest["groups"][label]
+            session = api.app_session(group["memberEmail"], options.password, options.base_url)
+            try:
+                for endpoint in options.endpoints:
+                    for cache_state in cache_states:
+                        name = f"{endpoint}/{label}/{cache_state}"
+                        result = run_case(session, counter, options.base_url, group, endpoint, cache_state, options.samples, options.warmup)
+                        result.update(group=label, members=group["members"], expenses=group["expenses"], cache=cache_state)
+                        cases[name] = result
+                        print_case(name, result)
+            finally:
+                session.close()
+    finally:
+        counter.close()
+    return cases
+
+
+def print_case(name, result):
+    queries = "n/a" if result["queries"] is None else result["queries"]
+    print(f"{name:<28} {result['members']:>7} {result['expenses']:>9} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {queries:>8}", flush=True)
+
+
+def compare(baseline, cases, threshold, query_threshold, min_delta_ms):
+    """Returns one message per regression against the baseline's cases."""
+    regressions = []
+    for name, before in sorted(baseline["cases"].items()):
+        after = cases.get(name)
+        if after is None:
+            print(f"  skipped {name}: not run this time", file=sys.stderr)
+            continue
+
+        limit = before["p95_ms"] * (1 + threshold)
+        if after["p95_ms"] > limit and after["p95_ms"] - before["p95_ms"] > min_delta_ms:
+            regressions.append(f"{name}: p95 {after['p95_ms']:.1f} ms, baseline {before['p95_ms']:.1f} ms (limit {limit:.1f} ms)")
+
+        if before.get("queries") is not None and after.get("queries") is not None:
+            query_limit = before["queries"] * (1 + query_threshold)
+            if after["queries"] > query_limit:
+                regressions.append(f"{name}: {after['queries']} queries, baseline {before['queries']} (limit {query_limit:g})")
+    return regressions
+
+
+def baseline_path(preset_name):
+    return os.path.join(BASELINE_DIR, f"{preset_name}.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--manifest", help="dataset manifest (default: the one dataset_generator.py wrote for preset and seed)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password the dataset was loaded with")
+    parser.add_argument("--base-url", default=api.BASE_URL)
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="measured requests per case")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="unmeasured requests per case")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true", help="write the results as the preset's baseline")
+    mode.add_argument("--compare", action="store_true", help="fail on regressions against the preset's baseline")
+    parser.add_argument("--baseline", help="baseline path (default: testsprite_tests/baselines/<preset>.json)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed p95 latency increase as a fraction")
+    parser.add_argument("--query-threshold", type=float, default=0.0, help="allowed query count increase as a fraction")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS, help="ignore p95 increases smaller than this")
+    parser.add_argument("--json", help="also write this run's results here")
+    options = parser.parse_args(argv)
+
+    if not (api.SERVICE_ROLE_KEY and api.ANON_KEY):
+        print("SUPABASE_SERVICE_ROLE_KEY and SUPABASE_ANON_KEY must be set to sign in", file=sys.stderr)
+        return 2
+    try:
+        manifest = load_manifest(options.preset, options.seed, options.manifest)
+    except FileNotFoundError:
+        print(f"No dataset manifest for {options.preset}/{options.seed}; load one with dataset_generator.py first", file=sys.stderr)
+        return 2
+    path = options.baseline or baseline_path(options.preset)
+    baseline = None
+    if options.compare:
+        try:
+            with open(path) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(
+                f"No baseline at {path}, so there is nothing to compare against.\n"
+                f"Record one on this machine with\n"
+                f"    python testsprite_tests/benchmark_suite.py --preset {options.preset} --seed {options.seed} --record\n"
+                f"and commit it (see testsprite_tests/baselines/README.md).",
+                file=sys.stderr,
+            )
+            return 2
+        if (baseline["preset"], baseline["seed"]) != (options.preset, options.seed):
+            print(f"{path} was recorded for {baseline['preset']}/{baseline['seed']}", file=sys.stderr)
+            return 2
+
+    if not CRON_SECRET:
+        print("CRON_SECRET is not set; running warm cases only", file=sys.stderr)
+    print(f"{'case':<28} {'members':>7} {'expenses':>9} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8}")
+    cases = run_suite(options, manifest)
+
+    result = {
+        "preset": options.preset,
+        "seed": options.seed,
+        "counts": manifest["counts"],
+        "samples": options.samples,
+        "recordedAt": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+        "cases": cases,
+    }
+    for target in filter(None, [options.json, path if options.record else None]):
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        with open(target, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if options.record:
+        print(f"\nBaseline written to {path}")
+
+    if baseline is not None:
+        regressions = compare(baseline, cases, options.threshold, options.query_threshold, options.min_delta_ms)
+        for message in regressions:
+            print(f"  REGRESSION {message}", file=sys.stderr)
+        print(f"\n{len(regressions)} regressions against {path} (recorded {baseline['recordedAt']})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
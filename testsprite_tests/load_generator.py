@@ -0,0 +1,292 @@
+"""Asyncio load generator for the groups, expenses and balances APIs.
+
+Seeds a group with members, signs in as one of them, then runs a configurable
+number of concurrent virtual users against the app for a fixed duration with a
+read/write mix. Connections are kept alive in a shared pool. Reports request
+rate and p50/p95/p99 latency per endpoint.
+
+    python testsprite_tests/load_generator.py --concurrency 50 --duration 30 --mix 90:10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import sys
+import uuid
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import spliteasy_api as api
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpConnection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    async def request(self, method, host, path, headers, body, timeout):
+        """Sends one request and reads its response, raising HttpError if that takes longer than timeout seconds."""
+        try:
+            return await asyncio.wait_for(self.exchange(method, host, path, headers, body), timeout)
+        except asyncio.TimeoutError:
+            self.reusable = False
+            raise HttpError(f"No complete response within {timeout:g}s") from None
+
+    async def exchange(self, method, host, path, headers, body):
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Content-Length: {len(body)}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise HttpError("Connection closed by server")
+        version, status = status_line.split()[0], int(status_line.split()[1])
+
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        closing = response_headers.get("connection", "").lower() == "close" or version == b"HTTP/1.0"
+        if status < 200 or status in (204, 304) or method == "HEAD":
+            payload = b""
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            data = bytearray()
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                data += await self.reader.readexactly(size + 2)
+                del data[-2:]
+            payload = bytes(data)
+        elif "content-length" in response_headers:
+            payload = await self.reader.readexactly(int(response_headers["content-length"]))
+        elif closing:
+            # Delimited by the server closing the connection
+            payload = await self.reader.read()
+        else:
+            # Reading to EOF would wait on a connection the server means to keep open
+            self.reusable = False
+            raise HttpError(f"{method} {path} returned {status} without a length on a keep-alive connection")
+
+        if closing:
+            self.reusable = False
+        return status, payload
+
+    def close(self):
+        self.writer.close()
+
+
+class HttpPool:
+    """Fixed-size pool of keep-alive connections to one origin."""
+
+    def __init__(self, base_url, size, cookies, timeout=api.TIMEOUT):
+        parsed = urlparse(base_url)
+        self.timeout = timeout
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.ssl = parsed.scheme == "https"
+        self.host_header = parsed.netloc
+        self.idle = asyncio.LifoQueue()
+        self.slots = asyncio.Semaphore(size)
+        self.headers = {"Accept": "application/json"}
+        if cookies:
+            self.headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+
+    async def send(self, request):
+        body = json.dumps(request.body).encode() if request.body is not None else b""
+        headers = dict(self.headers)
+        if request.body is not None:
+            headers["Content-Type"] = "application/json"
+
+        async with self.slots:
+            connection = self.idle.get_nowait() if not self.idle.empty() else None
+            if connection is None:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port, ssl=self.ssl or None), self.timeout
+                )
+                writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                connection = HttpConnection(reader, writer)
+            try:
+                status, payload = await connection.request(request.method, self.host_header, request.path, headers, body, self.timeout)
+            except BaseException:
+                connection.close()
+                raise
+            if connection.reusable:
+                self.idle.put_nowait(connection)
+            else:
+                connection.close()
+            return status, payload
+
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint, latency_ms, status):
+        self.latencies[endpoint].append(latency_ms)
+        self.statuses[endpoint][status] += 1
+        if status is None or status >= 400:
+            self.errors[endpoint] += 1
+
+    def summary(self, elapsed):
+        rows = []
+        for endpoint in sorted(self.latencies):
+            samples = sorted(self.latencies[endpoint])
+            rows.append({
+                "endpoint": endpoint,
+                "requests": len(samples),
+                "errors": self.errors[endpoint],
+                "rps": len(samples) / elapsed,
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+                "statuses": {str(status): count for status, count in self.statuses[endpoint].items()},
+            })
+        return rows
+
+
+def percentile(sorted_samples, pct):
+    # Nearest-rank percentile
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, -(-len(sorted_samples) * pct // 100))
+    return sorted_samples[int(rank) - 1]
+
+
+def parse_mix(value):
+    reads, _, writes = value.partition(":")
+    reads, writes = float(reads), float(writes or 0)
+    if reads < 0 or writes < 0 or reads + writes == 0:
+        raise argparse.ArgumentTypeError("mix must be READS:WRITES, e.g. 90:10")
+    return writes / (reads + writes)
+
+
+def next_request(rng, write_ratio, group_id, member_ids):
+    if rng.random() < write_ratio:
+        # Most writes are expenses; a few create groups, like a new user would
+        if rng.random() < 0.1:
+            return api.create_group(f"Load-{uuid.uuid4()}")
+        participants = rng.sample(member_ids, k=rng.randint(1, len(member_ids)))
+        amount = round(rng.uniform(1, 200), 2)
+        return api.add_expense(group_id, amount, f"Load expense {uuid.uuid4().hex[:8]}", participants)
+
+    return rng.choice([
+        api.list_groups,
+        lambda: api.list_expenses(group_id),
+        lambda: api.get_group_balances(group_id),
+    ])()
+
+
+async def virtual_user(pool, stats, deadline, measure_from, write_ratio, group_id, member_ids, seed):
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    while loop.time() < deadline:
+        request = next_request(rng, write_ratio, group_id, member_ids)
+        start = loop.time()
+        try:
+            status, _ = await pool.send(request)
+        except (OSError, HttpError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            status = None
+        finished = loop.time()
+        # Requests that start during warm-up prime connections and caches but aren't recorded
+        if start >= measure_from:
+            stats.record(request.endpoint, (finished - start) * 1000, status)
+
+
+async def run_load(options, group_id, member_ids, cookies):
+    pool = HttpPool(options.base_url, options.pool_size or options.concurrency, cookies, options.timeout)
+    stats = Stats()
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + options.warmup
+    deadline = measure_from + options.duration
+    try:
+        await asyncio.gather(*(
+            virtual_user(pool, stats, deadline, measure_from, options.write_ratio, group_id, member_ids, options.seed + i)
+            for i in range(options.concurrency)
+        ))
+    finally:
+        pool.close()
+    return stats.summary(options.duration)
+
+
+def print_summary(rows):
+    print(f"{'endpoint':<38} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for row in rows:
+        print(
+            f"{row['endpoint']:<38} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=api.BASE_URL)
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before the run")
+    parser.add_argument("--mix", dest="write_ratio", type=parse_mix, default=parse_mix("90:10"), help="READS:WRITES ratio")
+    parser.add_argument("--pool-size", type=int, help="keep-alive connections (default: concurrency)")
+    parser.add_argument("--timeout", type=float, default=api.TIMEOUT, help="seconds before a request counts as failed")
+    parser.add_argument("--members", type=int, default=5, help="members in the seeded group")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the summary here")
+    parser.add_argument("--max-p95-ms", type=float, help="exit non-zero if any endpoint's p95 exceeds this")
+    options = parser.parse_args(argv)
+
+    if not (api.SERVICE_ROLE_KEY and api.ANON_KEY):
+        print("SUPABASE_SERVICE_ROLE_KEY and SUPABASE_ANON_KEY must be set to seed and sign in", file=sys.stderr)
+        return 2
+
+    admin = api.admin_session()
+    password = uuid.uuid4().hex
+    member_ids = []
+    try:
+        group_id, emails, member_ids = api.seed_group(admin, options.members, password)
+        cookies = api.auth_cookies(emails[0], password)
+        rows = asyncio.run(run_load(options, group_id, member_ids, cookies))
+    finally:
+        api.cleanup_seed(admin, member_ids)
+        admin.close()
+
+    print_summary(rows)
+    if options.json:
+        with open(options.json, "w") as f:
+            json.dump({
+                "concurrency": options.concurrency,
+                "duration": options.duration,
+                "writeRatio": options.write_ratio,
+                "endpoints": rows,
+            }, f, indent=2)
+
+    if options.max_p95_ms is not None:
+        slow = [row for row in rows if row["p95_ms"] > options.max_p95_ms]
+        for row in slow:
+            print(f"p95 for {row['endpoint']} is {row['p95_ms']:.1f} ms, above {options.max_p95_ms:.1f} ms", file=sys.stderr)
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
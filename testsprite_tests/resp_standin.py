@@ -0,0 +1,149 @@
+"""Local stand-in for a Redis-protocol server.
+
+Implements the RESP2 subset the shared cache backend uses (PING, GET, SET with
+PX/EX, DEL, PUBLISH, SUBSCRIBE, UNSUBSCRIBE, FLUSHALL, SELECT, AUTH, QUIT) so
+multi-instance tests can run without installing Redis.
+
+    python testsprite_tests/resp_standin.py --port 6390
+"""
+
+import argparse
+import asyncio
+import time
+
+
+class RespStandin:
+    def __init__(self):
+        self.store = {}  # key -> (value, expires_at or None)
+        self.channels = {}  # channel -> set of StreamWriters
+
+    async def handle(self, reader, writer):
+        subscriptions = set()
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                reply = self.execute(args, writer, subscriptions)
+                if reply is not None:
+                    writer.write(reply)
+                    await writer.drain()
+                if args[0].upper() == "QUIT":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                self.channels.get(channel, set()).discard(writer)
+            writer.close()
+
+    def execute(self, args, writer, subscriptions):
+        command = args[0].upper()
+
+        if command in ("PING",):
+            return simple("PONG")
+        if command in ("AUTH", "SELECT", "QUIT"):
+            return simple("OK")
+        if command == "FLUSHALL":
+            self.store.clear()
+            return simple("OK")
+        if command == "GET":
+            return bulk(self.get(args[1]))
+        if command == "SET":
+            expires_at = None
+            options = [a.upper() for a in args[3:]]
+            if "PX" in options:
+                expires_at = time.monotonic() + int(args[3 + options.index("PX") + 1]) / 1000
+            elif "EX" in options:
+                expires_at = time.monotonic() + int(args[3 + options.index("EX") + 1])
+            self.store[args[1]] = (args[2], expires_at)
+            return simple("OK")
+        if command == "DEL":
+            removed = sum(1 for key in args[1:] if self.store.pop(key, None) is not None)
+            return integer(removed)
+        if command == "PUBLISH":
+            subscribers = list(self.channels.get(args[1], ()))
+            for subscriber in subscribers:
+                subscriber.write(array([b"message", args[1].encode(), args[2].encode()]))
+            return integer(len(subscribers))
+        if command == "SUBSCRIBE":
+            out = b""
+            for channel in args[1:]:
+                self.channels.setdefault(channel, set()).add(writer)
+                subscriptions.add(channel)
+                out += array([b"subscribe", channel.encode(), str(len(subscriptions)).encode()], count_last=True)
+            return out
+        if command == "UNSUBSCRIBE":
+            out = b""
+            for channel in args[1:] or list(subscriptions):
+                self.channels.get(channel, set()).discard(writer)
+                subscriptions.discard(channel)
+                out += array([b"unsubscribe", channel.encode(), str(len(subscriptions)).encode()], count_last=True)
+            return out
+
+        return f"-ERR unknown command '{args[0]}'\r\n".encode()
+
+    def get(self, key):
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() > expires_at:
+            del self.store[key]
+            return None
+        return value
+
+
+async def read_command(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command, e.g. "PING\r\n" typed into a terminal
+        return line.decode().split()
+    args = []
+    for _ in range(int(line[1:])):
+        length = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(length + 2))[:-2].decode())
+    return args
+
+
+def simple(text):
+    return f"+{text}\r\n".encode()
+
+
+def integer(value):
+    return f":{value}\r\n".encode()
+
+
+def bulk(value):
+    if value is None:
+        return b"$-1\r\n"
+    data = value.encode()
+    return b"$" + str(len(data)).encode() + b"\r\n" + data + b"\r\n"
+
+
+def array(items, count_last=False):
+    out = f"*{len(items)}\r\n".encode()
+    for i, item in enumerate(items):
+        if count_last and i == len(items) - 1:
+            out += b":" + item + b"\r\n"
+        else:
+            out += b"$" + str(len(item)).encode() + b"\r\n" + item + b"\r\n"
+    return out
+
+
+async def serve(host, port):
+    standin = RespStandin()
+    server = await asyncio.start_server(standin.handle, host, port)
+    print(f"RESP stand-in listening on {host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    options = parser.parse_args()
+    asyncio.run(serve(options.host, options.port))
@@ -0,0 +1,245 @@
+"""Parallel runner for the testsprite_tests scripts.
+
+Each TCxxx file is a standalone script that runs its test at import time. The
+runner executes them concurrently in a process or thread pool, counts the HTTP
+calls each one makes, and writes a report in the shape of tmp/test_results.json
+(plus an optional JUnit XML file for CI).
+
+    python testsprite_tests/run_tests.py --workers 8 --junit tmp/junit.xml
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+import uuid
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from glob import glob
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATTERN = "TC[0-9][0-9][0-9]_*.py"
+DEFAULT_REPORT = os.path.join(TESTS_DIR, "tmp", "local_test_results.json")
+TEST_PLANS = ["testsprite_backend_test_plan.json", "testsprite_frontend_test_plan.json"]
+
+_local = threading.local()
+
+
+class _ThreadStream:
+    """Sends writes to the current thread's capture buffer, or the real stream if none."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = getattr(_local, "output", None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        buffer = getattr(_local, "output", None)
+        (buffer or self._stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _install_instrumentation():
+    # Idempotent: thread workers share one process, process workers each install once
+    if getattr(_install_instrumentation, "done", False):
+        return
+    import requests
+
+    original_request = requests.Session.request
+
+    def counting_request(self, *args, **kwargs):
+        if hasattr(_local, "http_calls"):
+            _local.http_calls += 1
+        return original_request(self, *args, **kwargs)
+
+    requests.Session.request = counting_request
+    sys.stdout = _ThreadStream(sys.stdout)
+    sys.stderr = _ThreadStream(sys.stderr)
+    # Scripts import shared helpers (spliteasy_api) from their own directory
+    if TESTS_DIR not in sys.path:
+        sys.path.insert(0, TESTS_DIR)
+    _install_instrumentation.done = True
+
+
+def discover(pattern, keyword=None):
+    paths = sorted(glob(os.path.join(TESTS_DIR, pattern)))
+    if keyword:
+        paths = [path for path in paths if keyword.lower() in os.path.basename(path).lower()]
+    return paths
+
+
+def prepare_source(code, base_url=None, timeout=None):
+    """Applies --base-url/--timeout by rewriting the scripts' module-level constants."""
+    if base_url:
+        code = re.sub(r"^BASE_URL = .*$", f"BASE_URL = {base_url!r}", code, flags=re.M)
+    if timeout:
+        code = re.sub(r"^TIMEOUT = .*$", f"TIMEOUT = {timeout!r}", code, flags=re.M)
+    return code
+
+
+def title_for(path):
+    # TC001_Email_Magic_Link_Authentication_Success.py -> TC001-Email Magic Link Authentication Success
+    test_id, _, words = os.path.splitext(os.path.basename(path))[0].partition("_")
+    return f"{test_id}-{words.replace('_', ' ')}"
+
+
+def load_descriptions():
+    descriptions = {}
+    for plan in TEST_PLANS:
+        try:
+            with open(os.path.join(TESTS_DIR, plan)) as f:
+                for entry in json.load(f):
+                    descriptions.setdefault(entry["id"], entry.get("description", ""))
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+    return descriptions
+
+
+def run_test(path, base_url=None, timeout=None):
+    """Runs one test script and returns its result; never raises."""
+    _install_instrumentation()
+    with open(path) as f:
+        code = prepare_source(f.read(), base_url, timeout)
+
+    _local.http_calls = 0
+    _local.output = io.StringIO()
+    created = datetime.now(timezone.utc)
+    error = None
+    start = time.perf_counter()
+    try:
+        namespace = {"__name__": "__main__", "__file__": path}
+        exec(compile(code, path, "exec"), namespace)
+    except KeyboardInterrupt:
+        raise
+    except BaseException:
+        error = traceback.format_exc()
+    wall_time = time.perf_counter() - start
+
+    result = {
+        "path": path,
+        "code": code,
+        "testStatus": "FAILED" if error else "PASSED",
+        "testError": error or "",
+        "wallTimeMs": round(wall_time * 1000, 1),
+        "httpCalls": _local.http_calls,
+        "output": _local.output.getvalue(),
+        "created": created.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "modified": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+    }
+    del _local.http_calls
+    _local.output = None
+    return result
+
+
+def to_report_entry(result, descriptions, project_id, user_id):
+    title = title_for(result["path"])
+    return {
+        "projectId": project_id,
+        "testId": str(uuid.uuid4()),
+        "userId": user_id,
+        "title": title,
+        "description": descriptions.get(title.split("-", 1)[0], ""),
+        "code": result["code"],
+        "testStatus": result["testStatus"],
+        "testError": result["testError"],
+        "testType": "BACKEND",
+        "createFrom": "local",
+        "created": result["created"],
+        "modified": result["modified"],
+        "wallTimeMs": result["wallTimeMs"],
+        "httpCalls": result["httpCalls"],
+        "output": result["output"],
+    }
+
+
+def write_junit(entries, path, total_seconds):
+    failures = sum(1 for entry in entries if entry["testStatus"] != "PASSED")
+    suite = ET.Element("testsuite", {
+        "name": "testsprite_tests",
+        "tests": str(len(entries)),
+        "failures": str(failures),
+        "errors": "0",
+        "time": f"{total_seconds:.3f}",
+    })
+    for entry in entries:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": "testsprite_tests",
+            "name": entry["title"],
+            "time": f"{entry['wallTimeMs'] / 1000:.3f}",
+        })
+        properties = ET.SubElement(case, "properties")
+        ET.SubElement(properties, "property", {"name": "http_calls", "value": str(entry["httpCalls"])})
+        if entry["testStatus"] != "PASSED":
+            last_line = entry["testError"].strip().splitlines()[-1] if entry["testError"].strip() else "Failed"
+            failure = ET.SubElement(case, "failure", {"message": last_line})
+            failure.text = entry["testError"]
+        if entry["output"]:
+            ET.SubElement(case, "system-out").text = entry["output"]
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("TEST_WORKERS", "4")))
+    parser.add_argument("--mode", choices=["process", "thread"], default="process")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help="glob of scripts to run, relative to testsprite_tests")
+    parser.add_argument("-k", dest="keyword", help="only run scripts whose file name contains this")
+    parser.add_argument("--base-url", default=os.environ.get("BASE_URL"), help="overrides each script's BASE_URL")
+    parser.add_argument("--timeout", type=float, help="overrides each script's per-request TIMEOUT")
+    parser.add_argument("--json", default=DEFAULT_REPORT, help="report path (test_results.json shape)")
+    parser.add_argument("--junit", help="also write a JUnit XML report here")
+    options = parser.parse_args(argv)
+
+    paths = discover(options.pattern, options.keyword)
+    if not paths:
+        print(f"No tests match {options.pattern}", file=sys.stderr)
+        return 2
+
+    executor_class = ProcessPoolExecutor if options.mode == "process" else ThreadPoolExecutor
+    if options.mode == "thread":
+        _install_instrumentation()
+
+    results = []
+    start = time.perf_counter()
+    with executor_class(max_workers=max(1, options.workers)) as executor:
+        futures = [executor.submit(run_test, path, options.base_url, options.timeout) for path in paths]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"{result['testStatus']:<7} {title_for(result['path'])} ({result['wallTimeMs']:.0f} ms, {result['httpCalls']} HTTP calls)", flush=True)
+    total_seconds = time.perf_counter() - start
+
+    descriptions = load_descriptions()
+    project_id = os.environ.get("TESTSPRITE_PROJECT_ID")
+    user_id = os.environ.get("TESTSPRITE_USER_ID")
+    entries = [to_report_entry(result, descriptions, project_id, user_id) for result in sorted(results, key=lambda r: r["path"])]
+
+    os.makedirs(os.path.dirname(os.path.abspath(options.json)), exist_ok=True)
+    with open(options.json, "w") as f:
+        json.dump(entries, f, indent=2)
+    if options.junit:
+        write_junit(entries, options.junit, total_seconds)
+
+    failed = [entry for entry in entries if entry["testStatus"] != "PASSED"]
+    serial_seconds = sum(entry["wallTimeMs"] for entry in entries) / 1000
+    print(
+        f"\n{len(entries) - len(failed)} passed, {len(failed)} failed in {total_seconds:.1f}s "
+        f"({serial_seconds:.1f}s of test time, {options.workers} {options.mode} workers)"
+    )
+    for entry in failed:
+        print(f"  FAILED {entry['title']}: {entry['testError'].strip().splitlines()[-1]}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
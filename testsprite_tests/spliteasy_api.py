@@ -0,0 +1,204 @@
+"""Request builders and seeding helpers shared by the benchmarks and load tools.
+
+The builders mirror the helpers in TC006/TC009 (create_group, add_expense,
+get_group_balances) but target the app's real /api routes and return a plain
+ApiRequest, so the same definitions can be sent with `requests` or the asyncio
+load generator.
+"""
+
+import base64
+import json
+import os
+import time
+import uuid
+from collections import namedtuple
+from urllib.parse import urlencode, urlparse
+
+import requests
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "http://127.0.0.1:54321")
+ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "")
+SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+TIMEOUT = 30
+# @supabase/ssr splits session cookies longer than this into name.0, name.1, ...
+COOKIE_CHUNK_SIZE = 3180
+
+# `endpoint` is the route pattern used to group latency statistics
+ApiRequest = namedtuple("ApiRequest", ["endpoint", "method", "path", "body"])
+
+
+def create_group(group_name):
+    return ApiRequest("POST /api/groups", "POST", "/api/groups", {
+        "name": group_name,
+        "description": "Load test group",
+    })
+
+
+def list_groups():
+    return ApiRequest("GET /api/groups", "GET", "/api/groups", None)
+
+
+def add_expense(group_id, amount, description, participant_ids):
+    # Split in whole cents, one leftover cent each to the first participants, so the
+    # shares add up to the amount exactly as the route requires
+    share_cents, remainder = divmod(round(amount * 100), len(participant_ids))
+    shares = [
+        (share_cents + (1 if index < remainder else 0)) / 100
+        for index in range(len(participant_ids))
+    ]
+    return ApiRequest("POST /api/expenses", "POST", "/api/expenses", {
+        "groupId": group_id,
+        "amount": amount,
+        "description": description,
+        "category": "other",
+        "participants": [
+            {"userId": user_id, "shareAmount": share_amount}
+            for user_id, share_amount in zip(participant_ids, shares)
+        ],
+    })
+
+
+def list_expenses(group_id, limit=50):
+    query = urlencode({"groupId": group_id, "limit": limit})
+    return ApiRequest("GET /api/expenses", "GET", f"/api/expenses?{query}", None)
+
+
+def search_expenses(group_id, limit=50, **filters):
+    # filters: q, category, paidBy, participant, minAmount, maxAmount, from_, to, cursor
+    params = {"groupId": group_id, "limit": limit}
+    params.update({key.rstrip("_"): value for key, value in filters.items() if value is not None})
+    return ApiRequest("GET /api/expenses/search", "GET", f"/api/expenses/search?{urlencode(params)}", None)
+
+
+def get_group_balances(group_id):
+    return ApiRequest("GET /api/groups/[groupId]/balances", "GET", f"/api/groups/{group_id}/balances", None)
+
+
+def get_group_analytics(group_id, granularity="day"):
+    query = urlencode({"granularity": granularity})
+    return ApiRequest("GET /api/groups/[groupId]/analytics", "GET", f"/api/groups/{group_id}/analytics?{query}", None)
+
+
+def get_dashboard_summary():
+    return ApiRequest("GET /api/dashboard/summary", "GET", "/api/dashboard/summary", None)
+
+
+def load_dashboard():
+    # Server-rendered from the same cached summary as /api/dashboard/summary
+    return ApiRequest("GET /dashboard", "GET", "/dashboard", None)
+
+
+def send(session, request, base_url=BASE_URL):
+    """Sends an ApiRequest with a requests.Session and returns the response."""
+    return session.request(
+        request.method,
+        f"{base_url}{request.path}",
+        json=request.body,
+        timeout=TIMEOUT,
+    )
+
+
+def admin_session():
+    # Seeding talks to Supabase directly with the service role key
+    session = requests.Session()
+    session.headers.update({
+        "apikey": SERVICE_ROLE_KEY,
+        "Authorization": f"Bearer {SERVICE_ROLE_KEY}",
+        "Content-Type": "application/json",
+    })
+    return session
+
+
+def rest_insert(session, table, rows):
+    resp = session.post(
+        f"{SUPABASE_URL}/rest/v1/{table}",
+        json=rows,
+        headers={"Prefer": "return=representation"},
+        timeout=TIMEOUT,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def create_user(session, email, password):
+    resp = session.post(
+        f"{SUPABASE_URL}/auth/v1/admin/users",
+        json={
+            "email": email,
+            "password": password,
+            "email_confirm": True,
+            "user_metadata": {"full_name": email.split("@")[0]},
+        },
+        timeout=TIMEOUT,
+    )
+    resp.raise_for_status()
+    return resp.json()["id"]
+
+
+def delete_user(session, user_id):
+    session.delete(f"{SUPABASE_URL}/auth/v1/admin/users/{user_id}", timeout=TIMEOUT)
+
+
+def seed_group(session, member_count, password, prefix="load"):
+    """Creates member_count users and a group they all belong to; the first user is its admin."""
+    emails = [f"{prefix}_{uuid.uuid4().hex[:12]}@example.com" for _ in range(member_count)]
+    user_ids = [create_user(session, email, password) for email in emails]
+    group = rest_insert(session, "groups", [{"name": f"{prefix}-{uuid.uuid4()}", "created_by": user_ids[0]}])[0]
+    rest_insert(session, "group_members", [
+        {"group_id": group["id"], "user_id": user_id, "role": "admin" if i == 0 else "member"}
+        for i, user_id in enumerate(user_ids)
+    ])
+    return group["id"], emails, user_ids
+
+
+def cleanup_seed(session, user_ids):
+    """Deletes every group the seeded users created, then the users themselves."""
+    if user_ids:
+        try:
+            session.delete(
+                f"{SUPABASE_URL}/rest/v1/groups",
+                params={"created_by": f"in.({','.join(user_ids)})"},
+                timeout=TIMEOUT,
+            )
+        except requests.RequestException:
+            pass
+    for user_id in user_ids:
+        try:
+            delete_user(session, user_id)
+        except requests.RequestException:
+            pass
+
+
+def auth_cookies(email, password):
+    """Signs in with a password and returns the app's session cookies as a dict."""
+    resp = requests.post(
+        f"{SUPABASE_URL}/auth/v1/token",
+        params={"grant_type": "password"},
+        json={"email": email, "password": password},
+        headers={"apikey": ANON_KEY},
+        timeout=TIMEOUT,
+    )
+    resp.raise_for_status()
+    token = resp.json()
+    token.setdefault("expires_at", int(time.time()) + token.get("expires_in", 3600))
+
+    project_ref = urlparse(SUPABASE_URL).hostname.split(".")[0]
+    cookie_name = f"sb-{project_ref}-auth-token"
+    value = "base64-" + base64.urlsafe_b64encode(json.dumps(token).encode()).decode().rstrip("=")
+
+    if len(value) <= COOKIE_CHUNK_SIZE:
+        return {cookie_name: value}
+    return {
+        f"{cookie_name}.{i // COOKIE_CHUNK_SIZE}": value[i:i + COOKIE_CHUNK_SIZE]
+        for i in range(0, len(value), COOKIE_CHUNK_SIZE)
+    }
+
+
+def app_session(email, password, base_url=BASE_URL):
+    """A requests.Session signed in to the app as the given user."""
+    session = requests.Session()
+    host = urlparse(base_url).hostname
+    for name, value in auth_cookies(email, password).items():
+        session.cookies.set(name, value, domain=host)
+    return session
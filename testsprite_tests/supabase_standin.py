@@ -0,0 +1,1380 @@
+"""Local stand-in for the Supabase REST and auth APIs.
+
+Implements the PostgREST and GoTrue subset the app and these scripts use:
+table reads and writes with filters, ordering, paging, counts, `.single()` and
+embedded joins; the app's RPC functions; password sign-in, token refresh,
+getUser and the admin user API. It also counts the requests it serves, which
+benchmarks read from /standin/v1/stats as per-request query counts. Data lives in SQLite (in memory by default)
+and the row-level security policies from supabase/migrations are applied to
+the authenticated role. Nothing is delayed or rate limited and every process
+is its own database, so tests can run offline with one stand-in per worker.
+
+    python testsprite_tests/supabase_standin.py --port 54330
+
+The URL and keys are printed on startup. Point the app at them with
+NEXT_PUBLIC_SUPABASE_URL, NEXT_PUBLIC_SUPABASE_ANON_KEY and
+SUPABASE_SERVICE_ROLE_KEY, and the scripts with SUPABASE_URL,
+SUPABASE_ANON_KEY and SUPABASE_SERVICE_ROLE_KEY. Use --port 0 for a free port,
+or start_standin() to run one on a background thread.
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import inspect
+import json
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+# Same default as `supabase start`, so tokens from a local project config also verify
+DEFAULT_JWT_SECRET = "super-secret-jwt-token-with-at-least-32-characters-long"
+ACCESS_TOKEN_TTL = 3600
+KEY_EXPIRY = 1983812996
+# Not part of Supabase: per-API request counters for benchmarks (service role only)
+STATS_PATH = "/standin/v1/stats"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS auth_users (
+    id TEXT PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    encrypted_password TEXT,
+    raw_user_meta_data TEXT NOT NULL DEFAULT '{}',
+    email_confirmed_at TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS groups (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    created_by TEXT REFERENCES auth_users(id) ON DELETE CASCADE,
+    created_at TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY REFERENCES auth_users(id) ON DELETE CASCADE,
+    full_name TEXT,
+    avatar_url TEXT,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS group_members (
+    id TEXT PRIMARY KEY,
+    group_id TEXT REFERENCES groups(id) ON DELETE CASCADE,
+    user_id TEXT REFERENCES auth_users(id) ON DELETE CASCADE,
+    role TEXT DEFAULT 'member' CHECK (role IN ('admin', 'member')),
+    joined_at TEXT,
+    UNIQUE(group_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS expenses (
+    id TEXT PRIMARY KEY,
+    group_id TEXT REFERENCES groups(id) ON DELETE CASCADE,
+    paid_by_user_id TEXT REFERENCES auth_users(id) ON DELETE CASCADE,
+    amount NUMERIC NOT NULL CHECK (amount > 0),
+    amount_cents INTEGER GENERATED ALWAYS AS (CAST(ROUND(amount * 100) AS INTEGER)) STORED,
+    description TEXT NOT NULL,
+    category TEXT DEFAULT 'other',
+    created_at TEXT,
+    search_text TEXT GENERATED ALWAYS AS (lower(description || ' ' || COALESCE(category, ''))) STORED
+);
+
+CREATE TABLE IF NOT EXISTS expense_participants (
+    id TEXT PRIMARY KEY,
+    expense_id TEXT REFERENCES expenses(id) ON DELETE CASCADE,
+    user_id TEXT REFERENCES auth_users(id) ON DELETE CASCADE,
+    share_amount NUMERIC NOT NULL CHECK (share_amount >= 0),
+    share_cents INTEGER GENERATED ALWAYS AS (CAST(ROUND(share_amount * 100) AS INTEGER)) STORED,
+    UNIQUE(expense_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_group_members_user_id ON group_members(user_id);
+CREATE INDEX IF NOT EXISTS idx_expenses_group_created_at_id ON expenses(group_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_expense_participants_expense_id ON expense_participants(expense_id);
+
+-- Group versions (migration 015). SQLite has no statement-level triggers, so these bump
+-- once per row; versions only have to go up, not by one.
+CREATE TRIGGER IF NOT EXISTS expenses_bump_version_insert AFTER INSERT ON expenses
+BEGIN UPDATE groups SET version = version + 1 WHERE id = NEW.group_id; END;
+CREATE TRIGGER IF NOT EXISTS expenses_bump_version_update AFTER UPDATE ON expenses
+BEGIN UPDATE groups SET version = version + 1 WHERE id IN (OLD.group_id, NEW.group_id); END;
+CREATE TRIGGER IF NOT EXISTS expenses_bump_version_delete AFTER DELETE ON expenses
+BEGIN UPDATE groups SET version = version + 1 WHERE id = OLD.group_id; END;
+CREATE TRIGGER IF NOT EXISTS expense_participants_bump_version_insert AFTER INSERT ON expense_participants
+BEGIN UPDATE groups SET version = version + 1 WHERE id = (SELECT group_id FROM expenses WHERE id = NEW.expense_id); END;
+CREATE TRIGGER IF NOT EXISTS expense_participants_bump_version_update AFTER UPDATE ON expense_participants
+BEGIN UPDATE groups SET version = version + 1
+  WHERE id IN (SELECT group_id FROM expenses WHERE id IN (OLD.expense_id, NEW.expense_id)); END;
+CREATE TRIGGER IF NOT EXISTS expense_participants_bump_version_delete AFTER DELETE ON expense_participants
+BEGIN UPDATE groups SET version = version + 1 WHERE id = (SELECT group_id FROM expenses WHERE id = OLD.expense_id); END;
+CREATE TRIGGER IF NOT EXISTS group_members_bump_version_insert AFTER INSERT ON group_members
+BEGIN UPDATE groups SET version = version + 1 WHERE id = NEW.group_id; END;
+CREATE TRIGGER IF NOT EXISTS group_members_bump_version_update AFTER UPDATE ON group_members
+BEGIN UPDATE groups SET version = version + 1 WHERE id IN (OLD.group_id, NEW.group_id); END;
+CREATE TRIGGER IF NOT EXISTS group_members_bump_version_delete AFTER DELETE ON group_members
+BEGIN UPDATE groups SET version = version + 1 WHERE id = OLD.group_id; END;
+"""
+
+REST_TABLES = ("groups", "profiles", "group_members", "expenses", "expense_participants")
+UUID_COLUMNS = {"id", "group_id", "user_id", "created_by", "paid_by_user_id", "expense_id"}
+TIMESTAMP_COLUMNS = {"created_at", "joined_at", "updated_at"}
+NUMERIC_COLUMNS = {"amount", "share_amount"}
+
+# (table, column, referenced table, referenced column, constraint name) as the app's
+# embed hints name them; user references are modelled as pointing at profiles
+FOREIGN_KEYS = [
+    ("groups", "created_by", "profiles", "id", "groups_created_by_fkey"),
+    ("group_members", "group_id", "groups", "id", "group_members_group_id_fkey"),
+    ("group_members", "user_id", "profiles", "id", "group_members_user_id_fkey"),
+    ("expenses", "group_id", "groups", "id", "expenses_group_id_fkey"),
+    ("expenses", "paid_by_user_id", "profiles", "id", "expenses_paid_by_user_id_fkey"),
+    ("expense_participants", "expense_id", "expenses", "id", "expense_participants_expense_id_fkey"),
+    ("expense_participants", "user_id", "profiles", "id", "expense_participants_user_id_fkey"),
+]
+
+# Row-level security for the authenticated role, mirroring migrations 002 and 004.
+# `{t}` is the row's table alias; a missing entry denies the command.
+_MEMBER_GROUPS = "SELECT group_id FROM group_members WHERE user_id = auth_uid()"
+_GROUP_ADMIN = (
+    "EXISTS (SELECT 1 FROM group_members admin WHERE admin.group_id = {t}.group_id "
+    "AND admin.user_id = auth_uid() AND admin.role = 'admin')"
+)
+_MEMBER_EXPENSES = (
+    "{t}.expense_id IN (SELECT e.id FROM expenses e JOIN group_members gm "
+    "ON e.group_id = gm.group_id WHERE gm.user_id = auth_uid())"
+)
+POLICIES = {
+    "groups": dict.fromkeys(("select", "insert", "update", "delete"), "{t}.created_by = auth_uid()"),
+    "profiles": dict.fromkeys(("select", "insert", "update"), "{t}.id = auth_uid()"),
+    "group_members": {
+        "select": "{t}.group_id IN (" + _MEMBER_GROUPS + ")",
+        "insert": _GROUP_ADMIN,
+        "update": _GROUP_ADMIN,
+        "delete": _GROUP_ADMIN,
+    },
+    "expenses": {
+        "select": "{t}.group_id IN (" + _MEMBER_GROUPS + ")",
+        "insert": "{t}.group_id IN (" + _MEMBER_GROUPS + ")",
+        "update": "{t}.paid_by_user_id = auth_uid()",
+        "delete": "{t}.paid_by_user_id = auth_uid()",
+    },
+    "expense_participants": dict.fromkeys(("select", "insert", "update", "delete"), _MEMBER_EXPENSES),
+}
+
+READ_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+COMPARISONS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+SQLITE_VARIABLE_BATCH = 900
+
+
+class StandinError(Exception):
+    def __init__(self, status, body):
+        super().__init__(body)
+        self.status = status
+        self.body = body
+
+
+def postgrest_error(status, code, message, details=None, hint=None):
+    return StandinError(status, {"code": code, "details": details, "hint": hint, "message": message})
+
+
+def auth_error(status, error_code, message):
+    return StandinError(status, {"code": status, "error_code": error_code, "msg": message})
+
+
+def b64url(data):
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def b64url_decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode_jwt(claims, secret):
+    header = b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = b64url(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{b64url(signature)}"
+
+
+def decode_jwt(token, secret):
+    """Returns the claims of a valid, unexpired HS256 token, or raises ValueError."""
+    try:
+        header, payload, signature = token.split(".")
+        expected = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, b64url_decode(signature)):
+            raise ValueError("JWT could not be decoded")
+        claims = json.loads(b64url_decode(payload))
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise ValueError("JWT could not be decoded")
+    if claims.get("exp") is not None and claims["exp"] < time.time():
+        raise ValueError("JWT expired")
+    return claims
+
+
+def hash_password(password, salt=None):
+    salt = salt or secrets.token_hex(8)
+    return f"{salt}${hashlib.sha256(f'{salt}:{password}'.encode()).hexdigest()}"
+
+
+def now_timestamp():
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def normalize_timestamp(value):
+    # Stored as one canonical UTC text form so string comparison orders correctly
+    text = str(value).strip()
+    # A '+' offset that arrived unencoded in a query string has become a space
+    text = re.sub(r" (\d\d:?\d\d)$", r"+\1", text)
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise postgrest_error(400, "22007", f'invalid input syntax for type timestamp with time zone: "{value}"')
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def convert_value(column, value):
+    if value is None:
+        return None
+    if column in UUID_COLUMNS:
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            raise postgrest_error(400, "22P02", f'invalid input syntax for type uuid: "{value}"')
+    if column in TIMESTAMP_COLUMNS:
+        return normalize_timestamp(value)
+    if column in NUMERIC_COLUMNS:
+        try:
+            return round(float(value), 2)
+        except (TypeError, ValueError):
+            raise postgrest_error(400, "22P02", f'invalid input syntax for type numeric: "{value}"')
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def convert_cents(value):
+    # BIGINT parameters: JSON integers, or strings of digits as Postgres also accepts
+    if isinstance(value, bool) or value is None:
+        raise postgrest_error(400, "22P02", f'invalid input syntax for type bigint: "{value}"')
+    try:
+        cents = int(value) if isinstance(value, (int, str)) else None
+    except ValueError:
+        cents = None
+    if cents is None:
+        raise postgrest_error(400, "22P02", f'invalid input syntax for type bigint: "{value}"')
+    return cents
+
+
+def integrity_error(error):
+    message = str(error)
+    if message.startswith("UNIQUE"):
+        return postgrest_error(409, "23505", "duplicate key value violates unique constraint", message)
+    if "FOREIGN KEY" in message:
+        return postgrest_error(409, "23503", "insert or update violates foreign key constraint", message)
+    if message.startswith("CHECK"):
+        return postgrest_error(400, "23514", "new row violates check constraint", message)
+    if message.startswith("NOT NULL"):
+        column = message.rsplit(".", 1)[-1]
+        return postgrest_error(400, "23502", f'null value in column "{column}" violates not-null constraint', message)
+    return postgrest_error(400, "23000", message)
+
+
+def split_top_level(text, separator=","):
+    """Splits on separators outside parentheses and double quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "\\" and quoted and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == separator:
+            parts.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    parts.append("".join(current))
+    return [part for part in parts if part != ""]
+
+
+def unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def parse_operation(column, text):
+    """`not.op.value` / `op.value` -> ("cond", column, op, value, negate)."""
+    negate = text.startswith("not.")
+    if negate:
+        text = text[4:]
+    op, dot, value = text.partition(".")
+    if not dot:
+        raise postgrest_error(400, "PGRST100", f'"failed to parse filter ({text})"')
+    return ("cond", column, op, value, negate)
+
+
+def parse_logic(kind, text, negate=False):
+    """Parses the body of `or=(...)` / `and=(...)` into a filter tree."""
+    if not (text.startswith("(") and text.endswith(")")):
+        raise postgrest_error(400, "PGRST100", f'"failed to parse logic tree ({text})"')
+    children = []
+    for part in split_top_level(text[1:-1]):
+        nested = re.match(r"^(not\.)?(and|or)(\(.*\))$", part, re.S)
+        if nested:
+            children.append(parse_logic(nested.group(2), nested.group(3), bool(nested.group(1))))
+            continue
+        column, dot, rest = part.partition(".")
+        if not dot:
+            raise postgrest_error(400, "PGRST100", f'"failed to parse logic tree ({part})"')
+        children.append(parse_operation(column, rest))
+    return (kind, children, negate)
+
+
+def parse_filters(params):
+    """Groups the filter query params by embed path; () is the top-level table."""
+    filters = {}
+    for key, value in params:
+        path, _, name = key.rpartition(".")
+        if name in READ_PARAMS:
+            continue
+        path = tuple(path.split(".")) if path else ()
+        if name in ("and", "or", "not.and", "not.or"):
+            node = parse_logic(name.rsplit(".", 1)[-1], value, name.startswith("not."))
+        else:
+            node = parse_operation(name, value)
+        filters.setdefault(path, []).append(node)
+    return filters
+
+
+def parse_select(text):
+    """Parses a PostgREST select clause into ("star",), ("column", name, key) and embeds."""
+    text = re.sub(r'\s+(?=(?:[^"]*"[^"]*")*[^"]*$)', "", text or "*")
+    items = []
+    for part in split_top_level(text):
+        if part == "*":
+            items.append(("star",))
+            continue
+        embed = re.match(r"^(?:([\w]+):)?([\w]+)((?:![\w]+)*)\((.*)\)$", part, re.S)
+        if embed:
+            alias, target, modifiers, inner_select = embed.groups()
+            hints = [m for m in modifiers.split("!") if m]
+            inner = "inner" in hints
+            hint = next((m for m in hints if m not in ("inner", "left")), None)
+            items.append(("embed", alias or target, target, hint, inner, parse_select(inner_select or "*")))
+            continue
+        column = re.match(r"^(?:([\w]+):)?([\w]+)(?:::[\w]+)?$", part)
+        if not column:
+            raise postgrest_error(400, "PGRST100", f'"failed to parse select parameter ({part})"')
+        alias, name = column.groups()
+        items.append(("column", name, alias or name))
+    return items
+
+
+def parse_order(value):
+    terms = []
+    for term in value.split(","):
+        column, *modifiers = term.split(".")
+        direction = "DESC" if "desc" in modifiers else "ASC"
+        nulls = ""
+        if "nullsfirst" in modifiers:
+            nulls = " NULLS FIRST"
+        elif "nullslast" in modifiers:
+            nulls = " NULLS LAST"
+        terms.append((column, direction, nulls))
+    return terms
+
+
+def parse_prefer(headers):
+    prefer = {}
+    for header in headers.get_all("Prefer") or []:
+        for token in header.split(","):
+            name, _, value = token.strip().partition("=")
+            if name:
+                prefer[name] = value
+    return prefer
+
+
+def batched(values, size=SQLITE_VARIABLE_BATCH):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class RequestContext:
+    def __init__(self, role, uid=None):
+        self.role = role
+        self.uid = uid
+
+
+class SupabaseStandin:
+    """The database and request handling; HTTP framing lives in StandinHandler."""
+
+    def __init__(self, database=":memory:", jwt_secret=DEFAULT_JWT_SECRET):
+        self.jwt_secret = jwt_secret
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(database, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+        self.current_uid = None
+        self.db.create_function("auth_uid", 0, lambda: self.current_uid)
+        # table_xinfo also lists generated columns (hidden 2 or 3), which are readable but not writable
+        table_info = {table: self.db.execute(f"PRAGMA table_xinfo({table})").fetchall() for table in REST_TABLES}
+        self.columns = {table: [row["name"] for row in rows] for table, rows in table_info.items()}
+        self.generated_columns = {
+            table: {row["name"] for row in rows if row["hidden"] in (2, 3)} for table, rows in table_info.items()
+        }
+        self.refresh_tokens = {}  # refresh token -> user id
+        # Requests served per API since the last reset; benchmarks read these as query counts
+        self.request_counts = {"rest": 0, "rpc": 0, "auth": 0}
+        self.alias_counter = 0
+        self.anon_key = encode_jwt({"iss": "supabase-demo", "role": "anon", "exp": KEY_EXPIRY}, jwt_secret)
+        self.service_role_key = encode_jwt({"iss": "supabase-demo", "role": "service_role", "exp": KEY_EXPIRY}, jwt_secret)
+        self.rpc_functions = {
+            "get_group_balances": self.rpc_get_group_balances,
+            "get_dashboard_summary": self.rpc_get_dashboard_summary,
+            "create_expense_with_participants": self.rpc_create_expense_with_participants,
+            "import_expenses": self.rpc_import_expenses,
+            "get_group_spending_trend": self.rpc_get_group_spending_trend,
+            "get_group_top_spenders": self.rpc_get_group_top_spenders,
+            "reconcile_group_member_balances": self.rpc_reconcile_group_member_balances,
+            "get_group_version": self.rpc_get_group_version,
+            "bump_group_versions": self.rpc_bump_group_versions,
+        }
+
+    # Request entry point
+
+    def handle(self, method, path, params, headers, body):
+        """Returns (status, JSON-able body or None, extra headers)."""
+        context = self.authenticate(headers)
+        if path == STATS_PATH:
+            return self.handle_stats(context, method)
+        with self.lock:
+            self.count_request(path)
+            self.current_uid = context.uid
+            try:
+                with self.db:
+                    if path.startswith("/rest/v1/rpc/"):
+                        return self.handle_rpc(context, path[len("/rest/v1/rpc/"):], params, headers, body)
+                    if path.startswith("/rest/v1/"):
+                        return self.handle_table(context, method, path[len("/rest/v1/"):], params, headers, body)
+                    if path.startswith("/auth/v1/"):
+                        return self.handle_auth(context, method, path[len("/auth/v1/"):], params, headers, body)
+            except sqlite3.IntegrityError as error:
+                raise integrity_error(error)
+            finally:
+                self.current_uid = None
+        raise postgrest_error(404, "PGRST125", f"Invalid path specified in request URL: {path}")
+
+    def count_request(self, path):
+        if path.startswith("/rest/v1/rpc/"):
+            self.request_counts["rpc"] += 1
+        elif path.startswith("/rest/v1/"):
+            self.request_counts["rest"] += 1
+        elif path.startswith("/auth/v1/"):
+            self.request_counts["auth"] += 1
+
+    def handle_stats(self, context, method):
+        # GET reads the counters; DELETE reads and resets them in one step
+        if context.role != "service_role":
+            raise postgrest_error(401, "42501", "The stats endpoint requires the service role key")
+        if method not in ("GET", "DELETE"):
+            raise postgrest_error(405, "PGRST117", f"Unsupported HTTP method: {method}")
+        with self.lock:
+            counts = dict(self.request_counts)
+            if method == "DELETE":
+                self.request_counts = dict.fromkeys(self.request_counts, 0)
+        return 200, counts, {}
+
+    def authenticate(self, headers):
+        authorization = headers.get("Authorization") or ""
+        token = authorization[7:].strip() if authorization.lower().startswith("bearer ") else headers.get("apikey")
+        if not token:
+            raise StandinError(401, {"message": "No API key found in request"})
+        try:
+            claims = decode_jwt(token, self.jwt_secret)
+        except ValueError as error:
+            raise postgrest_error(401, "PGRST301", str(error))
+        role = claims.get("role", "anon")
+        return RequestContext(role, claims.get("sub") if role == "authenticated" else None)
+
+    # Tables
+
+    def handle_table(self, context, method, table, params, headers, body):
+        if table not in REST_TABLES:
+            raise postgrest_error(404, "42P01", f'relation "public.{table}" does not exist')
+        param_map = dict(params)
+        items = parse_select(param_map.get("select"))
+        filters = parse_filters(params)
+        prefer = parse_prefer(headers)
+        wants_object = "application/vnd.pgrst.object+json" in (headers.get("Accept") or "")
+
+        if method in ("GET", "HEAD"):
+            limit, offset = self.page_bounds(param_map, headers)
+            order = parse_order(param_map["order"]) if param_map.get("order") else []
+            rows = self.select_rows(context, table, items, filters, order, limit, offset)
+            total = self.count_rows(context, table, items, filters) if prefer.get("count") in ("exact", "planned", "estimated") else None
+            response_headers = {"Content-Range": self.content_range(offset, len(rows), total)}
+            if wants_object:
+                return 200, self.single(rows), response_headers
+            return 200, (None if method == "HEAD" else rows), response_headers
+
+        payload = self.parse_body(body) if method in ("POST", "PATCH") else None
+        if method == "POST":
+            rowids = self.insert_rows(context, table, payload, prefer, param_map.get("on_conflict"))
+            status = 201
+        elif method == "PATCH":
+            rowids = self.update_rows(context, table, payload, filters)
+            status = 200
+        elif method == "DELETE":
+            rowids = self.visible_rowids(context, table, filters, "delete")
+            status = 200
+        else:
+            raise postgrest_error(405, "PGRST117", f"Unsupported HTTP method: {method}")
+
+        rows = None
+        if prefer.get("return") == "representation":
+            rows = self.shape_rows(context, table, self.fetch_by_rowids(table, rowids), items, filters, ())
+        if method == "DELETE":
+            for batch in batched(rowids):
+                self.db.execute(f"DELETE FROM {table} WHERE rowid IN ({','.join('?' * len(batch))})", batch)
+
+        if rows is None:
+            return (201 if status == 201 else 204), None, {}
+        if wants_object:
+            return status, self.single(rows), {}
+        return status, rows, {}
+
+    def page_bounds(self, param_map, headers):
+        limit = int(param_map["limit"]) if param_map.get("limit") else None
+        offset = int(param_map.get("offset") or 0)
+        range_header = headers.get("Range")
+        if range_header and re.match(r"^\d+-\d*$", range_header):
+            start, _, end = range_header.partition("-")
+            offset = int(start)
+            if end:
+                range_limit = int(end) - offset + 1
+                limit = range_limit if limit is None else min(limit, range_limit)
+        return limit, offset
+
+    def content_range(self, offset, row_count, total):
+        total_text = "*" if total is None else str(total)
+        if row_count == 0:
+            return f"*/{total_text}"
+        return f"{offset}-{offset + row_count - 1}/{total_text}"
+
+    def single(self, rows):
+        if len(rows) != 1:
+            raise postgrest_error(
+                406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                f"The result contains {len(rows)} rows",
+            )
+        return rows[0]
+
+    def parse_body(self, body):
+        try:
+            return json.loads(body or b"null")
+        except ValueError:
+            raise postgrest_error(400, "PGRST102", "Empty or invalid json")
+
+    def check_column(self, table, column):
+        if column not in self.columns[table]:
+            raise postgrest_error(400, "42703", f"column {table}.{column} does not exist")
+
+    def next_alias(self):
+        self.alias_counter += 1
+        return f"t{self.alias_counter}"
+
+    def policy(self, context, table, command, alias):
+        if context.role == "service_role":
+            return "1"
+        if context.role != "authenticated":
+            return "0"
+        clause = POLICIES.get(table, {}).get(command)
+        return f"({clause.format(t=alias)})" if clause else "0"
+
+    def compile_filter(self, table, alias, node):
+        kind = node[0]
+        if kind == "cond":
+            _, column, op, value, negate = node
+            sql, params = self.compile_condition(table, alias, column, op, value)
+        else:
+            _, children, negate = node
+            compiled = [self.compile_filter(table, alias, child) for child in children]
+            sql = "(" + f" {kind.upper()} ".join(part for part, _ in compiled) + ")" if compiled else "1"
+            params = [param for _, part_params in compiled for param in part_params]
+        return (f"NOT ({sql})" if negate else sql), params
+
+    def compile_condition(self, table, alias, column, op, value):
+        self.check_column(table, column)
+        target = f'{alias}."{column}"'
+        if op in COMPARISONS:
+            return f"{target} {COMPARISONS[op]} ?", [convert_value(column, unquote(value))]
+        if op == "in":
+            if not (value.startswith("(") and value.endswith(")")):
+                raise postgrest_error(400, "PGRST100", f'"failed to parse filter (in.{value})"')
+            values = [convert_value(column, unquote(v)) for v in split_top_level(value[1:-1])]
+            if not values:
+                return "0", []
+            return f"{target} IN ({','.join('?' * len(values))})", values
+        if op == "is":
+            checks = {"null": "IS NULL", "true": "= 1", "false": "= 0", "unknown": "IS NULL"}
+            if value.lower() not in checks:
+                raise postgrest_error(400, "PGRST100", f'"failed to parse filter (is.{value})"')
+            return f"{target} {checks[value.lower()]}", []
+        if op == "like":
+            pattern = unquote(value).replace("%", "*").replace("_", "?")
+            return f"{target} GLOB ?", [pattern]
+        if op == "ilike":
+            # Backslash escapes wildcards, as it does in Postgres
+            return f"{target} LIKE ? ESCAPE '\\'", [unquote(value).replace("*", "%")]
+        raise postgrest_error(400, "PGRST100", f'"failed to parse filter ({op}.{value})"')
+
+    def resolve_embed(self, parent, target, hint):
+        """Returns (kind, parent column, child column) for embedding target in parent."""
+        if target not in REST_TABLES:
+            raise postgrest_error(400, "PGRST200", f"Could not find a relationship between '{parent}' and '{target}' in the schema cache")
+        candidates = []
+        for table, column, ref_table, ref_column, name in FOREIGN_KEYS:
+            if table == parent and ref_table == target:
+                candidates.append(("one", column, ref_column, name, column))
+            elif table == target and ref_table == parent:
+                candidates.append(("many", ref_column, column, name, column))
+        if hint:
+            candidates = [c for c in candidates if hint in (c[3], c[4])]
+        if not candidates:
+            raise postgrest_error(400, "PGRST200", f"Could not find a relationship between '{parent}' and '{target}' in the schema cache")
+        if len(candidates) > 1:
+            raise postgrest_error(300, "PGRST201", f"Could not embed because more than one relationship was found for '{parent}' and '{target}'")
+        kind, parent_column, child_column, _, _ = candidates[0]
+        return kind, parent_column, child_column
+
+    def compile_where(self, context, table, alias, items, filters, path, command="select"):
+        """RLS, filters at this embed path and EXISTS checks for !inner embeds."""
+        parts, params = [self.policy(context, table, command, alias)], []
+        for node in filters.get(path, []):
+            sql, node_params = self.compile_filter(table, alias, node)
+            parts.append(sql)
+            params += node_params
+        for item in items:
+            if item[0] != "embed" or not item[4]:
+                continue
+            _, name, target, hint, _, children = item
+            _, parent_column, child_column = self.resolve_embed(table, target, hint)
+            child_alias = self.next_alias()
+            child_where, child_params = self.compile_where(context, target, child_alias, children, filters, path + (name,))
+            parts.append(
+                f'EXISTS (SELECT 1 FROM {target} {child_alias} WHERE {child_alias}."{child_column}" = '
+                f'{alias}."{parent_column}" AND {child_where})'
+            )
+            params += child_params
+        return " AND ".join(parts), params
+
+    def select_rows(self, context, table, items, filters, order, limit, offset):
+        alias = self.next_alias()
+        where, params = self.compile_where(context, table, alias, items, filters, ())
+        sql = f"SELECT {alias}.rowid AS __rowid, {alias}.* FROM {table} {alias} WHERE {where}"
+        if order:
+            terms = []
+            for column, direction, nulls in order:
+                self.check_column(table, column)
+                terms.append(f'{alias}."{column}" {direction}{nulls}')
+            sql += " ORDER BY " + ", ".join(terms)
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        rows = self.db.execute(sql, params).fetchall()
+        return self.shape_rows(context, table, rows, items, filters, ())
+
+    def count_rows(self, context, table, items, filters):
+        alias = self.next_alias()
+        where, params = self.compile_where(context, table, alias, items, filters, ())
+        return self.db.execute(f"SELECT COUNT(*) FROM {table} {alias} WHERE {where}", params).fetchone()[0]
+
+    def fetch_by_rowids(self, table, rowids):
+        rows = []
+        for batch in batched(rowids):
+            rows += self.db.execute(
+                f"SELECT rowid AS __rowid, * FROM {table} WHERE rowid IN ({','.join('?' * len(batch))}) ORDER BY rowid",
+                batch,
+            ).fetchall()
+        return rows
+
+    def shape_rows(self, context, table, rows, items, filters, path):
+        """Projects raw rows through the select items, loading embeds one query per embed."""
+        shaped = [{} for _ in rows]
+        for item in items:
+            if item[0] == "star":
+                for raw, out in zip(rows, shaped):
+                    out.update((column, raw[column]) for column in self.columns[table])
+            elif item[0] == "column":
+                _, name, key = item
+                self.check_column(table, name)
+                for raw, out in zip(rows, shaped):
+                    out[key] = raw[name]
+            else:
+                _, name, target, hint, _, children = item
+                kind, parent_column, child_column = self.resolve_embed(table, target, hint)
+                keys = {raw[parent_column] for raw in rows if raw[parent_column] is not None}
+                children_by_key = {}
+                for batch in batched(keys):
+                    alias = self.next_alias()
+                    where, params = self.compile_where(context, target, alias, children, filters, path + (name,))
+                    child_rows = self.db.execute(
+                        f"SELECT {alias}.rowid AS __rowid, {alias}.* FROM {target} {alias} "
+                        f'WHERE {alias}."{child_column}" IN ({",".join("?" * len(batch))}) AND {where} '
+                        f"ORDER BY {alias}.rowid",
+                        list(batch) + params,
+                    ).fetchall()
+                    child_shaped = self.shape_rows(context, target, child_rows, children, filters, path + (name,))
+                    for raw_child, out_child in zip(child_rows, child_shaped):
+                        children_by_key.setdefault(raw_child[child_column], []).append(out_child)
+                for raw, out in zip(rows, shaped):
+                    matches = children_by_key.get(raw[parent_column], [])
+                    out[name] = (matches[0] if matches else None) if kind == "one" else matches
+        return shaped
+
+    def check_writable(self, table, column):
+        if column not in self.columns[table]:
+            raise postgrest_error(400, "PGRST204", f"Could not find the '{column}' column of '{table}' in the schema cache")
+        if column in self.generated_columns[table]:
+            raise postgrest_error(400, "428C9", f'cannot insert a non-DEFAULT value into column "{column}"', f'Column "{column}" is a generated column.')
+
+    def prepare_row(self, table, row):
+        if not isinstance(row, dict):
+            raise postgrest_error(400, "PGRST102", "Empty or invalid json")
+        for column in row:
+            self.check_writable(table, column)
+        values = {column: convert_value(column, value) for column, value in row.items()}
+        if "id" in self.columns[table] and table != "profiles" and values.get("id") is None:
+            values["id"] = str(uuid.uuid4())
+        for column in TIMESTAMP_COLUMNS.intersection(self.columns[table]):
+            if values.get(column) is None:
+                values[column] = now_timestamp()
+        return values
+
+    def insert_rows(self, context, table, payload, prefer, on_conflict):
+        rows = payload if isinstance(payload, list) else [payload]
+        conflict_columns = on_conflict.split(",") if on_conflict else ["id"]
+        resolution = prefer.get("resolution")
+        rowids = []
+        for row in rows:
+            values = self.prepare_row(table, row)
+            if resolution in ("merge-duplicates", "ignore-duplicates"):
+                existing = self.db.execute(
+                    f"SELECT rowid FROM {table} WHERE " + " AND ".join(f'"{c}" = ?' for c in conflict_columns),
+                    [values.get(c) for c in conflict_columns],
+                ).fetchone()
+                if existing:
+                    if resolution == "merge-duplicates":
+                        updates = {c: v for c, v in values.items() if c in row}
+                        self.db.execute(
+                            f"UPDATE {table} SET " + ", ".join(f'"{c}" = ?' for c in updates) + " WHERE rowid = ?",
+                            list(updates.values()) + [existing[0]],
+                        )
+                        rowids.append(existing[0])
+                    continue
+            self.check_insert_policy(context, table, values)
+            columns = list(values)
+            cursor = self.db.execute(
+                f"INSERT INTO {table} ({','.join(f'{chr(34)}{c}{chr(34)}' for c in columns)}) "
+                f"VALUES ({','.join('?' * len(columns))})",
+                [values[c] for c in columns],
+            )
+            rowids.append(cursor.lastrowid)
+        return rowids
+
+    def check_insert_policy(self, context, table, values):
+        # Checked before the insert: as in Postgres, the policy's subqueries must not see the new row
+        alias = self.next_alias()
+        columns = self.columns[table]
+        candidate = ", ".join(f'? AS "{column}"' for column in columns)
+        allowed = self.db.execute(
+            f"SELECT 1 FROM (SELECT {candidate}) {alias} WHERE {self.policy(context, table, 'insert', alias)}",
+            [values.get(column) for column in columns],
+        ).fetchone()
+        if not allowed:
+            raise self.policy_violation(context, table)
+
+    def visible_rowids(self, context, table, filters, command):
+        alias = self.next_alias()
+        where, params = self.compile_where(context, table, alias, [], filters, (), command)
+        return [row[0] for row in self.db.execute(f"SELECT {alias}.rowid FROM {table} {alias} WHERE {where}", params)]
+
+    def update_rows(self, context, table, payload, filters):
+        if not isinstance(payload, dict):
+            raise postgrest_error(400, "PGRST102", "Empty or invalid json")
+        for column in payload:
+            self.check_writable(table, column)
+        rowids = self.visible_rowids(context, table, filters, "update")
+        if not payload:
+            return rowids
+        values = {column: convert_value(column, value) for column, value in payload.items()}
+        for batch in batched(rowids):
+            self.db.execute(
+                f"UPDATE {table} SET " + ", ".join(f'"{c}" = ?' for c in values)
+                + f" WHERE rowid IN ({','.join('?' * len(batch))})",
+                list(values.values()) + batch,
+            )
+        # As in Postgres, the USING clause doubles as WITH CHECK for updated rows
+        self.check_policy(context, table, "update", rowids)
+        return rowids
+
+    def check_policy(self, context, table, command, rowids):
+        alias = self.next_alias()
+        clause = self.policy(context, table, command, alias)
+        for batch in batched(rowids):
+            violating = self.db.execute(
+                f"SELECT COUNT(*) FROM {table} {alias} WHERE {alias}.rowid IN ({','.join('?' * len(batch))}) AND NOT {clause}",
+                batch,
+            ).fetchone()[0]
+            if violating:
+                raise self.policy_violation(context, table)
+
+    def policy_violation(self, context, table):
+        return postgrest_error(
+            403 if context.role == "authenticated" else 401, "42501",
+            f'new row violates row-level security policy for table "{table}"',
+        )
+
+    # RPC functions. These compute from the base tables, so the balance and
+    # rollup ledgers the migrations maintain with triggers are not modelled.
+
+    def handle_rpc(self, context, name, params, headers, body):
+        function = self.rpc_functions.get(name)
+        if function is None:
+            raise postgrest_error(404, "PGRST202", f"Could not find the function public.{name} in the schema cache")
+        if context.role == "anon":
+            raise postgrest_error(401, "42501", f"permission denied for function {name}")
+        args = self.parse_body(body) if body else dict(params)
+        if not isinstance(args, dict):
+            raise postgrest_error(400, "PGRST102", "Empty or invalid json")
+        try:
+            inspect.signature(function).bind(context, **args)
+        except TypeError:
+            raise postgrest_error(
+                404, "PGRST202",
+                f"Could not find the function public.{name}({', '.join(sorted(args))}) in the schema cache",
+            )
+        result = function(context, **args)
+        if "application/vnd.pgrst.object+json" in (headers.get("Accept") or "") and isinstance(result, list):
+            result = self.single(result)
+        return 200, result, {}
+
+    def require_user(self, context):
+        if context.uid is None:
+            raise postgrest_error(403, "28000", "Not authenticated")
+        return context.uid
+
+    def is_member(self, group_id, user_id):
+        return self.db.execute(
+            "SELECT 1 FROM group_members WHERE group_id = ? AND user_id = ?", (group_id, user_id)
+        ).fetchone() is not None
+
+    def insert_participants(self, expense_id, participants):
+        try:
+            rows = [
+                (str(uuid.uuid4()), expense_id, convert_value("user_id", p.get("user_id")), convert_cents(p.get("share_cents")) / 100)
+                for p in participants
+            ]
+        except AttributeError:
+            raise postgrest_error(400, "22023", "Participants must be objects")
+        self.db.executemany(
+            "INSERT INTO expense_participants (id, expense_id, user_id, share_amount) VALUES (?, ?, ?, ?)", rows
+        )
+
+    def rpc_get_group_balances(self, context, p_group_id):
+        # SECURITY DEFINER behind is_group_member: every member sees every profile, others see nothing
+        if not self.is_member(convert_value("group_id", p_group_id), context.uid):
+            return []
+        rows = self.db.execute(
+            """
+            SELECT gm.user_id, p.full_name, p.avatar_url,
+              COALESCE((SELECT SUM(e.amount_cents) FROM expenses e
+                        WHERE e.group_id = gm.group_id AND e.paid_by_user_id = gm.user_id), 0) AS paid_cents,
+              COALESCE((SELECT SUM(ep.share_cents) FROM expense_participants ep
+                        JOIN expenses e ON e.id = ep.expense_id
+                        WHERE e.group_id = gm.group_id AND ep.user_id = gm.user_id), 0) AS share_cents
+            FROM group_members gm
+            JOIN profiles p ON p.id = gm.user_id
+            WHERE gm.group_id = ?
+            """,
+            (convert_value("group_id", p_group_id),),
+        ).fetchall()
+        balances = [
+            {
+                "user_id": row["user_id"],
+                "full_name": row["full_name"],
+                "avatar_url": row["avatar_url"],
+                "paid_cents": row["paid_cents"],
+                "share_cents": row["share_cents"],
+                "balance_cents": row["paid_cents"] - row["share_cents"],
+            }
+            for row in rows
+        ]
+        return sorted(balances, key=lambda row: row["balance_cents"], reverse=True)
+
+    def rpc_get_dashboard_summary(self, context):
+        uid = self.require_user(context)
+        rows = self.db.execute(
+            """
+            SELECT g.id, g.name, g.created_by, g.created_at, me.role,
+              (SELECT COUNT(*) FROM group_members gm WHERE gm.group_id = g.id) AS member_count,
+              (SELECT COUNT(*) FROM expenses e WHERE e.group_id = g.id) AS expense_count,
+              COALESCE((SELECT SUM(e.amount_cents) FROM expenses e WHERE e.group_id = g.id), 0) AS total_spent_cents,
+              (SELECT MAX(e.created_at) FROM expenses e WHERE e.group_id = g.id) AS last_expense_at,
+              COALESCE((SELECT SUM(e.amount_cents) FROM expenses e
+                        WHERE e.group_id = g.id AND e.paid_by_user_id = me.user_id), 0)
+              - COALESCE((SELECT SUM(ep.share_cents) FROM expense_participants ep
+                          JOIN expenses e ON e.id = ep.expense_id
+                          WHERE e.group_id = g.id AND ep.user_id = me.user_id), 0) AS net_balance_cents
+            FROM group_members me
+            JOIN groups g ON g.id = me.group_id
+            WHERE me.user_id = ?
+            """,
+            (uid,),
+        ).fetchall()
+        summaries = [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "created_by": row["created_by"],
+                "created_at": row["created_at"],
+                "role": row["role"],
+                "member_count": row["member_count"],
+                "expense_count": row["expense_count"],
+                "total_spent_cents": row["total_spent_cents"],
+                "last_activity_at": max(row["created_at"], row["last_expense_at"] or row["created_at"]),
+                "net_balance_cents": row["net_balance_cents"],
+            }
+            for row in rows
+        ]
+        return sorted(summaries, key=lambda row: (row["last_activity_at"], row["id"]), reverse=True)
+
+    def rpc_create_expense_with_participants(self, context, p_group_id, p_amount_cents, p_description, p_category="other", p_participants=None):
+        uid = self.require_user(context)
+        group_id = convert_value("group_id", p_group_id)
+        if not self.is_member(group_id, uid):
+            raise postgrest_error(403, "42501", "You are not a member of this group")
+        amount_cents = convert_cents(p_amount_cents)
+        if amount_cents <= 0:
+            raise postgrest_error(400, "22023", "Amount must be greater than 0")
+        if not isinstance(p_participants, list) or not p_participants:
+            raise postgrest_error(400, "22023", "At least one participant is required")
+        share_total = sum(convert_cents(p.get("share_cents")) for p in p_participants if isinstance(p, dict))
+        if share_total != amount_cents:
+            raise postgrest_error(400, "22023", "Total shares must equal the expense amount")
+        if any(isinstance(p, dict) and not self.is_member(group_id, convert_value("user_id", p.get("user_id"))) for p in p_participants):
+            raise postgrest_error(400, "23503", "Every participant must be a member of this group")
+
+        expense = self.prepare_row("expenses", {
+            "group_id": group_id,
+            "paid_by_user_id": uid,
+            "amount": amount_cents / 100,
+            "description": p_description,
+            "category": p_category or "other",
+        })
+        columns = list(expense)
+        self.db.execute(
+            f"INSERT INTO expenses ({','.join(columns)}) VALUES ({','.join('?' * len(columns))})",
+            [expense[c] for c in columns],
+        )
+        self.insert_participants(expense["id"], p_participants)
+        return dict(self.db.execute(
+            "SELECT id, group_id, paid_by_user_id, amount, amount_cents, description, category, created_at FROM expenses WHERE id = ?",
+            (expense["id"],),
+        ).fetchone())
+
+    def rpc_import_expenses(self, context, p_rows):
+        uid = self.require_user(context)
+        rows = p_rows if isinstance(p_rows, list) else []
+        if not all(isinstance(row, dict) for row in rows):
+            raise postgrest_error(400, "22023", "Import rows must be objects")
+        for group_id in sorted({convert_value("group_id", row.get("group_id")) for row in rows}):
+            if not self.is_member(group_id, uid):
+                raise postgrest_error(403, "42501", f"You are not a member of group {group_id}")
+
+        results = []
+        for position, row in enumerate(rows, start=1):
+            expense = self.prepare_row("expenses", {
+                "group_id": row.get("group_id"),
+                "paid_by_user_id": row.get("paid_by_user_id") or uid,
+                "amount": convert_cents(row.get("amount_cents")) / 100,
+                "description": row.get("description"),
+                "category": row.get("category") or "other",
+                "created_at": row.get("created_at"),
+            })
+            columns = list(expense)
+            self.db.execute(
+                f"INSERT INTO expenses ({','.join(columns)}) VALUES ({','.join('?' * len(columns))})",
+                [expense[c] for c in columns],
+            )
+            self.insert_participants(expense["id"], row.get("participants") or [])
+            results.append({"row_number": int(row.get("row") or position), "expense_id": expense["id"]})
+        return results
+
+    def expense_days(self, group_id, p_from, p_to):
+        rows = self.db.execute(
+            "SELECT paid_by_user_id, amount_cents, substr(created_at, 1, 10) AS day FROM expenses WHERE group_id = ?",
+            (convert_value("group_id", group_id),),
+        ).fetchall()
+        start = date.fromisoformat(p_from) if p_from else None
+        end = date.fromisoformat(p_to) if p_to else None
+        for row in rows:
+            day = date.fromisoformat(row["day"])
+            if (start is None or day >= start) and (end is None or day <= end):
+                yield row["paid_by_user_id"], row["amount_cents"], day
+
+    def rpc_get_group_spending_trend(self, context, p_group_id, p_from=None, p_to=None, p_granularity="day"):
+        truncate = {
+            "day": lambda day: day,
+            "week": lambda day: day - timedelta(days=day.weekday()),
+            "month": lambda day: day.replace(day=1),
+        }.get(p_granularity)
+        if truncate is None:
+            raise postgrest_error(400, "22023", f'unit "{p_granularity}" not recognized for type timestamp without time zone')
+        # RLS on group_daily_spending shows non-members no rows
+        if not self.is_member(convert_value("group_id", p_group_id), context.uid):
+            return []
+        totals = {}
+        for _, amount, day in self.expense_days(p_group_id, p_from, p_to):
+            total, count = totals.get(truncate(day), (0, 0))
+            totals[truncate(day)] = (total + amount, count + 1)
+        return [
+            {"period": period.isoformat(), "total_cents": total, "expense_count": count}
+            for period, (total, count) in sorted(totals.items())
+        ]
+
+    def rpc_get_group_top_spenders(self, context, p_group_id, p_from=None, p_to=None, p_limit=10):
+        if not self.is_member(convert_value("group_id", p_group_id), context.uid):
+            return []
+        totals = {}
+        for user_id, amount, _ in self.expense_days(p_group_id, p_from, p_to):
+            total, count = totals.get(user_id, (0, 0))
+            totals[user_id] = (total + amount, count + 1)
+        names = {}
+        for batch in batched(totals):
+            names.update(self.db.execute(
+                f"SELECT id, full_name FROM profiles WHERE id IN ({','.join('?' * len(batch))})", batch
+            ).fetchall())
+        ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:int(p_limit)]
+        return [
+            {"user_id": user_id, "full_name": names.get(user_id), "total_cents": total, "expense_count": count}
+            for user_id, (total, count) in ranked
+        ]
+
+    def rpc_reconcile_group_member_balances(self, context, p_group_id=None, p_repair=False):
+        # Balances are computed on read here, so there is never any drift to report
+        return []
+
+    def rpc_get_group_version(self, context, p_group_id):
+        group_id = convert_value("group_id", p_group_id)
+        if not self.is_member(group_id, context.uid):
+            return None
+        row = self.db.execute("SELECT version FROM groups WHERE id = ?", (group_id,)).fetchone()
+        return row["version"] if row else None
+
+    def rpc_bump_group_versions(self, context, p_group_ids):
+        if context.role != "service_role":
+            raise postgrest_error(403, "42501", "permission denied for function bump_group_versions")
+        group_ids = [convert_value("group_id", group_id) for group_id in p_group_ids or []]
+        for batch in batched(group_ids):
+            self.db.execute(
+                f"UPDATE groups SET version = version + 1 WHERE id IN ({','.join('?' * len(batch))})", batch
+            )
+        return None
+
+    # Auth
+
+    def handle_auth(self, context, method, path, params, headers, body):
+        payload = self.parse_auth_body(body)
+        param_map = dict(params)
+
+        if path == "token" and method == "POST":
+            grant_type = param_map.get("grant_type")
+            if grant_type == "password":
+                user = self.db.execute("SELECT * FROM auth_users WHERE email = ?", (str(payload.get("email", "")).lower(),)).fetchone()
+                password = str(payload.get("password", ""))
+                if not user or not user["encrypted_password"] or hash_password(password, user["encrypted_password"].split("$")[0]) != user["encrypted_password"]:
+                    raise auth_error(400, "invalid_credentials", "Invalid login credentials")
+                return 200, self.issue_session(user), {}
+            if grant_type == "refresh_token":
+                user_id = self.refresh_tokens.pop(payload.get("refresh_token"), None)
+                user = self.find_user(user_id) if user_id else None
+                if not user:
+                    raise auth_error(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+                return 200, self.issue_session(user), {}
+            raise auth_error(400, "validation_failed", "unsupported_grant_type")
+
+        if path == "signup" and method == "POST":
+            user = self.create_auth_user(payload.get("email"), payload.get("password"), payload.get("data") or {})
+            return 200, self.issue_session(user), {}
+
+        if path == "otp" and method == "POST":
+            # Accepted so sign-in forms work; no message is delivered
+            email = str(payload.get("email", "")).lower()
+            if not self.db.execute("SELECT 1 FROM auth_users WHERE email = ?", (email,)).fetchone():
+                if payload.get("create_user") is False:
+                    raise auth_error(422, "otp_disabled", "Signups not allowed for otp")
+                self.create_auth_user(email, None, payload.get("data") or {})
+            return 200, {}, {}
+
+        if path == "user" and method == "GET":
+            if context.role != "authenticated":
+                raise auth_error(403, "bad_jwt", "invalid claim: missing sub claim")
+            user = self.find_user(context.uid)
+            if not user:
+                raise auth_error(403, "user_not_found", "User from sub claim in JWT does not exist")
+            return 200, self.user_json(user), {}
+
+        if path == "logout" and method == "POST":
+            for token, user_id in list(self.refresh_tokens.items()):
+                if user_id == context.uid:
+                    del self.refresh_tokens[token]
+            return 204, None, {}
+
+        if path == "health":
+            return 200, {"name": "GoTrue", "version": "standin", "description": "Local Supabase auth stand-in"}, {}
+
+        if path == "settings":
+            return 200, {"external": {"email": True}, "disable_signup": False, "mailer_autoconfirm": True}, {}
+
+        if path.startswith("admin/users"):
+            if context.role != "service_role":
+                raise auth_error(403, "not_admin", "User not allowed")
+            user_id = path[len("admin/users/"):] if path.startswith("admin/users/") else None
+            if method == "POST" and user_id is None:
+                user = self.create_auth_user(
+                    payload.get("email"), payload.get("password"), payload.get("user_metadata") or {}, payload.get("id")
+                )
+                return 200, self.user_json(user), {}
+            if method == "GET" and user_id is None:
+                users = self.db.execute("SELECT * FROM auth_users ORDER BY created_at").fetchall()
+                return 200, {"users": [self.user_json(user) for user in users], "aud": "authenticated"}, {}
+            user = self.find_user(user_id)
+            if not user:
+                raise auth_error(404, "user_not_found", "User not found")
+            if method == "GET":
+                return 200, self.user_json(user), {}
+            if method == "DELETE":
+                # Profiles, memberships, created groups and expenses cascade as in Postgres
+                self.db.execute("DELETE FROM auth_users WHERE id = ?", (user["id"],))
+                return 200, {}, {}
+
+        raise auth_error(404, "not_found", f"Unsupported auth endpoint: {method} /auth/v1/{path}")
+
+    def parse_auth_body(self, body):
+        if not body:
+            return {}
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise auth_error(400, "bad_json", "Could not parse request body as JSON")
+        return payload if isinstance(payload, dict) else {}
+
+    def find_user(self, user_id):
+        return self.db.execute("SELECT * FROM auth_users WHERE id = ?", (user_id,)).fetchone()
+
+    def create_auth_user(self, email, password, metadata, user_id=None):
+        email = str(email or "").strip().lower()
+        if not re.match(r"^[^@\s]+@[^@\s]+$", email):
+            raise auth_error(400, "validation_failed", "Unable to validate email address: invalid format")
+        if self.db.execute("SELECT 1 FROM auth_users WHERE email = ?", (email,)).fetchone():
+            raise auth_error(422, "email_exists", "A user with this email address has already been registered")
+        try:
+            user_id = str(uuid.UUID(user_id)) if user_id else str(uuid.uuid4())
+        except ValueError:
+            raise auth_error(400, "validation_failed", "Invalid user id")
+        timestamp = now_timestamp()
+        self.db.execute(
+            "INSERT INTO auth_users (id, email, encrypted_password, raw_user_meta_data, email_confirmed_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (user_id, email, hash_password(password) if password else None, json.dumps(metadata), timestamp, timestamp, timestamp),
+        )
+        # Mirrors the handle_new_user trigger from migration 002
+        self.db.execute(
+            "INSERT INTO profiles (id, full_name, avatar_url, created_at) VALUES (?, ?, ?, ?)",
+            (user_id, metadata.get("full_name") or metadata.get("name"), metadata.get("avatar_url"), timestamp),
+        )
+        return self.find_user(user_id)
+
+    def user_json(self, user):
+        return {
+            "id": user["id"],
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": user["email"],
+            "email_confirmed_at": user["email_confirmed_at"],
+            "phone": "",
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": json.loads(user["raw_user_meta_data"]),
+            "identities": [],
+            "created_at": user["created_at"],
+            "updated_at": user["updated_at"],
+            "is_anonymous": False,
+        }
+
+    def issue_session(self, user):
+        issued_at = int(time.time())
+        access_token = encode_jwt({
+            "aud": "authenticated",
+            "exp": issued_at + ACCESS_TOKEN_TTL,
+            "iat": issued_at,
+            "sub": user["id"],
+            "email": user["email"],
+            "role": "authenticated",
+            "aal": "aal1",
+            "session_id": str(uuid.uuid4()),
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": json.loads(user["raw_user_meta_data"]),
+        }, self.jwt_secret)
+        refresh_token = secrets.token_urlsafe(24)
+        self.refresh_tokens[refresh_token] = user["id"]
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL,
+            "expires_at": issued_at + ACCESS_TOKEN_TTL,
+            "refresh_token": refresh_token,
+            "user": self.user_json(user),
+        }
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SupabaseStandin"
+    # Keep-alive clients would otherwise wait out a delayed ACK between the header and body writes
+    disable_nagle_algorithm = True
+
+    def do_OPTIONS(self):
+        self.respond(204, None, {})
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_HEAD(self):
+        self.dispatch("HEAD")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        url = urlsplit(self.path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        body = self.read_body()
+        try:
+            status, payload, headers = self.server.standin.handle(method, url.path, params, self.headers, body)
+        except StandinError as error:
+            status, payload, headers = error.status, error.body, {}
+        except Exception as error:
+            self.log_error("Unhandled error for %s %s: %r", method, self.path, error)
+            status, payload, headers = 500, {"code": "XX000", "details": None, "hint": None, "message": str(error)}, {}
+        self.respond(status, None if method == "HEAD" else payload, headers)
+
+    def read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def respond(self, status, payload, headers):
+        data = b"" if payload is None or status == 204 else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        # Browser clients call Supabase directly
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, POST, PATCH, PUT, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", self.headers.get("Access-Control-Request-Headers") or "*")
+        self.send_header("Access-Control-Expose-Headers", "Content-Range")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(host="127.0.0.1", port=0, database=":memory:", jwt_secret=DEFAULT_JWT_SECRET, verbose=False):
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.standin = SupabaseStandin(database, jwt_secret)
+    server.verbose = verbose
+    server.url = f"http://{host}:{server.server_address[1]}"
+    return server
+
+
+def start_standin(**kwargs):
+    """Starts a stand-in on a background thread; stop it with server.shutdown()."""
+    server = create_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54330, help="0 picks a free port")
+    parser.add_argument("--db", default=":memory:", help="SQLite file to keep data in (default: in memory)")
+    parser.add_argument("--jwt-secret", default=os.environ.get("SUPABASE_JWT_SECRET", DEFAULT_JWT_SECRET))
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    options = parser.parse_args(argv)
+
+    server = create_server(options.host, options.port, options.db, options.jwt_secret, options.verbose)
+    print(f"Supabase stand-in listening on {server.url}", flush=True)
+    print(f"SUPABASE_URL={server.url}", flush=True)
+    print(f"SUPABASE_ANON_KEY={server.standin.anon_key}", flush=True)
+    print(f"SUPABASE_SERVICE_ROLE_KEY={server.standin.service_role_key}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()